@@ -0,0 +1,259 @@
+# backtest/replay.py
+"""
+WS 기록 리플레이 (core.ws_record 로 남긴 *.jsonl.gz)
+
+  inject : 프레임을 core.data_feed.handle_*_message() 에 직접 주입
+      ▸ 라이브와 같은 파싱 → candles 저장 → HTF 로컬 합성 경로
+      ▸ 확정 LTF 봉은 BacktestEngine 으로 → build_entry_plan() + mock 체결
+      ▸ 'hist' 프레임(REST 과거 캔들)으로 candles·엔진 워밍업
+      ▸ 재생 전 config.settings.SYMBOLS 를 기록의 심볼로 채움 (없으면 data_feed 가 프레임을 버림)
+          hist 프레임 심볼 + Binance 스트림명(btcusdt@kline_…) · --symbols 로 직접 지정 가능
+      ▸ 프레임은 있는데 저장된 봉이 0 이면 종료코드 1
+  serve  : 로컬 WS 서버가 기록을 그대로 송신 → 라이브 프로세스를 그대로 붙여 실행
+      ▸ BINANCE_WS_URL=ws://127.0.0.1:8765/binance/stream?streams=
+        GATE_WS_URL=ws://127.0.0.1:8765/gate  python main.py
+
+  --speed 1 → 기록된 수신 간격 그대로 (1×), 0 → 최대 속도
+
+  사용 예
+    python -m backtest.replay inject logs/ws/ws_20250101_000000_123.jsonl.gz --speed 0
+    python -m backtest.replay inject logs/ws/ws_20250101_000000_123.jsonl.gz --symbols BTCUSDT,ETHUSDT
+    python -m backtest.replay serve  logs/ws/ws_20250101_000000_123.jsonl.gz --port 8765
+"""
+
+import os
+os.environ.setdefault("EXCHANGE_MODE", "mock")    # ← 설정 import 전에 (실거래소 접속 차단)
+os.environ.setdefault("NOTIFY_DISABLED", "1")     # ← notify import 전에 (운영 웹훅 전송 차단 · 워커 상속)
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+from datetime import datetime
+
+from config.settings import HTF_TF, LTF_TF, SYMBOLS, DEFAULT_LEVERAGE
+from core.ws_record import iter_frames
+from core.metrics import observe, histogram_snapshot
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+
+class _Pacer:
+    """기록 수신 시각 간격을 speed 배속으로 재현 (speed <= 0 → 대기 없음)"""
+    __slots__ = ("speed", "t_first", "start")
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.t_first = None
+        self.start = 0.0
+
+    def delay(self, t: float) -> float:
+        if self.speed <= 0:
+            return 0.0
+        if self.t_first is None:
+            self.t_first, self.start = t, time.perf_counter()
+            return 0.0
+        return (t - self.t_first) / self.speed - (time.perf_counter() - self.start)
+
+
+# ────────────────────────────── 직접 주입 ──────────────────────────────
+def _load_history(feed, eng, snap: dict):
+    sym, tf, bars = snap["symbol"], snap["tf"], snap["bars"]
+    feed.candles[sym][tf].extend(
+        {"time": datetime.fromtimestamp(b[0] / 1000),
+         "open": b[1], "high": b[2], "low": b[3], "close": b[4], "volume": b[5]}
+        for b in bars
+    )
+    if eng is not None and tf == LTF_TF:
+        for b in bars[:-1]:                 # REST 마지막 봉은 미확정 → WS 확정 봉이 대체
+            eng.on_bar(sym, int(b[0]), b[1], b[2], b[3], b[4], b[5], evaluate=False)
+
+
+def recorded_symbols(path: str) -> list[str]:
+    """기록에 등장하는 심볼 (hist 프레임 · Binance 스트림명 · Gate 캔들 payload)"""
+    hist, streams = set(), set()
+    for _, src, raw in iter_frames(path):
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            continue
+        if src == "hist":
+            hist.add(msg["symbol"])
+        elif src == "binance":
+            name = msg.get("stream", "")
+            if "@kline_" in name:
+                streams.add(name.split("@kline_")[0].upper())
+        elif src == "gate":
+            res = msg.get("result")
+            if msg.get("channel") == "futures.candlesticks" and isinstance(res, list) and len(res) == 3:
+                hist.add(res[1])
+    # 라이브와 같은 키 : Gate 형식(BTC_USDT)이 이미 있으면 Binance 스트림도 그 키로 저장됨
+    return sorted(hist | {s for s in streams if s.replace("USDT", "_USDT") not in hist})
+
+
+def _register_symbols(symbols) -> None:
+    """SYMBOLS 제자리 갱신 (이미 있는 항목은 유지)"""
+    for sym in symbols:
+        SYMBOLS.setdefault(sym, {
+            "base": sym.replace("_USDT", "").replace("USDT", ""),
+            "leverage": DEFAULT_LEVERAGE,
+            "htf": HTF_TF,
+            "ltf": LTF_TF,
+        })
+
+
+def inject(path: str, speed: float = 0.0, strategy: bool = True,
+           symbols: list[str] | None = None, **engine_kw) -> dict:
+    """
+    기록 파일을 라이브 파싱 경로로 재생하고 요약 dict 반환
+      symbols : 재생할 심볼 (None → recorded_symbols(path))
+    """
+    import core.data_feed as feed
+    _register_symbols(symbols if symbols is not None else recorded_symbols(path))
+    if not SYMBOLS:
+        log.warning("[REPLAY] 기록에서 심볼을 찾지 못함 → 저장될 봉 없음: %s", path)
+    eng = None
+    if strategy:
+        from backtest.engine import BacktestEngine
+        eng = BacktestEngine(HTF_TF, LTF_TF, **engine_kw)
+
+    handlers = {
+        "binance": feed.handle_binance_message,
+        "gate":    feed.handle_gate_message,
+    }
+    pacer = _Pacer(speed)
+    frames = stored = errors = 0
+    t_start = time.perf_counter()
+
+    for t, src, raw in iter_frames(path):
+        if src == "hist":
+            _load_history(feed, eng, json.loads(raw))
+            continue
+        handler = handlers.get(src)
+        if handler is None:
+            continue
+        wait = pacer.delay(t)
+        if wait > 0:
+            time.sleep(wait)
+
+        t0 = time.perf_counter()
+        try:
+            res = handler(json.loads(raw))
+        except Exception as e:
+            errors += 1
+            log.debug("[REPLAY] %s 프레임 처리 오류 → %s", src, e)
+            continue
+        frames += 1
+        if res is not None:
+            stored += 1
+            sym, tf, c = res
+            if eng is not None and tf == LTF_TF:
+                eng.on_bar(sym, int(c["time"].timestamp() * 1000),
+                           c["open"], c["high"], c["low"], c["close"], c["volume"])
+        observe("replay_frame_seconds", time.perf_counter() - t0, src=src)
+
+    elapsed = time.perf_counter() - t_start
+    out = {
+        "frames":         frames,
+        "candles":        stored,
+        "errors":         errors,
+        "elapsed_sec":    elapsed,
+        "frames_per_sec": frames / elapsed if elapsed else 0.0,
+        "frame_latency":  histogram_snapshot("replay_frame_seconds"),
+    }
+    if eng is not None:
+        out["strategy"] = eng.report()
+    return out
+
+
+# ────────────────────────────── 로컬 WS 서버 ──────────────────────────────
+async def serve(path: str, host: str = "127.0.0.1", port: int = 8765, speed: float = 1.0):
+    """
+    /binance… · /gate 경로로 접속한 클라이언트에게 해당 src 프레임을 기록 간격대로 송신
+    (접속마다 처음부터 재생, 송신 후에는 클라이언트가 끊을 때까지 연결 유지)
+    """
+    from aiohttp import web
+
+    async def _stream(request, src: str):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        pacer = _Pacer(speed)
+        sent = 0
+        log.info("[REPLAY] %s 클라이언트 접속 → 재생 시작", src)
+        for t, s, raw in iter_frames(path):
+            if s != src:
+                continue
+            wait = pacer.delay(t)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if ws.closed:
+                return ws
+            await ws.send_str(raw)
+            sent += 1
+        log.info("[REPLAY] %s 재생 완료 (%d 프레임)", src, sent)
+        async for _ in ws:                  # 구독 메시지 등은 무시
+            pass
+        return ws
+
+    async def _binance(request):
+        return await _stream(request, "binance")
+
+    async def _gate(request):
+        return await _stream(request, "gate")
+
+    app = web.Application()
+    app.router.add_get("/binance{tail:.*}", _binance)
+    app.router.add_get("/gate{tail:.*}", _gate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"[REPLAY] ws://{host}:{port}/binance/stream?streams=  ·  ws://{host}:{port}/gate")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WS 기록 리플레이")
+    ap.add_argument("mode", choices=("inject", "serve"))
+    ap.add_argument("path", help="core.ws_record 기록 파일 (*.jsonl.gz)")
+    ap.add_argument("--speed", type=float, default=None,
+                    help="재생 배속 (1 = 실시간, 0 = 최대 속도 / 기본: inject 0, serve 1)")
+    ap.add_argument("--no-strategy", action="store_true", help="inject: 파싱 경로만 재생")
+    ap.add_argument("--symbols", default="", help="inject: 심볼 (쉼표 구분 · 기본: 기록에서 추출)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+    if args.mode == "serve":
+        speed = 1.0 if args.speed is None else args.speed
+        asyncio.run(serve(args.path, args.host, args.port, speed))
+        return None
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] or None
+    rep = inject(args.path, args.speed or 0.0, strategy=not args.no_strategy, symbols=symbols)
+    print(
+        f"[REPLAY] frames={rep['frames']:,}  candles={rep['candles']:,}  errors={rep['errors']} "
+        f"| {rep['frames_per_sec']:,.0f} frames/sec ({rep['elapsed_sec']:.1f}s)"
+    )
+    for h in rep["frame_latency"]:
+        print(f"   {h['labels'].get('src')}: p50={h['p50']*1e6:.0f}µs p99={h['p99']*1e6:.0f}µs "
+              f"max={h['max']*1e3:.1f}ms")
+    if "strategy" in rep:
+        s = rep["strategy"]
+        print(f"   strategy: trades={s['trades']} win={s['win_rate']*100:.1f}% "
+              f"net={s['net_pnl']:+.2f} USDT")
+    if rep["frames"] and not rep["candles"]:
+        print(f"[REPLAY] ❌ 프레임 {rep['frames']:,}개 중 저장된 봉 없음 "
+              f"(심볼 {', '.join(SYMBOLS) or '없음'} · LTF/HTF={LTF_TF}/{HTF_TF})")
+        sys.exit(1)
+    return rep
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
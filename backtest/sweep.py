@@ -0,0 +1,264 @@
+# backtest/sweep.py
+"""
+파라미터 스윕 러너 (CPU 코어 병렬)
+
+  • 그리드 = {파라미터: [값, …]} 의 데카르트 곱 → 포인트마다 백테스트 1회
+  • 캔들은 부모 프로세스에서 1회만 읽어 심볼별 .npy 로 저장
+      ▸ 워커는 np.load(mmap_mode="r") 로 열어 **읽기 전용 공유** (페이지 캐시)
+      ▸ 워커 initializer 에서 1회만 열고, 포인트마다 재사용
+  • 파라미터 적용 = 모듈 상수 덮어쓰기
+      ▸ `from config.settings import RR` 처럼 이름을 복사해 간 모듈까지 함께 갱신
+      ▸ HTF_TF / LTF_TF 는 엔진 인자로 전달 (LTF 가 데이터 TF 보다 크면 리샘플)
+  • 결과 : 파라미터 + trades · win_rate · net_pnl · max_dd … 를 CSV 1개로
+
+  사용 예
+    python -m backtest.sweep BTCUSDT=data/btc_5m.csv ETHUSDT=data/eth_5m.csv \\
+        -p RR=1.5,2,3 -p SL_BUFFER=0.003,0.005 -p ENTRY_METHOD=zone_or_mss,zone_and_mss \\
+        --jobs 8 --out sweep.csv
+    python -m backtest.sweep BTCUSDT=btc.csv --grid grid.json
+"""
+
+import os
+os.environ.setdefault("EXCHANGE_MODE", "mock")    # ← 설정 import 전에 (실거래소 접속 차단)
+os.environ.setdefault("NOTIFY_DISABLED", "1")     # ← notify import 전에 (운영 웹훅 전송 차단 · 워커 상속)
+
+import sys
+import csv
+import json
+import time
+import shutil
+import argparse
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from backtest.engine import BacktestEngine, frame_to_arrays, load_csv
+from core.resample import resample_arrays, tf_to_ms
+from config.settings import HTF_TF, LTF_TF
+
+# 스윕 가능한 파라미터
+#   TRAILING_THRESHOLD_PCT / PROTECTIVE_MODE 는 PositionManager 전용 → 엔진 결과에는 영향 없음
+SWEEP_PARAMS = {
+    "RR", "SL_BUFFER", "MIN_SL_DISTANCE_PCT", "MIN_TP_DISTANCE_PCT",
+    "ENTRY_METHOD", "PROTECTIVE_MODE", "TRAILING_THRESHOLD_PCT",
+    "HTF_TF", "LTF_TF",
+}
+_COLS = ("time", "open", "high", "low", "close", "volume")
+
+_DATA: dict = {}            # 워커별 mmap 캔들  {symbol: (t, o, h, l, c, v)}
+_DATA_TF_MS: int = 0
+
+
+# ────────────────────────────── 파라미터 적용 ──────────────────────────────
+def apply_params(params: dict):
+    """
+    config.settings 및 같은 이름을 import 해 간 프로젝트 모듈의 상수를 덮어쓴다
+    (엔진 인자로 넘기는 HTF_TF / LTF_TF 포함 – core.iof 등이 LTF_TF 를 직접 참조)
+    """
+    import config.settings as settings
+    if "PROTECTIVE_MODE" in params:
+        params = dict(params, USE_HTF_PROTECTIVE=(params["PROTECTIVE_MODE"] == "mtf"))
+    for name, value in params.items():
+        setattr(settings, name, value)
+        for mod_name, mod in list(sys.modules.items()):
+            if mod is None or mod is settings:
+                continue
+            if not mod_name.startswith(("core.", "exchange.", "main")):
+                continue
+            if hasattr(mod, name):
+                setattr(mod, name, value)
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def _parse_value(text: str):
+    try:
+        return float(text)
+    except ValueError:
+        return text.strip().lower()
+
+
+# ────────────────────────────── 공유 캔들 ──────────────────────────────
+def export_arrays(data: dict[str, tuple], cache_dir: str):
+    """{symbol: 배열 튜플} → cache_dir/<symbol>.<col>.npy"""
+    os.makedirs(cache_dir, exist_ok=True)
+    for sym, arrs in data.items():
+        for col, arr in zip(_COLS, arrs):
+            np.save(os.path.join(cache_dir, f"{sym}.{col}.npy"), np.ascontiguousarray(arr))
+
+
+def open_arrays(cache_dir: str, symbols: list[str]) -> dict[str, tuple]:
+    return {
+        sym: tuple(
+            np.load(os.path.join(cache_dir, f"{sym}.{col}.npy"), mmap_mode="r")
+            for col in _COLS
+        )
+        for sym in symbols
+    }
+
+
+def _init_worker(cache_dir: str, symbols: list[str], data_tf_ms: int):
+    global _DATA, _DATA_TF_MS
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    _DATA = open_arrays(cache_dir, symbols)
+    _DATA_TF_MS = data_tf_ms
+
+
+# ────────────────────────────── 포인트 실행 ──────────────────────────────
+def max_drawdown(trades: list[dict], balance: float) -> tuple[float, float]:
+    """청산 시점 기준 자산 곡선의 최대 낙폭 (USDT, 비율)"""
+    equity = peak = balance
+    dd = dd_pct = 0.0
+    for t in sorted(trades, key=lambda x: x["exit_time"]):
+        equity += t["net_pnl"]
+        peak = max(peak, equity)
+        if peak - equity > dd:
+            dd, dd_pct = peak - equity, (peak - equity) / peak
+    return dd, dd_pct
+
+
+def run_point(params: dict, engine_kw: dict) -> dict:
+    """워커 1개에서 그리드 포인트 1개 실행 (initializer 로 _DATA 준비 완료 상태)"""
+    from exchange import mock_exchange as broker
+    htf = params.get("HTF_TF", HTF_TF)
+    ltf = params.get("LTF_TF", LTF_TF)
+    apply_params({**params, "HTF_TF": htf, "LTF_TF": ltf})
+
+    data = _DATA
+    ltf_ms = tf_to_ms(ltf)
+    if ltf_ms != _DATA_TF_MS:
+        if ltf_ms < _DATA_TF_MS:
+            raise ValueError(f"LTF {ltf} 가 데이터 TF 보다 작음")
+        data = {s: resample_arrays(a, ltf_ms) for s, a in data.items()}
+
+    eng = BacktestEngine(htf, ltf, **engine_kw)
+    rep = eng.run_arrays(data)
+    dd, dd_pct = max_drawdown(eng.trades, broker.INITIAL_BALANCE)
+    return {
+        **params,
+        "trades":       rep["trades"],
+        "win_rate":     round(rep["win_rate"], 4),
+        "net_pnl":      round(rep["net_pnl"], 4),
+        "pnl_pct":      round(rep["pnl_pct"], 6),
+        "max_dd":       round(dd, 4),
+        "max_dd_pct":   round(dd_pct, 6),
+        "fees":         round(rep["fees"], 4),
+        "bars":         rep["bars"],
+        "bars_per_sec": round(rep["bars_per_sec"], 1),
+    }
+
+
+def _run_safe(params: dict, engine_kw: dict) -> dict:
+    try:
+        return run_point(params, engine_kw)
+    except Exception as e:
+        return {**params, "error": f"{type(e).__name__}: {e}"}
+
+
+# ────────────────────────────── 스윕 ──────────────────────────────
+def sweep(
+    data: dict[str, tuple],
+    data_tf: str,
+    grid: dict,
+    jobs: int | None = None,
+    cache_dir: str | None = None,
+    **engine_kw,
+) -> list[dict]:
+    """
+    data : {symbol: (time_ms, o, h, l, c, v)}  (data_tf 봉)
+    grid : {파라미터: [값, …]}
+    반환 : 포인트별 결과 dict 목록 (net_pnl 내림차순)
+    """
+    unknown = set(grid) - SWEEP_PARAMS
+    if unknown:
+        raise ValueError(f"스윕 불가 파라미터: {sorted(unknown)}")
+    points = expand_grid(grid)
+
+    tmp = cache_dir is None
+    cache_dir = cache_dir or tempfile.mkdtemp(prefix="smc_sweep_")
+    export_arrays(data, cache_dir)
+    jobs = jobs or os.cpu_count() or 1
+
+    rows: list[dict] = []
+    t0 = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(cache_dir, list(data), tf_to_ms(data_tf)),
+        ) as ex:
+            futs = [ex.submit(_run_safe, p, engine_kw) for p in points]
+            for n, fut in enumerate(as_completed(futs), 1):
+                rows.append(fut.result())
+                if n % max(1, len(points) // 20) == 0 or n == len(points):
+                    print(f"[SWEEP] {n}/{len(points)}  ({time.perf_counter() - t0:.0f}s)")
+    finally:
+        if tmp:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    rows.sort(key=lambda r: r.get("net_pnl", float("-inf")), reverse=True)
+    return rows
+
+
+def write_csv(rows: list[dict], path: str):
+    fields: list[str] = []
+    for r in rows:
+        for k in r:
+            if k not in fields:
+                fields.append(k)
+    with open(path, "w", newline="", encoding="utf-8") as fp:
+        w = csv.DictWriter(fp, fieldnames=fields)
+        w.writeheader()
+        w.writerows(rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SMC 파라미터 스윕")
+    ap.add_argument("data", nargs="+", help="SYMBOL=path.csv …")
+    ap.add_argument("-p", "--param", action="append", default=[],
+                    help="NAME=v1,v2,… (여러 번 지정)")
+    ap.add_argument("--grid", help="{NAME: [값, …]} JSON 파일")
+    ap.add_argument("--data-tf", default=LTF_TF, help="입력 CSV 의 봉 TF")
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--window", type=int, default=300)
+    ap.add_argument("--tick", type=float, default=0.1)
+    ap.add_argument("--notional", type=float, default=1000.0)
+    ap.add_argument("--path", default=None, help="봉 내부 경로 가정 (ohlc|olhc|worst)")
+    ap.add_argument("--cache", default=None, help=".npy 캐시 디렉터리 (기본: 임시)")
+    ap.add_argument("--out", default="sweep_results.csv")
+    args = ap.parse_args(argv)
+
+    grid: dict = {}
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as fp:
+            grid.update(json.load(fp))
+    for item in args.param:
+        name, values = item.split("=", 1)
+        grid[name.strip().upper()] = [_parse_value(v) for v in values.split(",")]
+    if not grid:
+        ap.error("스윕할 파라미터가 없음 (-p / --grid)")
+
+    data = {}
+    for item in args.data:
+        sym, path = item.split("=", 1)
+        data[sym.upper()] = frame_to_arrays(load_csv(path))
+
+    rows = sweep(
+        data, args.data_tf, grid, jobs=args.jobs, cache_dir=args.cache,
+        window_ltf=args.window, window_htf=args.window, tick_size=args.tick,
+        notional=args.notional, path=args.path,
+    )
+    write_csv(rows, args.out)
+    print(f"[SWEEP] {len(rows)} 포인트 → {args.out}")
+    for r in rows[:5]:
+        print("   ", r)
+    return rows
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
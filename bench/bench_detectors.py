@@ -0,0 +1,244 @@
+# bench/bench_detectors.py
+"""
+탐지기 마이크로 벤치마크 (완전 오프라인)
+
+  • 대상 : detect_ob · detect_bb · detect_fvg · detect_structure · detect_equal_levels
+           get_mss_and_protective_low · get_improved_protective_level · is_iof_entry
+  • 입력 : bench.synthetic.make_ohlcv (trend / range / spike × 크기별, 시드 고정)
+      ▸ HTF 입력이 필요한 탐지기는 LTF 를 core.resample 로 4h 합성해 사용
+  • 측정 : ns/bar (반복 실행 중 최솟값) · tracemalloc 피크(KB)·할당 블록 수
+           · 결과 지문(sha1) → 탐지 로직이 바뀌면 baseline 과 달라짐
+  • baseline JSON 저장(--save) / 비교(--check, 허용치 초과 시 종료코드 1)
+      ▸ bench/baseline.json (100·1500 봉) 을 저장소에 함께 둔다 – 없으면 --check 는 종료코드 2
+
+  사용 예
+    python -m bench.bench_detectors                          # 전체 실행·표 출력
+    python -m bench.bench_detectors --sizes 100,1500 --save  # baseline 갱신
+    python -m bench.bench_detectors --check --tolerance 0.25
+"""
+
+import os
+os.environ["EXCHANGE_MODE"] = "mock"              # ← 설정 import 전에 (실거래소 접속 차단)
+
+import sys
+import gc
+import json
+import time
+import hashlib
+import logging
+import platform
+import argparse
+import tracemalloc
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+import notify.discord as discord
+discord.WEBHOOKS.update({k: None for k in discord.WEBHOOKS})    # 벤치 중 외부 전송 금지
+
+from bench.synthetic import make_ohlcv, REGIMES
+from core.resample import resample_frame
+from core.ob import detect_ob
+from core.bb import detect_bb
+from core.fvg import detect_fvg
+from core.structure import detect_structure
+from core.liquidity import detect_equal_levels
+import core.mss as mss
+from core.mss import get_mss_and_protective_low
+from core.protective import get_improved_protective_level
+from core.iof import is_iof_entry
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = (100, 1500, 10_000, 100_000)
+TICK = Decimal("0.01")
+
+
+# ────────────────────────────── 케이스 정의 ──────────────────────────────
+def _cases(ltf: pd.DataFrame, htf: pd.DataFrame) -> dict:
+    """탐지기 이름 → 인자 없는 호출 (사전 계산 입력은 측정에서 제외)"""
+    obs = detect_ob(ltf)
+    entry = float(ltf["close"].iloc[-1])
+    return {
+        "detect_ob":                     lambda: detect_ob(ltf),
+        "detect_bb":                     lambda: detect_bb(ltf, obs),
+        "detect_fvg":                    lambda: detect_fvg(ltf),
+        "detect_structure":              lambda: detect_structure(ltf),
+        "detect_equal_levels":           lambda: detect_equal_levels(ltf),
+        "get_mss_and_protective_low":    lambda: _mss(ltf),
+        "get_improved_protective_level": lambda: get_improved_protective_level(ltf, htf, "long", entry),
+        "is_iof_entry":                  lambda: is_iof_entry(htf, ltf, TICK),
+    }
+
+
+def _mss(ltf):
+    mss.REENTRY_COUNT.clear()           # 재진입 카운터가 반복 실행 결과를 바꾸지 않도록
+    return get_mss_and_protective_low(ltf, "long")
+
+
+def _normalize(obj):
+    if isinstance(obj, float):
+        return round(obj, 8)
+    if isinstance(obj, (np.floating, np.integer)):
+        return _normalize(obj.item())
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, dict):
+        return sorted((str(k), _normalize(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_normalize(v) for v in obj]
+    if isinstance(obj, pd.DataFrame):
+        if "structure" in obj:
+            s = obj["structure"].dropna()
+            return [list(map(int, s.index)), s.tolist()]
+        return [obj.shape, _normalize(obj.to_dict("list"))]
+    return repr(obj)
+
+
+def fingerprint(result) -> str:
+    """탐지 결과 → 12자리 sha1 (float 8자리 반올림)"""
+    return hashlib.sha1(repr(_normalize(result)).encode()).hexdigest()[:12]
+
+
+# ────────────────────────────── 측정 ──────────────────────────────
+def measure(fn, n_bars: int, min_time: float = 0.2, max_runs: int = 50) -> dict:
+    """반복 실행 최솟값 기준 ns/bar + 1회 실행 할당량"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    result = fn()
+    first = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(max(0, st.count_diff) for st in after.compare_to(before, "filename"))
+
+    best, runs, spent = first, 1, first
+    while spent < min_time and runs < max_runs:
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best = min(best, dt)
+        spent += dt
+        runs += 1
+    return {
+        "ns_per_bar":    best * 1e9 / n_bars,
+        "sec_per_call":  best,
+        "runs":          runs,
+        "alloc_peak_kb": peak / 1024,
+        "alloc_blocks":  blocks,
+        "fingerprint":   fingerprint(result),
+    }
+
+
+def run(sizes=SIZES, regimes=REGIMES, only=None, budget: float = 30.0, seed: int = 0) -> dict:
+    """
+    반환 : {"detector/regime/size": 측정 dict}
+    1회 호출이 budget 초를 넘은 탐지기는 더 큰 크기를 건너뛴다
+    """
+    results: dict = {}
+    over_budget: set = set()
+    for n in sorted(sizes):
+        for regime in regimes:
+            ltf = make_ohlcv(n, regime, seed)
+            htf = resample_frame(ltf, "4h")
+            htf.attrs["symbol"] = ltf.attrs["symbol"]
+            for name, fn in _cases(ltf, htf).items():
+                if only and name not in only:
+                    continue
+                key = f"{name}/{regime}/{n}"
+                if name in over_budget:
+                    results[key] = {"skipped": "budget"}
+                    continue
+                try:
+                    m = measure(fn, n)
+                except Exception as e:
+                    results[key] = {"error": f"{type(e).__name__}: {e}"}
+                    continue
+                results[key] = m
+                if m["sec_per_call"] > budget:
+                    over_budget.add(name)
+                print(f"{key:<48} {m['ns_per_bar']:>12,.0f} ns/bar  "
+                      f"{m['alloc_peak_kb']:>10,.0f} KB  {m['alloc_blocks']:>8,} blk  {m['fingerprint']}")
+    return results
+
+
+# ────────────────────────────── baseline ──────────────────────────────
+def _meta() -> dict:
+    return {
+        "python":   platform.python_version(),
+        "numpy":    np.__version__,
+        "pandas":   pd.__version__,
+        "machine":  platform.machine(),
+        "created":  time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def save_baseline(results: dict, path: str = BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump({"meta": _meta(), "results": results}, fp, indent=1, sort_keys=True)
+    print(f"[BENCH] baseline 저장 → {path}")
+
+
+def check(results: dict, path: str = BASELINE_PATH, tolerance: float = 0.25) -> list[str]:
+    """baseline 대비 회귀 목록 (속도·할당 허용치 초과, 결과 지문 변경 · baseline 없음)"""
+    if not os.path.exists(path):
+        return [f"baseline 없음: {path} → --save 로 먼저 생성"]
+    with open(path, encoding="utf-8") as fp:
+        base = json.load(fp)["results"]
+    problems = []
+    for key, cur in results.items():
+        ref = base.get(key)
+        if not ref or "ns_per_bar" not in ref or "ns_per_bar" not in cur:
+            continue
+        if cur["fingerprint"] != ref["fingerprint"]:
+            problems.append(f"{key}: 결과 변경 {ref['fingerprint']} → {cur['fingerprint']}")
+        for field in ("ns_per_bar", "alloc_peak_kb"):
+            if ref[field] and cur[field] > ref[field] * (1 + tolerance):
+                problems.append(
+                    f"{key}: {field} {ref[field]:,.0f} → {cur[field]:,.0f} "
+                    f"(+{(cur[field] / ref[field] - 1) * 100:.0f}%)"
+                )
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SMC 탐지기 벤치마크")
+    ap.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    ap.add_argument("--regimes", default=",".join(REGIMES))
+    ap.add_argument("--only", default="", help="탐지기 이름 (쉼표 구분)")
+    ap.add_argument("--budget", type=float, default=30.0, help="1회 호출 상한(초) – 초과 시 큰 크기 생략")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--save", action="store_true", help="결과를 baseline 으로 저장")
+    ap.add_argument("--check", action="store_true", help="baseline 과 비교 (회귀 시 종료코드 1)")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args(argv)
+    if args.check and not args.save and not os.path.exists(args.baseline):
+        print(f"[BENCH] ❌ baseline 없음: {args.baseline} → --save 로 먼저 생성")
+        return 2
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        regimes=[r for r in args.regimes.split(",") if r],
+        only={s for s in args.only.split(",") if s},
+        budget=args.budget,
+        seed=args.seed,
+    )
+    if args.save:
+        save_baseline(results, args.baseline)
+    if args.check:
+        problems = check(results, args.baseline, args.tolerance)
+        for p in problems:
+            print(f"[BENCH] ⚠️ {p}")
+        if problems:
+            return 1
+        print("[BENCH] ✅ baseline 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,9 +1,13 @@
 # config/settings.py
 
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from binance.client import Client
 from dotenv import load_dotenv
-import os
 from notify.discord import send_discord_debug
 
 load_dotenv()
@@ -34,11 +38,9 @@ if PROTECTIVE_MODE not in ALLOWED_PROTECTIVE:
 # "mtf" 때만 상위 TF 사용
 USE_HTF_PROTECTIVE = (PROTECTIVE_MODE == "mtf")
 
-# ── 모드 요약을 콘솔·디스코드에 출력 ───────────────────────────
+# ── 모드 요약 (콘솔·디스코드 출력은 bootstrap() 에서 1회) ──────────
 mode_human = "LTF-only" if PROTECTIVE_MODE == "ltf" else "LTF+HTF"
 msg_cfg = f"🔧 [CONFIG] Protective mode = {mode_human}"
-print(msg_cfg)
-send_discord_debug(msg_cfg, "aggregated")
 
 # ───────────────────────────────────────────────
 #  거래소 모드 스위치
@@ -55,16 +57,10 @@ ENABLE_GATE     = EXCHANGE_MODE in ("gate",    "both")
 # ────────────────────────────────
 ENABLE_MOCK     = EXCHANGE_MODE == "mock"
 
-# 심볼 테이블은 미리 빈 dict 로 초기화
+# 심볼 테이블은 미리 빈 dict 로 초기화 → bootstrap() 이 **제자리 갱신**
+#   (from config.settings import SYMBOLS 로 받아 둔 참조도 그대로 유효)
 SYMBOLS: dict[str, dict] = {}
 
-# Binance 클라이언트는 실제로 사용할 때만 생성
-if ENABLE_BINANCE:
-    api_key    = os.getenv("BINANCE_API_KEY")
-    api_secret = os.getenv("BINANCE_API_SECRET")
-    client = Client(api_key, api_secret, tld='com')
-    client.API_URL = "https://fapi.binance.com/fapi"
-
 # ───────────────────────────────────────────────
 # 🕒 단일 소스-오브-트루스(Time-frames)
 #    • .env 에 HTF_TF / LTF_TF 지정 가능
@@ -77,6 +73,10 @@ LTF_TF = os.getenv("LTF_TF", "15m").lower()   # Low-Time-Frame
 #  ↳ 필요 시 ‘추가’ 프레임을 세트에 넣어주면 된다.
 TIMEFRAMES = sorted({HTF_TF, LTF_TF})
 
+# ▶ HTF 로컬 합성 : WS 는 LTF 스트림만 구독하고 상위 TF 봉은
+#    core.resample.StreamResampler 로 직접 만든다 (과거 봉은 REST 로딩 유지)
+DERIVE_HTF_LOCALLY = os.getenv("DERIVE_HTF_LOCALLY", "0").lower() in ("1", "true", "yes")
+
 # ───────────────────────────────────────────────
 # HTF 프리미엄&디스카운트 필터 설정
 # ───────────────────────────────────────────────
@@ -89,7 +89,12 @@ SL_BUFFER = 0.005
 MIN_TP_DISTANCE_PCT = 0.01  # 1% 최소 거리
 # ▶ SL 최소 거리 설정 (진입가 대비 최소 2% 이상)
 MIN_SL_DISTANCE_PCT = 0.01  # 2% 최소 거리
+# ▶ SL 정정 병합 윈도우(초) : 직전 발주 후 이 시간 안에 들어온 SL 변경은
+#    마지막 값만 남겨 윈도우 종료 시 1회만 발주 (0 → 병합 끔)
+SL_COALESCE_WINDOW_SEC = float(os.getenv("SL_COALESCE_WINDOW_SEC", "3"))
 CANDLE_LIMIT = 1500
+# ▶ ATR 기간 (core.indicators 기본값 · volatility.atr_pct)
+ATR_PERIOD = 14
 DEFAULT_LEVERAGE = 20
 CUSTOM_LEVERAGES = {}
 
@@ -104,6 +109,7 @@ def fetch_max_leverages():
     if not ENABLE_BINANCE:
         return {}
     try:
+        from exchange.binance_api import client          # 지연 생성 클라이언트
         data = client.futures_leverage_bracket()
         return {
             entry['symbol']: int(entry['brackets'][0]['initialLeverage'])
@@ -122,15 +128,18 @@ OVERSHOOT_FACTOR = 2            # limit * OVERSHOOT_FACTOR 만큼 여유분 확
 
 def fetch_top_futures_symbols(
     limit: int    = TOP_SYMBOL_LIMIT,
-    overshoot: int = TOP_SYMBOL_LIMIT * OVERSHOOT_FACTOR
+    overshoot: int = TOP_SYMBOL_LIMIT * OVERSHOOT_FACTOR,
+    ticker: list | None = None,
 ):
     """
     ▸ 24h 거래량 상위 심볼을 (limit + overshoot) 만큼 가져온다.
       - exchangeInfo 에서 빠지는 심볼을 제외하고도 최종 10개를 확보하기 위함.
+    ▸ ticker : 미리 받아 둔 /ticker/24hr 응답 (bootstrap 병렬 조회용)
     """
     EXCLUDE_SYMBOLS = {"BTCUSDT"}  # ⛔ 제외할 심볼
     try:
-        ticker = requests.get("https://fapi.binance.com/fapi/v1/ticker/24hr").json()
+        if ticker is None:
+            ticker = requests.get("https://fapi.binance.com/fapi/v1/ticker/24hr", timeout=5).json()
         sorted_by_volume = sorted(ticker, key=lambda x: float(x['quoteVolume']), reverse=True)
         top_symbols = []
         for s in sorted_by_volume:
@@ -149,15 +158,19 @@ def fetch_top_futures_symbols(
 
 def fetch_symbol_info(
     symbols,
-    required: int = TOP_SYMBOL_LIMIT
+    required: int = TOP_SYMBOL_LIMIT,
+    info: dict | None = None,
+    max_leverages: dict | None = None,
 ):
     # ✔︎ USDT-M 선물 심볼까지 포함되는 futures exchangeInfo 사용
     #    (v1: 필터 포함, v2: 필터 제외) → v1 로 충분합니다.
-    info = requests.get(
-        "https://fapi.binance.com/fapi/v1/exchangeInfo", timeout=3
-    ).json()
+    if info is None:
+        info = requests.get(
+            "https://fapi.binance.com/fapi/v1/exchangeInfo", timeout=3
+        ).json()
     all_symbols = {s['symbol']: s for s in info['symbols']}
-    max_leverages = fetch_max_leverages()
+    if max_leverages is None:
+        max_leverages = fetch_max_leverages()
     result = {}
 
     for symbol in symbols:
@@ -198,12 +211,12 @@ def fetch_top_symbols(limit: int = TOP_SYMBOL_LIMIT,
     return fetch_symbol_info(raw, required=limit)
 # ──────────────────────────────────────────────────────────────────
 
-# 실행 시 자동 로딩
-if ENABLE_GATE and not ENABLE_BINANCE:          # Gate-전용일 때만
-    # 24h 거래량 Top 10 (Gate USDT-Perp)
-    raw = requests.get(
-        "https://fx-api.gateio.ws/api/v4/futures/usdt/tickers"
-    ).json()
+def fetch_gate_top_symbols(raw: list | None = None, limit: int = TOP_SYMBOL_LIMIT) -> dict:
+    """Gate USDT-Perp 24h 거래량 상위 limit 개 → SYMBOLS 형식"""
+    if raw is None:
+        raw = requests.get(
+            "https://fx-api.gateio.ws/api/v4/futures/usdt/tickers", timeout=5
+        ).json()
 
     # ▸ 6.97 기준: volume_24h_quote (USDT 환산)  
     #   └ 하위 호환 위해 다른 키들도 함께 확인
@@ -214,17 +227,16 @@ if ENABLE_GATE and not ENABLE_BINANCE:          # Gate-전용일 때만
             or item.get("volume_24h_quote", 0)         # 최신
         )
 
-    for t in sorted(raw, key=_vol, reverse=True)[:TOP_SYMBOL_LIMIT]:
+    out = {}
+    for t in sorted(raw, key=_vol, reverse=True)[:limit]:
         sym = t["contract"]          # e.g. BTC_USDT
-        SYMBOLS[sym] = {
+        out[sym] = {
             "base": sym.split("_")[0],
             "leverage": DEFAULT_LEVERAGE,
             "htf": "15m",
             "ltf": "1m",
         }
-
-elif ENABLE_BINANCE:                # Binance 전용/듀얼 모두
-    SYMBOLS.update(fetch_top_symbols())
+    return out
 
 # ───────────────────────────── 추가 ─────────────────────────────
 # 거래소별 심볼 테이블 분리
@@ -233,12 +245,135 @@ elif ENABLE_BINANCE:                # Binance 전용/듀얼 모두
 SYMBOLS_BINANCE = SYMBOLS       # 그대로 사용
 SYMBOLS_GATE = []               # Gate 지원 심볼 (듀얼 모드에서만 채움)
 
-if ENABLE_GATE:
-    from exchange.gate_sdk import normalize_contract_symbol   # 🔄 이곳으로 이동
-    for sym in SYMBOLS:
-        try:
-            normalize_contract_symbol(sym)
-            SYMBOLS_GATE.append(sym)
-        except ValueError:
-            print(f"[WARN] Gate 미지원 심볼 제외 (settings): {sym}")
-# ───────────────────────────────────────────────────────────────
+# ═══════════════════════════════════════════════════════════════
+#  🚀 bootstrap() : 심볼 유니버스·레버리지·Gate 계약 메타 1회 로딩
+#   • import 시점에는 네트워크 호출 없음 → 툴·백테스트는 즉시 기동
+#   • 라이브 진입점(main.py)이 다른 모듈보다 먼저 호출
+#   • REST 조회는 스레드 풀로 동시에, 결과는 BOOTSTRAP_SNAPSHOT 에 저장
+#       ▸ BOOTSTRAP_TTL_SEC 이내 스냅샷(같은 EXCHANGE_MODE)은 네트워크 없이 재사용
+#       ▸ 조회 실패 시 만료된 스냅샷이라도 있으면 그것으로 기동
+#   • on_bootstrap(fn) : 심볼 확정 후 파생 상태를 다시 만들 훅 (예: router.GATE_SET)
+# ═══════════════════════════════════════════════════════════════
+BOOTSTRAP_SNAPSHOT = os.getenv("BOOTSTRAP_SNAPSHOT", "logs/bootstrap_snapshot.json")
+BOOTSTRAP_TTL_SEC  = float(os.getenv("BOOTSTRAP_TTL_SEC", "21600"))     # 6h, 0 → 항상 새로 조회
+
+_BOOT_LOCK = threading.Lock()
+_BOOTSTRAPPED = False
+_BOOT_HOOKS: list = []
+
+
+def on_bootstrap(fn) -> None:
+    """bootstrap 완료 후 호출할 훅 등록 (이미 완료됐으면 즉시 호출)"""
+    _BOOT_HOOKS.append(fn)
+    if _BOOTSTRAPPED:
+        fn()
+
+
+def _read_snapshot() -> dict | None:
+    try:
+        with open(BOOTSTRAP_SNAPSHOT, encoding="utf-8") as fp:
+            snap = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    return snap if snap.get("mode") == EXCHANGE_MODE else None
+
+
+def _write_snapshot(snap: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(BOOTSTRAP_SNAPSHOT) or ".", exist_ok=True)
+        tmp = BOOTSTRAP_SNAPSHOT + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(snap, fp, ensure_ascii=False)
+        os.replace(tmp, BOOTSTRAP_SNAPSHOT)
+    except OSError as e:
+        print(f"[BOOT] 스냅샷 저장 실패 → {e}")
+
+
+def _fetch_universe() -> dict:
+    """거래소 REST 병렬 조회 → 스냅샷 dict"""
+    def _get(url):
+        return lambda: requests.get(url, timeout=5).json()
+
+    jobs = {}
+    if ENABLE_BINANCE:
+        jobs["ticker"]    = _get("https://fapi.binance.com/fapi/v1/ticker/24hr")
+        jobs["info"]      = _get("https://fapi.binance.com/fapi/v1/exchangeInfo")
+        jobs["leverages"] = fetch_max_leverages
+    if ENABLE_GATE:
+        from exchange.gate_sdk import fetch_contracts
+        jobs["contracts"] = fetch_contracts
+        if not ENABLE_BINANCE:
+            jobs["gate_tickers"] = _get("https://fx-api.gateio.ws/api/v4/futures/usdt/tickers")
+
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs)), thread_name_prefix="bootstrap") as ex:
+        futures = {k: ex.submit(fn) for k, fn in jobs.items()}
+        res = {k: f.result() for k, f in futures.items()}
+
+    if ENABLE_BINANCE:
+        raw = fetch_top_futures_symbols(ticker=res["ticker"])
+        symbols = fetch_symbol_info(raw, info=res["info"], max_leverages=res["leverages"])
+    elif ENABLE_GATE:
+        symbols = fetch_gate_top_symbols(res["gate_tickers"])
+    else:
+        symbols = {}
+    if (ENABLE_BINANCE or ENABLE_GATE) and not symbols:
+        raise RuntimeError("심볼 유니버스가 비어 있음")
+    return {
+        "mode":      EXCHANGE_MODE,
+        "created":   time.time(),
+        "symbols":   symbols,
+        "contracts": res.get("contracts", {}),
+    }
+
+
+def _apply(snap: dict) -> None:
+    SYMBOLS.clear()
+    SYMBOLS.update(snap["symbols"])
+    SYMBOLS_GATE.clear()
+    if ENABLE_GATE:
+        from exchange.gate_sdk import load_contracts, normalize_contract_symbol
+        load_contracts(snap.get("contracts") or {})
+        for sym in SYMBOLS:
+            try:
+                normalize_contract_symbol(sym)
+                SYMBOLS_GATE.append(sym)
+            except ValueError:
+                print(f"[WARN] Gate 미지원 심볼 제외 (settings): {sym}")
+
+
+def bootstrap(force: bool = False) -> dict:
+    """
+    SYMBOLS · SYMBOLS_GATE · Gate 계약 캐시를 채우고 SYMBOLS 반환 (중복 호출 no-op)
+    force=True → 스냅샷 TTL 무시하고 새로 조회
+    """
+    global _BOOTSTRAPPED
+    with _BOOT_LOCK:
+        if _BOOTSTRAPPED and not force:
+            return SYMBOLS
+        print(msg_cfg)
+        send_discord_debug(msg_cfg, "aggregated")
+
+        t0 = time.perf_counter()
+        snap = None if force else _read_snapshot()
+        source = "snapshot"
+        if snap is None or time.time() - snap.get("created", 0) > BOOTSTRAP_TTL_SEC:
+            stale = snap
+            try:
+                snap = _fetch_universe()
+                source = "REST"
+                _write_snapshot(snap)
+            except Exception as e:
+                if stale is None:
+                    raise
+                snap, source = stale, "stale snapshot"
+                msg = f"⚠️ [BOOT] 거래소 조회 실패 → 만료 스냅샷 사용: {e}"
+                print(msg)
+                send_discord_debug(msg, "aggregated")
+
+        _apply(snap)
+        _BOOTSTRAPPED = True
+        print(f"[BOOT] 심볼 {len(SYMBOLS)}개 로딩 ({source}, {time.perf_counter() - t0:.2f}s)")
+
+    for fn in list(_BOOT_HOOKS):
+        fn()
+    return SYMBOLS
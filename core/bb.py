@@ -2,7 +2,11 @@
 import pandas as pd
 from typing import List, Dict
 from notify.discord import send_discord_debug
-from decimal import Decimal, ROUND_DOWN
+import logging
+from core.log import get_logger, log_changed
+from core.cache import BoundedSet
+
+log = get_logger(__name__)
 
 def detect_bb(df: pd.DataFrame, ob_zones: List[Dict], max_rebound_candles: int = 3) -> List[Dict]:
     """
@@ -15,8 +19,8 @@ def detect_bb(df: pd.DataFrame, ob_zones: List[Dict], max_rebound_candles: int =
 
     for ob in ob_zones:
         ob_type = ob['type']
-        ob_high = Decimal(str(ob['high']))
-        ob_low = Decimal(str(ob['low']))
+        ob_high = float(ob['high'])
+        ob_low = float(ob['low'])
         ob_time = ob['time']
         df_after = df[df['time'] > ob_time].reset_index(drop=True)
         invalid_index = None      # OB 무효화된 봉 인덱스
@@ -38,8 +42,8 @@ def detect_bb(df: pd.DataFrame, ob_zones: List[Dict], max_rebound_candles: int =
                 min(invalid_index + 1 + max_rebound_candles, len(df_after))
             ):
                 rebound = df_after.iloc[j]
-                high = Decimal(str(rebound['high']))
-                low = Decimal(str(rebound['low']))
+                high = float(rebound['high'])
+                low = float(rebound['low'])
                 if ob_type == "bullish":
                     bb_zones.append({
                         "type": "bearish",
@@ -61,35 +65,32 @@ def detect_bb(df: pd.DataFrame, ob_zones: List[Dict], max_rebound_candles: int =
     tf = df.attrs.get("tf", "?")
     if bb_zones:
         last = bb_zones[-1]
-        print(f"[BB][{tf}] {symbol} → {last['type'].upper()} {last['low']}~{last['high']} (총 {len(bb_zones)})")
+        log_changed(log, ("bb", symbol, tf), logging.DEBUG,
+                    "[BB][%s] %s → %s %s~%s (총 %d)",
+                    tf, symbol, last['type'].upper(), last['low'], last['high'], len(bb_zones))
     else:
-        print(f"[BB][{tf}] {symbol} → 감지 없음")
+        log_changed(log, ("bb", symbol, tf), logging.DEBUG, "[BB][%s] %s → 감지 없음", tf, symbol)
 
     # ───────── 중복-알림 차단 ──────────
     symbol = df.attrs.get("symbol", "UNKNOWN")
     tf     = df.attrs.get("tf", "?")
     key    = (symbol, tf)
 
-    _seen = _BB_CACHE.setdefault(key, set())   # 전역 dict  { (sym,tf): set() }
     fresh = []
     for z in bb_zones:
-        sig = (round(z["low"], 8), round(z["high"], 8), z["type"])
-        if sig in _seen:
-            continue                # 이미 알림 → 건너뜀
-        _seen.add(sig)
-        fresh.append(z)
+        sig = key + (round(z["low"], 8), round(z["high"], 8), z["type"])
+        if _BB_CACHE.remember(sig):    # 처음 보는 존만 (이미 알림 → 건너뜀)
+            fresh.append(z)
 
     # ① fresh 로 잡힌 BB 만 알림
     for z in fresh[-5:]:
-        msg = (
-            f"[BB] {symbol} ({tf}) NEW {z['type'].upper()}  "
-            f"{z['low']} ~ {z['high']}  |  {z['time']:%Y-%m-%d %H:%M}"
-        )
-        print(msg)
+        log.info("[BB] %s (%s) NEW %s  %s ~ %s  |  %s",
+                 symbol, tf, z['type'].upper(), z['low'], z['high'], z['time'])
         #send_discord_debug(msg, "aggregated")          # 두 번째 인자는 원하는 태그
 
     # ② 전략에는 전체 OB 리스트를 넘긴다
     return bb_zones
 
 # ───────── 모듈 전역 캐시  ─────────
-_BB_CACHE: dict[tuple[str, str], set[tuple]] = {}
\ No newline at end of file
+#  (sym, tf, low, high, type) – 현재 감지 존은 매 호출 갱신되므로 지난 존만 밀려남
+_BB_CACHE = BoundedSet("bb_seen", 20_000)
\ No newline at end of file
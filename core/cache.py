@@ -0,0 +1,183 @@
+# core/cache.py
+"""
+모듈 전역 메모 dict 용 크기 제한 캐시 (LRU · 유휴 TTL)
+
+  • BoundedCache(name, maxsize, ttl=None) : dict 처럼 쓰는 LRU
+      ▸ 읽기(get · [] · in)·쓰기 모두 최근 사용으로 갱신
+        → 계속 참조되는 키(아직 감지되는 존 · 활성 심볼)는 남고 안 쓰는 키만 밀려남
+      ▸ maxsize 초과 → 가장 오래 안 쓴 키부터 제거
+      ▸ ttl(초) : 마지막 사용 후 ttl 이 지난 키는 없는 것으로 취급
+        LRU 순서 = 사용 시각 순서 → 만료분은 항상 앞쪽에 모여 있어 쓰기 때 앞에서부터 정리
+      ▸ 락 1개 (OrderedDict 재배치는 원자적이지 않음)
+  • BoundedSet : 값 없는 BoundedCache – add · remember · in · discard
+  • 메트릭 (core.control_server /metrics)
+      cache_entries{cache}                      : 현재 항목 수 (스크레이프 시점)
+      cache_capacity{cache}                     : maxsize
+      cache_evictions_total{cache, reason}      : size | ttl
+  • stats() : 이름별 {size, maxsize, ttl, evicted, expired} · caches() : 이름 → 인스턴스 (core.memdiag)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from core.metrics import counter, register_collector
+
+_MISSING = object()
+_REGISTRY: dict[str, "BoundedCache"] = {}
+
+
+class BoundedCache(MutableMapping):
+    def __init__(self, name: str, maxsize: int, ttl: float | None = None):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive: {maxsize!r}")
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()       # key → (value, 마지막 사용 monotonic)
+        self._lock = threading.Lock()
+        self._evicted = counter("cache_evictions_total", cache=name, reason="size")
+        self._expired = counter("cache_evictions_total", cache=name, reason="ttl")
+        _REGISTRY[name] = self
+
+    # ────────────────────────────── 내부 ──────────────────────────────
+    def _lookup(self, key, now: float):
+        """(락 보유 중) 값 또는 _MISSING – 찾으면 최근 사용으로 갱신"""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return _MISSING
+        if self.ttl is not None and now - item[1] > self.ttl:
+            del self._data[key]
+            self._expired.inc()
+            return _MISSING
+        self._data[key] = (item[0], now)
+        self._data.move_to_end(key)
+        return item[0]
+
+    def _store(self, key, value, now: float):
+        """(락 보유 중) 삽입·갱신 후 만료분·초과분 정리"""
+        data = self._data
+        data[key] = (value, now)
+        data.move_to_end(key)
+        if self.ttl is not None:
+            horizon = now - self.ttl
+            while data:
+                k, (_, t) = next(iter(data.items()))
+                if t >= horizon:
+                    break
+                del data[k]
+                self._expired.inc()
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+            self._evicted.inc()
+
+    # ────────────────────────────── dict API ──────────────────────────────
+    def get(self, key, default=None):
+        with self._lock:
+            v = self._lookup(key, time.monotonic())
+        return default if v is _MISSING else v
+
+    def __getitem__(self, key):
+        with self._lock:
+            v = self._lookup(key, time.monotonic())
+        if v is _MISSING:
+            raise KeyError(key)
+        return v
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._store(key, value, time.monotonic())
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key, time.monotonic()) is not _MISSING
+
+    def setdefault(self, key, default=None):
+        with self._lock:
+            now = time.monotonic()
+            v = self._lookup(key, now)
+            if v is _MISSING:
+                self._store(key, default, now)
+                v = default
+            return v
+
+    def pop(self, key, default=_MISSING):
+        with self._lock:
+            v = self._lookup(key, time.monotonic())
+            if v is not _MISSING:
+                del self._data[key]
+                return v
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        """키 스냅샷 (오래 안 쓴 것부터 · 만료 여부는 보지 않음)"""
+        with self._lock:
+            return iter(list(self._data))
+
+    def items_snapshot(self) -> list[tuple]:
+        """(key, value) 스냅샷 – LRU 순서·TTL 을 건드리지 않음 (진단용)"""
+        with self._lock:
+            return [(k, item[0]) for k, item in self._data.items()]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {len(self)}/{self.maxsize})"
+
+
+class BoundedSet(BoundedCache):
+    """seen-set 용 – 값은 None"""
+
+    def add(self, key) -> None:
+        self[key] = None
+
+    def discard(self, key) -> None:
+        self.pop(key, None)
+
+    def remember(self, key) -> bool:
+        """처음 보는(또는 만료된) 키면 기록 후 True · 이미 있으면 사용 시각만 갱신 후 False"""
+        with self._lock:
+            now = time.monotonic()
+            if self._lookup(key, now) is not _MISSING:
+                return False
+            self._store(key, None, now)
+            return True
+
+
+def stats() -> dict[str, dict]:
+    return {
+        name: {
+            "size": len(c),
+            "maxsize": c.maxsize,
+            "ttl": c.ttl,
+            "evicted": c._evicted.value,
+            "expired": c._expired.value,
+        }
+        for name, c in list(_REGISTRY.items())
+    }
+
+
+def caches() -> dict[str, BoundedCache]:
+    return dict(_REGISTRY)
+
+
+def _cache_samples():
+    out = []
+    for name, c in list(_REGISTRY.items()):
+        out.append(("cache_entries", {"cache": name}, len(c)))
+        out.append(("cache_capacity", {"cache": name}, c.maxsize))
+    return out
+
+register_collector(_cache_samples)           # /metrics 스크레이프 시점에만 계산
@@ -0,0 +1,60 @@
+# core/chart_render.py
+"""
+진입/청산 차트 렌더러 (워커 프로세스 측)
+
+  • 이 모듈은 렌더 워커에서만 import 되므로 무거운 의존성은 **지연 import**
+  • Figure/Axes 는 워커당 1세트를 만들어 두고 cla() 로 재사용
+    (plt.subplots / plt.close 반복 비용 제거)
+  • render_chart() 는 렌더링에 걸린 시간(초)을 돌려준다 → 호출측 metrics 기록
+"""
+
+from time import perf_counter
+
+_FIG = None
+_AX  = None
+
+
+def _figure():
+    global _FIG, _AX
+    if _FIG is None:
+        import matplotlib
+        matplotlib.use("Agg")              # GUI 없는 서버에서도 렌더
+        import matplotlib.pyplot as plt
+        _FIG, _AX = plt.subplots(figsize=(10, 4))
+    else:
+        _AX.cla()
+    return _FIG, _AX
+
+
+def warmup() -> bool:
+    """워커 기동 직후 matplotlib import·Figure 생성을 미리 끝내 둔다"""
+    _figure()
+    return True
+
+
+def render_chart(rows: list, trade: dict, path: str) -> float:
+    """
+    rows  : [(time, open, high, low, close), …]  (최근 60개)
+    trade : symbol · open · tp · sl 필드를 가진 dict 사본
+    path  : PNG 저장 경로
+    """
+    t0 = perf_counter()
+    import matplotlib.dates as mdates
+    from mplfinance.original_flavor import candlestick_ohlc
+
+    fig, ax = _figure()
+    ohlc = [
+        (mdates.date2num(t), float(o), float(h), float(l), float(c))
+        for t, o, h, l, c in rows
+    ]
+    candlestick_ohlc(ax, ohlc, width=0.0008, colorup="g", colordown="r", alpha=0.9)
+    ax.axhline(trade["open"], color="blue", linestyle="--")
+    ax.axhline(trade["tp"],   color="green", linestyle=":")
+    ax.axhline(trade["sl"],   color="red",   linestyle=":")
+
+    ax.set_title(f"{trade['symbol']} Entry/Exit")
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+    ax.grid(alpha=.3)
+
+    fig.savefig(path, dpi=120, bbox_inches="tight")
+    return perf_counter() - t0
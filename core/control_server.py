@@ -0,0 +1,103 @@
+# core/control_server.py
+"""
+로컬 제어·조회 HTTP 엔드포인트 (표준 라이브러리 http.server)
+
+  • CONTROL_HTTP_HOST:CONTROL_HTTP_PORT (기본 127.0.0.1:9108, PORT=0 → 끔)
+  • 데몬 스레드의 ThreadingHTTPServer → 트레이딩 루프와 독립
+  • register_route(path, handler) 로 모듈별 경로 추가
+      ▸ handler(query: dict) → dict/list (JSON 응답) 또는 (status, content_type, body)
+  • 기본 경로
+      /latency : 단계별·심볼별 지연 히스토그램 (count·mean·p50·p99·max)
+      /metrics : Prometheus 텍스트 포맷 (카운터·게이지·summary)
+"""
+
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+from urllib.parse import urlsplit, parse_qs
+
+from core.log import get_logger
+from core.metrics import STAGE, TICK_TO_ORDER, histogram_snapshot, render_prometheus
+
+log = get_logger(__name__)
+
+CONTROL_HTTP_HOST = os.getenv("CONTROL_HTTP_HOST", "127.0.0.1")
+CONTROL_HTTP_PORT = int(os.getenv("CONTROL_HTTP_PORT", "9108"))
+
+_ROUTES: Dict[str, Callable[[dict], object]] = {}
+_server: ThreadingHTTPServer | None = None
+
+
+def register_route(path: str, handler: Callable[[dict], object]) -> None:
+    _ROUTES[path] = handler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "smc-control/1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        handler = _ROUTES.get(url.path)
+        if handler is None:
+            self._send(404, "application/json", json.dumps({"routes": sorted(_ROUTES)}))
+            return
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            res = handler(query)
+        except Exception as e:
+            log.warning("[CTRL] %s 처리 오류 → %s", url.path, e)
+            self._send(500, "application/json", json.dumps({"error": str(e)}))
+            return
+        if isinstance(res, tuple):
+            self._send(*res)
+        else:
+            self._send(200, "application/json", json.dumps(res, default=str))
+
+    def _send(self, status: int, content_type: str, body):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):          # 접근 로그는 DEBUG 로만
+        log.debug("[CTRL] " + fmt, *args)
+
+
+def _latency(query: dict):
+    symbol = query.get("symbol")
+    rows = histogram_snapshot(STAGE) + histogram_snapshot(TICK_TO_ORDER)
+    if symbol:
+        rows = [r for r in rows if r["labels"].get("symbol") == symbol]
+    return rows
+
+
+register_route("/latency", _latency)
+register_route("/metrics", lambda _q: (200, "text/plain; version=0.0.4", render_prometheus()))
+
+
+def start(host: str = CONTROL_HTTP_HOST, port: int = CONTROL_HTTP_PORT) -> ThreadingHTTPServer | None:
+    """서버 기동 (중복 호출 무시 · 포트 0 이면 비활성)"""
+    global _server
+    if _server is not None or not port:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        log.warning("[CTRL] %s:%d 바인드 실패 → %s", host, port, e)
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="control-http", daemon=True).start()
+    log.info("[CTRL] http://%s:%d  (%s)", host, port, ", ".join(sorted(_ROUTES)))
+    return _server
+
+
+def stop() -> None:
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
@@ -1,5 +1,6 @@
 # core/data_feed.py
 
+import os
 import aiohttp
 import asyncio
 import requests
@@ -10,7 +11,12 @@ from config.settings import (
     SYMBOLS, TIMEFRAMES, CANDLE_LIMIT, ENABLE_GATE,
     LTF_TF,          # ex) "1h"
     HTF_TF,          # ex) "1d"
+    DERIVE_HTF_LOCALLY,
 )
+from core.resample import StreamResampler, tf_to_ms
+from core import ws_record
+from core.metrics import stage, mark_tick, counter, register_collector
+from core.memdiag import register_source
 import json                        # 🌟 Gate WS 메시지 파싱용
 from notify.discord import send_discord_debug
 import pandas as pd
@@ -50,10 +56,19 @@ def is_gate_sym(sym: str) -> bool:
 
 # ▶ settings 안 TIMEFRAMES 전체를 그대로 쓰고,
 #   그중 LTF_TF/HTF_TF 를 기준 타임프레임으로 사용
-TIMEFRAMES_BINANCE = TIMEFRAMES
 LTF = LTF_TF
 HTF = HTF_TF
 
+# ▶ DERIVE_HTF_LOCALLY → LTF 의 배수인 상위 TF 는 구독하지 않고 LTF 확정봉으로 합성
+DERIVED_TFS = [
+    tf for tf in TIMEFRAMES
+    if tf != LTF and tf_to_ms(tf) % tf_to_ms(LTF) == 0
+] if DERIVE_HTF_LOCALLY else []
+STREAM_TFS = [tf for tf in TIMEFRAMES if tf not in DERIVED_TFS]
+TIMEFRAMES_BINANCE = STREAM_TFS
+
+_RESAMPLERS: dict[tuple[str, str], StreamResampler] = {}
+
 # ---------------------------------------------------------------------------
 # ⛳ 캐시된 데이터 조회 함수 (get_cached_data 구현)
 # ---------------------------------------------------------------------------
@@ -121,7 +136,7 @@ def _ws_worker(symbol: str):
                         "close":  float(k["c"]),
                         "volume": float(k["v"]),
                     }
-                    candles[symbol.upper()][tf].append(candle)
+                    _store_candle(symbol.upper(), tf, candle)
                     # ⭐ 포지션 업데이트는 **설정된 LTF_TF** 로만
                     if tf == LTF and pm.has_position(symbol.upper()):
                         ltf_df = pd.DataFrame(candles[symbol.upper()][LTF])
@@ -155,10 +170,11 @@ def set_pm(manager):
 
 # ----------------------------------------------- REST / WS End-points
 # ▶ USDT-M Futures (FAPI) 엔드포인트로 교체
+#   WS URL 은 환경변수로 덮어쓸 수 있음 → backtest.replay 로컬 서버 접속용
 BINANCE_REST_URL = "https://fapi.binance.com"
-BINANCE_WS_URL   = "wss://fstream.binance.com/stream?streams="
+BINANCE_WS_URL   = os.getenv("BINANCE_WS_URL", "wss://fstream.binance.com/stream?streams=")
 # Gate Futures v4 USDT-settled WS
-GATE_WS_URL      = "wss://fx-ws.gateio.ws/v4/ws/usdt"
+GATE_WS_URL      = os.getenv("GATE_WS_URL", "wss://fx-ws.gateio.ws/v4/ws/usdt")
 
 # ────────────────────────────────────────────────────────────────
 #  ✨ 공통 Runner : WS 코루틴이 죽어도 알아서 재접속
@@ -169,12 +185,14 @@ import traceback, math
 
 async def _run_forever(coro_factory, tag: str):
     backoff = 1.0                            # seconds
+    reconnects = counter("ws_reconnects_total", stream=tag)
     while True:
         try:
             await coro_factory()             # 실제 stream 코루틴 실행
         except asyncio.CancelledError:
             raise                            # ← graceful shutdown
         except Exception as e:
+            reconnects.inc()
             print(f"[WS][{tag}] crashed → {e!r}")
             traceback.print_exc()
             print(f"[WS][{tag}] reconnect in {backoff:.0f}s …")
@@ -182,11 +200,76 @@ async def _run_forever(coro_factory, tag: str):
             backoff = min(backoff * 2, 60)   # 1 → 2 → 4 … 최대 60
         else:
             # 정상 return 은 비정상 상황 → 곧바로 재시작
+            reconnects.inc()
             print(f"[WS][{tag}] returned unexpectedly – restarting")
 
 # 캔들 저장소: {symbol: {timeframe: deque}}
 candles = defaultdict(lambda: defaultdict(lambda: deque(maxlen=CANDLE_LIMIT)))
 
+# ── /metrics : 수신 프레임 수 · (symbol, tf) 별 마지막 확정 봉 지연
+_WS_MSGS_BINANCE = counter("ws_messages_total", exchange="binance")
+_WS_MSGS_GATE    = counter("ws_messages_total", exchange="gate")
+
+def _candle_lag_samples():
+    """마지막 저장 봉의 마감 시각 이후 경과 초 (정상이면 0 ~ 수 초, 끊기면 계속 증가)"""
+    now = datetime.now().timestamp()         # 봉 time 은 로컬 naive datetime
+    out = []
+    for sym, tfs in list(candles.items()):
+        for tf, dq in list(tfs.items()):
+            if not dq:
+                continue
+            try:
+                close_at = dq[-1]["time"].timestamp() + tf_to_ms(tf) / 1000
+            except (ValueError, KeyError):
+                continue
+            out.append(("candle_lag_seconds", {"symbol": sym, "tf": tf}, now - close_at))
+            out.append(("candle_buffer_len", {"symbol": sym, "tf": tf}, len(dq)))
+    return out
+
+register_collector(_candle_lag_samples)
+register_source("candles", lambda: candles)           # /memory : 캔들 저장소 바이트
+register_source("resamplers", lambda: _RESAMPLERS)
+
+# ---------------------------------------------------------------------------
+# ⛳ 확정 봉 저장 (+ 상위 TF 로컬 합성)
+# ---------------------------------------------------------------------------
+def _candle_ms(candle: dict) -> int:
+    return int(candle["time"].timestamp() * 1000)
+
+def _seed_resampler(symbol: str, tf: str, before_ms: int) -> StreamResampler:
+    """
+    심볼·TF 첫 합성 시 REST 로 받은 LTF 이력으로 진행 중 버킷을 채운다
+    (이력 구간의 완성 봉은 REST 상위 TF 이력과 겹치므로 버림)
+    """
+    r = _RESAMPLERS[(symbol, tf)] = StreamResampler.from_tf(LTF, tf)
+    for c in list(candles[symbol][LTF]):
+        t_ms = _candle_ms(c)
+        if t_ms < before_ms:                 # REST 의 미확정 마지막 봉은 제외
+            r.push(t_ms, c["open"], c["high"], c["low"], c["close"], c["volume"])
+    return r
+
+def _append_derived(dq: deque, bar: tuple):
+    t_ms, o, h, l, c, v = bar
+    row = {
+        "time":   datetime.fromtimestamp(t_ms / 1000),
+        "open":   o, "high": h, "low": l, "close": c, "volume": v,
+    }
+    if dq and dq[-1]["time"] == row["time"]:
+        dq[-1] = row                         # REST 이력의 진행 중 봉 → 확정 값으로 교체
+    else:
+        dq.append(row)
+
+def _store_candle(symbol: str, tf: str, candle: dict):
+    """WS 확정 봉 저장 – DERIVE_HTF_LOCALLY 면 LTF 봉으로 상위 TF 도 갱신"""
+    if DERIVED_TFS and tf == LTF:
+        t_ms = _candle_ms(candle)
+        for htf in DERIVED_TFS:
+            r = _RESAMPLERS.get((symbol, htf)) or _seed_resampler(symbol, htf, t_ms)
+            for bar in r.push(t_ms, candle["open"], candle["high"], candle["low"],
+                              candle["close"], candle["volume"]):
+                _append_derived(candles[symbol][htf], bar)
+    candles[symbol][tf].append(candle)
+
 # 1. 과거 캔들 로딩 (REST)
 # ─────────────────────────── Binance 전용 ───────────────────────────
 def load_historical_candles_binance(
@@ -315,6 +398,7 @@ def initialize_historical():
                     ok_bi += 1
 
                 candles[symbol][tf].extend(data)
+                ws_record.record_history(symbol, tf, data)
             except Exception as e:                        # ← 실패 처리
                 tag = f"{symbol}-{tf} ({repr(e)})"        # 내용 전체 보이도록
                 if symbol.endswith("_USDT"):
@@ -341,11 +425,98 @@ def initialize_historical():
     send_discord_debug(msg, "aggregated")
 
 # 2-A. Binance 실시간 WebSocket
+def handle_binance_message(raw: dict):
+    """
+    Binance combined-stream 프레임 1개 처리 (라이브 WS · 리플레이 공용)
+    반환 : 저장한 (symbol, tf, candle) – 미완성 봉·무시 프레임이면 None
+    """
+    data = raw['data']
+    stream = raw['stream']  # e.g., btcusdt@kline_1m
+    symbol_tf = stream.split('@kline_')
+    if len(symbol_tf) != 2:
+        return None
+    stream_symbol = symbol_tf[0].upper()           # 'BTCUSDT'
+    gate_symbol   = stream_symbol.replace("USDT", "_USDT")
+    tf = symbol_tf[1]
+
+    # Gate 모드에선 저장 키를 'BTC_USDT' 로 맞춘다
+    symbol = gate_symbol if gate_symbol in SYMBOLS else stream_symbol
+    symbol = symbol.upper()
+
+    k = data['k']
+    if not k['x']:  # 캔들 미완성 시 무시
+        return None
+    candle = {
+        "time": datetime.fromtimestamp(k['t'] / 1000),
+        "open": float(k['o']),
+        "high": float(k['h']),
+        "low": float(k['l']),
+        "close": float(k['c']),
+        "volume": float(k['v'])
+    }
+    if symbol not in SYMBOLS:
+        return None
+    _store_candle(symbol, tf, candle)
+    if tf == LTF:
+        mark_tick(symbol)                   # 확정 봉 수신 시각 → tick_to_order 지연 기준
+
+    # ───── 실시간 포지션 가격·SL 갱신 ─────
+    if pm and tf == LTF and pm.has_position(symbol):
+        with stage("pm_update", symbol):
+            ltf_df = pd.DataFrame(candles[symbol][LTF])
+            # ─ 보호선용 상위 TF(HTF_TF) DataFrame
+            htf_df = (
+                pd.DataFrame(candles[symbol][HTF])
+                if candles[symbol][HTF] else None
+            )
+            # 오타 수정: htf_df
+            pm.update_price(
+                symbol,
+                candle["close"],
+                ltf_df = ltf_df,
+                htf_df = htf_df,
+            )
+    return symbol, tf, candle
+
+def handle_gate_message(data: dict):
+    """
+    Gate futures.candlesticks 프레임 1개 처리 (라이브 WS · 리플레이 공용)
+    반환 : 저장한 (symbol, tf, candle) – 구독 응답·heartbeat 이면 None
+    """
+    # ▶️  (1) 채널·이벤트 필터
+    if data.get("channel") != "futures.candlesticks" or data.get("event") != "update":
+        return None
+
+    # ▶️  (2) payload 안전 체크
+    res = data.get("result", [])
+    if not (isinstance(res, list) and len(res) == 3):
+        # heartbeat/ping 등  형식이 다른 패킷은 스킵
+        return None
+
+    # payload: [tf, "BTC_USDT", [ts, o, h, l, c, v]]
+    tf, sym, k = res
+    candle = {
+        "time":   datetime.fromtimestamp(k[0] / 1000),
+        "open":   float(k[1]),
+        "high":   float(k[2]),
+        "low":    float(k[3]),
+        "close":  float(k[4]),
+        "volume": float(k[5])
+    }
+    _store_candle(sym, tf, candle)
+    if tf == LTF:
+        mark_tick(sym)
+    if pm and tf == LTF and pm.has_position(sym):
+        with stage("pm_update", sym):
+            ltf_df = pd.DataFrame(candles[sym][LTF])
+            pm.update_price(sym, candle["close"], ltf_df=ltf_df)
+    return sym, tf, candle
+
 async def stream_live_candles_binance():
     stream_pairs = [
         f"{to_binance(symbol).lower()}@kline_{tf}"
         for symbol in SYMBOLS
-        for tf in TIMEFRAMES
+        for tf in STREAM_TFS
     ]
     url = BINANCE_WS_URL + "/".join(stream_pairs)
 
@@ -355,50 +526,9 @@ async def stream_live_candles_binance():
                 print("✅ [WS] Binance WebSocket 연결 성공!")
                 send_discord_debug("✅ [BINANCE] WebSocket 연결 성공!", "binance")
                 async for msg in ws:
-                    raw = msg.json()
-                    data = raw['data']
-                    stream = raw['stream']  # e.g., btcusdt@kline_1m
-                    symbol_tf = stream.split('@kline_')
-                    if len(symbol_tf) != 2:
-                        continue
-                    stream_symbol = symbol_tf[0].upper()           # 'BTCUSDT'
-                    gate_symbol   = stream_symbol.replace("USDT", "_USDT")
-                    tf = symbol_tf[1]
-                    
-                    # Gate 모드에선 저장 키를 'BTC_USDT' 로 맞춘다
-                    symbol = gate_symbol if gate_symbol in SYMBOLS else stream_symbol
-                    symbol = symbol.upper()
-
-                    k = data['k']
-                    if not k['x']:  # 캔들 미완성 시 무시
-                        continue
-                    candle = {
-                        "time": datetime.fromtimestamp(k['t'] / 1000),
-                        "open": float(k['o']),
-                        "high": float(k['h']),
-                        "low": float(k['l']),
-                        "close": float(k['c']),
-                        "volume": float(k['v'])
-                    }
-                    if symbol in SYMBOLS:
-                        candles[symbol][tf].append(candle)
-
-                        # ───── 실시간 포지션 가격·SL 갱신 ─────
-                        if pm and tf == LTF and pm.has_position(symbol):
-                            ltf_df = pd.DataFrame(candles[symbol][LTF])
-                            # ─ 보호선용 상위 TF(HTF_TF) DataFrame
-                            htf_df = (
-                                pd.DataFrame(candles[symbol][HTF])
-                                if candles[symbol][HTF] else None
-                            )
-                            # 오타 수정: htf_df
-                            pm.update_price(
-                                symbol,
-                                candle["close"],
-                                ltf_df = ltf_df,
-                                htf_df = htf_df,
-                            )
-                    #send_discord_debug(f"[WS] {symbol}-{tf} 캔들 업데이트됨", "binance")                 
+                    _WS_MSGS_BINANCE.inc()
+                    ws_record.record("binance", msg.data)
+                    handle_binance_message(json.loads(msg.data))
 
         except Exception as e:
             msg = f"❌ [BINANCE] WebSocket 연결 실패: {e}"
@@ -418,7 +548,7 @@ async def stream_live_candles_gate():
         async with session.ws_connect(GATE_WS_URL) as ws:
             # 구독 메시지 일괄 전송
             for sym in gate_symbols:
-                for tf in TIMEFRAMES:
+                for tf in STREAM_TFS:
                     sub = {
                         "time": 0,
                         "channel": "futures.candlesticks",
@@ -429,32 +559,9 @@ async def stream_live_candles_gate():
             print("✅ [WS] Gate WebSocket 연결·구독 성공!")
 
             async for msg in ws:
-                data = json.loads(msg.data)
-
-                # ▶️  (1) 채널·이벤트 필터
-                if data.get("channel") != "futures.candlesticks" or data.get("event") != "update":
-                    continue
-
-                # ▶️  (2) payload 안전 체크
-                res = data.get("result", [])
-                if not (isinstance(res, list) and len(res) == 3):
-                    # heartbeat/ping 등  형식이 다른 패킷은 스킵
-                    continue
-
-                # payload: [tf, "BTC_USDT", [ts, o, h, l, c, v]]
-                tf, sym, k = res
-                candle = {
-                    "time":   datetime.fromtimestamp(k[0] / 1000),
-                    "open":   float(k[1]),
-                    "high":   float(k[2]),
-                    "low":    float(k[3]),
-                    "close":  float(k[4]),
-                    "volume": float(k[5])
-                }
-                candles[sym][tf].append(candle)
-                if pm and tf == LTF and pm.has_position(sym):
-                    ltf_df = pd.DataFrame(candles[sym][LTF])
-                    pm.update_price(sym, candle["close"], ltf_df=ltf_df)
+                _WS_MSGS_GATE.inc()
+                ws_record.record("gate", msg.data)
+                handle_gate_message(json.loads(msg.data))
 
 # 3. 초기 로딩 + WS 병렬 실행
 #    ※ initialize_historical() 는 main.initialize() 에서
@@ -3,25 +3,27 @@
 import pandas as pd
 from typing import List, Dict
 from notify.discord import send_discord_debug
-from decimal import Decimal, ROUND_DOWN
+import logging
+from core.log import get_logger, log_changed
+from core.ticks import grid
+
+log = get_logger(__name__)
 
 def detect_fvg(df: pd.DataFrame) -> List[Dict]:
     fvg_zones = []
 
-    # tick_size 는 df.attrs 로부터 우선 시도 → 없으면 기본 0.0001
-    tick_size = Decimal(
-        str(df.attrs.get("tick_size", "0.0001"))
-    ).normalize()
-    min_width = tick_size * 3  # 최소 유효 폭 조건
+    # tick_size 는 df.attrs 로부터 우선 시도 → 없으면 기본 0.0001 (폭 판정은 tick 단위 정수)
+    g = grid(df.attrs.get("tick_size", "0.0001"))
+    min_width = g.step * 3  # 최소 유효 폭 조건
 
     for i in range(2, len(df)):
         c1 = df.iloc[i - 2]
         c3 = df.iloc[i]
 
         # 상승 FVG
-        if Decimal(str(c1['high'])) < Decimal(str(c3['low'])):
-            low = Decimal(str(c1['high'])).quantize(tick_size)
-            high = Decimal(str(c3['low'])).quantize(tick_size)
+        if c1['high'] < c3['low']:
+            low = g.units(c1['high'])
+            high = g.units(c3['low'])
             width = high - low
             if width < min_width:
                 continue
@@ -31,7 +33,7 @@ def detect_fvg(df: pd.DataFrame) -> List[Dict]:
             institutional_score = 0
             
             # 큰 FVG 크기 (평균 범위의 50% 이상)
-            if float(width) > avg_range * 0.5:
+            if g.price(width) > avg_range * 0.5:
                 institutional_score += 1
             
             # 볼륨 확인 (있을 때만)
@@ -42,17 +44,17 @@ def detect_fvg(df: pd.DataFrame) -> List[Dict]:
             
             fvg_zones.append({
                 "type": "bullish",
-                "low": float(low),
-                "high": float(high),
+                "low": g.price(low),
+                "high": g.price(high),
                 "time": df["time"].iloc[i],
                 "institutional_score": institutional_score,
                 "pattern": "fvg"
             })
 
         # 하락 FVG
-        elif Decimal(str(c1['low'])) > Decimal(str(c3['high'])):
-            low = Decimal(str(c3['high'])).quantize(tick_size)
-            high = Decimal(str(c1['low'])).quantize(tick_size)
+        elif c1['low'] > c3['high']:
+            low = g.units(c3['high'])
+            high = g.units(c1['low'])
             width = high - low
             if width < min_width:
                 continue
@@ -62,7 +64,7 @@ def detect_fvg(df: pd.DataFrame) -> List[Dict]:
             institutional_score = 0
             
             # 큰 FVG 크기 (평균 범위의 50% 이상)
-            if float(width) > avg_range * 0.5:
+            if g.price(width) > avg_range * 0.5:
                 institutional_score += 1
             
             # 볼륨 확인 (있을 때만)
@@ -73,8 +75,8 @@ def detect_fvg(df: pd.DataFrame) -> List[Dict]:
             
             fvg_zones.append({
                 "type": "bearish",
-                "low": float(low),
-                "high": float(high),
+                "low": g.price(low),
+                "high": g.price(high),
                 "time": df["time"].iloc[i],
                 "institutional_score": institutional_score,
                 "pattern": "fvg"
@@ -84,8 +86,10 @@ def detect_fvg(df: pd.DataFrame) -> List[Dict]:
     tf = df.attrs.get("tf", "?")
     if fvg_zones:
         last = fvg_zones[-1]
-        print(f"[FVG][{tf}] {symbol} → {last['type'].upper()} {last['low']}~{last['high']} (총 {len(fvg_zones)})")
+        log_changed(log, ("fvg", symbol, tf), logging.DEBUG,
+                    "[FVG][%s] %s → %s %s~%s (총 %d)",
+                    tf, symbol, last['type'].upper(), last['low'], last['high'], len(fvg_zones))
     else:
-        print(f"[FVG][{tf}] {symbol} → 감지 없음")
+        log_changed(log, ("fvg", symbol, tf), logging.DEBUG, "[FVG][%s] %s → 감지 없음", tf, symbol)
     #send_discord_debug(f"📉 [FVG] {symbol} - FVG {count}개 감지됨", "aggregated")
     return fvg_zones
@@ -0,0 +1,241 @@
+# core/indicators.py
+"""
+공용 변동성 지표 – True Range · SMA-ATR · Wilder-ATR (증분 갱신)
+
+  • (symbol, tf, period, source) 별 상태 1개
+      ▸ 호출 측 DataFrame(attrs symbol·tf) 의 마지막 동기화 봉 이후 새 봉만 push
+        → 매 틱 1500봉 TR 재계산 없음
+      ▸ 마지막 봉 값이 바뀌면(진행 중 봉 → 확정) 직전 상태로 되돌린 뒤 다시 push
+      ▸ 기준 봉을 찾지 못하거나 값이 다르면(다른 데이터·리플레이) 전체 재구성
+  • 읽기 : 봉 시각 → (TR, SMA-ATR, Wilder-ATR) dict 조회 O(1) (최근 CANDLE_LIMIT 봉)
+  • attrs 가 없는 DataFrame 은 상태 없이 계산
+      ▸ SMA    : 대상 봉까지 period+1 봉만 사용
+      ▸ Wilder : 처음부터 재귀
+  • source
+      ▸ "hl"   : high / low            (iof 버퍼 · utils 무효화 · volatility)
+      ▸ "body" : max/min(open, close)  (mss – 몸통 기준 BOS 폭과 비교)
+  • 정의
+      TR     = max(H-L, |H-C₋₁|, |L-C₋₁|)   (첫 봉은 H-L)
+      SMA    = TR period 단순평균            (period 봉 미만이면 None)
+      Wilder = 첫 period 봉 SMA 로 시작, 이후 ATR += (TR - ATR) / period
+"""
+
+import threading
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import ATR_PERIOD, CANDLE_LIMIT
+from core.cache import BoundedCache
+
+MAX_CATCHUP = 256          # 이보다 많이 밀린 상태는 재구성이 더 단순
+_RESUM_EVERY = 1024        # 누적합 부동소수 오차 정리 주기
+
+
+class _AtrState:
+    __slots__ = ("period", "window", "tr_sum", "wilder", "n", "prev_close",
+                 "last_time", "last_bar", "values", "order", "_undo")
+
+    def __init__(self, period: int, hist_len: int = CANDLE_LIMIT):
+        self.period = period
+        self.window: deque = deque(maxlen=period)
+        self.tr_sum = 0.0
+        self.wilder: float | None = None
+        self.n = 0
+        self.prev_close: float | None = None
+        self.last_time: int | None = None
+        self.last_bar: tuple | None = None
+        self.values: dict[int, tuple] = {}           # time_ns → (tr, sma, wilder)
+        self.order: deque = deque(maxlen=hist_len)   # values 키 (오래된 것부터 제거)
+        self._undo = None
+
+    def push(self, t: int, h: float, l: float, c: float):
+        pc = self.prev_close
+        tr = h - l if pc is None else max(h - l, abs(h - pc), abs(l - pc))
+        dropped = self.window[0] if len(self.window) == self.period else None
+        self._undo = (self.tr_sum, self.wilder, self.prev_close, self.last_time, self.last_bar, dropped)
+
+        self.window.append(tr)
+        self.tr_sum += tr - (dropped or 0.0)
+        self.n += 1
+        if self.n % _RESUM_EVERY == 0:
+            self.tr_sum = sum(self.window)
+        p = self.period
+        sma = self.tr_sum / p if self.n >= p else None
+        if self.n == p:
+            self.wilder = sma
+        elif self.n > p:
+            self.wilder += (tr - self.wilder) / p
+
+        self.prev_close = c
+        self.last_time = t
+        self.last_bar = (h, l, c)
+        if len(self.order) == self.order.maxlen:
+            self.values.pop(self.order[0], None)
+        self.order.append(t)
+        self.values[t] = (tr, sma, self.wilder)
+
+    def pop(self) -> bool:
+        """마지막 push 되돌리기 (1단계만 · 불가하면 False)"""
+        if self._undo is None:
+            return False
+        self.tr_sum, self.wilder, self.prev_close, self.last_time, self.last_bar, dropped = self._undo
+        self._undo = None
+        self.window.pop()
+        if dropped is not None:
+            self.window.appendleft(dropped)
+        self.n -= 1
+        self.values.pop(self.order.pop(), None)
+        return True
+
+
+_STATES = BoundedCache("atr_states", 512)    # LRU – 유니버스에서 빠진 심볼 상태는 밀려남
+_LOCK = threading.Lock()
+
+
+def _columns(df: pd.DataFrame, source: str):
+    if source == "body":
+        o, c = df["open"].to_numpy(float), df["close"].to_numpy(float)
+        return np.maximum(o, c), np.minimum(o, c), c
+    return df["high"].to_numpy(float), df["low"].to_numpy(float), df["close"].to_numpy(float)
+
+
+def _times(df: pd.DataFrame) -> np.ndarray:
+    return pd.to_datetime(df["time"]).to_numpy("datetime64[ns]").view("i8")
+
+
+def _last_time(df: pd.DataFrame) -> int:
+    return pd.Timestamp(df["time"].iat[-1]).value
+
+
+def _last_bar(df: pd.DataFrame, source: str) -> tuple:
+    if source == "body":
+        o, c = float(df["open"].iat[-1]), float(df["close"].iat[-1])
+        return max(o, c), min(o, c), c
+    return float(df["high"].iat[-1]), float(df["low"].iat[-1]), float(df["close"].iat[-1])
+
+
+def _push_rows(st: _AtrState, times, h, l, c, start: int = 0):
+    for i in range(start, len(times)):
+        st.push(int(times[i]), float(h[i]), float(l[i]), float(c[i]))
+
+
+def _catch_up(st: _AtrState, df: pd.DataFrame, source: str) -> bool:
+    """꼬리 MAX_CATCHUP 봉 안에서 기준 봉을 찾아 새 봉만 push (실패 → False)"""
+    tail = df.iloc[-MAX_CATCHUP:]
+    times = _times(tail)
+    hits = np.flatnonzero(times == st.last_time)
+    if not hits.size:
+        return False
+    j = int(hits[-1])
+    h, l, c = _columns(tail, source)
+    if (h[j], l[j], c[j]) != st.last_bar:
+        # 기준 봉 값 변경 (진행 중 봉 갱신) → 1봉 되돌린 뒤 다시 push
+        if not st.pop():
+            return False
+        if st.last_time is None:
+            if len(tail) != len(df) or j != 0:
+                return False
+        elif j == 0 or times[j - 1] != st.last_time:
+            return False
+        _push_rows(st, times, h, l, c, j)
+    else:
+        _push_rows(st, times, h, l, c, j + 1)
+    return True
+
+
+def _sync(key: tuple, df: pd.DataFrame, period: int, source: str, t: int) -> _AtrState:
+    """상태를 df 끝까지 맞춤 (락 보유 중 호출) – t 는 조회할 봉 시각"""
+    st = _STATES.get(key)
+    if st is not None and st.last_time is not None:
+        last = _last_time(df)
+        if last == st.last_time and _last_bar(df, source) == st.last_bar:
+            return st                                  # 새 봉 없음 → O(1)
+        # 과거 구간 뷰(미완성 봉 제외 등)는 보관 값 그대로
+        if last < st.last_time and t in st.values:
+            return st
+        if _catch_up(st, df, source):
+            return st
+    st = _STATES[key] = _AtrState(period)
+    h, l, c = _columns(df, source)
+    _push_rows(st, _times(df), h, l, c)
+    return st
+
+
+def _stateless(df: pd.DataFrame, period: int, source: str, pos: int, method: str) -> Optional[float]:
+    h, l, c = _columns(df, source)
+    start = 0 if method == "wilder" else max(0, pos - period)
+    st = _AtrState(period, hist_len=1)
+    for i in range(start, pos + 1):
+        if i == start and start > 0:
+            st.prev_close = c[i]                       # 창 밖 봉은 직전 종가로만 사용
+            continue
+        st.push(i, h[i], l[i], c[i])
+    _, sma, wilder = st.values[pos]
+    return wilder if method == "wilder" else sma
+
+
+def atr(
+    df: pd.DataFrame,
+    period: int = ATR_PERIOD,
+    *,
+    method: str = "sma",
+    source: str = "hl",
+    at=None,
+) -> Optional[float]:
+    """
+    df 마지막 봉(또는 at 시각 봉)의 ATR
+      method : "sma" | "wilder" · source : "hl" | "body"
+      데이터 부족(period 봉 미만)·at 미존재 → None
+    """
+    if df is None or df.empty:
+        return None
+    idx = 1 if method == "sma" else 2
+    symbol, tf = df.attrs.get("symbol"), df.attrs.get("tf")
+
+    if symbol and tf and "time" in df.columns:
+        key = (symbol, tf, period, source)
+        t = int(pd.Timestamp(at).value) if at is not None else _last_time(df)
+        with _LOCK:
+            st = _sync(key, df, period, source, t)
+            row = st.values.get(t)
+        if row is not None:
+            return row[idx]
+
+    # 상태 없이 계산 (attrs 없음 · 보관 구간 밖)
+    if at is None:
+        pos = len(df) - 1
+    else:
+        hits = np.flatnonzero(_times(df) == int(pd.Timestamp(at).value)) if "time" in df.columns else []
+        if not len(hits):
+            return None
+        pos = int(hits[-1])
+    return _stateless(df, period, source, pos, method)
+
+
+def true_range(df: pd.DataFrame, source: str = "hl") -> Optional[float]:
+    """마지막 봉의 TR – 상태가 있으면 O(1)"""
+    if df is None or df.empty:
+        return None
+    symbol, tf = df.attrs.get("symbol"), df.attrs.get("tf")
+    if symbol and tf and "time" in df.columns:
+        t = _last_time(df)
+        with _LOCK:
+            st = _sync((symbol, tf, ATR_PERIOD, source), df, ATR_PERIOD, source, t)
+            row = st.values.get(t)
+        if row is not None:
+            return row[0]
+    h, l, c = _columns(df, source)
+    pos = len(df) - 1
+    if pos == 0:
+        return float(h[0] - l[0])
+    return float(max(h[pos] - l[pos], abs(h[pos] - c[pos - 1]), abs(l[pos] - c[pos - 1])))
+
+
+def reset(symbol: str | None = None) -> None:
+    """상태 폐기 (심볼 지정 시 그 심볼만)"""
+    with _LOCK:
+        for key in [k for k in _STATES if symbol is None or k[0] == symbol]:
+            del _STATES[key]
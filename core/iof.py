@@ -8,17 +8,28 @@ from core.ob import detect_ob
 from core.bb import detect_bb
 from core.mss import get_mss_and_protective_low
 from core.utils import refined_premium_discount_filter
+from core.resample import tf_to_ms
+from core import indicators
 from notify.discord import send_discord_debug
+import logging
+from core.log import get_logger, log_changed
 from typing import Tuple, Optional, Dict
 from decimal import Decimal
-from collections import defaultdict
+from core.ticks import TickGrid, grid
+from core.zones import ZoneSet
+from core.cache import BoundedCache, BoundedSet
+
+log = get_logger(__name__)
 
 # ─────────────────────────────────────────────────────────────
 #  ✅  무효(소멸)-블록 캐시
-#      INVALIDATED_BLOCKS[symbol] = { (kind, tf, high, low), … }
+#      INVALIDATED_BLOCKS = { (symbol, kind, tf, high, low), … }
+#      ▸ 엔트리 스캔이 매번 조회 → 아직 감지되는 블록은 유지
+#      ▸ INVALIDATED_TTL 동안 조회되지 않은 블록(룩백 밖) · 크기 초과분은 제거
 # ─────────────────────────────────────────────────────────────
 
-INVALIDATED_BLOCKS: defaultdict[str, set[tuple]] = defaultdict(set)
+INVALIDATED_TTL = 7 * 86_400
+INVALIDATED_BLOCKS = BoundedSet("iof_invalidated", 20_000, ttl=INVALIDATED_TTL)
 
 # ───── 헬퍼: 진행-중 캔들 제거 ─────────────────────────
 def _drop_unclosed(df: pd.DataFrame, tf_minutes: int) -> pd.DataFrame:
@@ -36,36 +47,41 @@ def mark_invalidated(symbol: str,
     가격이 블록(OB·BB)을 ‘완전히’ 돌파해 무효화됐을 때 호출.
     이후 엔트리 스캔 단계에서 해당 블록이 자동으로 제외된다.
     """
-    INVALIDATED_BLOCKS[symbol].add((kind, tf, high, low))
+    INVALIDATED_BLOCKS.add((symbol, kind, tf, high, low))
 
 
 def is_invalidated(symbol: str,
                    kind: str, tf: str,
                    high: float, low: float) -> bool:
     """지정 블록이 이미 무효화됐는지 여부"""
-    return (kind, tf, high, low) in INVALIDATED_BLOCKS[symbol]
+    return (symbol, kind, tf, high, low) in INVALIDATED_BLOCKS
+
+# (symbol, tf) → (마지막 HTF 봉 시각, OB 목록, BB 목록) – LRU (유니버스 교체 시 지난 심볼은 밀려남)
+_OB_CACHE_HTF = BoundedCache("iof_htf_zones", 1024)
+# (symbol, tf) → (TickGrid, OB ZoneSet, BB ZoneSet) – HTF 재계산·tick 변경 때만 갱신
+_ZONE_SETS    = BoundedCache("iof_zone_sets", 1024)
 
-_LAST_OB_TIME: dict[tuple[str, str], datetime]          = {}
-_OB_CACHE_HTF: dict[tuple[str, str], tuple]            = {}
+LOOKBACK_HTF = 50          # 최근 HTF 존 n개만 검사
 
 #   True/False , 'long'|'short'|None ,  존 dict 또는 None
 def is_iof_entry(
         htf_df: pd.DataFrame,
         ltf_df: pd.DataFrame,
-        tick_size: Decimal
+        tick_size: TickGrid | Decimal
 ) -> Tuple[bool, Optional[str], Optional[Dict]]:
     trigger_zone = None        # ← 돌려줄 존 정보
+    g = grid(tick_size)        # 가격 비교는 tick 단위 정수
     symbol = htf_df.attrs.get("symbol", "UNKNOWN")
     tf = htf_df.attrs.get("tf", "?")
     
     # 1. HTF 구조 판단
     htf_struct = detect_structure(htf_df)
     if htf_struct is None or not isinstance(htf_struct, pd.DataFrame) or 'structure' not in htf_struct.columns:
-        print(f"[IOF] [{symbol}-{tf}] ❌ detect_structure() 반환 오류 → 진입 판단 불가")
+        log.warning("[IOF] [%s-%s] ❌ detect_structure() 반환 오류 → 진입 판단 불가", symbol, tf)
         return False, None, None
     structure_series = htf_struct['structure'].dropna()
     if structure_series.empty:
-        print(f"[IOF] [{symbol}-{tf}] ❌ 구조 데이터 없음 → 진입 판단 불가")
+        log.debug("[IOF] [%s-%s] ❌ 구조 데이터 없음 → 진입 판단 불가", symbol, tf)
         return False, None, None
     recent = structure_series.iloc[-1]
 
@@ -77,7 +93,8 @@ def is_iof_entry(
         bias = 'SHORT'
     elif recent.startswith('CHoCH'):
         bias = 'NONE'
-    print(f"[BIAS] [{symbol}-{tf}] HTF 구조 기준 Bias = {bias} (최근 구조: {recent})")
+    log_changed(log, ("bias", symbol, tf), logging.INFO,
+                "[BIAS] [%s-%s] HTF 구조 기준 Bias = %s (최근 구조: %s)", symbol, tf, bias, recent)
     #send_discord_debug(f"[BIAS] HTF 구조 기준 Bias = {bias} (최근 구조: {recent})", "aggregated")
 
     if recent in ['BOS_up', 'CHoCH_up', 'OB_Break_up']:
@@ -85,44 +102,36 @@ def is_iof_entry(
     elif recent in ['BOS_down', 'CHoCH_down', 'OB_Break_down']:
         direction = 'short'
     else:
-        print(f"[IOF] [{symbol}-{tf}] ❌ 최근 구조 신호 미충족 → 최근 구조: {recent}")
+        log.debug("[IOF] [%s-%s] ❌ 최근 구조 신호 미충족 → 최근 구조: %s", symbol, tf, recent)
         return False, None, None
 
     if bias in ['LONG', 'SHORT']:
         if bias.lower() == direction:
-            print(f"[IOF] [{symbol}-{tf}] ✅ Bias와 진입 방향 일치 → Bias={bias}, Direction={direction}")
+            log.debug("[IOF] [%s-%s] ✅ Bias와 진입 방향 일치 → Bias=%s, Direction=%s", symbol, tf, bias, direction)
             #send_discord_debug(f"[IOF] ✅ Bias와 진입 방향 일치 → Bias={bias}, Direction={direction}", "aggregated")
         else:
-            print(f"[IOF] [{symbol}-{tf}] ⚠️ Bias와 진입 방향 불일치 → Bias={bias}, Direction={direction}")
+            log.debug("[IOF] [%s-%s] ⚠️ Bias와 진입 방향 불일치 → Bias=%s, Direction=%s", symbol, tf, bias, direction)
             #send_discord_debug(f"[IOF] ⚠️ Bias와 진입 방향 불일치 → Bias={bias}, Direction={direction}", "aggregated")
 
     # current_price 직접 정의 (PD ZONE 비활 임시 테스트용)
     if ltf_df.empty or 'close' not in ltf_df.columns or ltf_df['close'].dropna().empty:
-        print("[IOF] ❌ LTF 종가 없음")
+        log.debug("[IOF] ❌ LTF 종가 없음")
         return False, direction, None
 
-    current_price = Decimal(str((ltf_df['high'].iloc[-1] + ltf_df['low'].iloc[-1]) / 2))
-    current_price = Decimal(str(current_price)).quantize(tick_size)
+    current_price = g.units((ltf_df['high'].iloc[-1] + ltf_df['low'].iloc[-1]) / 2)
 
     # ✅ ATR 기반 동적 버퍼 계산
     try:
-        # ATR 계산 (14봉 기준)
-        htf_df = htf_df.copy()
-        htf_df.loc[:, 'prev_close'] = htf_df['close'].shift(1)
-        tr = pd.concat([
-            htf_df['high'] - htf_df['low'],
-            (htf_df['high'] - htf_df['prev_close']).abs(),
-            (htf_df['low'] - htf_df['prev_close']).abs(),
-        ], axis=1).max(axis=1)
-        atr = tr.rolling(window=14).mean().iloc[-1]
-        
+        # ATR 14 (core.indicators 증분 상태 – 새 봉만 반영)
+        atr = indicators.atr(htf_df, 14)
+
         # ATR 기반 동적 버퍼 (ATR의 20%)
-        if not pd.isna(atr):
-            buffer = Decimal(str(atr * 0.2)).quantize(tick_size)
+        if atr is not None:
+            buffer = g.units(atr * 0.2)
         else:
-            buffer = tick_size * 10  # 폴백: 고정 버퍼
+            buffer = g.step * 10  # 폴백: 고정 버퍼 (10 tick)
     except Exception:
-        buffer = tick_size * 10  # 오류 시 고정 버퍼 사용
+        buffer = g.step * 10  # 오류 시 고정 버퍼 사용
     
     near_buffer = buffer  # 근접 로그용도 같은 버퍼 사용
 
@@ -133,53 +142,53 @@ def is_iof_entry(
     last_htf_time = htf_df["time"].iloc[-1]      # 마지막 완결 15m 캔들 시각
 
     cache_key = (symbol, tf)
-    if _LAST_OB_TIME.get(cache_key) != last_htf_time:
-        # ① 15 m 캔들이 새로 닫혔을 때만 HTF OB/BB 재계산
+    htf_cached = _OB_CACHE_HTF.get(cache_key)
+    if htf_cached is None or htf_cached[0] != last_htf_time:
+        # ① 15 m 캔들이 새로 닫혔을 때만(또는 캐시에서 밀려났을 때) HTF OB/BB 재계산
         htf_ob = detect_ob(htf_df)
         htf_bb = detect_bb(htf_df, htf_ob)
         _OB_CACHE_HTF[cache_key] = (last_htf_time, htf_ob, htf_bb)
-        _LAST_OB_TIME[cache_key] = last_htf_time
+        _ZONE_SETS.pop(cache_key, None)
     else:
         # ② 직전 계산값 재사용
-        _, htf_ob, htf_bb = _OB_CACHE_HTF.get(cache_key, (None, [], []))
+        _, htf_ob, htf_bb = htf_cached
 
     # ── 모든 경우에 대해 None 방지 & 디버그 출력 ─────────────────────────────
     htf_ob = htf_ob or []
     htf_bb = htf_bb or []
-    print(f"[DEBUG] {symbol}-{tf}  HTF_OB={len(htf_ob)}  HTF_BB={len(htf_bb)}")
-
-    LOOKBACK_HTF = 50          # 최근 HTF 존 n개만 검사
+    log.debug("[DEBUG] %s-%s  HTF_OB=%d  HTF_BB=%d", symbol, tf, len(htf_ob), len(htf_bb))
 
-    def _in_zone(z):
-        low  = Decimal(str(z['low'])).quantize(tick_size)
-        high = Decimal(str(z['high'])).quantize(tick_size)
-        return (low - buffer) <= current_price <= (high + buffer)
+    # 존 구간 배열은 존 목록이 바뀔 때만 생성
+    cached = _ZONE_SETS.get(cache_key)
+    if cached is None or cached[0] is not g:
+        cached = _ZONE_SETS[cache_key] = (
+            g, ZoneSet(htf_ob, g, LOOKBACK_HTF), ZoneSet(htf_bb, g, LOOKBACK_HTF),
+        )
+    _, ob_set, bb_set = cached
 
     def zone_dir(z):                     # 존 타입 → 매매방향
         return 'long' if z['type'] == 'bullish' else 'short'
 
-    # OB
-    for z in reversed(htf_ob[-LOOKBACK_HTF:]):
-        if _in_zone(z):
-            IN_HTF_ZONE = True
-            trigger_zone = {"kind": "ob_htf", **z}
-            direction = zone_dir(z)
-            print(f"[DEBUG] Hit HTF-OB  → direction set to {direction}")
-            if ENTRY_METHOD == "zone_or_mss":
-                return True, direction, trigger_zone   # ◆ MSS 컨펌 생략 모드
-            break                                      # → and_mss 모드면 계속
+    # OB (현재가 ± 버퍼가 걸치는 가장 최신 존)
+    z = ob_set.hit(current_price, buffer)
+    if z is not None:
+        IN_HTF_ZONE = True
+        trigger_zone = {"kind": "ob_htf", **z}
+        direction = zone_dir(z)
+        log.debug("[DEBUG] Hit HTF-OB  → direction set to %s", direction)
+        if ENTRY_METHOD == "zone_or_mss":
+            return True, direction, trigger_zone   # ◆ MSS 컨펌 생략 모드 (and_mss 모드면 계속)
 
     # BB (OB에서 못 찾았을 때만)
     if (not IN_HTF_ZONE):
-        for z in reversed(htf_bb[-LOOKBACK_HTF:]):
-            if _in_zone(z):
-                IN_HTF_ZONE = True
-                trigger_zone = {"kind": "bb_htf", **z}
-                direction = zone_dir(z)
-                print(f"[DEBUG] Hit HTF-BB  → direction set to {direction}")
-                if ENTRY_METHOD == "zone_or_mss":
-                    return True, direction, trigger_zone
-                break
+        z = bb_set.hit(current_price, buffer)
+        if z is not None:
+            IN_HTF_ZONE = True
+            trigger_zone = {"kind": "bb_htf", **z}
+            direction = zone_dir(z)
+            log.debug("[DEBUG] Hit HTF-BB  → direction set to %s", direction)
+            if ENTRY_METHOD == "zone_or_mss":
+                return True, direction, trigger_zone
 
     # ──────────────────────────────────────────────────────────
     #  HTF 프리미엄&디스카운트 필터 적용 (바닥 숏 / 고점 롱 방지)
@@ -191,20 +200,18 @@ def is_iof_entry(
         )
         
         if not filter_passed:
-            print(f"[PREMIUM_DISCOUNT] ❌ {filter_msg}")
+            log.info("[PREMIUM_DISCOUNT] ❌ %s", filter_msg)
             send_discord_debug(f"[PREMIUM_DISCOUNT] ❌ {filter_msg}", "aggregated")
             return False, direction, None
         else:
-            print(f"[PREMIUM_DISCOUNT] ✅ {filter_msg} (mid: {mid_price:.4f}, HTF: {htf_low:.4f}~{htf_high:.4f})")
+            log.info("[PREMIUM_DISCOUNT] ✅ %s (mid: %.4f, HTF: %.4f~%.4f)", filter_msg, mid_price, htf_low, htf_high)
             send_discord_debug(f"[PREMIUM_DISCOUNT] ✅ 필터 통과 (mid: {mid_price:.4f})", "aggregated")
 
     # ──────────────────────────────────────────────────────────
     #  HTF 존 OUT 이면서 zone_or_mss 모드?  →  LTF MSS 단독 체크
     # ──────────────────────────────────────────────────────────
-    # ① LTF_TF 가 '5m', '15m', '1h' 등 어떤 단위이든 분으로 환산
-    unit = LTF_TF[-1].lower()      # 'm' or 'h'
-    val  = int(LTF_TF[:-1])
-    tf_minutes = val * (60 if unit == "h" else 1)
+    # ① LTF_TF 가 '5m', '15m', '1h', '1d' 등 어떤 단위이든 분으로 환산
+    tf_minutes = tf_to_ms(LTF_TF) // 60_000
 
     if (not IN_HTF_ZONE) and ENTRY_METHOD == "zone_or_mss":
         ltf_df = _drop_unclosed(ltf_df, tf_minutes)
@@ -219,7 +226,7 @@ def is_iof_entry(
         need_short = last_struct in ('BOS_down', 'CHoCH_down', 'OB_Break_down')
 
         if (direction == 'long' and need_long) or (direction == 'short' and need_short):
-            print(f"[ENTRY] MSS-only trigger ({last_struct}) → zone_or_mss")
+            log.info("[ENTRY] MSS-only trigger (%s) → zone_or_mss", last_struct)
             send_discord_debug(f"[ENTRY] MSS-only trigger → {last_struct}", "aggregated")
             # ── MSS 보호선 계산 (몸통 기준, 재진입 카운터 영향 X)
             mss = get_mss_and_protective_low(ltf_df, direction, use_wick=False, reentry_limit=999)
@@ -251,12 +258,12 @@ def is_iof_entry(
         # 컨펌 미달 → 아직 진입하지 않음
         return False, direction, None
 
-    print(f"[CONFIRM] LTF 구조 컨펌 완료 → {last_struct}")
+    log.info("[CONFIRM] LTF 구조 컨펌 완료 → %s", last_struct)
     #send_discord_debug(f"[CONFIRM] LTF 구조 컨펌 완료 → {last_struct}", "aggregated")
 
     # 🚩 zone_and_mss 모드에서는 trigger_zone(OB/BB)이 반드시 있어야 진입
     if ENTRY_METHOD == "zone_and_mss" and not trigger_zone:
-        print(f"[BUG] zone_and_mss인데 trigger_zone 없음! 진입 차단")
+        log.error("[BUG] zone_and_mss인데 trigger_zone 없음! 진입 차단")
         return False, direction, None
     # 여기까지 왔으면 HTF 존 + LTF BOS/CHoCH 모두 OK → 진입
     return True, direction, trigger_zone
@@ -0,0 +1,175 @@
+# core/journal.py
+"""
+포지션 저널 (append-only write-ahead log + 주기적 압축 스냅샷)
+
+  • PositionStore 가 포지션 상태 전이(진입·SL/TP·half_exit·수량·종료)를 게시할 때마다 WAL 에 1줄 (JSON Lines)
+      ▸ last_price 만 바뀐 가격 틱은 기록하지 않음 → 복원된 last_price 는 마지막 전이 시점 값
+      {"seq": n, "ts": epoch, "sym": "BTCUSDT", "pos": {...} | null(삭제)}
+      ▸ write 는 즉시 (커널 버퍼까지) → 프로세스가 죽어도 기록은 남음
+      ▸ fsync 는 백그라운드 스레드가 JOURNAL_FSYNC_MS 간격으로 묶어서 1회
+        → 트레이딩 경로는 디스크를 기다리지 않고, 전원 장애 시 유실은 그 구간 이하
+  • JOURNAL_COMPACT_EVERY 줄마다 현재 상태 전체를 positions.snap.json 으로 원자 교체 후 WAL 비움
+  • load() : 스냅샷 + 이후 WAL 재생 → {symbol: dict}  (수 ms)
+      ▸ 스냅샷 seq 이하 WAL 줄은 건너뜀 (압축 도중 종료 대비)
+      ▸ 쓰다 만 마지막 줄은 잘라냄 (이후 append 가 깨진 줄에 이어 붙지 않도록)
+  • POSITION_JOURNAL_DIR="" → 비활성 (open_journal() 이 None)
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+
+from core.log import get_logger
+from core.metrics import counter, observe
+
+log = get_logger(__name__)
+
+POSITION_JOURNAL_DIR  = os.getenv("POSITION_JOURNAL_DIR", "logs/journal")
+JOURNAL_FSYNC_MS      = float(os.getenv("JOURNAL_FSYNC_MS", "50"))
+JOURNAL_COMPACT_EVERY = int(os.getenv("JOURNAL_COMPACT_EVERY", "2000"))
+
+_RECORDS = counter("journal_records_total")
+
+
+class PositionJournal:
+    def __init__(self, directory: str, fsync_ms: float = JOURNAL_FSYNC_MS,
+                 compact_every: int = JOURNAL_COMPACT_EVERY):
+        self.dir = directory
+        self.wal_path = os.path.join(directory, "positions.wal")
+        self.snap_path = os.path.join(directory, "positions.snap.json")
+        self.fsync_sec = max(fsync_ms, 1.0) / 1000
+        self.compact_every = max(compact_every, 1)
+
+        self._lock = threading.Lock()
+        self._state: dict[str, dict] = {}
+        self._seq = 0
+        self._since_compact = 0
+        self._dirty = False
+        self._fp = None
+        self._closed = False
+
+    # ────────────────────────────── 복원 ──────────────────────────────
+    def load(self) -> dict[str, dict]:
+        """스냅샷 + WAL 재생 → {symbol: 포지션 dict}, 이후 record() 가능"""
+        os.makedirs(self.dir, exist_ok=True)
+        state, seq = {}, 0
+        try:
+            with open(self.snap_path, encoding="utf-8") as fp:
+                snap = json.load(fp)
+            state, seq = dict(snap["positions"]), int(snap["seq"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("[JOURNAL] 스냅샷 손상 → WAL 만 재생 (%s)", e)
+
+        replayed = good = 0
+        try:
+            with open(self.wal_path, "rb+") as fp:
+                for line in fp:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete line")
+                        rec = json.loads(line)
+                    except ValueError:
+                        log.warning("[JOURNAL] 잘린 WAL 줄 제거 (seq %d 이후)", seq)
+                        fp.truncate(good)
+                        break
+                    good += len(line)
+                    if rec["seq"] <= seq:
+                        continue
+                    seq = rec["seq"]
+                    if rec["pos"] is None:
+                        state.pop(rec["sym"], None)
+                    else:
+                        state[rec["sym"]] = rec["pos"]
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            self._state, self._seq = state, seq
+            self._since_compact = replayed
+            self._fp = open(self.wal_path, "a", encoding="utf-8")
+        threading.Thread(target=self._fsync_loop, name="journal-fsync", daemon=True).start()
+        return dict(state)
+
+    # ────────────────────────────── 기록 ──────────────────────────────
+    def record(self, symbol: str, pos: dict | None) -> None:
+        """포지션 전이 1건 (pos=None → 삭제)"""
+        with self._lock:
+            if self._fp is None:
+                return
+            self._seq += 1
+            self._fp.write(json.dumps(
+                {"seq": self._seq, "ts": round(time.time(), 3), "sym": symbol, "pos": pos},
+                ensure_ascii=False, default=str,
+            ) + "\n")
+            self._fp.flush()
+            if pos is None:
+                self._state.pop(symbol, None)
+            else:
+                self._state[symbol] = pos
+            self._dirty = True
+            self._since_compact += 1
+            if self._since_compact >= self.compact_every:
+                self._compact()
+        _RECORDS.inc()
+
+    def _compact(self) -> None:
+        """(락 보유 중) 현재 상태 → 스냅샷 원자 교체, WAL 비움"""
+        tmp = self.snap_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fp:
+                json.dump({"seq": self._seq, "positions": self._state},
+                          fp, ensure_ascii=False, default=str)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp, self.snap_path)
+        except OSError as e:
+            log.warning("[JOURNAL] 스냅샷 저장 실패 → WAL 유지 (%s)", e)
+            return
+        self._fp.close()
+        self._fp = open(self.wal_path, "w", encoding="utf-8")
+        self._since_compact = 0
+        self._dirty = False
+
+    # ────────────────────────────── fsync ──────────────────────────────
+    def _fsync_loop(self):
+        while not self._closed:
+            time.sleep(self.fsync_sec)
+            self.sync()
+
+    def sync(self) -> None:
+        """쌓인 기록 fsync (파일 교체와 겹치지 않도록 fd 복제본으로, 락 밖에서)"""
+        with self._lock:
+            if not self._dirty or self._fp is None:
+                return
+            fd = os.dup(self._fp.fileno())
+            self._dirty = False
+        t0 = time.perf_counter()
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            log.warning("[JOURNAL] fsync 실패 → %s", e)
+        finally:
+            os.close(fd)
+        observe("journal_fsync_seconds", time.perf_counter() - t0)
+
+    def close(self) -> None:
+        self.sync()
+        with self._lock:
+            self._closed = True
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+
+def open_journal(directory: str = POSITION_JOURNAL_DIR) -> PositionJournal | None:
+    """설정 디렉터리의 저널 (비활성이면 None) – 종료 시 자동 fsync·close"""
+    if not directory:
+        return None
+    journal = PositionJournal(directory)
+    atexit.register(journal.close)
+    return journal
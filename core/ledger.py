@@ -0,0 +1,257 @@
+# core/ledger.py
+"""
+거래 원장 (SQLite · WAL 모드 · append-only)
+
+  • 1 거래 = trades 1행
+      ▸ open_trade()  : 진입 (의도 진입가·SL/TP·SL 근거·진입 근거)
+      ▸ record_fill() : 실제 체결가·수량(기초자산 단위) → 슬리피지(bps, + = 불리)
+      ▸ close_trade() : 청산가·청산 사유·수수료 → pnl 확정
+    청산 후 행은 수정하지 않는다
+  • pnl
+      ▸ points : (청산 - 체결) × 방향          (가격 단위)
+      ▸ pnl    : points × qty - fees (USDT)   – 수량을 모르면 NULL (points 만 기록)
+      ▸ USDT 집계(summary·pnl_by_period·by_symbol)는 pnl 이 있는 행만
+        수량 미상 거래는 unsized_trades · unsized_points(가격 단위) 로 따로 보고
+      ▸ fees   : 미지정 시 (체결 + 청산) × qty × LEDGER_FEE_RATE
+  • 인덱스 : (exit_time) · (symbol, exit_time) · 미청산(symbol) 부분 인덱스
+    → 기간·심볼 집계는 SQL 한 번 (수년치도 ms 단위)
+  • 조회 API
+      summary(since, until, symbol)   : 거래 수·승률·PnL·기대값·평균 손익·최대 낙폭 (+ 수량 미상 건수)
+      pnl_by_period(period, ...)      : 일·주·월 단위 PnL·승률 (롤링 리포트용)
+      by_symbol(since, until)         : 심볼별 성과
+  • 경로 TRADE_LEDGER_PATH (기본 logs/trades.sqlite3) · 첫 사용 시 생성
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+LEDGER_PATH     = os.getenv("TRADE_LEDGER_PATH", "logs/trades.sqlite3")
+LEDGER_FEE_RATE = float(os.getenv("LEDGER_FEE_RATE", "0.0005"))      # 진입·청산 각각 (taker)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id             INTEGER PRIMARY KEY,
+    symbol         TEXT    NOT NULL,
+    direction      TEXT    NOT NULL,
+    entry_time     REAL    NOT NULL,          -- epoch sec (UTC)
+    intended_entry REAL    NOT NULL,
+    entry          REAL    NOT NULL,          -- 실제 체결가 (모르면 의도 진입가)
+    qty            REAL,
+    slippage_bps   REAL,
+    sl             REAL,
+    tp             REAL,
+    sl_reason      TEXT,
+    basis          TEXT,
+    exit_time      REAL,
+    exit           REAL,
+    exit_reason    TEXT,
+    fees           REAL,
+    points         REAL,
+    pnl            REAL
+);
+CREATE INDEX IF NOT EXISTS ix_trades_exit        ON trades(exit_time);
+CREATE INDEX IF NOT EXISTS ix_trades_symbol_exit ON trades(symbol, exit_time);
+CREATE INDEX IF NOT EXISTS ix_trades_open        ON trades(symbol) WHERE exit_time IS NULL;
+"""
+
+_PERIODS = {
+    "day":   "%Y-%m-%d",
+    "week":  "%Y-W%W",
+    "month": "%Y-%m",
+}
+
+
+def _ts(dt: datetime | float | None) -> float | None:
+    if dt is None or isinstance(dt, (int, float)):
+        return dt
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class _MaxDrawdown:
+    """SQLite 집계 함수 max_drawdown(pnl) – 청산 순서대로 입력된 pnl 누적 곡선의 최대 낙폭"""
+
+    def __init__(self):
+        self.equity = self.peak = self.dd = 0.0
+
+    def step(self, pnl):
+        self.equity += pnl or 0.0
+        if self.equity > self.peak:
+            self.peak = self.equity
+        elif self.peak - self.equity > self.dd:
+            self.dd = self.peak - self.equity
+
+    def finalize(self):
+        return self.dd
+
+
+def _where(since, until, symbol, *, priced: bool = True) -> tuple[str, list]:
+    """청산 완료 거래 조건 – priced=True 면 USDT pnl 이 있는 행만 (False → 수량 미상 행만)"""
+    cond = ["exit_time IS NOT NULL", "pnl IS NOT NULL" if priced else "pnl IS NULL"]
+    args = []
+    if since is not None:
+        cond.append("exit_time >= ?")
+        args.append(_ts(since))
+    if until is not None:
+        cond.append("exit_time < ?")
+        args.append(_ts(until))
+    if symbol:
+        cond.append("symbol = ?")
+        args.append(symbol)
+    return " AND ".join(cond), args
+
+
+class TradeLedger:
+    def __init__(self, path: str = LEDGER_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.create_aggregate("max_drawdown", 1, _MaxDrawdown)
+
+    # ────────────────────────────── 기록 ──────────────────────────────
+    def open_trade(self, symbol: str, direction: str, entry: float, sl: float, tp: float,
+                   *, entry_time: datetime | None = None, sl_reason: str | None = None,
+                   basis=None) -> int:
+        if basis is not None and not isinstance(basis, str):
+            basis = json.dumps(basis, ensure_ascii=False, default=str)
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO trades (symbol, direction, entry_time, intended_entry, entry,"
+                " sl, tp, sl_reason, basis) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (symbol, direction, _ts(entry_time or datetime.now(timezone.utc)),
+                 entry, entry, sl, tp, sl_reason, basis),
+            )
+            return cur.lastrowid
+
+    def _open_id(self, symbol: str) -> int | None:
+        row = self._db.execute(
+            "SELECT id FROM trades WHERE symbol = ? AND exit_time IS NULL"
+            " ORDER BY id DESC LIMIT 1", (symbol,),
+        ).fetchone()
+        return row["id"] if row else None
+
+    def record_fill(self, symbol: str, fill_price: float | None, qty: float | None) -> None:
+        """미청산 거래의 실제 체결가·수량 (슬리피지 = 의도 진입가 대비, + 가 불리)"""
+        with self._lock:
+            tid = self._open_id(symbol)
+            if tid is None:
+                return
+            self._db.execute(
+                "UPDATE trades SET"
+                " entry = COALESCE(?, entry),"
+                " qty = COALESCE(?, qty),"
+                " slippage_bps = CASE WHEN ? IS NULL THEN slippage_bps ELSE"
+                "   (? - intended_entry) / intended_entry * 10000"
+                "   * (CASE direction WHEN 'long' THEN 1 ELSE -1 END) END"
+                " WHERE id = ?",
+                (fill_price, qty, fill_price, fill_price, tid),
+            )
+
+    def close_trade(self, symbol: str, exit_price: float, *, exit_time: datetime | None = None,
+                    reason: str | None = None, fees: float | None = None) -> int | None:
+        """미청산 거래 확정 (없으면 None)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, direction, entry, qty FROM trades"
+                " WHERE symbol = ? AND exit_time IS NULL ORDER BY id DESC LIMIT 1", (symbol,),
+            ).fetchone()
+            if row is None:
+                return None
+            mult = 1 if row["direction"] == "long" else -1
+            points = (exit_price - row["entry"]) * mult
+            qty = row["qty"]
+            pnl = None                              # 수량 미상 → USDT 환산 불가
+            if qty:
+                if fees is None:
+                    fees = (row["entry"] + exit_price) * qty * LEDGER_FEE_RATE
+                pnl = points * qty - fees
+            self._db.execute(
+                "UPDATE trades SET exit_time = ?, exit = ?, exit_reason = ?, fees = ?,"
+                " points = ?, pnl = ? WHERE id = ?",
+                (_ts(exit_time or datetime.now(timezone.utc)), exit_price, reason,
+                 fees, points, pnl, row["id"]),
+            )
+            return row["id"]
+
+    # ────────────────────────────── 조회 ──────────────────────────────
+    def _query(self, sql: str, args=()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def summary(self, since=None, until=None, symbol: str | None = None) -> dict:
+        """청산 완료 거래 성과 (since ≤ exit_time < until · USDT pnl 이 있는 행만)"""
+        where, args = _where(since, until, symbol)
+        row = self._query(
+            "SELECT COUNT(*)                              AS trades,"
+            "       COALESCE(SUM(pnl > 0), 0)             AS wins,"
+            "       COALESCE(SUM(pnl), 0.0)               AS pnl,"
+            "       AVG(CASE WHEN pnl > 0 THEN pnl END)   AS avg_win,"
+            "       AVG(CASE WHEN pnl <= 0 THEN pnl END)  AS avg_loss"
+            f" FROM trades WHERE {where}", args,
+        )[0]
+        out = dict(row)
+        # 정렬된 서브쿼리(co-routine)가 청산 순서대로 집계 함수에 공급
+        out["max_drawdown"] = self._query(
+            "SELECT max_drawdown(pnl) FROM"
+            f" (SELECT pnl FROM trades WHERE {where} ORDER BY exit_time, id)", args,
+        )[0][0] or 0.0
+        n = out["trades"]
+        out["win_rate"] = out["wins"] / n * 100 if n else 0.0
+        out["expectancy"] = out["pnl"] / n if n else 0.0
+        where, args = _where(since, until, symbol, priced=False)
+        unsized = self._query(
+            "SELECT COUNT(*) AS n, COALESCE(SUM(points), 0.0) AS points"
+            f" FROM trades WHERE {where}", args,
+        )[0]
+        out["unsized_trades"] = unsized["n"]
+        out["unsized_points"] = unsized["points"]
+        return out
+
+    def pnl_by_period(self, period: str = "day", since=None, until=None,
+                      symbol: str | None = None) -> list[dict]:
+        """period(day·week·month) 별 거래 수·승수·PnL (오래된 순)"""
+        fmt = _PERIODS[period]
+        where, args = _where(since, until, symbol)
+        rows = self._query(
+            f"SELECT strftime('{fmt}', exit_time, 'unixepoch') AS period,"
+            " COUNT(*) AS trades, SUM(pnl > 0) AS wins, SUM(pnl) AS pnl"
+            f" FROM trades WHERE {where} GROUP BY period ORDER BY period", args,
+        )
+        return [dict(r) for r in rows]
+
+    def by_symbol(self, since=None, until=None) -> list[dict]:
+        where, args = _where(since, until, None)
+        rows = self._query(
+            "SELECT symbol, COUNT(*) AS trades, SUM(pnl > 0) AS wins, SUM(pnl) AS pnl,"
+            " AVG(slippage_bps) AS avg_slippage_bps"
+            f" FROM trades WHERE {where} GROUP BY symbol ORDER BY pnl DESC", args,
+        )
+        return [dict(r) for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_ledger: TradeLedger | None = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> TradeLedger:
+    """프로세스 공용 원장 (첫 호출 시 파일·스키마 생성)"""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = TradeLedger(LEDGER_PATH)
+    return _ledger
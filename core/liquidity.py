@@ -4,6 +4,31 @@ import pandas as pd
 from typing import List, Dict, Tuple
 from decimal import Decimal
 from notify.discord import send_discord_debug
+import logging
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+def _scan_equal(prices, times, kind: str, tolerance_pct: float, out: List[Dict]) -> None:
+    """앞뒤 10봉 안에 tolerance_pct % 이내 가격이 1개 이상 있으면 유동성 레벨"""
+    n = len(prices)
+    for i in range(1, n - 1):
+        current = prices[i]
+
+        # 앞뒤 캔들들과 비교
+        matches = 0
+        for j in range(max(0, i - 10), min(n, i + 11)):
+            if j != i and abs(current - prices[j]) / current < tolerance_pct / 100:
+                matches += 1
+
+        if matches >= 1:  # 최소 1개 이상의 매칭
+            out.append({
+                "type": kind,
+                "price": current,
+                "time": times.iloc[i],
+                "matches": matches,
+                "strength": min(3, matches)  # 최대 3점
+            })
 
 def detect_equal_levels(df: pd.DataFrame, tolerance_pct: float = 0.1) -> List[Dict]:
     """
@@ -23,52 +48,13 @@ def detect_equal_levels(df: pd.DataFrame, tolerance_pct: float = 0.1) -> List[Di
     symbol = df.attrs.get("symbol", "UNKNOWN")
     tf = df.attrs.get("tf", "?")
     
+    # 열은 numpy 배열로 한 번만 꺼내 비교 (행마다 .iloc 호출 없음)
+    times = df['time']
     # Equal Highs 감지 (Buy Side Liquidity)
-    for i in range(1, len(df) - 1):
-        current_high = df['high'].iloc[i]
-        
-        # 앞뒤 캔들들과 비교
-        matches = []
-        for j in range(max(0, i - 10), min(len(df), i + 11)):
-            if j == i:
-                continue
-                
-            other_high = df['high'].iloc[j]
-            if abs(current_high - other_high) / current_high < tolerance_pct / 100:
-                matches.append(j)
-        
-        if len(matches) >= 1:  # 최소 1개 이상의 매칭
-            liquidity_levels.append({
-                "type": "buy_side_liquidity",
-                "price": current_high,
-                "time": df['time'].iloc[i],
-                "matches": len(matches),
-                "strength": min(3, len(matches))  # 최대 3점
-            })
-    
-    # Equal Lows 감지 (Sell Side Liquidity)  
-    for i in range(1, len(df) - 1):
-        current_low = df['low'].iloc[i]
-        
-        # 앞뒤 캔들들과 비교
-        matches = []
-        for j in range(max(0, i - 10), min(len(df), i + 11)):
-            if j == i:
-                continue
-                
-            other_low = df['low'].iloc[j]
-            if abs(current_low - other_low) / current_low < tolerance_pct / 100:
-                matches.append(j)
-        
-        if len(matches) >= 1:  # 최소 1개 이상의 매칭
-            liquidity_levels.append({
-                "type": "sell_side_liquidity", 
-                "price": current_low,
-                "time": df['time'].iloc[i],
-                "matches": len(matches),
-                "strength": min(3, len(matches))  # 최대 3점
-            })
-    
+    _scan_equal(df['high'].to_numpy(), times, "buy_side_liquidity", tolerance_pct, liquidity_levels)
+    # Equal Lows 감지 (Sell Side Liquidity)
+    _scan_equal(df['low'].to_numpy(), times, "sell_side_liquidity", tolerance_pct, liquidity_levels)
+
     # 중복 제거 및 정렬
     liquidity_levels = remove_duplicate_levels(liquidity_levels, tolerance_pct)
     liquidity_levels.sort(key=lambda x: x['strength'], reverse=True)
@@ -76,10 +62,10 @@ def detect_equal_levels(df: pd.DataFrame, tolerance_pct: float = 0.1) -> List[Di
     # 상위 10개만 유지
     liquidity_levels = liquidity_levels[:10]
     
-    if liquidity_levels:
-        print(f"[LIQUIDITY] {symbol} ({tf}) → {len(liquidity_levels)}개 유동성 레벨 감지")
+    if liquidity_levels and log.isEnabledFor(logging.DEBUG):
+        log.debug("[LIQUIDITY] %s (%s) → %d개 유동성 레벨 감지", symbol, tf, len(liquidity_levels))
         for level in liquidity_levels[:3]:  # 상위 3개만 로그
-            print(f"  {level['type']}: {level['price']:.5f} (강도: {level['strength']})")
+            log.debug("  %s: %.5f (강도: %s)", level['type'], level['price'], level['strength'])
     
     return liquidity_levels
 
@@ -0,0 +1,95 @@
+# core/log.py
+"""
+로깅 서브시스템 (builtins.print 패치 대체)
+
+  • 표준 logging 기반 – 호출부는 `log = get_logger(__name__)` 후
+    `log.debug("[OB][%s] %s → …", tf, symbol)` 처럼 **%-포맷 인자**로 호출
+      ▸ 레벨이 꺼져 있으면 isEnabledFor() 에서 끝 → 문자열 포맷 비용 0
+  • setup_logging() : QueueHandler → QueueListener(백그라운드 스레드)
+      ▸ 콘솔 + RotatingFileHandler 로 기록 (핫패스는 큐 적재만)
+  • 반복 로그 억제 헬퍼
+      ▸ log_changed() : 키별 인자가 직전과 같으면 생략 (요약 라인 중복 제거)
+      ▸ log_every()   : 키별 interval 초에 1회만 출력 (반복 경고)
+      ▸ 두 헬퍼 모두 억제 시 LogRecord 생성·포맷을 하지 않는다
+
+  환경변수
+    LOG_LEVEL (INFO) · LOG_FILE (logs/smc_trader.log)
+    LOG_MAX_BYTES (10MB) · LOG_BACKUPS (5)
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+from core.cache import BoundedCache
+
+LOG_LEVEL     = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE      = os.getenv("LOG_FILE", "logs/smc_trader.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUPS   = int(os.getenv("LOG_BACKUPS", "5"))
+
+_FORMAT = "%(asctime)s %(levelname).1s %(name)s | %(message)s"
+
+_listener: logging.handlers.QueueListener | None = None
+
+# 억제 헬퍼 상태 : key → 마지막 인자 / 마지막 출력 시각 (키에 심볼 포함 → LRU)
+_LAST_ARGS = BoundedCache("log_last_args", 4096)
+_LAST_EMIT = BoundedCache("log_last_emit", 4096)
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def setup_logging(level: str | None = None) -> None:
+    """루트 로거에 큐 핸들러 설치 (멱등)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    handlers: list[logging.Handler] = []
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(_FORMAT, "%H:%M:%S"))
+    handlers.append(console)
+
+    if LOG_FILE:
+        os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
+        fh = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+        fh.setFormatter(logging.Formatter(_FORMAT))
+        handlers.append(fh)
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(q)]
+    root.setLevel(level or LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def log_changed(logger: logging.Logger, key, level: int, msg: str, *args) -> None:
+    """key 별로 args 가 직전과 다를 때만 출력 (같으면 포맷 없이 반환)"""
+    if not logger.isEnabledFor(level):
+        return
+    if _LAST_ARGS.get(key) == args:
+        return
+    _LAST_ARGS[key] = args
+    logger.log(level, msg, *args)
+
+
+def log_every(logger: logging.Logger, key, interval: float, level: int, msg: str, *args) -> None:
+    """key 별로 interval 초에 한 번만 출력"""
+    if not logger.isEnabledFor(level):
+        return
+    now = time.monotonic()
+    if now - _LAST_EMIT.get(key, -interval) < interval:
+        return
+    _LAST_EMIT[key] = now
+    logger.log(level, msg, *args)
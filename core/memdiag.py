@@ -0,0 +1,268 @@
+# core/memdiag.py
+"""
+메모리 사용량 진단 (서브시스템별 바이트 · tracemalloc 스냅샷 diff)
+
+  • report() : 프로세스 RSS + 등록된 서브시스템별 추정 바이트
+      ▸ register_source(name, fn) : fn() → 측정할 객체 (모듈이 자기 저장소를 등록)
+          candles       – core.data_feed 캔들 deque (dict 봉)
+          resamplers    – core.data_feed 상위 TF 합성기
+          notify_queue  – notify.discord 전송 큐
+          positions     – PositionManager 포지션 스냅샷 (main)
+      ▸ caches.<name> : core.cache 에 등록된 BoundedCache 전부 (항목 수 · 바이트)
+      ▸ deep_sizeof() : 컨테이너·객체 속성을 따라가며 sys.getsizeof 합산 (같은 객체 1회)
+          DataFrame·Series 는 memory_usage(deep=True) · ndarray 는 getsizeof(데이터 포함)
+          항목이 MEMDIAG_SAMPLE 개를 넘는 컨테이너는 균등 표본 × 배율로 추정 (exact=True → 전수)
+  • trace_snapshot() : tracemalloc 스냅샷 → 직전(또는 기준) 스냅샷 대비 증가 상위 N 줄
+      ▸ 첫 호출 때 추적 시작 (MEMDIAG_TRACE_FRAMES 프레임) – 켜져 있는 동안 할당마다 오버헤드
+      ▸ 첫 스냅샷 = 기준 · 이후 호출마다 직전 대비 diff (base=1 → 기준 대비)
+      ▸ dump=1 → MEMDIAG_DIR 에 .snap 저장 (tracemalloc.Snapshot.load() 로 오프라인 비교)
+      ▸ stop=1 → 추적 종료·스냅샷 폐기
+  • detect_* 의 df.copy() 같은 일시 할당은 report 에 잡히지 않음 → trace diff 로 확인
+  • 경로 (core.control_server)
+      /memory        : report() (?exact=1)
+      /memory/trace  : trace_snapshot() (?top=20&key=lineno|filename|traceback&base=1&dump=1&stop=1)
+"""
+
+import os
+import sys
+import gc
+import json
+import threading
+import tracemalloc
+from collections import deque
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Callable, Dict
+
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+MEMDIAG_SAMPLE       = int(os.getenv("MEMDIAG_SAMPLE", "64"))
+MEMDIAG_TRACE_FRAMES = int(os.getenv("MEMDIAG_TRACE_FRAMES", "1"))
+MEMDIAG_DIR          = os.getenv("MEMDIAG_DIR", "logs/memdiag")
+
+_SOURCES: Dict[str, Callable[[], object]] = {}
+
+# 내용을 따라가지 않는 타입 (크기만)
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None),
+           date, datetime, timedelta, Decimal, range)
+# 크기도 세지 않는 타입 (모듈·클래스·함수 → 따라가면 프로세스 전체)
+_SKIP = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+def register_source(name: str, fn: Callable[[], object]) -> None:
+    _SOURCES[name] = fn
+
+
+# ────────────────────────────── 크기 추정 ──────────────────────────────
+def _pandas_bytes(obj) -> int | None:
+    if not type(obj).__module__.startswith("pandas"):
+        return None
+    mu = getattr(obj, "memory_usage", None)
+    if mu is None:
+        return None
+    v = mu(deep=True)
+    return int(v.sum() if hasattr(v, "sum") else v)
+
+
+def _children(obj) -> list[list]:
+    """따라갈 하위 객체 묶음 – 표본은 묶음별로 (dict 는 키·값 따로)"""
+    if isinstance(obj, (dict, Mapping)):
+        return [list(obj.keys()), list(obj.values())]
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return [list(obj)]
+    out = []
+    d = getattr(obj, "__dict__", None)
+    if isinstance(d, dict):
+        out.append(d)
+    for cls in type(obj).__mro__:
+        for s in getattr(cls, "__slots__", ()):
+            if s not in ("__dict__", "__weakref__"):
+                v = getattr(obj, s, None)
+                if v is not None:
+                    out.append(v)
+    return [out]
+
+
+def deep_sizeof(obj, *, exact: bool = False, sample: int = MEMDIAG_SAMPLE) -> int:
+    """obj 가 참조하는 객체 그래프의 추정 바이트 (같은 객체는 1회)"""
+    seen: set[int] = set()
+    total = 0.0
+    stack = [(obj, 1.0)]
+    while stack:
+        o, w = stack.pop()
+        if isinstance(o, _SKIP) or id(o) in seen:
+            continue
+        seen.add(id(o))
+        pb = _pandas_bytes(o)
+        if pb is not None:
+            total += w * pb
+            continue
+        try:
+            total += w * sys.getsizeof(o)
+        except TypeError:
+            continue
+        if isinstance(o, _ATOMIC) or type(o).__module__ == "numpy":
+            continue
+        for kids in _children(o):
+            if not exact and len(kids) > sample:
+                step = len(kids) / sample
+                stack.extend((kids[int(i * step)], w * step) for i in range(sample))
+            else:
+                stack.extend((k, w) for k in kids)
+    return int(total)
+
+
+def _rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/status", encoding="ascii") as fp:
+            for line in fp:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource                          # 리눅스 외 : 최대 RSS (macOS 는 바이트)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def report(exact: bool = False) -> dict:
+    """서브시스템별 추정 바이트 (측정 실패한 항목은 error)"""
+    subsystems: dict[str, dict] = {}
+    for name, fn in list(_SOURCES.items()):
+        try:
+            target = fn()
+            subsystems[name] = {"bytes": deep_sizeof(target, exact=exact)}
+            if hasattr(target, "__len__"):
+                subsystems[name]["entries"] = len(target)
+        except Exception as e:
+            subsystems[name] = {"error": str(e)}
+
+    from core.cache import caches
+    for name, c in caches().items():
+        subsystems[f"caches.{name}"] = {
+            "bytes": deep_sizeof(c.items_snapshot(), exact=exact),
+            "entries": len(c),
+            "maxsize": c.maxsize,
+        }
+
+    measured = sum(v.get("bytes", 0) for v in subsystems.values())
+    return {
+        "rss_bytes": _rss_bytes(),
+        "measured_bytes": measured,
+        "exact": exact,
+        "subsystems": dict(sorted(subsystems.items(), key=lambda kv: -kv[1].get("bytes", 0))),
+        "gc_objects": len(gc.get_objects()),
+        "tracing": tracemalloc.is_tracing(),
+    }
+
+
+# ────────────────────────────── tracemalloc ──────────────────────────────
+_trace_lock = threading.Lock()
+_baseline: tracemalloc.Snapshot | None = None
+_previous: tracemalloc.Snapshot | None = None
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _fmt_stat(st) -> dict:
+    frame = st.traceback[0]
+    row = {
+        "where": f"{frame.filename}:{frame.lineno}",
+        "size_bytes": st.size,
+        "count": st.count,
+    }
+    if hasattr(st, "size_diff"):
+        row["size_diff_bytes"] = st.size_diff
+        row["count_diff"] = st.count_diff
+    if len(st.traceback) > 1:
+        row["traceback"] = [f"{f.filename}:{f.lineno}" for f in st.traceback]
+    return row
+
+
+def stop_trace() -> None:
+    global _baseline, _previous
+    with _trace_lock:
+        _baseline = _previous = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    log.info("[MEM] tracemalloc 종료")
+
+
+def trace_snapshot(top: int = 20, key: str = "lineno", *, against_base: bool = False,
+                   dump: bool = False) -> dict:
+    """
+    스냅샷 1개 → 증가 상위 top 줄
+      첫 호출 : 추적 시작만 (비교 대상 없음)
+      against_base : 직전 대신 첫 스냅샷(기준) 대비
+    """
+    global _baseline, _previous
+    if key not in ("lineno", "filename", "traceback"):
+        raise ValueError(f"key must be lineno|filename|traceback: {key!r}")
+    with _trace_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMDIAG_TRACE_FRAMES)
+            _baseline = _previous = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            log.info("[MEM] tracemalloc 시작 (%d 프레임) – 기준 스냅샷 저장", MEMDIAG_TRACE_FRAMES)
+            return {"started": True, "frames": MEMDIAG_TRACE_FRAMES}
+
+        snap = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        ref = _baseline if against_base else _previous
+        diff = snap.compare_to(ref, key) if ref is not None else snap.statistics(key)
+        _previous = snap
+        current, peak = tracemalloc.get_traced_memory()
+
+    out = {
+        "against": "base" if against_base else "previous",
+        "traced_bytes": current,
+        "traced_peak_bytes": peak,
+        "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        "top": [_fmt_stat(st) for st in diff[:max(int(top), 1)]],
+    }
+    if dump:
+        os.makedirs(MEMDIAG_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(MEMDIAG_DIR, f"trace_{stamp}.snap")
+        snap.dump(path)
+        out["dump"] = path
+    return out
+
+
+# ────────────────────────────── 경로 ──────────────────────────────
+def _flag(query: dict, name: str) -> bool:
+    return query.get(name, "0").lower() in ("1", "true", "yes")
+
+
+def _route_report(query: dict):
+    return report(exact=_flag(query, "exact"))
+
+
+def _route_trace(query: dict):
+    if _flag(query, "stop"):
+        stop_trace()
+        return {"tracing": False}
+    try:
+        return trace_snapshot(
+            int(query.get("top", 20)), query.get("key", "lineno"),
+            against_base=_flag(query, "base"), dump=_flag(query, "dump"),
+        )
+    except ValueError as e:
+        return 400, "application/json", json.dumps({"error": str(e)})
+
+
+def register_routes() -> None:
+    """/memory (서브시스템별 바이트) · /memory/trace (tracemalloc diff)"""
+    from core.control_server import register_route
+    register_route("/memory", _route_report)
+    register_route("/memory/trace", _route_trace)
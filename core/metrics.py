@@ -0,0 +1,328 @@
+# core/metrics.py
+"""
+프로세스 내부 경량 메트릭 저장소
+
+  • 히스토그램 버킷은 로그 스케일(1 µs ~ 약 67 s, 버킷 간격 ≈ 19 %) 고정
+  • observe() 는 bisect + 리스트 인덱스 증가만 수행 → 핫패스 부담 최소화
+    (GIL 하에서 카운트가 드물게 1 씩 유실될 수 있으나 통계 용도로 허용)
+  • 라벨 조합별 인스턴스는 최초 1회만 락을 잡고 생성
+  • span() / stage() : with 블록 구간 시간 → 히스토그램
+      ▸ 확정 봉 수신(data_feed) → 판단(strategy) → 주문(main) → PositionManager 단계별 지연
+      ▸ mark_tick() ~ observe_tick_to_order() : 봉 수신부터 주문 호출까지 전체 지연
+  • maybe_log_summary() 주기 요약 · core.control_server /latency 로 조회
+  • counter() / gauge() / register_collector() + render_prometheus()
+      ▸ core.control_server /metrics 로 스크레이프 (Prometheus 텍스트 포맷)
+      ▸ TimedApi : REST SDK 클라이언트 호출 횟수·오류·지연 (거래소·엔드포인트별)
+"""
+
+import os
+import time
+import bisect
+import threading
+from typing import Dict, List, Tuple
+
+# 1µs × 2^(i/4)  (i = 0 … 103)  → 마지막 버킷 ≈ 67 초
+_BUCKETS: Tuple[float, ...] = tuple(1e-6 * 2 ** (i / 4) for i in range(104))
+
+_LOCK = threading.Lock()
+
+
+class Histogram:
+    __slots__ = ("name", "labels", "counts", "count", "sum", "max")
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...]):
+        self.name   = name
+        self.labels = labels
+        self.counts = [0] * (len(_BUCKETS) + 1)     # 마지막 칸 = overflow
+        self.count  = 0
+        self.sum    = 0.0
+        self.max    = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum   += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 근사 분위수 (관측치가 없으면 0.0)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(_BUCKETS[i], self.max) if i < len(_BUCKETS) else self.max
+        return self.max
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+_HISTOGRAMS: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+
+
+def histogram(name: str, **labels) -> Histogram:
+    """(name, labels) 조합의 히스토그램을 가져오거나 새로 만든다"""
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    h = _HISTOGRAMS.get(key)
+    if h is None:
+        with _LOCK:
+            h = _HISTOGRAMS.get(key)
+            if h is None:
+                h = _HISTOGRAMS[key] = Histogram(name, key[1])
+    return h
+
+
+def observe(name: str, value: float, **labels) -> None:
+    histogram(name, **labels).observe(value)
+
+
+def histogram_snapshot(prefix: str = "") -> List[dict]:
+    """name 이 prefix 로 시작하는 히스토그램 요약 (count·mean·p50·p99·max)"""
+    out = []
+    for h in list(_HISTOGRAMS.values()):
+        if not h.name.startswith(prefix) or not h.count:
+            continue
+        out.append({
+            "name":   h.name,
+            "labels": dict(h.labels),
+            "count":  h.count,
+            "mean":   h.mean(),
+            "p50":    h.quantile(0.50),
+            "p99":    h.quantile(0.99),
+            "max":    h.max,
+        })
+    return out
+
+
+# ────────────────────────────── 구간 계측 (span) ──────────────────────────────
+#   with span("pipeline_stage_seconds", stage="iof", symbol=sym):
+#       ...
+#   ▸ 종료 시 perf_counter 차이를 해당 히스토그램에 observe (예외가 나도 기록)
+STAGE = "pipeline_stage_seconds"            # 단계별 지연 (labels: stage, symbol)
+TICK_TO_ORDER = "tick_to_order_seconds"     # 확정 봉 수신 → 주문 호출 (labels: symbol)
+
+
+class span:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, name: str, **labels):
+        self.hist = histogram(name, **labels)
+        self.t0 = 0.0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0)
+        return False
+
+
+def stage(stage_name: str, symbol: str) -> span:
+    """파이프라인 단계 span 단축형"""
+    return span(STAGE, stage=stage_name, symbol=symbol)
+
+
+# 심볼별 마지막 확정 봉 수신 시각 (perf_counter) – data_feed 가 기록, 주문부가 소비
+_TICK_AT: Dict[str, float] = {}
+
+
+def mark_tick(symbol: str) -> None:
+    _TICK_AT[symbol] = time.perf_counter()
+
+
+def tick_age(symbol: str) -> float | None:
+    """마지막 확정 봉 수신 후 경과 초 (기록 없으면 None)"""
+    t = _TICK_AT.get(symbol)
+    return None if t is None else time.perf_counter() - t
+
+
+def observe_tick_to_order(symbol: str) -> None:
+    age = tick_age(symbol)
+    if age is not None:
+        observe(TICK_TO_ORDER, age, symbol=symbol)
+
+
+# ────────────────────────────── 주기 요약 ──────────────────────────────
+LATENCY_SUMMARY_SEC = float(os.getenv("LATENCY_SUMMARY_SEC", "300"))     # 0 → 끔
+_next_summary = 0.0
+
+
+def summary_lines(prefixes: Tuple[str, ...] = (STAGE, TICK_TO_ORDER)) -> List[str]:
+    """stage·symbol 별 p50/p99 표 (지연 큰 순)"""
+    rows = [h for p in prefixes for h in histogram_snapshot(p)]
+    rows.sort(key=lambda h: h["p99"], reverse=True)
+    return [
+        f"{h['labels'].get('stage') or h['name'].removesuffix('_seconds'):<16} {h['labels'].get('symbol', '-'):<12} "
+        f"n={h['count']:<7} p50={h['p50'] * 1e3:8.2f}ms p99={h['p99'] * 1e3:8.2f}ms "
+        f"max={h['max'] * 1e3:8.2f}ms"
+        for h in rows
+    ]
+
+
+def maybe_log_summary(logger) -> None:
+    """LATENCY_SUMMARY_SEC 간격으로 지연 요약을 INFO 로 출력 (전략 루프에서 호출)"""
+    global _next_summary
+    if LATENCY_SUMMARY_SEC <= 0:
+        return
+    now = time.monotonic()
+    if now < _next_summary:
+        return
+    first = _next_summary == 0.0
+    _next_summary = now + LATENCY_SUMMARY_SEC
+    if first:
+        return
+    lines = summary_lines()
+    if lines:
+        logger.info("[LATENCY] 단계별 지연 요약\n  %s", "\n  ".join(lines))
+
+
+# ────────────────────────────── 카운터·게이지 ──────────────────────────────
+#   ▸ 핫패스에서는 모듈 로드 시 counter()/gauge() 로 받아 둔 인스턴스의 inc()/set() 만 호출
+#     (속성 덧셈 1회 ≈ 50 ns – 라벨 조회·락 없음)
+class Counter:
+    __slots__ = ("name", "labels", "value")
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...]):
+        self.name   = name
+        self.labels = labels
+        self.value  = 0
+
+    def inc(self, n: float = 1) -> None:
+        self.value += n
+
+
+class Gauge(Counter):
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def dec(self, n: float = 1) -> None:
+        self.value -= n
+
+
+_COUNTERS: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Counter] = {}
+_GAUGES:   Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Gauge]   = {}
+
+
+def _get(store: dict, cls, name: str, labels: dict):
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    m = store.get(key)
+    if m is None:
+        with _LOCK:
+            m = store.get(key)
+            if m is None:
+                m = store[key] = cls(name, key[1])
+    return m
+
+
+def counter(name: str, **labels) -> Counter:
+    return _get(_COUNTERS, Counter, name, labels)
+
+
+def gauge(name: str, **labels) -> Gauge:
+    return _get(_GAUGES, Gauge, name, labels)
+
+
+# 스크레이프 시점에만 계산하는 게이지 (큐 깊이·봉 지연 등)
+#   fn() → [(name, {labels}, value), …]
+_COLLECTORS: List = []
+
+
+def register_collector(fn) -> None:
+    if fn not in _COLLECTORS:
+        _COLLECTORS.append(fn)
+
+
+class TimedApi:
+    """
+    REST SDK 클라이언트 래퍼 – 메서드 호출마다
+    rest_requests_total / rest_errors_total / rest_request_seconds {exchange, endpoint} 기록
+    (속성 읽기·쓰기는 원본 객체로 그대로 전달)
+    """
+    __slots__ = ("_api", "_exchange", "_wrapped")
+
+    def __init__(self, api, exchange: str):
+        object.__setattr__(self, "_api", api)
+        object.__setattr__(self, "_exchange", exchange)
+        object.__setattr__(self, "_wrapped", {})
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+        fn = self._wrapped.get(name)
+        if fn is None:
+            fn = self._wrapped[name] = _timed(attr, self._exchange, name)
+        return fn
+
+    def __setattr__(self, name, value):
+        setattr(self._api, name, value)
+
+
+def _timed(fn, exchange: str, endpoint: str):
+    calls = counter("rest_requests_total", exchange=exchange, endpoint=endpoint)
+    errors = counter("rest_errors_total", exchange=exchange, endpoint=endpoint)
+    hist = histogram("rest_request_seconds", exchange=exchange, endpoint=endpoint)
+
+    def wrapper(*args, **kwargs):
+        calls.value += 1
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            errors.value += 1
+            raise
+        finally:
+            hist.observe(time.perf_counter() - t0)
+
+    wrapper.__name__ = endpoint
+    return wrapper
+
+
+# ────────────────────────────── Prometheus 텍스트 포맷 ──────────────────────────────
+def _fmt_labels(labels, extra: str = "") -> str:
+    parts = [
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in (labels.items() if isinstance(labels, dict) else labels)
+    ]
+    if extra:
+        parts.append(extra)
+    return "{%s}" % ",".join(parts) if parts else ""
+
+
+def render_prometheus() -> str:
+    """text/plain; version=0.0.4 – 카운터·게이지·수집기, 히스토그램은 summary(p50/p99)로"""
+    out: List[str] = []
+    typed: set = set()
+
+    def _emit(kind: str, name: str, labels, value, suffix: str = "", extra: str = ""):
+        if name not in typed:
+            typed.add(name)
+            out.append(f"# TYPE {name} {kind}")
+        out.append(f"{name}{suffix}{_fmt_labels(labels, extra)} {float(value):.9g}")
+
+    for c in sorted(list(_COUNTERS.values()), key=lambda m: (m.name, m.labels)):
+        _emit("counter", c.name, c.labels, c.value)
+    for g in sorted(list(_GAUGES.values()), key=lambda m: (m.name, m.labels)):
+        _emit("gauge", g.name, g.labels, g.value)
+    for fn in list(_COLLECTORS):
+        try:
+            samples = sorted(fn(), key=lambda s: (s[0], sorted(s[1].items())))
+        except Exception:
+            continue
+        for name, labels, value in samples:
+            _emit("gauge", name, labels, value)
+    for h in sorted(list(_HISTOGRAMS.values()), key=lambda m: (m.name, m.labels)):
+        if not h.count:
+            continue
+        for q in (0.5, 0.99):
+            _emit("summary", h.name, h.labels, h.quantile(q), extra=f'quantile="{q}"')
+        out.append(f"{h.name}_sum{_fmt_labels(h.labels)} {h.sum:.9g}")
+        out.append(f"{h.name}_count{_fmt_labels(h.labels)} {h.count}")
+    return "\n".join(out) + "\n"
@@ -1,10 +1,11 @@
 # core/monitor.py
-import matplotlib
-matplotlib.use("Agg")              # GUI 없는 서버에서도 렌더
-import matplotlib.pyplot as plt
-from mplfinance.original_flavor import candlestick_ohlc
-import matplotlib.dates as mdates
-import pandas as pd
+import os
+import queue
+import sqlite3
+import threading
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing as mp
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from tempfile import gettempdir
@@ -13,25 +14,45 @@ from notify.discord import send_discord_file, send_discord_message
 # 차트에 사용할 LTF 타임프레임을 settings 에서 읽어오기
 from core.data_feed import candles
 from config.settings import LTF_TF       # ← NEW
+from core.metrics import observe
+from core.ledger import get_ledger
+from core.cache import BoundedCache
 
-# 내부 메모리용 간단 로그
-TRADE_LOG: list[dict] = []
+# 미청산 거래 (차트 캡처용) – 이력·통계는 core.ledger (SQLite) 에 영속 저장
+#   청산 이벤트를 받지 못한 심볼(수동 청산 등)이 쌓이지 않도록 LRU
+_OPEN_TRADES = BoundedCache("monitor_open_trades", 1024)
 
 # ────────────────────── 진입 / 청산 이벤트 헬퍼 ──────────────────────
-def on_entry(symbol: str, direction: str, entry: float, sl: float, tp: float):
-    TRADE_LOG.append({
+def _ledger_call(fn, *args, **kw):
+    """원장 기록 실패가 주문·포지션 흐름을 끊지 않도록"""
+    try:
+        return fn(*args, **kw)
+    except sqlite3.Error as e:
+        print(f"[LEDGER] 기록 실패 → {e}")
+        return None
+
+def on_entry(symbol: str, direction: str, entry: float, sl: float, tp: float,
+             *, sl_reason: str | None = None, basis=None):
+    now = datetime.now(timezone.utc)
+    _ledger_call(get_ledger().open_trade, symbol, direction, entry, sl, tp,
+                 entry_time=now, sl_reason=sl_reason, basis=basis)
+    trade = _OPEN_TRADES[symbol] = {
         "symbol": symbol,
         "direction": direction,
         "open": entry,
         "sl": sl,
         "tp": tp,
-        "entry_time": datetime.now(timezone.utc),   # UTC-aware
+        "entry_time": now,                          # UTC-aware
         "exit": None,
-        "pnl": 0.0,
-    })
-    _capture_chart(TRADE_LOG[-1])   # ★ 진입 즉시 스냅샷
+    }
+    _capture_chart(trade)   # ★ 진입 즉시 스냅샷 (큐 적재만)
 
-def on_exit(symbol: str, exit_price: float, exit_time: datetime | None = None):
+def on_fill(symbol: str, fill_price: float | None, qty: float | None):
+    """실제 체결가·수량 → 원장 슬리피지·수량 (PositionManager 가 진입 직후 조회)"""
+    _ledger_call(get_ledger().record_fill, symbol, fill_price, qty)
+
+def on_exit(symbol: str, exit_price: float, exit_time: datetime | None = None,
+            *, reason: str | None = None, fees: float | None = None):
     """
     exit_time 이 None 이면 UTC now 로 자동 지정.
     PositionManager.close() 에서 timezone-aware 를 넘겨줄 수 있음.
@@ -39,64 +60,107 @@ def on_exit(symbol: str, exit_price: float, exit_time: datetime | None = None):
     if exit_time is None:
         exit_time = datetime.now(timezone.utc)
 
-    for trade in reversed(TRADE_LOG):
-        if trade["symbol"] == symbol and trade["exit"] is None:
-            trade["exit"]      = exit_price
-            trade["exit_time"] = exit_time          # <- aware
-            mult = 1 if trade["direction"] == "long" else -1
-            trade["pnl"] = (exit_price - trade["open"]) * mult
-            _capture_chart(trade)                   # PNG 생성 & 전송
-            break
+    _ledger_call(get_ledger().close_trade, symbol, exit_price,
+                 exit_time=exit_time, reason=reason, fees=fees)
+    trade = _OPEN_TRADES.pop(symbol, None)
+    if trade is not None:
+        trade["exit"]      = exit_price
+        trade["exit_time"] = exit_time              # <- aware
+        _capture_chart(trade)                       # PNG 생성 & 전송 (비동기)
 
 # ────────────────────────── 차트 캡쳐 & 전송 ─────────────────────────
-def _capture_chart(trade: dict):
-    sym = trade["symbol"]
-    # ── ① 메모리 캔들 (LTF_TF) 우선
-    df = pd.DataFrame(candles.get(sym, {}).get(LTF_TF, []))
-    if df.empty:
-        import requests, time
-        end = int(time.time() * 1000)
-        start = end - 60 * 5 * 60 * 1000     # 60개(5분) = 300분
-        url = (
-            f"https://api.binance.com/api/v3/klines?"
-            f"symbol={sym}&interval={LTF_TF}&startTime={start}&endTime={end}"
-        )
-        raw = requests.get(url, timeout=3).json()
-        if raw and isinstance(raw, list):
-            df = pd.DataFrame(
-                raw,
-                columns=[
-                    'time', 'open', 'high', 'low', 'close',
-                    'vol','c1','c2','c3','c4','c5','c6'
-                ],
-            )
-            df.loc[:, 'time'] = pd.to_datetime(df['time'], unit='ms')
-            # ── 가격 컬럼만 float 로 변환 ──
-            price_cols = ['open', 'high', 'low', 'close']
-            df.loc[:, price_cols] = df[price_cols].astype(float)
-        if df.empty:
+#   • on_entry/on_exit 는 trade 사본을 큐에 넣고 즉시 반환
+#   • 디스패처 스레드 : 캔들 스냅샷(필요 시 REST 폴백) → 렌더 워커 → Discord
+#   • CHART_RENDER_MODE = process(기본) | thread | off
+#       process : matplotlib 렌더를 별도 프로세스에서 수행 (GIL 경합 제거)
+#   • 큐가 가득 차면 새 캡처는 버린다 (차트는 부가 기능)
+CHART_RENDER_MODE = os.getenv("CHART_RENDER_MODE", "process").lower()
+CHART_QUEUE_MAX   = int(os.getenv("CHART_QUEUE_MAX", "16"))
+CHART_BARS        = 60
+
+_chart_q: queue.Queue = queue.Queue(maxsize=CHART_QUEUE_MAX)
+_renderer = None
+_dispatcher: threading.Thread | None = None
+_chart_lock = threading.Lock()
+
+def start_chart_worker():
+    """
+    렌더 워커·디스패처 기동 (멱등)
+      ▸ process 모드는 fork 기반이므로 가급적 **스레드가 적은 기동 초기**에
+        호출해 두는 것이 좋다 (main.py 에서 PositionManager 생성 전 호출).
+    """
+    global _renderer, _dispatcher
+    if CHART_RENDER_MODE == "off" or _dispatcher is not None:
+        return
+    with _chart_lock:
+        if _dispatcher is not None:
             return
+        from core import chart_render
+        if CHART_RENDER_MODE == "process":
+            try:
+                _renderer = ProcessPoolExecutor(
+                    max_workers=1, mp_context=mp.get_context("fork")
+                )
+            except ValueError:          # fork 미지원 플랫폼 → 스레드
+                _renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart")
+        else:
+            _renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart")
+        _renderer.submit(chart_render.warmup)
+        _dispatcher = threading.Thread(target=_chart_loop, name="chart-dispatch", daemon=True)
+        _dispatcher.start()
 
-    df = df.tail(60).copy()
-    df["date"] = mdates.date2num(df["time"])
-    ohlc = df[["date", "open", "high", "low", "close"]].values
-
-    fig, ax = plt.subplots(figsize=(10, 4))
-    candlestick_ohlc(ax, ohlc, width=0.0008, colorup="g", colordown="r", alpha=0.9)
-    ax.axhline(trade["open"], color="blue", linestyle="--")
-    ax.axhline(trade["tp"],   color="green", linestyle=":")
-    ax.axhline(trade["sl"],   color="red",   linestyle=":")
-
-    ax.set_title(f"{sym} Entry/Exit")
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-    ax.grid(alpha=.3)
-
-    path = Path(gettempdir()) / f"{sym}_{int(trade['entry_time'].timestamp())}.png"
-    fig.savefig(path, dpi=120, bbox_inches="tight")
-    plt.close(fig)
+def _capture_chart(trade: dict):
+    if CHART_RENDER_MODE == "off":
+        return
+    if _dispatcher is None:
+        start_chart_worker()
+    try:
+        _chart_q.put_nowait((dict(trade), perf_counter()))
+    except queue.Full:
+        print(f"[CHART] 렌더 큐 포화 → 캡처 생략: {trade['symbol']}")
+
+def _chart_rows(sym: str) -> list:
+    """최근 LTF 캔들 60개를 (time, o, h, l, c) 튜플로 스냅샷 – time 은 거래 시각과 같은 UTC aware"""
+    # ── ① 메모리 캔들 (LTF_TF) 우선 · data_feed 는 로컬 naive → UTC 로 변환
+    buf = list(candles.get(sym, {}).get(LTF_TF, ()))[-CHART_BARS:]
+    if buf:
+        return [
+            (c["time"].astimezone(timezone.utc), c["open"], c["high"], c["low"], c["close"])
+            for c in buf
+        ]
+
+    import requests, time
+    end = int(time.time() * 1000)
+    start = end - 60 * 5 * 60 * 1000     # 60개(5분) = 300분
+    url = (
+        f"https://api.binance.com/api/v3/klines?"
+        f"symbol={sym}&interval={LTF_TF}&startTime={start}&endTime={end}"
+    )
+    raw = requests.get(url, timeout=3).json()
+    if not raw or not isinstance(raw, list):
+        return []
+    return [
+        (datetime.fromtimestamp(k[0] / 1000, tz=timezone.utc), float(k[1]), float(k[2]), float(k[3]), float(k[4]))
+        for k in raw[-CHART_BARS:]
+    ]
 
-    send_discord_file(str(path), "aggregated")
-    path.unlink(missing_ok=True)
+def _chart_loop():
+    from core.chart_render import render_chart
+    while True:
+        trade, t_req = _chart_q.get()
+        sym = trade["symbol"]
+        try:
+            rows = _chart_rows(sym)
+            if not rows:
+                continue
+            path = Path(gettempdir()) / f"{sym}_{int(trade['entry_time'].timestamp())}.png"
+            render_sec = _renderer.submit(render_chart, rows, trade, str(path)).result()
+            observe("chart_render_seconds", render_sec, mode=CHART_RENDER_MODE)
+            send_discord_file(str(path), "aggregated")
+            path.unlink(missing_ok=True)
+            observe("chart_capture_seconds", perf_counter() - t_req, mode=CHART_RENDER_MODE)
+        except Exception as e:
+            print(f"[CHART] {sym} 차트 캡처 실패 → {e}")
 
 # ───────────────────────────── 주간 리포트 ─────────────────────────────
 _last_report_week = None
@@ -111,28 +175,19 @@ def maybe_send_weekly_report(now: datetime):
 
     _last_report_week = now.isocalendar().week
     week_ago = now - timedelta(days=7)
-    
-    # ▸ exit_time 이 과거 버전(naive)일 수 있으므로 비교 전에 UTC 로 보정
-    def _aware(dt: datetime) -> datetime:
-        return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
-
-    week_trades = [
-        t for t in TRADE_LOG
-        if (et := t.get("exit_time")) and _aware(et) >= week_ago
-    ]
-    if not week_trades:
-        return
 
-    pnl = sum(t["pnl"] for t in week_trades)
-    win = sum(1 for t in week_trades if t["pnl"] > 0)
-    winrate = win / len(week_trades) * 100
-    expectancy = pnl / len(week_trades)
+    s = _ledger_call(get_ledger().summary, since=week_ago, until=now)
+    if not s or not (s["trades"] or s["unsized_trades"]):
+        return
 
     msg = (
         f"📊 **Weekly P&L**\n"
-        f"• Trades : {len(week_trades)}\n"
-        f"• WinRate: {winrate:.1f} %\n"
-        f"• Expect : {expectancy:.2f} USDT\n"
-        f"• P&L    : {pnl:.2f} USDT"
+        f"• Trades : {s['trades']}\n"
+        f"• WinRate: {s['win_rate']:.1f} %\n"
+        f"• Expect : {s['expectancy']:.2f} USDT\n"
+        f"• P&L    : {s['pnl']:.2f} USDT\n"
+        f"• MaxDD  : {s['max_drawdown']:.2f} USDT"
     )
+    if s["unsized_trades"]:                     # 수량 미상 → USDT 집계 제외 (가격 단위로 별도)
+        msg += f"\n• Unsized: {s['unsized_trades']} trades · {s['unsized_points']:+.4f} pts (USDT 제외)"
     send_discord_message(msg, "aggregated")
@@ -4,10 +4,17 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict
 from core.structure import detect_structure
+from core import indicators
 from notify.discord import send_discord_debug
+from core.log import get_logger
+from core.cache import BoundedCache
 
-# 보호선별 재진입 카운터
-REENTRY_COUNT: dict[tuple[str, float], int] = {}
+log = get_logger(__name__)
+
+# 보호선별 재진입 카운터 {(symbol, price_range): 횟수}
+#   REENTRY_TTL 동안 다시 닿지 않은 보호선은 초기화 · 크기 초과 시 오래된 것부터 제거
+REENTRY_TTL = 7 * 86_400
+REENTRY_COUNT = BoundedCache("mss_reentry", 10_000, ttl=REENTRY_TTL)
 
 def get_mss_and_protective_low(
     df: pd.DataFrame,
@@ -36,7 +43,7 @@ def get_mss_and_protective_low(
     lo = 'low'  if use_wick else 'body_low'
 
     if df_struct.empty:
-        print("[MSS] 구조 데이터 없음 → MSS 판단 불가")
+        log.debug("[MSS] 구조 데이터 없음 → MSS 판단 불가")
         return None
 
     # ───── 최근 BOS(= MSS) 찾기 ───────────────────
@@ -44,7 +51,7 @@ def get_mss_and_protective_low(
     mss_idx = df_struct[df_struct['structure'] == bos_tag].last_valid_index()  # <― 원본 index(label)
 
     if mss_idx is None:
-        print(f"[MSS] {direction.upper()} MSS 미탐지/기준부족")
+        log.debug("[MSS] %s MSS 미탐지/기준부족", direction.upper())
         return None
 
     # df_struct 내 위치(숫자 idx) → 보호선 계산용
@@ -53,22 +60,17 @@ def get_mss_and_protective_low(
     # ───── BOS 폭 & ATR 필터 ──────────────────────
     #   • BOS 폭이 0.8 × ATR14 이상일 때만 MSS 인정
     # ------------------------------------------------
-    # ATR 계산(간단 True Range)
-    df.loc[:, 'prev_close'] = df['close'].shift(1)
-    tr = pd.concat(
-        [
-            df[hi] - df[lo],
-            (df[hi] - df['prev_close']).abs(),
-            (df[lo] - df['prev_close']).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
-    atr = tr.rolling(window=atr_window).mean()
+    # ATR (BOS 봉 시점 · hi/lo 와 같은 몸통/꼬리 기준 True Range)
+    atr_val = indicators.atr(
+        df, atr_window, source="hl" if use_wick else "body", at=df.loc[mss_idx, 'time'],
+    )
 
     bos_range = df.loc[mss_idx, hi] - df.loc[mss_idx, lo]
-    atr_val   = atr.loc[mss_idx]
-    if np.isnan(atr_val) or bos_range < 0.6 * atr_val:
-        print(f"[MSS] {direction.upper()} MSS BOS폭 {bos_range:.2f} < 0.6×ATR({atr_val:.2f}) → 패스")
+    if atr_val is None or np.isnan(atr_val):
+        log.debug("[MSS] %s MSS ATR 미산출(%s) → 패스", direction.upper(), atr_val)
+        return None
+    if bos_range < 0.6 * atr_val:
+        log.debug("[MSS] %s MSS BOS폭 %.2f < 0.6×ATR(%.2f) → 패스", direction.upper(), bos_range, atr_val)
         return None
 
     # ───── 보호선 계산 ────────────────────────────
@@ -83,12 +85,12 @@ def get_mss_and_protective_low(
     price_range = int(protective * 1000)  # 0.1% 단위로 정규화
     key = (symbol, price_range)
     if REENTRY_COUNT.get(key, 0) >= reentry_limit:
-        print(f"[MSS] {symbol} 보호선 {protective:.4f} → 재진입 한도({reentry_limit}) 초과")
+        log.info("[MSS] %s 보호선 %.4f → 재진입 한도(%s) 초과", symbol, protective, reentry_limit)
         return None
     REENTRY_COUNT[key] = REENTRY_COUNT.get(key, 0) + 1
-    print(
-        f"[MSS] {direction.upper()} MSS PASS | BOS폭 {bos_range:.2f} (ATR {atr_val:.2f}) "
-        f"→ 보호선 {protective:.4f} @ {df_struct.loc[mss_idx,'time']}"
+    log.info(
+        "[MSS] %s MSS PASS | BOS폭 %.2f (ATR %.2f) → 보호선 %.4f @ %s",
+        direction.upper(), bos_range, atr_val, protective, df_struct.loc[mss_idx, 'time'],
     )
     send_discord_debug(
         f"[MSS] {direction.upper()} MSS | 보호선 {protective:.4f}", "aggregated"
@@ -1,6 +1,10 @@
 # core/ob.py
+import numpy as np
 import pandas as pd
 from notify.discord import send_discord_debug
+import logging
+from core.log import get_logger, log_changed
+from core.cache import BoundedSet
 # ─────────────────────────────────────────────────────────
 #  OB 리스트 후처리 : 겹치는 영역만 추출
 #  - N 개의 OB 가 서로 겹치면, 교집합(high=min(high), low=max(low)) 만 남김
@@ -9,7 +13,8 @@ from notify.discord import send_discord_debug
 #  ⓘ 패치 포인트 : detect_ob() → 마지막에 refine_overlaps() 호출
 # ─────────────────────────────────────────────────────────
 from typing import List, Dict, Tuple
-from decimal import Decimal
+
+log = get_logger(__name__)
 
 def detect_ob(df: pd.DataFrame) -> List[Dict]:
     """
@@ -17,93 +22,82 @@ def detect_ob(df: pd.DataFrame) -> List[Dict]:
     - bullish: 하락 마감 음봉 뒤 상승 발생
     - bearish: 상승 마감 양봉 뒤 하락 발생
     """
-    df = df.copy()
     ob_zones = []
     # displacement(변위) 캔들은 통상 1~3봉 안쪽을 봅니다
     MAX_DISPLACEMENT = 3
 
-    # shadow(꼬리) 무시하고 body 영역만 zone 으로 저장
-    def ob_body(candle):
-        o, c = Decimal(str(candle["open"])), Decimal(str(candle["close"]))
-        return (max(o, c), min(o, c))     # high, low (body extreme)
-
-    for i in range(2, len(df) - MAX_DISPLACEMENT):
-        c1 = df.iloc[i - 2]
-        c2 = df.iloc[i - 1]
-        high2, low2 = ob_body(c2)
+    # 행마다 df.iloc 로 Series 를 만들지 않고 numpy 열 배열로 비교 (결과 동일 · 봉당 수십 배 빠름)
+    n = len(df)
+    op = df["open"].to_numpy(dtype=float)
+    hi = df["high"].to_numpy(dtype=float)
+    lo = df["low"].to_numpy(dtype=float)
+    cl = df["close"].to_numpy(dtype=float)
+    vol = df["volume"].to_numpy(dtype=float) if "volume" in df.columns else None
+    times = df["time"].tolist()
+    rng = hi - lo
+
+    def _mean(x):
+        """pandas Series.mean 과 같은 값 (NaN 제외 · 합계 순서 동일)"""
+        ok = ~np.isnan(x)
+        if ok.all():
+            return np.add.reduce(x) / len(x)
+        return np.add.reduce(x[ok]) / ok.sum() if ok.any() else np.nan
+
+    def _zone(kind: str, i: int, k: int) -> Dict:
+        """i-1 봉(c2) = OB · k 봉 = displacement"""
+        # shadow(꼬리) 무시하고 body 영역만 zone 으로 저장 (float 그대로 – 라운딩은 소비 측 tick 격자)
+        high2, low2 = max(op[i - 1], cl[i - 1]), min(op[i - 1], cl[i - 1])
+        # SMC 품질 점수 계산
+        displacement = abs(cl[k] - cl[i - 1])
+        w = slice(max(0, i - 10), i + 1)
+        avg_range = _mean(rng[w])
+
+        # 볼륨 비율 계산 (볼륨 데이터가 있을 때만)
+        volume_ratio = 1.0
+        if vol is not None and not np.isnan(vol[i - 1]):
+            vol_avg = _mean(vol[w])
+            volume_ratio = vol[i - 1] / vol_avg if vol_avg > 0 else 1.0
+
+        # 기관성 OB 판단 점수
+        institutional_score = 0
+        if displacement > avg_range * 1.2:  # 큰 displacement
+            institutional_score += 1
+        if volume_ratio > 1.5:  # 높은 볼륨
+            institutional_score += 1
+
+        return {
+            "type": kind,
+            "high": float(high2),
+            "low": float(low2),
+            "time": times[i - 1],
+            "displacement": displacement,
+            "volume_ratio": volume_ratio,
+            "institutional_score": institutional_score,
+            "pattern": "ob"
+        }
+
+    for i in range(2, n - MAX_DISPLACEMENT):
         for j in range(1, MAX_DISPLACEMENT + 1):
-            if i + j >= len(df):
+            k = i + j
+            if k >= n:
                 break
-            c_next = df.iloc[i + j]
 
             # Bearish OB: 상승 후 하락 displacement
             if (
-                c1["high"] < c2["high"]                      # 이전 봉 대비 고점 상승
-                and c2["high"] > c_next["high"]             # 이후 봉 고점↓
-                and c_next["close"] < c_next["open"]        # 하락 마감
+                hi[i - 2] < hi[i - 1]                       # 이전 봉 대비 고점 상승
+                and hi[i - 1] > hi[k]                       # 이후 봉 고점↓
+                and cl[k] < op[k]                           # 하락 마감
             ):
-                # SMC 품질 점수 계산
-                displacement = abs(c_next["close"] - c2["close"])
-                avg_range = df["high"].iloc[max(0, i-10):i+1].sub(df["low"].iloc[max(0, i-10):i+1]).mean()
-                
-                # 볼륨 비율 계산 (볼륨 데이터가 있을 때만)
-                volume_ratio = 1.0
-                if 'volume' in df.columns and not pd.isna(df['volume'].iloc[i-1]):
-                    vol_avg = df['volume'].iloc[max(0, i-10):i+1].mean()
-                    volume_ratio = df['volume'].iloc[i-1] / vol_avg if vol_avg > 0 else 1.0
-                
-                # 기관성 OB 판단 점수
-                institutional_score = 0
-                if displacement > avg_range * 1.2:  # 큰 displacement
-                    institutional_score += 1
-                if volume_ratio > 1.5:  # 높은 볼륨
-                    institutional_score += 1
-                
-                ob_zones.append({
-                    "type": "bearish",
-                    "high": float(high2),
-                    "low": float(low2),
-                    "time": c2['time'],
-                    "displacement": displacement,
-                    "volume_ratio": volume_ratio,
-                    "institutional_score": institutional_score,
-                    "pattern": "ob"
-                })
+                ob_zones.append(_zone("bearish", i, k))
                 break
 
             # Bullish OB: 하락 후 상승 displacement
             if (
-                c1["low"] > c2["low"]
-                and c2["low"] < c_next["low"]
-                and c_next["close"] > c_next["open"]
+                lo[i - 2] > lo[i - 1]
+                and lo[i - 1] < lo[k]
+                and cl[k] > op[k]
             ):
-                # SMC 품질 점수 계산
-                displacement = abs(c_next["close"] - c2["close"])
-                avg_range = df["high"].iloc[max(0, i-10):i+1].sub(df["low"].iloc[max(0, i-10):i+1]).mean()
-                
-                # 볼륨 비율 계산 (볼륨 데이터가 있을 때만)
-                volume_ratio = 1.0
-                if 'volume' in df.columns and not pd.isna(df['volume'].iloc[i-1]):
-                    vol_avg = df['volume'].iloc[max(0, i-10):i+1].mean()
-                    volume_ratio = df['volume'].iloc[i-1] / vol_avg if vol_avg > 0 else 1.0
-                
-                # 기관성 OB 판단 점수
-                institutional_score = 0
-                if displacement > avg_range * 1.2:  # 큰 displacement
-                    institutional_score += 1
-                if volume_ratio > 1.5:  # 높은 볼륨
-                    institutional_score += 1
-                
-                ob_zones.append({
-                    "type": "bullish",
-                    "high": float(high2),
-                    "low": float(low2),
-                    "time": c2['time'],
-                    "displacement": displacement,
-                    "volume_ratio": volume_ratio,
-                    "institutional_score": institutional_score,
-                    "pattern": "ob"
-                })
+                ob_zones.append(_zone("bullish", i, k))
                 break
     # ───────────────────────────────────────────
     # ① 겹치는 OB 교집합으로 축소
@@ -115,31 +109,25 @@ def detect_ob(df: pd.DataFrame) -> List[Dict]:
     # 디버그 메시지는 가장 최근 1개만 출력 (딱 필요한 정보만)
     if ob_zones:
         last = ob_zones[-1]
-        print(f"[OB][{tf}] {symbol} → {last['type'].upper()} {last['low']}~{last['high']} (총 {len(ob_zones)})")
+        log_changed(log, ("ob", symbol, tf), logging.DEBUG,
+                    "[OB][%s] %s → %s %s~%s (총 %d)",
+                    tf, symbol, last['type'].upper(), last['low'], last['high'], len(ob_zones))
     else:
-        print(f"[OB][{tf}] {symbol} → 감지 없음")
+        log_changed(log, ("ob", symbol, tf), logging.DEBUG, "[OB][%s] %s → 감지 없음", tf, symbol)
 
     # ───────── 중복-알림 차단 ──────────
-    symbol = df.attrs.get("symbol", "UNKNOWN")
-    tf     = df.attrs.get("tf", "?")
-    key    = (symbol, tf)
+    key = (symbol, tf)
 
-    _seen = _OB_CACHE.setdefault(key, set())   # 전역 dict  { (sym,tf): set() }
     fresh = []
     for z in ob_zones:
-        sig = (round(z["low"], 8), round(z["high"], 8), z["type"])
-        if sig in _seen:
-            continue                # 이미 알림 → 건너뜀
-        _seen.add(sig)
-        fresh.append(z)
+        sig = key + (round(z["low"], 8), round(z["high"], 8), z["type"])
+        if _OB_CACHE.remember(sig):    # 처음 보는 존만 (이미 알림 → 건너뜀)
+            fresh.append(z)
 
     # ① fresh 로 잡힌 OB 만 알림
     for z in fresh[-5:]:
-        msg = (
-            f"[OB] {symbol} ({tf}) NEW {z['type'].upper()}  "
-            f"{z['low']} ~ {z['high']}  |  {z['time']:%Y-%m-%d %H:%M}"
-        )
-        print(msg)
+        log.info("[OB] %s (%s) NEW %s  %s ~ %s  |  %s",
+                 symbol, tf, z['type'].upper(), z['low'], z['high'], z['time'])
         #send_discord_debug(msg, "aggregated")          # 두 번째 인자는 원하는 태그
 
     # ② 전략단에는 교집합 처리된 OB 리스트를 넘긴다
@@ -196,4 +184,5 @@ def refine_overlaps(obs: List[Dict]) -> List[Dict]:
     return refined
 
 # ───────── 모듈 전역 캐시  ─────────
-_OB_CACHE: dict[tuple[str, str], set[tuple]] = {}
\ No newline at end of file
+#  (sym, tf, low, high, type) – 현재 감지 존은 매 호출 갱신되므로 지난 존만 밀려남
+_OB_CACHE = BoundedSet("ob_seen", 20_000)
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import time as time_module
 from typing import Dict, Optional
-from decimal import Decimal, ROUND_DOWN, ROUND_UP
+from decimal import ROUND_DOWN, ROUND_UP
 # ── pandas 타입 힌트/연산에 사용 ──────────────────────
 import pandas as pd
 
@@ -11,18 +11,31 @@ from core.protective import (
     get_protective_level,      # ← MTF(5 m) 보호선
 )
 from config.settings import RR, USE_HTF_PROTECTIVE, HTF_TF   # ⬅︎ 스위치 import
-from core.monitor import on_entry, on_exit     # ★ 추가
+from core.monitor import on_entry, on_exit, on_fill     # ★ 추가 (core.ledger 기록)
 from exchange.binance_api import get_mark_price  # ★ 마크 가격 조회
 from notify.discord import send_discord_message, send_discord_debug
 import threading, json, os
 from exchange.router import (
     update_stop_loss,
+    SL_DEFERRED,
     update_take_profit,      # ★ NEW
     cancel_order,
     close_position_market,
     get_open_position,
+    get_all_open_positions,
+    reset_sl_state,
+    base_quantity,
 )
 from core.data_feed import ensure_stream
+from core.position_store import PositionStore
+from core.position_record import Position
+from core.journal import open_journal
+from core.ticks import for_symbol, tick_size
+from core.metrics import counter
+from core.cache import BoundedCache
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 # ────── Tunable risk / SL 파라미터 (2025-07-04) ──────────────────
 TRAILING_THRESHOLD_PCT = 0.008   # 0.8 % – 트레일링 SL 민감도
@@ -30,14 +43,44 @@ SAFETY_TICKS            = 1      # 내부 종료용 버퍼(틱) 2→1
 MIN_RR_BASE             = 0.005  # 0.5 % – 최소 엔트리-SL 거리
 # ----------------------------------------------------------------
 
+# 다른 스레드가 같은 심볼을 갱신 중이라 건너뛴 가격 틱 수
+_UPDATE_SKIPPED = counter("position_update_skipped_total")
+
+def _order_id(res) -> int | None:
+    """SL 발주 반환값 → 주문 ID (no-op True · Gate True · False → None)"""
+    return res if isinstance(res, int) and not isinstance(res, bool) else None
+
+def _last_bar_time(df: Optional[pd.DataFrame]):
+    """HTF DataFrame 의 마지막 봉 시각 (time 컬럼 또는 시간 인덱스 · 없으면 None)"""
+    if df is None or df.empty:
+        return None
+    if "time" in df.columns:
+        return df["time"].iloc[-1]
+    return df.index[-1] if isinstance(df.index, pd.DatetimeIndex) else None
+
 class PositionManager:
+    """
+    포지션 상태는 core.position_store.PositionStore 에 보관 (값 = core.position_record.Position)
+      ▸ 상태를 바꾸는 메서드는 심볼 작성자 권한(store.edit) 안에서 실행
+        → WS 워커·메인 루프·헬스체크가 같은 심볼 SL 을 동시에 정정하지 않음
+      ▸ update_price() 는 같은 심볼 갱신이 진행 중이면 그 틱을 건너뛴다
+      ▸ 읽기(has_position·active_symbols·_verify_stop_losses 등)는 불변 스냅샷
+    모든 게시(진입·SL/TP 변경·익절·종료)는 core.journal 에 기록
+      ▸ 재시작 시 저널 재생 → 거래소 전체 포지션 1회 조회로 대조 (sync_from_exchange)
+    """
     def __init__(self):
-        self.positions: Dict[str, Dict] = {}
+        self.journal = open_journal()
+        self.positions = PositionStore(
+            on_publish=self._on_publish,
+            volatile=("last_price",),           # 가격 틱은 저널에 남기지 않음
+        )
         # ▸ 마지막 종료 시각 저장  {symbol: epoch sec}
         self._cooldowns: Dict[str, float] = {}
         # ▸ 스탑로스 알림 중복 방지 {symbol: epoch sec}
         self._sl_alerts: Dict[str, float] = {}
 
+        # 🔸 저널 복원 (trigger_zone·보호선·half_exit·initial_size 포함)
+        self._restore_from_journal()
         # 🔸 WS 시작 직후 거래소-실시간과 동기화
         self.sync_from_exchange()
         # 🔸 주기적 헬스체크 스레드
@@ -48,44 +91,101 @@ class PositionManager:
     # --------------------------------------------------
     # 🟢 1)  실행-직후 싱크
     # --------------------------------------------------
+    def _on_publish(self, symbol: str, pos: Position | None):
+        """게시 훅 – 포지션 소멸 시 대기 중인 병합 SL 발주 취소 · 저널 기록"""
+        if pos is None:
+            reset_sl_state(symbol)
+        if self.journal is not None:
+            self._journal_record(symbol, pos)
+
+    def _journal_record(self, symbol: str, pos: Position | None):
+        self.journal.record(symbol, pos.to_dict() if pos is not None else None)
+
+    def _restore_from_journal(self):
+        if self.journal is None:
+            return
+        t0 = time_module.perf_counter()
+        try:
+            records = self.journal.load()
+        except OSError as e:
+            log.warning("[JOURNAL] 로드 실패 → 거래소 기준으로만 동기화 (%s)", e)
+            return
+        restored = {}
+        for sym, d in records.items():
+            try:
+                restored[sym] = Position.from_dict({"symbol": sym, **d})
+            except (KeyError, TypeError) as e:
+                log.info("[JOURNAL] %s 레코드 무시 → %s", sym, e)
+        self.positions.load(restored)
+        if restored:
+            log.info(
+                "[JOURNAL] %s개 포지션 복원 (%.1f ms) → %s",
+                len(restored), (time_module.perf_counter() - t0) * 1000, ', '.join(restored),
+            )
+
+    @staticmethod
+    def _live_sl_tp(sym: str, entry: float) -> tuple[float, float]:
+        """저널에 없는 포지션 – 열린 SL / TP 주문 가격 (못 읽으면 ±2 % 폴백)"""
+        sl_px = tp_px = None
+        try:
+            from exchange.binance_api import client as _c
+            open_orders = _c.futures_get_open_orders(symbol=sym)
+            for od in open_orders:
+                if od["type"] == "STOP_MARKET":
+                    sl_px = float(od["stopPrice"])
+                elif od["type"] == "LIMIT" and od.get("reduceOnly"):
+                    tp_px = float(od["price"])
+        except Exception:
+            pass
+        return sl_px or (entry * 0.98), tp_px or (entry * 1.02)
+
     def sync_from_exchange(self):
         """
-        Binance / Gate 의 현재 포지션·주문을 읽어
-        self.positions 캐시를 재구성한다.
+        거래소 전체 포지션 스냅샷 1회(get_all_open_positions)로
+        self.positions 캐시를 대조·재구성한다.
+          ▸ 거래소에만 있음 → 열린 SL/TP 주문으로 레코드 생성
+          ▸ 내부에만 있음   → 조회 이후 같은 포지션(generation 동일)일 때만 force_exit
+          ▸ 방향이 다름     → 내부(저널) 레코드가 낡음 → 종료 처리 후 재생성
         """
         from config.settings import SYMBOLS            # 모든 심볼 목록
-        for sym in SYMBOLS:
-            try:
-                live = get_open_position(sym)
-            except Exception as e:
-                print(f"[SYNC] {sym} REST 실패 → {e}")
-                continue
+        from exchange.router import GATE_SET
+        syms = set(SYMBOLS) | set(GATE_SET) | set(self.positions)
+        gens = {sym: self.positions.generation(sym) for sym in syms}   # REST 조회 전 세대
+        live_all = get_all_open_positions()
+        if live_all is None:                           # 조회 실패 → 이번 판정 보류
+            return
+
+        for sym in syms:
+            gen = gens[sym]
+            live = live_all.get(sym)
+
+            if live and sym in self.positions and self.positions[sym].direction != live["direction"]:
+                with self.positions.edit(sym):
+                    if self.positions.generation(sym) != gen:
+                        continue
+                    log.info(
+                        "[SYNC] %s 내부 %s ≠ 거래소 %s → 재생성",
+                        sym, self.positions[sym].direction, live['direction'],
+                    )
+                    self._force_exit(sym, reason="sync_mismatch")
 
             if live and sym not in self.positions:
-                # ---- SL / TP 실가격 추출 -----------------------
-                sl_px = tp_px = None
-                try:
-                    from exchange.binance_api import client as _c
-                    open_orders = _c.futures_get_open_orders(symbol=sym)
-                    for od in open_orders:
-                        if od["type"] == "STOP_MARKET":
-                            sl_px = float(od["stopPrice"])
-                        elif od["type"] == "LIMIT" and od.get("reduceOnly"):
-                            tp_px = float(od["price"])
-                except Exception:
-                    pass
-
-                entry   = live["entry"]
-                sl_px   = sl_px or (entry * 0.98)      # 대충 2 % 폴백
-                tp_px   = tp_px or (entry * 1.02)
-                self.init_position(
-                    sym, live["direction"], entry, sl_px, tp_px
-                )
-                print(f"[SYNC] {sym} → 캐시 재생성 완료")
+                sl_px, tp_px = self._live_sl_tp(sym, live["entry"])
+                with self.positions.edit(sym):
+                    if sym in self.positions:          # 조회 사이 enter() 가 먼저 등록
+                        continue
+                    self.init_position(
+                        sym, live["direction"], live["entry"], sl_px, tp_px
+                    )
+                log.info("[SYNC] %s → 캐시 재생성 완료", sym)
 
             elif (not live) and sym in self.positions:
                 # 캐시에 있는데 실제론 이미 닫힘
-                self.force_exit(sym)
+                #   ▸ 조회 이후 포지션이 새로 생겼으면(재진입 등) 이번 판정은 버림
+                #     (가격 틱·SL 변경은 세대를 바꾸지 않음)
+                with self.positions.edit(sym):
+                    if self.positions.generation(sym) == gen:
+                        self._force_exit(sym, reason="sync_closed")
 
     # --------------------------------------------------
     # 🟢 2)  15 초마다 헬스체크
@@ -97,8 +197,8 @@ class PositionManager:
                 # SL 검증 추가
                 self._verify_stop_losses()
             except Exception as e:
-                print(f"[HEALTH] sync 오류: {e}")
-            time.sleep(15)          # ← 주기 조정 가능
+                log.warning("[HEALTH] sync 오류: %s", e)
+            time_module.sleep(15)   # ← 주기 조정 가능
     # ─────────  쿨-다운  헬퍼  ──────────
     COOLDOWN_SEC = 300          # ★ 5 분  (원하면 조정)
 
@@ -112,20 +212,24 @@ class PositionManager:
         return list(self.positions.keys())
     
     # 외부(거래소)에서 이미 청산됐음을 감지했을 때 메모리에서 제거
-    def force_exit(self, symbol: str, exit_price: float | None = None):
+    def force_exit(self, symbol: str, exit_price: float | None = None, reason: str = "external"):
         """거래소에서 이미 닫혔다고 판단될 때 호출"""
+        with self.positions.edit(symbol):
+            self._force_exit(symbol, exit_price, reason)
+
+    def _force_exit(self, symbol: str, exit_price: float | None = None, reason: str = "external"):
         if symbol not in self.positions:
             return
         if exit_price is None:
-            exit_price = self.positions[symbol].get("last_price",   # 직전가
-                         self.positions[symbol]["entry"])           # 없으면 진입가
+            exit_price = self.positions[symbol].last_price         # 직전가 (없으면 진입가)
         from datetime import datetime, timezone
-        on_exit(symbol, exit_price, datetime.now(timezone.utc))
+        on_exit(symbol, exit_price, datetime.now(timezone.utc), reason=reason)
         self.positions.pop(symbol, None)
+        reset_sl_state(symbol)
 
     # 최근 가격을 가져오기 (없으면 KeyError)
     def last_price(self, symbol: str) -> float:
-        return self.positions[symbol]["last_price"]
+        return self.positions[symbol].last_price
 
     def has_position(self, symbol: str) -> bool:
         return symbol in self.positions
@@ -142,6 +246,21 @@ class PositionManager:
         protective: float | None = None,   # ★ NEW
         htf_df: pd.DataFrame | None = None,  # ★ HTF 데이터 추가
         trigger_zone: dict | None = None,    # ★ 진입근거 존 정보 추가
+    ):
+        with self.positions.edit(symbol):
+            self._enter(symbol, direction, entry, sl, tp, basis, protective, htf_df, trigger_zone)
+
+    def _enter(
+        self,
+        symbol: str,
+        direction: str,
+        entry: float,
+        sl: float | None,
+        tp: float | None,
+        basis: dict | str | None,
+        protective: float | None,
+        htf_df: pd.DataFrame | None,
+        trigger_zone: dict | None,
     ):
         """포지션 등록 + 개선된 SL 산출
 
@@ -151,6 +270,8 @@ class PositionManager:
           `created_at` 타임스탬프를 저장한다.
         """
         basis_txt = f" | {basis}" if basis else " | NO_BASIS"
+        sl_reason = "given" if sl is not None else None     # 원장 기록용 SL 근거
+        reset_sl_state(symbol)          # 직전 포지션의 로컬 SL 상태 폐기
         
         # ─── ① 개선된 SL 산출 로직 ─────────────────────────
         if sl is None:
@@ -173,11 +294,14 @@ class PositionManager:
                     sl_reason = sl_result['reason']
                     sl_priority = sl_result['priority']
                     
-                    print(f"[SL] {symbol} 개선된 SL 산출: {sl:.5f} | 근거: {sl_reason} | 우선순위: {sl_priority}")
+                    log.info(
+                        "[SL] %s 개선된 SL 산출: %.5f | 근거: %s | 우선순위: %s",
+                        symbol, sl, sl_reason, sl_priority,
+                    )
                     send_discord_debug(f"[SL] {symbol} 개선된 SL: {sl:.5f} | {sl_reason}", "aggregated")
                     
                 except Exception as e:
-                    print(f"[SL] {symbol} 개선된 SL 산출 실패: {e} → 기존 로직 사용")
+                    log.warning("[SL] %s 개선된 SL 산출 실패: %s → 기존 로직 사용", symbol, e)
                     send_discord_debug(f"[SL] {symbol} 개선된 SL 산출 실패: {e}", "aggregated")
                     sl = None  # 기존 로직으로 폴백
             
@@ -186,16 +310,14 @@ class PositionManager:
                 # ①-A MSS-only protective 가 있으면 그대로
                 if protective is not None:
                     sl = protective
+                    sl_reason = "MSS protective"
                 else:
                     # ①-B 최후 폴백 = 1 % 리스크
                     sl = entry * (1 - 0.01) if direction == "long" else entry * (1 + 0.01)
+                    sl_reason = "1% fallback"
 
         # ─── ② 최소 리스크(거리) 검증 및 보정 ──────────────────
-        try:
-            from exchange.router import get_tick_size as _tick
-            tick = float(_tick(symbol) or 0)
-        except Exception:
-            tick = 0
+        tick = tick_size(symbol)             # 심볼별 1회 조회 캐시 (실패 → 0)
 
         # 최소 위험비 검증
         min_rr = max(MIN_RR_BASE, (float(tick) / entry) * 3 if tick else 0)
@@ -203,46 +325,37 @@ class PositionManager:
         if direction == "long":
             gap = (entry - sl) / entry
             if gap < min_rr:
-                print(f"[SL] {symbol} SL 최소 거리 미달 ({gap:.4f} < {min_rr:.4f}) → 보정")
+                log.info("[SL] %s SL 최소 거리 미달 (%.4f < %.4f) → 보정", symbol, gap, min_rr)
                 sl = entry * (1 - min_rr)
+                sl_reason = f"{sl_reason} → 최소 거리 보정"
         else:  # short
             gap = (sl - entry) / entry
             if gap < min_rr:
-                print(f"[SL] {symbol} SL 최소 거리 미달 ({gap:.4f} < {min_rr:.4f}) → 보정")
+                log.info("[SL] %s SL 최소 거리 미달 (%.4f < %.4f) → 보정", symbol, gap, min_rr)
                 sl = entry * (1 + min_rr)
+                sl_reason = f"{sl_reason} → 최소 거리 보정"
 
         # ─── ③ TP를 SL 기준으로 재계산 --------------------
-        # ── tickSize 라운딩을 먼저 맞춘다 ──
-        from exchange.router import get_tick_size as _tick
-        tick = Decimal(str(_tick(symbol) or 0))
+        # ── tickSize 라운딩을 먼저 맞춘다 (tick 격자 정수 라운딩) ──
+        g = for_symbol(symbol)
         risk = abs(entry - sl)
         tp_f = entry + risk * RR if direction == "long" else entry - risk * RR
 
-        if tick:                              # tick 이 0 이면 그대로
-            if direction == "long":
-                tp_f = float(Decimal(str(tp_f)).quantize(tick, ROUND_UP))
-            else:
-                tp_f = float(Decimal(str(tp_f)).quantize(tick, ROUND_DOWN))
+        if g is not None:                     # tick 을 모르면 그대로
+            tp_f = g.round(tp_f, ROUND_UP if direction == "long" else ROUND_DOWN)
         tp = tp_f
 
         ensure_stream(symbol)
-        self.positions[symbol] = {
-            "direction": direction,
-            "entry": entry,
-            "sl": sl,
-            "tp": tp,
-            "last_price": entry,          # ← 한 번 넣어두면 KeyError 방지
-            "half_exit": False,
-            "protective_level": protective,          # ← 최초부터 보유
-            "mss_triggered": False,
-            "sl_order_id": None,
-            "tp_order_id": None,          # ← TP 주문 ID 추가
-            "initial_size": None,         # ← 초기 포지션 사이즈 추가
-            "_created": time_module.time(),        # → 트레일링 SL grace‑period 용 (수정됨)
-            "trigger_zone": trigger_zone,    # ★ 진입근거 존 정보 저장
-            "htf_df": htf_df,               # ★ HTF 데이터 저장 (참조용)
-        }
-        on_entry(symbol, direction, entry, sl, tp)   # ★ 호출
+        self.positions[symbol] = Position(
+            symbol, direction, entry, sl, tp,
+            protective_level=protective,             # ← 최초부터 보유
+            created=time_module.time(),              # → 트레일링 SL grace‑period 용
+            trigger_zone=trigger_zone,               # ★ 진입근거 존 (kind·high·low·time 만)
+            # ★ HTF 는 DataFrame 대신 TF 만 저장 → 필요 시 캔들 저장소에서 조회
+            htf_tf=(htf_df.attrs.get("tf", HTF_TF) if htf_df is not None else None),
+            htf_time=_last_bar_time(htf_df),         # ★ 진입 시점 HTF 핸들 → htf_frame() 이 여기까지 자름
+        )
+        on_entry(symbol, direction, entry, sl, tp, sl_reason=sl_reason, basis=basis)   # ★ 호출
 
         # 진입 시 SL 주문 생성 (강화된 로직)
         sl_success = False
@@ -259,30 +372,30 @@ class PositionManager:
                 sl_success = ensure_stop_loss_gate(symbol, direction, sl, max_retries=3)
                 
             if sl_success:
-                self.positions[symbol]['sl_order_id'] = None  # 실제 ID는 거래소에서 관리
-                self.positions[symbol]['sl'] = sl
-                print(f"[SL] 초기 SL 주문 등록 완료 | {symbol} @ {sl:.4f}")
+                self.positions[symbol].sl_order_id = None  # 실제 ID는 거래소에서 관리
+                self.positions[symbol].sl = sl
+                log.info("[SL] 초기 SL 주문 등록 완료 | %s @ %.4f", symbol, sl)
                 send_discord_debug(f"[SL] 초기 SL 주문 등록 완료 | {symbol} @ {sl:.4f}", "aggregated")
             else:
-                print(f"[CRITICAL] {symbol} SL 주문 생성 실패 - 포지션 위험!")
+                log.critical("[CRITICAL] %s SL 주문 생성 실패 - 포지션 위험!", symbol)
                 send_discord_debug(f"[CRITICAL] {symbol} SL 주문 생성 실패 - 포지션 위험!", "aggregated")
                 
         except Exception as e:
-            print(f"[ERROR] {symbol} SL 설정 중 오류: {e}")
+            log.error("[ERROR] %s SL 설정 중 오류: %s", symbol, e)
             send_discord_debug(f"[ERROR] {symbol} SL 설정 중 오류: {e}", "aggregated")
 
         # ────────── TP 주문 생성 (절반 수량) ──────────
         tp_result = update_take_profit(symbol, direction, tp)
         if tp_result is True:       # 동일 TP → 주문 생략
-            print(f"[TP] {symbol} TP unchanged")
+            log.info("[TP] %s TP unchanged", symbol)
         elif tp_result not in (False, True):
-            self.positions[symbol]['tp_order_id'] = (
+            self.positions[symbol].tp_order_id = (
                 tp_result if isinstance(tp_result, int) else None
             )
-            print(f"[TP] 초기 TP 주문 등록 완료 | {symbol} @ {tp:.4f} (절반 수량)")
+            log.info("[TP] 초기 TP 주문 등록 완료 | %s @ %.4f (절반 수량)", symbol, tp)
             send_discord_debug(f"[TP] 초기 TP 주문 등록 완료 | {symbol} @ {tp:.4f} (절반 수량)", "aggregated")
         else:
-            print(f"[TP] {symbol} TP 주문 생성 실패")
+            log.warning("[TP] %s TP 주문 생성 실패", symbol)
             send_discord_debug(f"[TP] {symbol} TP 주문 생성 실패", "aggregated")
 
         # ────────── 초기 포지션 사이즈 저장 ──────────
@@ -303,11 +416,14 @@ class PositionManager:
                     return 0.0
                 
                 initial_size = _get_pos_size(pos)
-                self.positions[symbol]['initial_size'] = initial_size
-                print(f"[ENTRY] {symbol} 초기 포지션 사이즈: {initial_size}")
+                self.positions[symbol].initial_size = initial_size
+                # 원장 qty 는 기초자산 단위 (Gate size = 계약 수 → × quanto_multiplier)
+                on_fill(symbol, pos.get("entry") or None,
+                        base_quantity(symbol, initial_size) if initial_size else None)
+                log.info("[ENTRY] %s 초기 포지션 사이즈: %s", symbol, initial_size)
                 send_discord_debug(f"[ENTRY] {symbol} 초기 포지션 사이즈: {initial_size}", "aggregated")
         except Exception as e:
-            print(f"[ENTRY] {symbol} 초기 포지션 사이즈 확인 실패: {e}")
+            log.warning("[ENTRY] %s 초기 포지션 사이즈 확인 실패: %s", symbol, e)
             send_discord_debug(f"[ENTRY] {symbol} 초기 포지션 사이즈 확인 실패: {e}", "aggregated")
 
         # ────────── 메시지 구성 ──────────
@@ -328,7 +444,7 @@ class PositionManager:
         # ────────── 중복 알림 차단 ──────────
         if _ENTRY_CACHE.get(symbol) != msg:
             _ENTRY_CACHE[symbol] = msg        # 최근 메시지 기억
-            print(msg)
+            log.info("%s", msg)
             send_discord_message(msg, "aggregated")
 
     # ➊ 5 분 봉(DataFrame) 을 추가로 받을 수 있도록 인자 확장
@@ -341,15 +457,29 @@ class PositionManager:
     ):
         if symbol not in self.positions:
             return
-
-        pos = self.positions[symbol]
-        protective = pos.get("protective_level")       # ← 있을 수도/없을 수도
-        pos["last_price"] = current_price          # ← 가장 먼저 업데이트
-        direction = pos['direction']
-        sl, tp = pos['sl'], pos['tp']
-        entry = pos['entry']
-        half_exit = pos['half_exit']
-        mss_triggered = pos['mss_triggered']
+        # 같은 심볼을 다른 스레드가 갱신 중이면 이번 틱은 건너뜀 (다음 틱에서 재평가)
+        with self.positions.edit(symbol, blocking=False) as pos:
+            if pos is None:
+                if symbol in self.positions:
+                    _UPDATE_SKIPPED.inc()
+                return
+            self._update_price(symbol, pos, current_price, ltf_df, htf_df)
+
+    def _update_price(
+        self,
+        symbol: str,
+        pos: Position,
+        current_price: float,
+        ltf_df:  Optional[pd.DataFrame],
+        htf_df:  Optional[pd.DataFrame],
+    ):
+        protective = pos.protective_level              # ← 있을 수도/없을 수도
+        pos.last_price = current_price          # ← 가장 먼저 업데이트
+        direction = pos.direction
+        sl, tp = pos.sl, pos.tp
+        entry = pos.entry
+        half_exit = pos.half_exit
+        mss_triggered = pos.mss_triggered
 
         # ───────────────────────────────────────────────
         # ❶ 1차 TP(절반 익절) 달성 여부 **먼저** 확인
@@ -360,7 +490,7 @@ class PositionManager:
             # 실제 포지션 사이즈 확인을 통한 절반 익절 감지
             try:
                 current_pos = get_open_position(symbol)
-                if current_pos and pos.get('initial_size'):
+                if current_pos and pos.initial_size:
                     # 현재 포지션 사이즈 추출
                     def _get_pos_size(p: dict) -> float:
                         for k in ("size", "positionAmt", "qty", "amount"):
@@ -373,105 +503,120 @@ class PositionManager:
                         return 0.0
                     
                     current_size = _get_pos_size(current_pos)
-                    initial_size = pos['initial_size']
+                    initial_size = pos.initial_size
                     
                     # 포지션 사이즈가 60% 이하로 줄어들면 절반 익절로 판단 (약간의 여유 마진)
                     if current_size <= initial_size * 0.6:
                         if direction == "long":
-                            print(f"[PARTIAL TP] {symbol} LONG 절반 익절 감지 @ {current_price:.5f} (포지션: {current_size:.6f} -> {initial_size:.6f})")
+                            log.info(
+                                "[PARTIAL TP] %s LONG 절반 익절 감지 @ %.5f (포지션: %.6f -> %.6f)",
+                                symbol, current_price, current_size, initial_size,
+                            )
                             send_discord_message(f"[PARTIAL TP] {symbol} LONG 절반 익절 감지 @ {current_price:.5f}", "aggregated")
                         else:
-                            print(f"[PARTIAL TP] {symbol} SHORT 절반 익절 감지 @ {current_price:.5f} (포지션: {current_size:.6f} -> {initial_size:.6f})")
+                            log.info(
+                                "[PARTIAL TP] %s SHORT 절반 익절 감지 @ %.5f (포지션: %.6f -> %.6f)",
+                                symbol, current_price, current_size, initial_size,
+                            )
                             send_discord_message(f"[PARTIAL TP] {symbol} SHORT 절반 익절 감지 @ {current_price:.5f}", "aggregated")
                         
                         send_discord_debug(f"[DEBUG] {symbol} {direction.upper()} 1차 익절 완료 (실제 포지션 감소)", "aggregated")
-                        pos["half_exit"] = True
+                        pos.half_exit = True
 
                         # ── NEW ── ① 익절 직후 SL → 본절(Entry)
                         new_sl = entry                         # breakeven
                         # tickSize 라운드 & 진입가와 ≥1 tick 차이 확보
-                        from exchange.router import get_tick_size as _tick
-                        tick = float(_tick(symbol) or 0)
+                        tick = tick_size(symbol)
                         if direction == "long":
                             new_sl = max(new_sl, sl + tick)    # 최소 1 tick ↑
                         else:  # short
                             new_sl = min(new_sl, sl - tick)    # 최소 1 tick ↓
 
                         if self.should_update_sl(symbol, new_sl):
-                            sl_res = update_stop_loss(symbol, direction, new_sl)
+                            sl_res = self._request_sl(symbol, direction, new_sl)
                             # sl_res 가 'True' 이면 → SL 가격 변경 없음(no-op)
                             if isinstance(sl_res, bool) and sl_res is True:
-                                print(f"[SL] {symbol} SL unchanged(=BE) – keep existing order")
+                                log.info("[SL] %s SL unchanged(=BE) – keep existing order", symbol)
+                            elif sl_res == SL_DEFERRED:    # 발주 전 → 확정되면 _on_sl_flushed 가 반영
+                                log.info("[SL->BE] %s 본절 SL 병합 대기 @ %.4f", symbol, new_sl)
                             elif sl_res is not False:
-                                old_id = pos.get("sl_order_id")
-                                pos["sl"] = new_sl
-                                pos["sl_order_id"] = sl_res if isinstance(sl_res, int) else None
-                                if old_id:
+                                old_id = pos.sl_order_id
+                                pos.sl = new_sl
+                                pos.sl_order_id = sl_res if isinstance(sl_res, int) else None
+                                if old_id and isinstance(sl_res, int):   # 새 주문이 실제 발주된 경우만
                                     cancel_order(symbol, old_id)
-                                print(f"[SL->BE] {symbol} SL 본절로 이동 완료 @ {new_sl:.4f}")
+                                log.info("[SL->BE] %s SL 본절로 이동 완료 @ %.4f", symbol, new_sl)
                                 send_discord_debug(f"[SL] {symbol} 본절로 이동 → {new_sl:.4f}", "aggregated")
                         return  # 절반 익절 처리 완료
                         
             except Exception as e:
-                print(f"[PARTIAL TP] {symbol} 포지션 사이즈 확인 실패: {e}")
+                log.warning("[PARTIAL TP] %s 포지션 사이즈 확인 실패: %s", symbol, e)
                 # 실패 시 기존 방식으로 폴백
-                if direction == "long" and current_price >= pos["tp"]:
-                    print(f"[PARTIAL TP] {symbol} LONG 절반 익절 @ {current_price:.5f} (TP: {pos['tp']:.5f}) [폴백]")
-                    send_discord_message(f"[PARTIAL TP] {symbol} LONG 절반 익절 @ {current_price:.5f} (TP: {pos['tp']:.5f})", "aggregated")
+                if direction == "long" and current_price >= pos.tp:
+                    log.info(
+                        "[PARTIAL TP] %s LONG 절반 익절 @ %.5f (TP: %.5f) [폴백]",
+                        symbol, current_price, pos.tp,
+                    )
+                    send_discord_message(f"[PARTIAL TP] {symbol} LONG 절반 익절 @ {current_price:.5f} (TP: {pos.tp:.5f})", "aggregated")
                     send_discord_debug(f"[DEBUG] {symbol} LONG 1차 익절 완료", "aggregated")
-                    pos["half_exit"] = True
+                    pos.half_exit = True
 
                     # ── NEW ── ① 익절 직후 SL → 본절(Entry)
                     new_sl = entry                         # breakeven
                     # tickSize 라운드 & 진입가와 ≥1 tick 차이 확보
-                    from exchange.router import get_tick_size as _tick
-                    tick = float(_tick(symbol) or 0)
+                    tick = tick_size(symbol)
                     if direction == "long":
                         new_sl = max(new_sl, sl + tick)    # 최소 1 tick ↑
                     else:  # short
                         new_sl = min(new_sl, sl - tick)    # 최소 1 tick ↓
 
                     if self.should_update_sl(symbol, new_sl):
-                        sl_res = update_stop_loss(symbol, direction, new_sl)
+                        sl_res = self._request_sl(symbol, direction, new_sl)
                         # sl_res 가 'True' 이면 → SL 가격 변경 없음(no-op)
                         if isinstance(sl_res, bool) and sl_res is True:
-                            print(f"[SL] {symbol} SL unchanged(=BE) – keep existing order")
+                            log.info("[SL] %s SL unchanged(=BE) – keep existing order", symbol)
+                        elif sl_res == SL_DEFERRED:    # 발주 전 → 확정되면 _on_sl_flushed 가 반영
+                            log.info("[SL->BE] %s 본절 SL 병합 대기 @ %.4f", symbol, new_sl)
                         elif sl_res is not False:
-                            old_id = pos.get("sl_order_id")
-                            pos["sl"] = new_sl
-                            pos["sl_order_id"] = sl_res if isinstance(sl_res, int) else None
-                            if old_id:
+                            old_id = pos.sl_order_id
+                            pos.sl = new_sl
+                            pos.sl_order_id = sl_res if isinstance(sl_res, int) else None
+                            if old_id and isinstance(sl_res, int):   # 새 주문이 실제 발주된 경우만
                                 cancel_order(symbol, old_id)
-                            print(f"[SL->BE] {symbol} SL 본절로 이동 완료 @ {new_sl:.4f}")
+                            log.info("[SL->BE] %s SL 본절로 이동 완료 @ %.4f", symbol, new_sl)
                             send_discord_debug(f"[SL] {symbol} 본절로 이동 → {new_sl:.4f}", "aggregated")
                 
-                elif direction == "short" and current_price <= pos["tp"]:
-                    print(f"[PARTIAL TP] {symbol} SHORT 절반 익절 @ {current_price:.5f} (TP: {pos['tp']:.5f}) [폴백]")
-                    send_discord_message(f"[PARTIAL TP] {symbol} SHORT 절반 익절 @ {current_price:.5f} (TP: {pos['tp']:.5f})", "aggregated")
+                elif direction == "short" and current_price <= pos.tp:
+                    log.info(
+                        "[PARTIAL TP] %s SHORT 절반 익절 @ %.5f (TP: %.5f) [폴백]",
+                        symbol, current_price, pos.tp,
+                    )
+                    send_discord_message(f"[PARTIAL TP] {symbol} SHORT 절반 익절 @ {current_price:.5f} (TP: {pos.tp:.5f})", "aggregated")
                     send_discord_debug(f"[DEBUG] {symbol} SHORT 1차 익절 완료", "aggregated")
-                    pos["half_exit"] = True
+                    pos.half_exit = True
 
                     # ── NEW ── ① 익절 직후 SL → 본절(Entry)
                     new_sl = entry
-                    from exchange.router import get_tick_size as _tick
-                    tick = float(_tick(symbol) or 0)
+                    tick = tick_size(symbol)
                     if direction == "long":
                         new_sl = max(new_sl, sl + tick)
                     else:
                         new_sl = min(new_sl, sl - tick)
 
                     if self.should_update_sl(symbol, new_sl):
-                        sl_res = update_stop_loss(symbol, direction, new_sl)
+                        sl_res = self._request_sl(symbol, direction, new_sl)
                         # sl_res 가 'True' 이면 → SL 가격 변경 없음(no-op)
                         if isinstance(sl_res, bool) and sl_res is True:
-                            print(f"[SL] {symbol} SL unchanged(=BE) – keep existing order")
+                            log.info("[SL] %s SL unchanged(=BE) – keep existing order", symbol)
+                        elif sl_res == SL_DEFERRED:    # 발주 전 → 확정되면 _on_sl_flushed 가 반영
+                            log.info("[SL->BE] %s 본절 SL 병합 대기 @ %.4f", symbol, new_sl)
                         elif sl_res is not False:
-                            old_id = pos.get("sl_order_id")
-                            pos["sl"] = new_sl
-                            pos["sl_order_id"] = sl_res if isinstance(sl_res, int) else None
-                            if old_id:
+                            old_id = pos.sl_order_id
+                            pos.sl = new_sl
+                            pos.sl_order_id = sl_res if isinstance(sl_res, int) else None
+                            if old_id and isinstance(sl_res, int):   # 새 주문이 실제 발주된 경우만
                                 cancel_order(symbol, old_id)
-                            print(f"[SL->BE] {symbol} SL 본절로 이동 완료 @ {new_sl:.4f}")
+                            log.info("[SL->BE] %s SL 본절로 이동 완료 @ %.4f", symbol, new_sl)
                             send_discord_debug(f"[SL] {symbol} 본절로 이동 → {new_sl:.4f}", "aggregated")
         
         # ───────────────────────────────────────────────
@@ -488,30 +633,34 @@ class PositionManager:
             from core.protective import get_improved_protective_level
             
             try:
-                # 저장된 HTF 데이터와 trigger_zone 사용
-                stored_htf_df = pos.get("htf_df")
-                stored_trigger_zone = pos.get("trigger_zone")
+                # 진입 시점까지의 HTF 캔들 (인자로 같은 TF 가 오면 그걸 잘라 재사용) + trigger_zone
+                ref_htf_df = (
+                    pos.htf_frame(htf_df) if htf_df is not None and pos.htf_tf == HTF_TF
+                    else pos.htf_frame()
+                )
                 
                 improved_protective = get_improved_protective_level(
                     ltf_df=ltf_df,
-                    htf_df=stored_htf_df if stored_htf_df is not None else htf_df,
+                    htf_df=ref_htf_df if ref_htf_df is not None else htf_df,
                     direction=direction,
                     entry_price=entry,
-                    trigger_zone=stored_trigger_zone,
+                    trigger_zone=pos.trigger_zone,
                     use_htf=USE_HTF_PROTECTIVE
                 )
                 
                 if improved_protective:
                     candidates.append(improved_protective["protective_level"])
-                    print(f"[PROTECTIVE] {symbol} 개선된 보호선: {improved_protective['protective_level']:.5f} | "
-                          f"근거: {improved_protective['reason']} | 우선순위: {improved_protective['priority']}")
+                    log.info(
+                        "[PROTECTIVE] %s 개선된 보호선: %.5f | 근거: %s | 우선순위: %s",
+                        symbol, improved_protective['protective_level'], improved_protective['reason'], improved_protective['priority'],
+                    )
                     send_discord_debug(f"[PROTECTIVE] {symbol} 개선된 보호선: {improved_protective['protective_level']:.5f} | "
                                      f"{improved_protective['reason']}", "aggregated")
                 else:
-                    print(f"[PROTECTIVE] {symbol} 개선된 보호선 산출 실패 → 기존 로직 사용")
+                    log.warning("[PROTECTIVE] %s 개선된 보호선 산출 실패 → 기존 로직 사용", symbol)
                     
             except Exception as e:
-                print(f"[PROTECTIVE] {symbol} 개선된 보호선 산출 오류: {e} → 기존 로직 사용")
+                log.warning("[PROTECTIVE] %s 개선된 보호선 산출 오류: %s → 기존 로직 사용", symbol, e)
                 send_discord_debug(f"[PROTECTIVE] {symbol} 개선된 보호선 오류: {e}", "aggregated")
                 
                 # 기존 로직으로 폴백
@@ -537,11 +686,11 @@ class PositionManager:
 
             # 보호선이 더 "보수적"일 때만 교체
             if better_level:
-                pos["mss_triggered"]   = True        # 최초·후속 MSS 모두 기록
-                pos["protective_level"] = new_protective
+                pos.mss_triggered   = True        # 최초·후속 MSS 모두 기록
+                pos.protective_level = new_protective
                 protective              = new_protective
 
-                print(f"[MSS] 보호선 갱신 | {symbol} @ {protective:.4f}")
+                log.info("[MSS] 보호선 갱신 | %s @ %.4f", symbol, protective)
                 send_discord_debug(f"[MSS] 보호선 갱신 | {symbol} @ {protective:.4f}", "aggregated")
 
             # ─── 보호선 방향·위치 검증 ──────────────────────────────
@@ -552,18 +701,17 @@ class PositionManager:
                 (direction == "short" and protective >= entry)
             )
             if invalid_protective:
-                print(f"[MSS] 보호선 무시: 방향 불일치 | {symbol} "
-                    f"(entry={entry:.4f}, protective={protective:.4f})")
+                log.info("[MSS] 보호선 무시: 방향 불일치 | %s (entry=%.4f, protective=%.4f)", symbol, entry, protective)
                 send_discord_debug(
                     f"[MSS] 보호선 무시: 방향 불일치 | {symbol} "
                     f"(entry={entry:.4f}, protective={protective:.4f})",
                     "aggregated",
                 )
                 # ▸ ❶ 60 초 쿨다운 해시 저장
-                pos["_mss_skip_until"] = time_module.time() + 60
+                pos.mss_skip_until = time_module.time() + 60
                 # ▸ ❷ 보호선·MSS 플래그 초기화
-                pos["protective_level"] = None
-                pos["mss_triggered"]    = False
+                pos.protective_level = None
+                pos.mss_triggered    = False
                 protective              = None
                 return                  #   ← 이후 SL 갱신·EARLY-STOP 스킵
                 
@@ -578,7 +726,10 @@ class PositionManager:
             min_rr      = MIN_RR_BASE   # 0.5 %
             risk_ratio  = abs(entry - protective) / entry
             if risk_ratio < min_rr:
-                print(f"[SL] 보호선 무시: 엔트리와 {risk_ratio:.4%} 격차(≥ {min_rr*100:.2f}% 필요) | {symbol}")
+                log.info(
+                    "[SL] 보호선 무시: 엔트리와 %.4f%% 격차(≥ %.2f%% 필요) | %s",
+                    risk_ratio * 100, min_rr * 100, symbol,
+                )
                 send_discord_debug(
                     f"[SL] 보호선 무시: 진입가와 {risk_ratio:.4%} 격차 – 기존 SL 유지", "aggregated"
                 )
@@ -588,33 +739,33 @@ class PositionManager:
 
             if needs_update:
                 # ① 새 SL 주문 먼저 발행
-                sl_result = update_stop_loss(symbol, direction, protective)
-                if sl_result is not False:           # 성공해야만 교체 진행
+                sl_result = self._request_sl(symbol, direction, protective)
+                if sl_result == SL_DEFERRED:         # 발주 전 → 기존 SL 유지 (확정 시 _on_sl_flushed)
+                    log.info("[SL] 보호선 SL 병합 대기 | %s @ %.4f", symbol, protective)
+                elif sl_result is not False:         # 성공해야만 교체 진행
                     id_info = f" (ID: {sl_result})"
-                    old_id  = pos.get("sl_order_id")   # 기존 주문 기억
+                    old_id  = pos.sl_order_id   # 기존 주문 기억
 
                     # 메모리 갱신
-                    pos["sl_order_id"] = (
-                        sl_result if isinstance(sl_result, int) else None
-                    )
-                    pos["sl"] = protective
+                    pos.sl_order_id = _order_id(sl_result)
+                    pos.sl = protective
 
-                    # ② 기존 주문 취소 (있으면)
-                    if old_id:
+                    # ② 기존 주문 취소 (새 주문이 실제 발주된 경우만 · no-op True 제외)
+                    if old_id and _order_id(sl_result) is not None:
                         cancel_order(symbol, old_id)
-                        print(f"[SL] 기존 SL 주문 취소됨 | {symbol}")
+                        log.info("[SL] 기존 SL 주문 취소됨 | %s", symbol)
 
-                    print(f"[SL] 보호선 기반 SL 재설정 완료 | {symbol} @ {protective:.4f}{id_info}")
+                    log.info("[SL] 보호선 기반 SL 재설정 완료 | %s @ %.4f%s", symbol, protective, id_info)
                     send_discord_debug(f"[SL] 보호선 기반 SL 재설정 완료 | {symbol} @ {protective:.4f}{id_info}", "aggregated")
                 else:
-                    print(f"[SL] ❌ 보호선 기반 SL 주문 실패 | {symbol}")
+                    log.error("[SL] ❌ 보호선 기반 SL 주문 실패 | %s", symbol)
                     send_discord_debug(f"[SL] ❌ 보호선 기반 SL 주문 실패 | {symbol}", "aggregated")
                     return
 
             else:
                 # 디버그 노이즈 감소를 위해 half_exit 이후에만 로그
                 if half_exit:
-                    print(f"[SL] 보호선 SL 갱신 생략: 기존 SL이 더 보수적 | {symbol}")
+                    log.info("[SL] 보호선 SL 갱신 생략: 기존 SL이 더 보수적 | %s", symbol)
                 # send_discord_debug(f"[SL] 보호선 SL 갱신 생략: 기존 SL이 더 보수적 | {symbol}", "aggregated")
 
             # ➜ 더 이상 `EARLY STOP` 으로 시장가 종료하지 않음
@@ -628,8 +779,7 @@ class PositionManager:
 
         # → 틱사이즈 확보 (Gate, Binance 모두 대응)
         try:
-            from exchange.router import get_tick_size as _tick
-            tick = float(_tick(symbol) or 0)
+            tick = tick_size(symbol)
         except Exception:
             tick = 0.0   # 실패 시 0 ⇒ 기존 로직과 동일
 
@@ -642,12 +792,13 @@ class PositionManager:
                 now = time_module.time()
                 last_alert = self._sl_alerts.get(symbol, 0)
                 if now - last_alert > 30:  # 30초마다 최대 1번 알림
-                    print(f"[STOP LOSS] {symbol} LONG @ mark_price={mark_price:.2f}")
+                    log.info("[STOP LOSS] %s LONG @ mark_price=%.2f", symbol, mark_price)
                     send_discord_message(f"[STOP LOSS] {symbol} LONG @ {mark_price:.2f}", "aggregated")
                     self._sl_alerts[symbol] = now
-                self.close(symbol)
+                self.close(symbol, reason="stop_loss")
             else:
-                print(f"[DEBUG] {symbol} 스탑로스 조건 충족하지만 포지션 없음 - 캐시 정리")
+                log.debug("[DEBUG] %s 스탑로스 조건 충족하지만 포지션 없음 - 캐시 정리", symbol)
+                on_exit(symbol, sl, reason="sl_filled")     # 거래소 STOP 체결 → 원장 마감
                 self.positions.pop(symbol, None)
                 self._cooldowns[symbol] = time_module.time()
                 # 스탑로스 알림 상태도 정리
@@ -661,12 +812,13 @@ class PositionManager:
                 now = time_module.time()
                 last_alert = self._sl_alerts.get(symbol, 0)
                 if now - last_alert > 30:  # 30초마다 최대 1번 알림
-                    print(f"[STOP LOSS] {symbol} SHORT @ mark_price={mark_price:.2f}")
+                    log.info("[STOP LOSS] %s SHORT @ mark_price=%.2f", symbol, mark_price)
                     send_discord_message(f"[STOP LOSS] {symbol} SHORT @ {mark_price:.2f}", "aggregated")
                     self._sl_alerts[symbol] = now
-                self.close(symbol)
+                self.close(symbol, reason="stop_loss")
             else:
-                print(f"[DEBUG] {symbol} 스탑로스 조건 충족하지만 포지션 없음 - 캐시 정리")
+                log.debug("[DEBUG] %s 스탑로스 조건 충족하지만 포지션 없음 - 캐시 정리", symbol)
+                on_exit(symbol, sl, reason="sl_filled")     # 거래소 STOP 체결 → 원장 마감
                 self.positions.pop(symbol, None)
                 self._cooldowns[symbol] = time_module.time()
                 # 스탑로스 알림 상태도 정리
@@ -675,30 +827,38 @@ class PositionManager:
         # 절반 익절 이후 보호선 이탈 체크
         elif half_exit and protective:
             if direction == 'long' and current_price <= protective:
-                print(f"[FINAL EXIT] {symbol} LONG 보호선 이탈 → 잔여 종료")
+                log.info("[FINAL EXIT] %s LONG 보호선 이탈 → 잔여 종료", symbol)
                 send_discord_message(f"[FINAL EXIT] {symbol} LONG 보호선 이탈 → 잔여 종료", "aggregated")
                 send_discord_debug(f"[DEBUG] {symbol} LONG 보호선 이탈로 포지션 완전 종료", "aggregated")
-                self.close(symbol)
+                self.close(symbol, reason="protective")
 
             elif direction == 'short' and current_price >= protective:
-                print(f"[FINAL EXIT] {symbol} SHORT 보호선 이탈 → 잔여 종료")
+                log.info("[FINAL EXIT] %s SHORT 보호선 이탈 → 잔여 종료", symbol)
                 send_discord_message(f"[FINAL EXIT] {symbol} SHORT 보호선 이탈 → 잔여 종료", "aggregated")
                 send_discord_debug(f"[DEBUG] {symbol} SHORT 보호선 이탈로 포지션 완전 종료", "aggregated")
-                self.close(symbol)
+                self.close(symbol, reason="protective")
 
-    def close(self, symbol: str, exit_price: float | None = None):
+    def close(self, symbol: str, exit_price: float | None = None, reason: str = "close"):
         """
         * 여러 곳에서 동시에 호출돼도 안전하도록 idempotent 처리
         * pop() 을 한 번만 호출해 KeyError 방지
+        * reason : 원장(core.ledger) 청산 사유
         """
+        with self.positions.edit(symbol):
+            self._close(symbol, exit_price, reason)
+
+    def _close(self, symbol: str, exit_price: float | None = None, reason: str = "close"):
         # ▸ SL이 이미 트리거돼 포지션이 0 인 경우 MARKET 청산·취소 생략
         from exchange.router import get_open_position
         live = get_open_position(symbol)
         if not live or abs(live.get("entry", 0)) == 0:
-            print(f"[INFO] {symbol} SL 이미 소멸 → MARKET 청산 생략")
+            log.info("[INFO] %s SL 이미 소멸 → MARKET 청산 생략", symbol)
             # 내부 포지션만 제거하고 쿨-다운
             pos = self.positions.pop(symbol, None)
+            if pos is not None:
+                on_exit(symbol, exit_price or pos.sl, reason="sl_filled")
             self._cooldowns[symbol] = time_module.time()
+            reset_sl_state(symbol)
             return
         
         pos = self.positions.pop(symbol, None)
@@ -715,25 +875,26 @@ class PositionManager:
             if still_live and abs(still_live.get("entry", 0)) > 0:
                 raise RuntimeError("position not closed")
 
-            print(f"[EXIT] {symbol} 시장가 청산 완료")
+            log.info("[EXIT] %s 시장가 청산 완료", symbol)
             send_discord_debug(f"[EXIT] {symbol} 시장가 청산 완료", "aggregated")
 
             # ③ **확실히 닫힌 뒤** SL 주문 취소
-            sl_order_id = pos.get("sl_order_id")
+            sl_order_id = pos.sl_order_id
             if sl_order_id:
                 cancel_order(symbol, sl_order_id)
+            reset_sl_state(symbol)
 
         except Exception as e:
             # 실패 시 SL 그대로 둬야 하므로 취소하지 않는다
-            print(f"[WARN] {symbol} 시장가 청산 실패 → {e}")
+            log.warning("[WARN] %s 시장가 청산 실패 → %s", symbol, e)
             send_discord_debug(f"[WARN] {symbol} 시장가 청산 실패 → {e}", "aggregated")
             return   # 헷지 유지 후 재시도 기회
 
         if exit_price is None:
-            exit_price = pos.get("last_price", pos["entry"])
+            exit_price = pos.last_price
 
         from datetime import datetime, timezone
-        on_exit(symbol, exit_price, datetime.now(timezone.utc))
+        on_exit(symbol, exit_price, datetime.now(timezone.utc), reason=reason)
 
         # ▸ 쿨-다운 시작
         self._cooldowns[symbol] = time_module.time()
@@ -741,28 +902,52 @@ class PositionManager:
         self._sl_alerts.pop(symbol, None)
 
     def init_position(self, symbol: str, direction: str, entry: float, sl: float, tp: float):
-        self.positions[symbol] = {
-            "direction": direction,
-            "entry": entry,
-            "sl": sl,
-            "tp": tp,
-            "last_price": entry,          # ← 한 번 넣어두면 KeyError 방지
-            "half_exit": False,
-            "protective_level": None,
-            "mss_triggered": False
-        }
+        # PositionStore.__setitem__ → 심볼 작성자 권한으로 게시
+        self.positions[symbol] = Position(symbol, direction, entry, sl, tp)
     
+    # ─────────  SL 정정 (병합 발주 결과 반영)  ─────────
+    def _request_sl(self, symbol: str, direction: str, new_sl: float):
+        """
+        router.update_stop_loss 래퍼 (심볼 작성자 권한 안에서 호출)
+          ▸ SL_DEFERRED = 아직 발주 전 → 호출 측은 pos.sl·sl_order_id 를 바꾸지 않는다
+          ▸ 병합 발주 결과는 타이머 스레드에서 _on_sl_flushed 로 반영
+        """
+        gen = self.positions.generation(symbol)
+        return update_stop_loss(
+            symbol, direction, new_sl,
+            on_result=lambda level, res: self._on_sl_flushed(symbol, gen, level, res),
+        )
+
+    def _on_sl_flushed(self, symbol: str, gen: int, level: float, res):
+        """병합 SL 발주 결과 – 같은 포지션(generation 동일)일 때만 SL·주문 ID 반영"""
+        if res is False:
+            log.warning("[SL] %s 병합 SL 발주 실패 @ %.4f → 기존 SL 유지 (다음 갱신 때 재시도)", symbol, level)
+            return
+        with self.positions.edit(symbol) as pos:
+            if pos is None or self.positions.generation(symbol) != gen:
+                return
+            old_id = pos.sl_order_id
+            new_id = _order_id(res)
+            pos.sl = level
+            if new_id is not None:
+                pos.sl_order_id = new_id
+                if old_id and old_id != new_id:
+                    cancel_order(symbol, old_id)
+        log.info("[SL] %s 병합 SL 확정 @ %.4f (ID: %s)", symbol, level, res)
+        send_discord_debug(f"[SL] {symbol} 병합 SL 확정 → {level:.4f}", "aggregated")
+
     def should_update_sl(self, symbol: str, new_sl: float) -> bool:
         if symbol not in self.positions:
             return False
-        current_sl = self.positions[symbol]['sl']
-        direction = self.positions[symbol]['direction']
+        pos = self.positions[symbol]
+        current_sl = pos.sl
+        direction = pos.direction
         if direction == 'long':
             # 롱 ➜ 새 SL 이 더 높아야 보수적
             return new_sl > current_sl
         else:  # short
             # 기본: 더 낮게 ↓, 또는 entry 와의 Risk 가 줄어들면 ↑ 허용
-            entry      = self.positions[symbol]["entry"]
+            entry      = pos.entry
             risk_now   = abs(entry - current_sl)
             risk_new   = abs(entry - new_sl)
             return (new_sl < current_sl) or (risk_new < risk_now)
@@ -775,28 +960,30 @@ class PositionManager:
     ):
         if symbol not in self.positions:
             return
+        with self.positions.edit(symbol) as pos:
+            if pos is not None:
+                self._trail(symbol, pos, current_price, threshold_pct)
 
-        pos = self.positions[symbol]
+    def _trail(self, symbol: str, pos: dict, current_price: float, threshold_pct: float):
         # ① 1차 익절(half_exit) 전이면 트레일링 SL 비활성
-        if not pos.get("half_exit"):
+        if not pos.half_exit:
             return
         # ② half_exit 후라도 *진입 30 초 이내* 는 무시 (급격한 노이즈 방어)
-        if time_module.time() - pos.get("_created", 0) < 30:
+        if time_module.time() - pos.created < 30:
             return
-        direction = pos['direction']
-        current_sl = pos['sl']
-        protective  = pos.get("protective_level")
+        direction = pos.direction
+        current_sl = pos.sl
+        protective  = pos.protective_level
 
         # 절반 익절 이후에도 계속 SL 추적
         # (보호선이 있으면 둘 중 더 보수적인 가격만 채택)
 
         # ▸ tickSize 먼저 확보 -------------------------------------
-        from exchange.router import get_tick_size as _tick
-        tick = float(_tick(symbol) or 0)
+        tick = tick_size(symbol)
 
         # ─── 최소 거리(리스크-가드) 확보 ────────────────────────────
         #   max(0.03 %,   tickSize / entry × 3)
-        entry     = pos["entry"]
+        entry     = pos.entry
         tick_rr   = (tick / entry) if (tick and entry) else 0
         min_rr    = max(MIN_RR_BASE, tick_rr * 3)
 
@@ -815,40 +1002,41 @@ class PositionManager:
                     if swing_data:
                         swing_low = swing_data["protective_level"]
             except Exception as e:
-                print(f"[SWING] {symbol} 스윙 저점 계산 실패: {e}")
+                log.warning("[SWING] %s 스윙 저점 계산 실패: %s", symbol, e)
             
             # 하이브리드 트레일링: 스윙 저점과 퍼센트 트레일링 중 더 보수적인 값
             if swing_low and swing_low > percent_trailing:
                 new_sl = swing_low
-                print(f"[HYBRID] {symbol} 스윙 저점 기준 트레일링: {swing_low:.4f}")
+                log.info("[HYBRID] %s 스윙 저점 기준 트레일링: %.4f", symbol, swing_low)
             else:
                 new_sl = percent_trailing
-                print(f"[HYBRID] {symbol} 퍼센트 기준 트레일링: {percent_trailing:.4f}")
+                log.info("[HYBRID] %s 퍼센트 기준 트레일링: %.4f", symbol, percent_trailing)
             
             if (
                 (new_sl - current_sl) > tick * 2                    # 최소 2 tick 위
                 and self.should_update_sl(symbol, new_sl)
-                and (entry := pos["entry"])
+                and (entry := pos.entry)
                 and abs(entry - new_sl) / entry >= min_rr
                 and (protective is None or new_sl > protective)
             ):
-                old_sl, old_tp = pos["sl"], pos["tp"]   # ▸ rollback 저장
+                old_sl, old_tp = pos.sl, pos.tp   # ▸ rollback 저장
 
-                pos["sl"] = new_sl                      # ① 선(先)-메모리 갱신
-                # 두 번째 쓰레드는 여기서 diff<=2tick 조건에 걸려 바로 return
+                pos.sl = new_sl                      # ① 초안 갱신 (심볼 작성자 권한 보유 중)
 
-                sl_result = update_stop_loss(symbol, direction, new_sl)
-                if sl_result is not False:
-                    pos['sl_order_id'] = (
+                sl_result = self._request_sl(symbol, direction, new_sl)
+                if sl_result == SL_DEFERRED:   # 발주 전 → 초안 원복 (확정 시 _on_sl_flushed)
+                    pos.sl, pos.tp = old_sl, old_tp
+                elif sl_result is not False:
+                    pos.sl_order_id = (
                         sl_result if isinstance(sl_result, int) else None
                     )
                     # 📌 1차 익절 이후에는 TP 를 새로 만들지 않는다
                     #     잔여 물량은 트레일링 SL 로만 관리
-                    print(f"[TRAILING SL] {symbol} LONG SL 갱신: {current_sl:.4f} → {new_sl:.4f}")
+                    log.info("[TRAILING SL] %s LONG SL 갱신: %.4f → %.4f", symbol, current_sl, new_sl)
                     send_discord_debug(f"[TRAILING SL] {symbol} LONG SL 갱신: {current_sl:.4f} → {new_sl:.4f}", "aggregated")
 
                 else:                       # ★ API 실패 → 값 원복
-                    pos["sl"], pos["tp"] = old_sl, old_tp
+                    pos.sl, pos.tp = old_sl, old_tp
                     return                  # 중복 갱신도 방지
                 
         elif direction == "short":
@@ -867,44 +1055,47 @@ class PositionManager:
                     if swing_data:
                         swing_high = swing_data["protective_level"]
             except Exception as e:
-                print(f"[SWING] {symbol} 스윙 고점 계산 실패: {e}")
+                log.warning("[SWING] %s 스윙 고점 계산 실패: %s", symbol, e)
             
             # 하이브리드 트레일링: 스윙 고점과 퍼센트 트레일링 중 더 보수적인 값
             if swing_high and swing_high < percent_trailing:
                 new_sl = swing_high
-                print(f"[HYBRID] {symbol} 스윙 고점 기준 트레일링: {swing_high:.4f}")
+                log.info("[HYBRID] %s 스윙 고점 기준 트레일링: %.4f", symbol, swing_high)
             else:
                 new_sl = percent_trailing
-                print(f"[HYBRID] {symbol} 퍼센트 기준 트레일링: {percent_trailing:.4f}")
+                log.info("[HYBRID] %s 퍼센트 기준 트레일링: %.4f", symbol, percent_trailing)
             if (
                 (current_sl - new_sl) > tick * 2                 # 최소 2 tick 아래
                 and self.should_update_sl(symbol, new_sl)
-                and (entry := pos["entry"])
+                and (entry := pos.entry)
                 and abs(entry - new_sl) / entry >= min_rr
                 and (protective is None or new_sl < protective)   # 보호선보다 위험하지 않게
             ):
-                old_sl, old_tp = pos["sl"], pos["tp"]   # ▸ rollback 저장
+                old_sl, old_tp = pos.sl, pos.tp   # ▸ rollback 저장
 
-                pos["sl"] = new_sl                      # ① 선(先)-메모리 갱신
-                # 두 번째 쓰레드는 여기서 diff<=2tick 조건에 걸려 바로 return
+                pos.sl = new_sl                      # ① 초안 갱신 (심볼 작성자 권한 보유 중)
 
-                sl_result = update_stop_loss(symbol, direction, new_sl)
-                if sl_result is not False:
-                    pos['sl_order_id'] = (
+                sl_result = self._request_sl(symbol, direction, new_sl)
+                if sl_result == SL_DEFERRED:   # 발주 전 → 초안 원복 (확정 시 _on_sl_flushed)
+                    pos.sl, pos.tp = old_sl, old_tp
+                elif sl_result is not False:
+                    pos.sl_order_id = (
                         sl_result if isinstance(sl_result, int) else None
                     )
                     # 📌 1차 익절 이후에는 TP 를 새로 만들지 않는다
 
-                    print(f"[TRAILING SL] {symbol} SHORT SL 갱신: {current_sl:.4f} → {new_sl:.4f}")
+                    log.info("[TRAILING SL] %s SHORT SL 갱신: %.4f → %.4f", symbol, current_sl, new_sl)
                     send_discord_debug(f"[TRAILING SL] {symbol} SHORT SL 갱신: {current_sl:.4f} → {new_sl:.4f}", "aggregated")
 
                 else:                       # ★ API 실패 → 값 원복
-                    pos["sl"], pos["tp"] = old_sl, old_tp
+                    pos.sl, pos.tp = old_sl, old_tp
                     return
     def dump(self, sym=None):
         import json, pprint, datetime
         now = datetime.datetime.utcnow().isoformat(timespec="seconds")
-        data = self.positions if sym is None else {sym: self.positions.get(sym, {})}
+        snap = self.positions.snapshot()
+        data = ({k: v.to_dict() for k, v in snap.items()} if sym is None
+                else {sym: snap[sym].to_dict() if sym in snap else {}})
         pprint.pp({ "ts": now, **data })
 
     def _verify_stop_losses(self):
@@ -917,7 +1108,7 @@ class PositionManager:
 
 
 # Global cache for entry messages
-_ENTRY_CACHE: dict[str, str] = {}    # {symbol: 마지막 전송 메시지}
+_ENTRY_CACHE = BoundedCache("position_entry_msg", 1024)    # {symbol: 마지막 전송 메시지}
 
 
 class PositionManagerExtended(PositionManager):
@@ -936,7 +1127,7 @@ class PositionManagerExtended(PositionManager):
             positions_copy = dict(self.positions)
             
             for symbol, pos in positions_copy.items():
-                sl_price = pos.get('sl')
+                sl_price = pos.sl
                 if not sl_price:
                     continue
                     
@@ -946,38 +1137,38 @@ class PositionManagerExtended(PositionManager):
                     try:
                         from exchange.binance_api import verify_sl_exists, ensure_stop_loss
                         if not verify_sl_exists(symbol, sl_price):
-                            print(f"[WARN] {symbol} Binance SL 주문 누락 감지 - 재생성 시도")
+                            log.warning("[WARN] %s Binance SL 주문 누락 감지 - 재생성 시도", symbol)
                             send_discord_debug(f"[WARN] {symbol} Binance SL 주문 누락 감지", "aggregated")
                             
                             # SL 재생성 시도
-                            direction = pos.get('direction')
+                            direction = pos.direction
                             if direction:
                                 success = ensure_stop_loss(symbol, direction, sl_price, max_retries=2)
                                 if not success:
                                     send_discord_debug(f"[CRITICAL] {symbol} Binance SL 재생성 실패!", "aggregated")
                                      
                     except Exception as e:
-                        print(f"[ERROR] {symbol} Binance SL 검증 중 오류: {e}")
+                        log.error("[ERROR] %s Binance SL 검증 중 오류: %s", symbol, e)
                 else:
                     # Gate 심볼 검증
                     try:
                         from exchange.gate_sdk import verify_sl_exists_gate, ensure_stop_loss_gate
                         if not verify_sl_exists_gate(symbol, sl_price):
-                            print(f"[WARN] {symbol} Gate SL 주문 누락 감지 - 재생성 시도")
+                            log.warning("[WARN] %s Gate SL 주문 누락 감지 - 재생성 시도", symbol)
                             send_discord_debug(f"[WARN] {symbol} Gate SL 주문 누락 감지", "aggregated")
                             
                             # SL 재생성 시도
-                            direction = pos.get('direction')
+                            direction = pos.direction
                             if direction:
                                 success = ensure_stop_loss_gate(symbol, direction, sl_price, max_retries=2)
                                 if not success:
                                     send_discord_debug(f"[CRITICAL] {symbol} Gate SL 재생성 실패!", "aggregated")
                                     
                     except Exception as e:
-                        print(f"[ERROR] {symbol} Gate SL 검증 중 오류: {e}")
+                        log.error("[ERROR] %s Gate SL 검증 중 오류: %s", symbol, e)
                         
         except Exception as e:
-            print(f"[ERROR] SL 검증 프로세스 오류: {e}")
+            log.error("[ERROR] SL 검증 프로세스 오류: %s", e)
 
     def force_ensure_all_stop_losses(self):
         """
@@ -985,60 +1176,60 @@ class PositionManagerExtended(PositionManager):
         수동 호출용 메서드
         """
         if not self.positions:
-            print("[INFO] 활성 포지션이 없습니다.")
+            log.info("[INFO] 활성 포지션이 없습니다.")
             return
             
-        print("[INFO] 모든 포지션의 SL 검증을 시작합니다...")
+        log.info("[INFO] 모든 포지션의 SL 검증을 시작합니다...")
         
         try:
             from exchange.router import GATE_SET
             
             for symbol, pos in self.positions.items():
-                sl_price = pos.get('sl')
-                direction = pos.get('direction')
+                sl_price = pos.sl
+                direction = pos.direction
                 
                 if not sl_price or not direction:
-                    print(f"[WARN] {symbol} 포지션 정보 불완전 - 건너뜀")
+                    log.warning("[WARN] %s 포지션 정보 불완전 - 건너뜀", symbol)
                     continue
                     
-                print(f"[CHECK] {symbol} SL 검증 중...")
+                log.info("[CHECK] %s SL 검증 중...", symbol)
                 
                 if symbol not in GATE_SET:
                     # Binance 심볼
                     try:
                         from exchange.binance_api import verify_sl_exists, ensure_stop_loss
                         if verify_sl_exists(symbol, sl_price):
-                            print(f"[OK] {symbol} Binance SL 주문 존재 확인 @ {sl_price:.4f}")
+                            log.info("[OK] %s Binance SL 주문 존재 확인 @ %.4f", symbol, sl_price)
                         else:
-                            print(f"[FIXING] {symbol} Binance SL 주문 누락 - 재생성 중...")
+                            log.info("[FIXING] %s Binance SL 주문 누락 - 재생성 중...", symbol)
                             success = ensure_stop_loss(symbol, direction, sl_price, max_retries=3)
                             if success:
-                                print(f"[FIXED] {symbol} Binance SL 주문 재생성 완료")
+                                log.info("[FIXED] %s Binance SL 주문 재생성 완료", symbol)
                                 send_discord_debug(f"[FIXED] {symbol} Binance SL 주문 재생성 완료", "aggregated")
                             else:
-                                print(f"[FAILED] {symbol} Binance SL 주문 재생성 실패")
+                                log.error("[FAILED] %s Binance SL 주문 재생성 실패", symbol)
                                 send_discord_debug(f"[FAILED] {symbol} Binance SL 주문 재생성 실패", "aggregated")
                     except Exception as e:
-                        print(f"[ERROR] {symbol} Binance SL 처리 중 오류: {e}")
+                        log.error("[ERROR] %s Binance SL 처리 중 오류: %s", symbol, e)
                 else:
                     # Gate 심볼
                     try:
                         from exchange.gate_sdk import verify_sl_exists_gate, ensure_stop_loss_gate
                         if verify_sl_exists_gate(symbol, sl_price):
-                            print(f"[OK] {symbol} Gate SL 주문 존재 확인 @ {sl_price:.4f}")
+                            log.info("[OK] %s Gate SL 주문 존재 확인 @ %.4f", symbol, sl_price)
                         else:
-                            print(f"[FIXING] {symbol} Gate SL 주문 누락 - 재생성 중...")
+                            log.info("[FIXING] %s Gate SL 주문 누락 - 재생성 중...", symbol)
                             success = ensure_stop_loss_gate(symbol, direction, sl_price, max_retries=3)
                             if success:
-                                print(f"[FIXED] {symbol} Gate SL 주문 재생성 완료")
+                                log.info("[FIXED] %s Gate SL 주문 재생성 완료", symbol)
                                 send_discord_debug(f"[FIXED] {symbol} Gate SL 주문 재생성 완료", "aggregated")
                             else:
-                                print(f"[FAILED] {symbol} Gate SL 주문 재생성 실패")
+                                log.error("[FAILED] %s Gate SL 주문 재생성 실패", symbol)
                                 send_discord_debug(f"[FAILED] {symbol} Gate SL 주문 재생성 실패", "aggregated")
                     except Exception as e:
-                        print(f"[ERROR] {symbol} Gate SL 처리 중 오류: {e}")
+                        log.error("[ERROR] %s Gate SL 처리 중 오류: %s", symbol, e)
                     
         except Exception as e:
-            print(f"[ERROR] 강제 SL 검증 중 오류: {e}")
+            log.error("[ERROR] 강제 SL 검증 중 오류: %s", e)
             
-        print("[INFO] SL 검증 완료")
+        log.info("[INFO] SL 검증 완료")
@@ -0,0 +1,148 @@
+# core/position_record.py
+"""
+PositionManager 포지션 1건 레코드 (__slots__ 고정 필드)
+
+  • enter() · init_position() 이 같은 필드 집합을 사용 → 키 누락·오타 KeyError 없음
+  • HTF DataFrame 복사본을 들고 있지 않음
+      ▸ htf_tf · htf_time(진입 시점 마지막 HTF 봉 시각)만 저장하고, 필요할 때
+        htf_frame() 이 core.data_feed 캔들 저장소 (symbol, htf_tf) deque 를
+        htf_time 까지 잘라 진입 시점 DataFrame 을 만든다
+        (저장소 보관 길이를 넘긴 오래된 봉은 앞에서부터 빠짐)
+      ▸ trigger_zone 도 kind · high · low · time 만 보관
+    → 포지션당 메모리 = 스칼라 필드 몇 개 (거래 기간과 무관)
+  • PositionStore 초안은 copy() 로 얕은 복제 (dict 복제보다 빠름)
+  • to_dict() / from_dict() : JSON 호환 직렬화 (저널·덤프용)
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+_ZONE_KEYS = ("kind", "high", "low", "time")
+
+
+def compact_zone(zone: dict | None) -> dict | None:
+    """진입근거 존 → SL·보호선 산출에 쓰는 키만"""
+    if not zone:
+        return None
+    return {k: zone[k] for k in _ZONE_KEYS if k in zone}
+
+
+class Position:
+    __slots__ = (
+        "symbol",
+        "direction",
+        "entry",
+        "sl",
+        "tp",
+        "last_price",
+        "half_exit",
+        "protective_level",
+        "mss_triggered",
+        "mss_skip_until",
+        "sl_order_id",
+        "tp_order_id",
+        "initial_size",
+        "created",
+        "trigger_zone",
+        "htf_tf",
+        "htf_time",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        direction: str,
+        entry: float,
+        sl: float,
+        tp: float,
+        *,
+        last_price: float | None = None,
+        half_exit: bool = False,
+        protective_level: float | None = None,
+        mss_triggered: bool = False,
+        mss_skip_until: float = 0.0,
+        sl_order_id: int | None = None,
+        tp_order_id: int | None = None,
+        initial_size: float | None = None,
+        created: float = 0.0,
+        trigger_zone: dict | None = None,
+        htf_tf: str | None = None,
+        htf_time=None,
+    ):
+        self.symbol           = symbol
+        self.direction        = direction
+        self.entry            = entry
+        self.sl               = sl
+        self.tp               = tp
+        self.last_price       = entry if last_price is None else last_price
+        self.half_exit        = half_exit
+        self.protective_level = protective_level
+        self.mss_triggered    = mss_triggered
+        self.mss_skip_until   = mss_skip_until
+        self.sl_order_id      = sl_order_id
+        self.tp_order_id      = tp_order_id
+        self.initial_size     = initial_size
+        self.created          = created                 # 트레일링 SL grace-period 기준
+        self.trigger_zone     = compact_zone(trigger_zone)
+        self.htf_tf           = htf_tf                  # 보호선용 상위 TF (None → 미사용)
+        self.htf_time         = htf_time                # 진입 시점 마지막 HTF 봉 시각 (None → 현재 캔들)
+
+    def copy(self) -> "Position":
+        new = Position.__new__(Position)
+        for f in Position.__slots__:
+            setattr(new, f, getattr(self, f))
+        return new
+
+    # ────────────────────────────── 캔들 참조 ──────────────────────────────
+    def htf_frame(self, df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+        """
+        진입 시점까지의 HTF 캔들 (time ≤ htf_time · 없으면 None)
+          ▸ df : 같은 TF 의 현재 DataFrame 이 있으면 저장소 대신 잘라서 사용
+        """
+        if not self.htf_tf:
+            return None
+        if df is None:
+            from core.data_feed import candles
+            dq = candles.get(self.symbol, {}).get(self.htf_tf)
+            if not dq:
+                return None
+            df = pd.DataFrame(list(dq))
+        if self.htf_time is not None:
+            times = df["time"] if "time" in df.columns else df.index.to_series()
+            df = df[(times <= self.htf_time).to_numpy()]
+            if df.empty:
+                return None
+        df.attrs["symbol"] = self.symbol
+        df.attrs["tf"] = self.htf_tf
+        return df
+
+    # ────────────────────────────── 직렬화 ──────────────────────────────
+    def to_dict(self) -> dict:
+        d = {f: getattr(self, f) for f in Position.__slots__}
+        if self.htf_time is not None:
+            d["htf_time"] = str(self.htf_time)
+        if self.trigger_zone and "time" in self.trigger_zone:
+            d["trigger_zone"] = {**self.trigger_zone, "time": str(self.trigger_zone["time"])}
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Position":
+        """to_dict() 결과 (구버전 dict 의 _created · htf_df 키도 허용)"""
+        kw = {f: d[f] for f in cls.__slots__ if f in d}
+        if "created" not in kw and "_created" in d:
+            kw["created"] = d["_created"]
+        if kw.get("htf_time") is not None:
+            kw["htf_time"] = pd.Timestamp(kw["htf_time"])
+        return cls(
+            kw.pop("symbol", d.get("symbol", "")),
+            kw.pop("direction"),
+            kw.pop("entry"),
+            kw.pop("sl"),
+            kw.pop("tp"),
+            **kw,
+        )
+
+    def __repr__(self):
+        return (f"Position({self.symbol} {self.direction} entry={self.entry} "
+                f"sl={self.sl} tp={self.tp} half_exit={self.half_exit})")
@@ -0,0 +1,182 @@
+# core/position_store.py
+"""
+PositionManager 용 포지션 상태 저장소
+
+  • 읽기 : 락 없음
+      ▸ 전체 상태는 {symbol: Position} 불변 스냅샷(MappingProxyType) 1개 참조
+      ▸ 쓰기는 새 스냅샷을 만들어 참조만 교체(copy-on-write) → 읽는 쪽은 항상 일관된 상태
+      ▸ 게시된 Position 은 다시 수정하지 않음 (초안은 항상 copy() 본)
+  • 쓰기 : 심볼별 단일 작성자
+      ▸ with store.edit(symbol) as pos:  → 심볼 락(RLock) 보유 중 pos 는 **가변 초안(draft)** Position
+      ▸ 같은 스레드 안의 중첩 edit 는 같은 초안을 공유, 가장 바깥 블록 종료 시 1회 게시
+      ▸ 초안이 게시본과 같으면(필드 변경 없음) 게시하지 않음
+      ▸ 게시할 때마다 심볼 버전 +1 (version(symbol)) → 읽은 뒤 바뀌었는지 비교 가능
+      ▸ generation(symbol) : 포지션 생성·교체·삭제 때만 +1 (가격 틱·SL 변경으로는 불변)
+        → "조회 이후 같은 포지션인가" 판정용 (sync_from_exchange)
+      ▸ blocking=False : 다른 스레드가 같은 심볼을 갱신 중이면 None (가격 틱 건너뛰기용)
+  • dict 호환 읽기 API (in · [] · get · keys · items · len)
+      ▸ 편집 중인 스레드에게는 자기 초안을, 그 외에는 불변 스냅샷을 돌려준다
+      ▸ store[sym] = Position(...) / store.pop(sym) 은 edit 블록 안에서만 (밖이면 자체 edit 1회)
+  • on_publish(symbol, Position | None) : 게시 직후 호출 (심볼 락 보유 중 → 심볼별 순서 보장)
+      ▸ core.journal 기록용 · load() 로 복원한 상태는 호출하지 않음
+      ▸ volatile 필드(PositionManager : last_price)만 바뀐 게시는 스냅샷만 교체
+        → 버전 유지 · on_publish 없음 (매 틱 저널 기록 안 함 – 상태 전이만)
+"""
+
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from types import MappingProxyType
+
+_EMPTY = MappingProxyType({})
+
+
+class _Slot:
+    __slots__ = ("lock", "owner", "depth", "draft", "base", "replaced")
+
+    def __init__(self):
+        self.lock  = threading.RLock()
+        self.owner = None           # 편집 중인 스레드 ident
+        self.depth = 0
+        self.draft = None           # Position | None(삭제·미존재)
+        self.base  = None           # 편집 시작 시 게시본 (변경 판정용)
+        self.replaced = False       # 초안을 새 Position 으로 교체 (store[sym] = … · pop)
+
+
+class PositionStore(Mapping):
+    def __init__(self, on_publish=None, volatile: tuple[str, ...] = ()):
+        self._on_publish = on_publish
+        self._volatile = frozenset(volatile)
+        self._snap = _EMPTY                         # {symbol: Position}
+        self._versions: dict[str, int] = {}
+        self._generations: dict[str, int] = {}
+        self._slots: dict[str, _Slot] = {}
+        self._slots_lock = threading.Lock()
+        self._publish_lock = threading.Lock()       # 스냅샷 교체만 직렬화 (짧음)
+
+    # ────────────────────────────── 읽기 ──────────────────────────────
+    def snapshot(self) -> Mapping:
+        """현재 전체 상태 (불변 · 락 없음)"""
+        return self._snap
+
+    def version(self, symbol: str) -> int:
+        return self._versions.get(symbol, 0)
+
+    def generation(self, symbol: str) -> int:
+        return self._generations.get(symbol, 0)
+
+    def _own_slot(self, symbol: str):
+        slot = self._slots.get(symbol)
+        if slot is not None and slot.owner == threading.get_ident():
+            return slot
+        return None
+
+    def __getitem__(self, symbol):
+        slot = self._own_slot(symbol)
+        if slot is not None:
+            if slot.draft is None:
+                raise KeyError(symbol)
+            return slot.draft
+        return self._snap[symbol]
+
+    def __contains__(self, symbol):
+        slot = self._own_slot(symbol)
+        if slot is not None:
+            return slot.draft is not None
+        return symbol in self._snap
+
+    def __iter__(self):
+        return iter(list(self._snap))
+
+    def __len__(self):
+        return len(self._snap)
+
+    # ────────────────────────────── 쓰기 ──────────────────────────────
+    def _slot(self, symbol: str) -> _Slot:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            with self._slots_lock:
+                slot = self._slots.setdefault(symbol, _Slot())
+        return slot
+
+    @contextmanager
+    def edit(self, symbol: str, blocking: bool = True):
+        """심볼 작성자 권한 획득 → 초안 Position (포지션 없으면 None)"""
+        slot = self._slot(symbol)
+        if not slot.lock.acquire(blocking):
+            yield None
+            return
+        try:
+            if slot.depth == 0:
+                cur = slot.base = self._snap.get(symbol)
+                slot.draft = cur.copy() if cur is not None else None
+                slot.owner = threading.get_ident()
+            slot.depth += 1
+            try:
+                yield slot.draft
+            finally:
+                slot.depth -= 1
+                if slot.depth == 0:
+                    draft, base, replaced = slot.draft, slot.base, slot.replaced
+                    slot.draft = slot.base = slot.owner = None
+                    slot.replaced = False
+                    self._publish(symbol, draft, base, replaced)
+        finally:
+            slot.lock.release()
+
+    @staticmethod
+    def _changed(a, b) -> set | None:
+        """게시본 a → 초안 b 에서 바뀐 필드 (비교 불가 → None)"""
+        fields = getattr(type(a), "__slots__", None)
+        if fields is None or type(a) is not type(b):
+            return None
+        return {f for f in fields if getattr(a, f) != getattr(b, f)}
+
+    def _publish(self, symbol: str, draft, base, replaced: bool):
+        with self._publish_lock:
+            if draft is None and symbol not in self._snap:
+                return
+            changed = None
+            if not replaced and draft is not None and base is not None:
+                changed = self._changed(base, draft)
+                if changed is not None and not changed:
+                    return                              # 변경 없음 → 버전 유지
+            nxt = dict(self._snap)
+            if draft is None:
+                del nxt[symbol]
+            else:
+                nxt[symbol] = draft
+            self._snap = MappingProxyType(nxt)
+            if changed is not None and changed <= self._volatile:
+                return                                  # 가격만 갱신 → 상태 전이 아님
+            self._versions[symbol] = self._versions.get(symbol, 0) + 1
+            if replaced or draft is None or base is None:
+                self._generations[symbol] = self._generations.get(symbol, 0) + 1
+        if self._on_publish is not None:
+            self._on_publish(symbol, draft)
+
+    def load(self, records: dict) -> None:
+        """복원한 {symbol: 포지션} 으로 시작 상태 설정 (on_publish 없음)"""
+        with self._publish_lock:
+            nxt = dict(self._snap)
+            for symbol, pos in records.items():
+                nxt[symbol] = pos
+                self._versions[symbol] = self._versions.get(symbol, 0) + 1
+                self._generations[symbol] = self._generations.get(symbol, 0) + 1
+            self._snap = MappingProxyType(nxt)
+
+    def __setitem__(self, symbol: str, value):
+        with self.edit(symbol):
+            slot = self._slots[symbol]
+            slot.draft, slot.replaced = value, True
+
+    def pop(self, symbol: str, default=None):
+        if symbol not in self:
+            return default
+        with self.edit(symbol) as cur:
+            slot = self._slots[symbol]
+            slot.draft, slot.replaced = None, True
+        return cur
+
+    def __repr__(self):
+        return f"PositionStore({dict(self._snap)!r})"
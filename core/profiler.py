@@ -0,0 +1,167 @@
+# core/profiler.py
+"""
+런타임 토글 샘플링 프로파일러 (재시작·외부 도구 불필요)
+
+  • 켜는 법
+      ▸ kill -USR2 <pid>                      → PROFILE_SECONDS 초 샘플링
+      ▸ GET /profile?seconds=30&hz=100        → core.control_server 경로
+        (/profile/status : 진행 여부·마지막 결과 경로)
+  • 백그라운드 스레드가 hz 간격으로 sys._current_frames() 를 읽어
+    메인 이벤트 루프 + 워커 스레드(WS·브래킷·디스코드 등) 스택을 수집
+  • 결과 (PROFILE_DIR)
+      ▸ profile_<UTC>.collapsed : "스레드;모듈:함수;…;모듈:함수 샘플수"
+        → flamegraph.pl / speedscope / inferno 에 그대로 입력
+      ▸ profile_<UTC>.txt       : core.* 함수별 self / total 샘플 집계
+  • 샘플링 중에도 트레이딩 스레드는 멈추지 않음 (GIL 양보 주기만큼의 오버헤드)
+"""
+
+import os
+import sys
+import time
+import signal
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+PROFILE_DIR     = os.getenv("PROFILE_DIR", "logs/profile")
+PROFILE_SECONDS = float(os.getenv("PROFILE_SECONDS", "30"))
+PROFILE_HZ      = float(os.getenv("PROFILE_HZ", "100"))
+MAX_SECONDS     = 600
+
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+last_result: dict | None = None         # 마지막 완료 결과 (경로·샘플 수)
+
+
+def running() -> bool:
+    return _thread is not None and _thread.is_alive()
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    mod = frame.f_globals.get("__name__", "?")
+    return f"{mod}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _sample(stacks: Counter, self_cnt: Counter, total_cnt: Counter, me: int):
+    names = {t.ident: t.name for t in threading.enumerate()}
+    for tid, frame in sys._current_frames().items():
+        if tid == me:
+            continue
+        labels = []
+        while frame is not None:
+            labels.append(_label(frame))
+            frame = frame.f_back
+        if not labels:
+            continue
+        labels.reverse()
+        stacks[";".join([names.get(tid, f"thread-{tid}")] + labels)] += 1
+
+        leaf = labels[-1]
+        if leaf.startswith("core.") and not leaf.startswith(__name__):
+            self_cnt[leaf] += 1
+        for fn in set(labels):
+            if fn.startswith("core.") and not fn.startswith(__name__):
+                total_cnt[fn] += 1
+
+
+def _run(seconds: float, hz: float):
+    global _thread, last_result
+    me = threading.get_ident()
+    stacks: Counter = Counter()
+    self_cnt: Counter = Counter()
+    total_cnt: Counter = Counter()
+    interval = 1.0 / hz
+    n = 0
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            t0 = time.monotonic()
+            _sample(stacks, self_cnt, total_cnt, me)
+            n += 1
+            time.sleep(max(0.0, interval - (time.monotonic() - t0)))
+        last_result = _write(stacks, self_cnt, total_cnt, n, seconds, hz)
+        log.info("[PROFILE] 완료 (%d 샘플) → %s", n, last_result["collapsed"])
+    except Exception as e:
+        log.warning("[PROFILE] 샘플링 실패 → %s", e)
+    finally:
+        with _lock:
+            _thread = None
+
+
+def _write(stacks: Counter, self_cnt: Counter, total_cnt: Counter,
+           n: int, seconds: float, hz: float) -> dict:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    base = os.path.join(PROFILE_DIR, f"profile_{stamp}")
+
+    with open(base + ".collapsed", "w", encoding="utf-8") as fp:
+        for stack, cnt in stacks.most_common():
+            fp.write(f"{stack} {cnt}\n")
+
+    with open(base + ".txt", "w", encoding="utf-8") as fp:
+        fp.write(f"# {seconds:.0f}s @ {hz:.0f}Hz · {n} 틱 · core.* 함수별 샘플 (스레드 합산)\n")
+        fp.write(f"{'total':>8} {'total%':>7} {'self':>8} {'self%':>7}  function\n")
+        for fn, tot in total_cnt.most_common():
+            s = self_cnt.get(fn, 0)
+            fp.write(f"{tot:>8} {tot / n * 100:>6.1f}% {s:>8} {s / n * 100:>6.1f}%  {fn}\n")
+
+    return {
+        "collapsed": base + ".collapsed",
+        "summary":   base + ".txt",
+        "samples":   n,
+        "top_core":  total_cnt.most_common(10),
+    }
+
+
+def start(seconds: float = PROFILE_SECONDS, hz: float = PROFILE_HZ) -> bool:
+    """샘플링 시작 (이미 실행 중이면 False)"""
+    global _thread
+    seconds = min(max(float(seconds), 0.1), MAX_SECONDS)
+    hz = min(max(float(hz), 1.0), 1000.0)
+    with _lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=_run, args=(seconds, hz), name="profiler", daemon=True)
+        _thread.start()
+    log.info("[PROFILE] 샘플링 시작 – %.0fs @ %.0fHz", seconds, hz)
+    return True
+
+
+# ────────────────────────────── 트리거 ──────────────────────────────
+def _on_signal(signum, _frame):
+    # 핸들러는 메인 스레드 임의 지점에서 실행 → 락 재진입을 피해 별도 스레드에서 시작
+    threading.Thread(target=start, name="profiler-trigger", daemon=True).start()
+
+
+def install_signal() -> bool:
+    """SIGUSR2 → start() (Windows 등 미지원 플랫폼·메인 스레드 외 호출 시 False)"""
+    sig = getattr(signal, "SIGUSR2", None)
+    if sig is None:
+        return False
+    try:
+        signal.signal(sig, _on_signal)
+    except ValueError:
+        return False
+    return True
+
+
+def _route_start(query: dict):
+    if not start(query.get("seconds", PROFILE_SECONDS), query.get("hz", PROFILE_HZ)):
+        return 409, "application/json", '{"error": "already running"}'
+    return {"running": True, "dir": PROFILE_DIR}
+
+
+def _route_status(_query: dict):
+    return {"running": running(), "last": last_result}
+
+
+def register_routes() -> None:
+    """/profile (시작) · /profile/status (진행 여부·마지막 결과)"""
+    from core.control_server import register_route
+    register_route("/profile", _route_start)
+    register_route("/profile/status", _route_status)
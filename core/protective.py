@@ -2,17 +2,7 @@
 
 import pandas as pd
 from typing import Optional, Dict, List
-
-
-def _is_swing_low(series, idx: int, span: int) -> bool:
-    """idx 캔들이 좌우 span 개보다 모두 낮으면 True"""
-    low = series[idx]
-    return low == min(series[idx - span: idx + span + 1])
-
-
-def _is_swing_high(series, idx: int, span: int) -> bool:
-    high = series[idx]
-    return high == max(series[idx - span: idx + span + 1])
+from core.swings import latest_swing
 
 
 # span 기본값 3 → **2**  ⇒ 좌우 2개만 넘으면 스윙으로 인정 (완화)
@@ -23,22 +13,18 @@ def get_protective_level(df: pd.DataFrame,
     """
     최근 LTF 스윙 로우(롱) / 스윙 하이(숏) 를 보호선으로 반환
     • lookback 구간 안에서 가장 마지막 스윙 포인트를 사용
+    • core.swings 인덱스 조회 (봉마다 재스캔 없음)
     """
     if len(df) < span * 2 + 1:
         return None
 
-    df = df.reset_index(drop=True)
-    lows  = df['low'].tolist()
-    highs = df['high'].tolist()
-
-    rng = range(len(df) - span - 1, max(len(df) - lookback - span, span) - 1, -1)
-
-    for i in rng:
-        if direction == "long" and _is_swing_low(lows, i, span):
-            return {"protective_level": lows[i], "swing_time": df['time'][i]}
-        if direction == "short" and _is_swing_high(highs, i, span):
-            return {"protective_level": highs[i], "swing_time": df['time'][i]}
-    return None
+    swing = latest_swing(
+        df, "low" if direction == "long" else "high",
+        span=span, start=max(len(df) - lookback - span, span),
+    )
+    if swing is None:
+        return None
+    return {"protective_level": swing["level"], "swing_time": swing["time"]}
 
 
 def get_improved_protective_level(
@@ -229,50 +215,22 @@ def get_htf_swing_protective(
         return None
         
     try:
-        # 간단한 스윙 포인트 감지 (3봉 기준)
-        highs = df['high'].tolist()
-        lows = df['low'].tolist()
-        
-        swing_points = []
-        
-        for i in range(2, len(df) - 2):
-            # 스윙 고점
-            if highs[i] > highs[i-1] and highs[i] > highs[i+1] and highs[i] > highs[i-2] and highs[i] > highs[i+2]:
-                swing_points.append({
-                    'type': 'high',
-                    'level': highs[i],
-                    'index': i
-                })
-            
-            # 스윙 저점
-            if lows[i] < lows[i-1] and lows[i] < lows[i+1] and lows[i] < lows[i-2] and lows[i] < lows[i+2]:
-                swing_points.append({
-                    'type': 'low',
-                    'level': lows[i],
-                    'index': i
-                })
-        
-        if not swing_points:
-            return None
-            
-        # 최근 스윙 포인트 중 적절한 보호선 선택
+        # 좌우 2봉보다 엄격히 높은/낮은 스윙 (core.swings 인덱스)
         if direction == "long":
             # LONG: 최근 스윙 저점 중 진입가보다 낮은 것
-            swing_lows = [sp for sp in swing_points if sp['type'] == 'low' and sp['level'] < entry_price]
-            if swing_lows:
-                latest_swing_low = max(swing_lows, key=lambda x: x['index'])
+            swing = latest_swing(df, "low", span=2, strict=True, start=2, beyond=entry_price)
+            if swing:
                 return {
-                    'protective_level': latest_swing_low['level'],
-                    'reason': f"HTF 스윙 저점({latest_swing_low['level']:.5f})"
+                    'protective_level': swing['level'],
+                    'reason': f"HTF 스윙 저점({swing['level']:.5f})"
                 }
         else:  # short
             # SHORT: 최근 스윙 고점 중 진입가보다 높은 것
-            swing_highs = [sp for sp in swing_points if sp['type'] == 'high' and sp['level'] > entry_price]
-            if swing_highs:
-                latest_swing_high = max(swing_highs, key=lambda x: x['index'])
+            swing = latest_swing(df, "high", span=2, strict=True, start=2, beyond=entry_price)
+            if swing:
                 return {
-                    'protective_level': latest_swing_high['level'],
-                    'reason': f"HTF 스윙 고점({latest_swing_high['level']:.5f})"
+                    'protective_level': swing['level'],
+                    'reason': f"HTF 스윙 고점({swing['level']:.5f})"
                 }
                 
     except Exception as e:
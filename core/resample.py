@@ -0,0 +1,138 @@
+# core/resample.py
+"""
+멀티 타임프레임 리샘플러 (라이브·백테스트 공용)
+
+  • tf_to_ms()       : '15m' · '4h' · '1d' · '1w' → 밀리초
+  • bucket_start()   : 봉 시작 시각 → 상위 TF 버킷 시작 (거래소 경계 정렬)
+      ▸ m/h/d : UTC 기준  t - t % tf
+      ▸ w     : 월요일 00:00 UTC 기준 (Binance 주봉과 동일)
+  • resample_arrays() / resample_frame() : 과거 데이터 일괄 변환 (numpy reduceat)
+  • StreamResampler  : 확정된 하위 봉을 1개씩 넣어 상위 봉을 점진 생성
+  • 버킷은 **시각**으로 결정 → 봉 누락(공백)이 있어도 경계가 밀리지 않는다
+"""
+
+import numpy as np
+import pandas as pd
+
+_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+_WEEK_OFFSET_MS = 4 * 86_400_000          # 1970-01-01 은 목요일 → 월요일 정렬 보정
+
+
+def tf_to_ms(tf: str) -> int:
+    """'5m' · '4h' · '1d' · '1w' → 밀리초 (지원하지 않는 단위는 ValueError)"""
+    unit = tf[-1].lower()
+    if unit not in _UNIT_MS or not tf[:-1].isdigit():
+        raise ValueError(f"지원하지 않는 타임프레임: {tf}")
+    return int(tf[:-1]) * _UNIT_MS[unit]
+
+
+def _offset(tf_ms: int) -> int:
+    return _WEEK_OFFSET_MS if tf_ms % _UNIT_MS["w"] == 0 else 0
+
+
+def bucket_start(t_ms, tf_ms: int):
+    """봉 시작 시각(ms, 스칼라 또는 배열) → tf_ms 버킷 시작 시각"""
+    off = _offset(tf_ms)
+    return t_ms - (t_ms - off) % tf_ms
+
+
+# ────────────────────────────── 일괄 변환 ──────────────────────────────
+def resample_arrays(arrs: tuple, tf_ms: int, base_ms: int | None = None,
+                    drop_partial: bool = False) -> tuple:
+    """
+    (time_ms, o, h, l, c, v) → tf_ms 봉 배열 튜플 (입력은 시간순 정렬 가정)
+    drop_partial=True : 마지막 버킷이 아직 닫히지 않았으면 제외 (base_ms 필요)
+    """
+    t, o, h, l, c, v = arrs
+    if len(t) == 0:
+        return arrs
+    t = np.asarray(t, dtype=np.int64)
+    bucket = bucket_start(t, tf_ms)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(t)] - 1
+    out = (
+        bucket[starts],
+        np.asarray(o)[starts],
+        np.maximum.reduceat(h, starts),
+        np.minimum.reduceat(l, starts),
+        np.asarray(c)[ends],
+        np.add.reduceat(v, starts),
+    )
+    if drop_partial and base_ms and t[-1] + base_ms < out[0][-1] + tf_ms:
+        out = tuple(a[:-1] for a in out)
+    return out
+
+
+def resample_frame(df: pd.DataFrame, tf: str, base_tf: str | None = None,
+                   drop_partial: bool = False) -> pd.DataFrame:
+    """
+    time(datetime) · open · high · low · close · volume 컬럼 DataFrame → tf 봉
+    time 컬럼은 tz 없는 UTC 로 해석
+    """
+    if df.empty:
+        return df.copy()
+    t = pd.to_datetime(df["time"]).to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    vol = df["volume"].to_numpy(dtype=np.float64) if "volume" in df else np.zeros(len(df))
+    arrs = (t, *(df[c].to_numpy(dtype=np.float64) for c in ("open", "high", "low", "close")), vol)
+    rt, o, h, l, c, v = resample_arrays(
+        arrs, tf_to_ms(tf), tf_to_ms(base_tf) if base_tf else None, drop_partial
+    )
+    out = pd.DataFrame({
+        "time": pd.to_datetime(rt, unit="ms"),
+        "open": o, "high": h, "low": l, "close": c, "volume": v,
+    })
+    out.attrs.update(df.attrs)
+    out.attrs["tf"] = tf
+    return out
+
+
+# ────────────────────────────── 스트림 변환 ──────────────────────────────
+class StreamResampler:
+    """
+    확정된 base 봉 → 상위 tf 봉 (심볼·TF 쌍마다 1개)
+      ▸ 버킷의 마지막 base 봉이 들어오면 즉시 완성 봉 방출
+      ▸ 공백으로 마지막 봉이 빠지면 다음 버킷의 첫 봉에서 방출
+      ▸ 같은 버킷에 이미 지난 봉(중복·역순)은 무시
+    """
+    __slots__ = ("tf_ms", "base_ms", "bucket", "last_t", "o", "h", "l", "c", "v")
+
+    def __init__(self, base_ms: int, tf_ms: int):
+        if tf_ms % base_ms:
+            raise ValueError(f"상위 TF({tf_ms}ms) 가 base({base_ms}ms) 의 배수가 아님")
+        self.base_ms, self.tf_ms = base_ms, tf_ms
+        self.bucket = None
+        self.last_t = None
+
+    @classmethod
+    def from_tf(cls, base_tf: str, tf: str) -> "StreamResampler":
+        return cls(tf_to_ms(base_tf), tf_to_ms(tf))
+
+    def push(self, t_ms: int, o: float, h: float, l: float, c: float, v: float = 0.0) -> list:
+        """완성된 상위 봉 튜플 (time_ms, o, h, l, c, v) 을 0~2개 반환"""
+        if self.last_t is not None and t_ms <= self.last_t:
+            return []
+        self.last_t = t_ms
+        out = []
+        bucket = t_ms - (t_ms - _offset(self.tf_ms)) % self.tf_ms
+        if self.bucket is not None and bucket != self.bucket:
+            out.append((self.bucket, self.o, self.h, self.l, self.c, self.v))
+            self.bucket = None
+        if self.bucket is None:
+            self.bucket, self.o, self.h, self.l, self.c, self.v = bucket, o, h, l, c, v
+        else:
+            if h > self.h:
+                self.h = h
+            if l < self.l:
+                self.l = l
+            self.c = c
+            self.v += v
+        if t_ms + self.base_ms >= bucket + self.tf_ms:          # 버킷 마지막 봉
+            out.append((self.bucket, self.o, self.h, self.l, self.c, self.v))
+            self.bucket = None
+        return out
+
+    def partial(self) -> tuple | None:
+        """진행 중(미완성) 상위 봉 – 없으면 None"""
+        if self.bucket is None:
+            return None
+        return (self.bucket, self.o, self.h, self.l, self.c, self.v)
@@ -0,0 +1,287 @@
+# core/strategy.py
+"""
+진입 판단 (동기 · 순수 함수)
+
+  • build_entry_plan() : HTF/LTF DataFrame → 진입 계획 dict 또는 None
+      ▸ 주문·잔고·포지션 조회 등 **외부 I/O 없음**
+      ▸ 실거래(main.handle_pair)와 백테스트(backtest.engine)가 같은 로직을 공유
+  • 반환 dict
+      direction · entry · sl · tp · trg_zone · zone · basis · protective
+      · liquidity_sweep
+"""
+
+from decimal import Decimal
+
+import pandas as pd
+
+from config.settings import RR, SL_BUFFER, MIN_TP_DISTANCE_PCT, MIN_SL_DISTANCE_PCT
+from core.structure import detect_structure
+from core.iof import is_iof_entry, is_invalidated
+from core.ob import detect_ob
+from core.confirmation import confirm_ltf_reversal
+from core.liquidity import detect_equal_levels, get_nearest_liquidity_level, is_liquidity_sweep
+from core.log import get_logger
+from core.metrics import stage
+from core.ticks import TickGrid, grid
+
+log = get_logger(__name__)
+
+
+def build_entry_plan(
+    symbol: str,
+    htf: pd.DataFrame,
+    ltf: pd.DataFrame,
+    tick_size: TickGrid | Decimal,
+    htf_tf: str,
+) -> dict | None:
+    """
+    htf / ltf : attrs["symbol"], attrs["tf"] 가 주입된 캔들 DataFrame
+    tick_size : TickGrid 또는 Decimal tick (SL/TP 라운딩 기준)
+    """
+    g = grid(tick_size)
+    with stage("htf_structure", symbol):
+        htf_struct = detect_structure(htf)
+    if (
+        htf_struct is None
+        or "structure" not in htf_struct.columns
+        or htf_struct["structure"].dropna().empty
+    ):
+        return None
+
+    # ⬇️ htf 전체 DataFrame을 그대로 넘겨야 attrs 를 활용할 수 있음
+    with stage("iof", symbol):
+        signal, direction, trg_zone = is_iof_entry(htf, ltf, g)
+    if not signal or direction is None:
+        return None
+
+    # ───── LTF(1m·5m) 반전이 확인될 때까지 대기 ─────
+    with stage("confirm", symbol):
+        confirmed = confirm_ltf_reversal(ltf, direction)
+    if not confirmed:
+        log.info("[WAIT] %s – 아직 LTF 리젝션 미확인. 진입 보류", symbol)
+        return None
+
+    entry = float(ltf["close"].iloc[-1])
+    # Zone 기반 SL/TP 계산 (OB 사용)
+    zone = None
+    # ────────────────  ❗FVG 제외 ────────────────
+    # detect_ob() 가 리턴하는 dict 예시:
+    #   {"type": "long", "pattern": "ob", "high": …, "low": …}
+    #   {"type": "short","pattern": "fvg", …}
+    #
+    # pattern(=구조 종류)이 'fvg' 이면 건너뛰고,
+    # 그렇지 않은 블록(OB, BB 등)만 진입 근거로 사용한다.
+    # OB 리스트를 기관성 점수 기준으로 정렬
+    with stage("ob", symbol):
+        ltf_obs = detect_ob(ltf)
+    ltf_obs_sorted = sorted(ltf_obs, key=lambda x: x.get('institutional_score', 0), reverse=True)
+
+    for ob in ltf_obs_sorted:
+        # ① FVG 조건부 허용 (HTF 확인 시에만)
+        if ob.get("pattern") == "fvg":
+            # HTF에서 강한 구조 확인 시에만 FVG 허용
+            recent_structure = htf_struct['structure'].dropna().tail(3)
+
+            strong_structure_signals = ['BOS_up', 'BOS_down', 'CHoCH_up', 'CHoCH_down']
+            has_strong_htf_confirmation = any(s in recent_structure.values for s in strong_structure_signals)
+
+            if not has_strong_htf_confirmation:
+                log.debug("[FVG] %s FVG 스킵 - HTF 구조 확인 부족", symbol)
+                continue
+            else:
+                log.debug("[FVG] %s FVG 허용 - HTF 구조 확인됨", symbol)
+
+        # ② 이미 무효화된 OB/BB 면 스킵
+        if is_invalidated(symbol, "ob", htf_tf, ob["high"], ob["low"]):
+            continue
+
+        if ob["type"].lower() == direction:     # 방향 일치하는 블록
+            # 기관성 점수가 높은 OB 우선 선택
+            institutional_score = ob.get('institutional_score', 0)
+            if institutional_score >= 1:
+                log.info("[OB] %s 기관성 OB 선택 (점수: %s)", symbol, institutional_score)
+            zone = ob
+            break
+
+    # 이하 SL/TP 는 진입 신호 1건당 1회 → Decimal 그대로 (entry 가 tick 격자 밖일 수 있는 백테스트 포함)
+    tick_size = g.tick
+    entry_dec = Decimal(str(entry))
+
+    # ── 공통 버퍼 계산 ────────
+    # (1) **기본 버퍼** : 환경 상수 × tick
+    base_buf = tick_size * Decimal(str(SL_BUFFER))
+
+    # (2) **동적 버퍼** : HTF 트리거-존(또는 최근 OB) 폭의 10 %
+    zone_range = None
+    if trg_zone is not None:
+        hi = Decimal(str(trg_zone["high"]))
+        lo = Decimal(str(trg_zone["low"]))
+        zone_range = abs(hi - lo)
+    elif zone is not None:
+        hi = Decimal(str(zone["high"]))
+        lo = Decimal(str(zone["low"]))
+        zone_range = abs(hi - lo)
+
+    if zone_range is not None:
+        dyn_buf = (zone_range * Decimal("0.10")).quantize(tick_size)
+        buf_dec = max(base_buf, dyn_buf)      # ⬅️  둘 중 더 큰 값
+    else:
+        buf_dec = base_buf
+
+    # ── 1) '트리거 Zone' 이탈 기준 SL ──
+    if trg_zone is not None:
+        if direction == "long":
+            sl_dec = (Decimal(str(trg_zone["low"])) - buf_dec).quantize(tick_size)
+        else:
+            sl_dec = (Decimal(str(trg_zone["high"])) + buf_dec).quantize(tick_size)
+
+    # ── 2) fallback : 최근 OB extreme ──
+    elif zone is not None:
+        if direction == "long":
+            sl_dec = (Decimal(str(zone["low"])) - buf_dec).quantize(tick_size)
+        else:
+            sl_dec = (Decimal(str(zone["high"])) + buf_dec).quantize(tick_size)
+    # ── 2) fallback: 직전 캔들 extreme ──────────────────────────
+    else:
+        if direction == "long":
+            sl_dec = (Decimal(str(ltf["low"].iloc[-1])) - buf_dec).quantize(tick_size)
+        else:
+            sl_dec = (Decimal(str(ltf["high"].iloc[-1])) + buf_dec).quantize(tick_size)
+
+    # ── 3) SL 최소 거리 검증 ────────────────────────────────
+    risk_ratio = abs(entry_dec - sl_dec) / entry_dec
+    min_rr = Decimal(str(MIN_SL_DISTANCE_PCT)) # 설정값 사용
+
+    # 최소 거리 미달 시 확대
+    if risk_ratio < min_rr:
+        # 필요한 조정량을 Decimal 로 맞추면 바로 `.quantize()` 가능
+        adj = (min_rr * entry_dec - abs(entry_dec - sl_dec)).quantize(tick_size)
+        sl_dec = (sl_dec - adj) if direction == "long" else (sl_dec + adj)
+        sl_dec = sl_dec.quantize(tick_size)
+        log.info("[SL] %s SL 최소 거리 확대: %.2f%% → %.2f%%",
+                 symbol, float(risk_ratio * 100), float(min_rr * 100))
+
+    # ── 4) 유동성 레벨 기반 TP 설정 (우선순위: 유동성 > 반대 OB > RR) ─────────────────────
+    tp_dec = None
+    tp_method = "RR기반"
+    min_tp_distance = entry_dec * Decimal(str(MIN_TP_DISTANCE_PCT))
+
+    # 4-1) 유동성 레벨 기반 TP 설정
+    try:
+        with stage("liquidity", symbol):
+            htf_liquidity_levels = detect_equal_levels(htf)
+        nearest_liquidity = get_nearest_liquidity_level(htf_liquidity_levels, entry, direction)
+
+        if nearest_liquidity:
+            liquidity_tp = Decimal(str(nearest_liquidity['price'])).quantize(tick_size)
+
+            # 최소 TP 거리 검증 (진입가 대비 최소 1% 이상)
+            dist = liquidity_tp - entry_dec if direction == "long" else entry_dec - liquidity_tp
+            if dist >= min_tp_distance:
+                tp_dec = liquidity_tp
+                tp_method = "유동성레벨"
+                log.info("[TP] %s 유동성 레벨 기반 TP: %.5f (강도: %s)",
+                         symbol, float(tp_dec), nearest_liquidity['strength'])
+            else:
+                log.debug("[TP] %s 유동성 TP 너무 가까움 - 최소 거리 미달: %.5f", symbol, float(liquidity_tp))
+    except Exception as e:
+        log.warning("[TP] %s 유동성 분석 실패: %s", symbol, e)
+
+    # 4-2) fallback: HTF 반대 OB extreme에 TP 설정
+    if tp_dec is None:
+        htf_ob = detect_ob(htf)      # htf = HTF DataFrame, 위에서 이미 attrs 세팅됨
+        if direction == "long":
+            # 가장 가까운 위쪽 bearish OB의 low
+            candidates = [Decimal(str(z["low"])) for z in htf_ob if z["type"] == "bearish" and Decimal(str(z["low"])) > entry_dec]
+            ob_tp = min(candidates) if candidates else None
+            ok = ob_tp is not None and ob_tp - entry_dec >= min_tp_distance
+        else:
+            # 가장 가까운 아래 bullish OB의 high
+            candidates = [Decimal(str(z["high"])) for z in htf_ob if z["type"] == "bullish" and Decimal(str(z["high"])) < entry_dec]
+            ob_tp = max(candidates) if candidates else None
+            ok = ob_tp is not None and entry_dec - ob_tp >= min_tp_distance
+        if ok:
+            tp_dec = ob_tp
+            tp_method = "HTF반대OB"
+            log.info("[TP] %s HTF 반대 OB 기반 TP: %.5f", symbol, float(tp_dec))
+        elif ob_tp is not None:
+            log.debug("[TP] %s HTF OB TP 너무 가까움 - 최소 거리 미달: %.5f", symbol, float(ob_tp))
+
+    # 4-3) fallback: 기존 RR TP (최소 거리 보장)
+    if tp_dec is None:
+        rr_dec = Decimal(str(RR))
+        if direction == "long":
+            tp_dec = (entry_dec + (entry_dec - sl_dec) * rr_dec).quantize(tick_size)
+        else:
+            tp_dec = (entry_dec - (sl_dec - entry_dec) * rr_dec).quantize(tick_size)
+        log.info("[TP] %s RR 기반 TP: %.5f (RR: %s)", symbol, float(tp_dec), float(rr_dec))
+    else:
+        tp_dec = tp_dec.quantize(tick_size)
+
+    # ★ 거래소 주문용 SL (PositionManager.enter() 는 개선된 로직으로 재산출)
+    calculated_sl = float(sl_dec)
+    tp = float(tp_dec)
+
+    # ── 5) 유동성 사냥 후 진입 확인 ─────────────────────
+    liquidity_sweep_confirmed = False
+    try:
+        with stage("liquidity", symbol):
+            ltf_liquidity_levels = detect_equal_levels(ltf)
+        want_type = 'sell_side_liquidity' if direction == "long" else 'buy_side_liquidity'
+        sweep_dir = 'down' if direction == "long" else 'up'
+        for level in ltf_liquidity_levels:
+            beyond = level['price'] < entry if direction == "long" else level['price'] > entry
+            if level['type'] == want_type and beyond and is_liquidity_sweep(ltf, level['price'], sweep_dir):
+                liquidity_sweep_confirmed = True
+                log.info("[LIQUIDITY] %s %s 진입 - %s 사냥 감지 @ %.5f", symbol, direction.upper(),
+                         "SSL" if direction == "long" else "BSL", level['price'])
+                break
+
+        # 유동성 사냥이 없으면 진입 보류
+        if not liquidity_sweep_confirmed:
+            log.info("[LIQUIDITY] %s 유동성 사냥 미확인 - 진입 보류", symbol)
+            return None  # 유동성 사냥 확인 필수
+    except Exception as e:
+        # 오류 시 기존 로직 유지
+        log.warning("[LIQUIDITY] %s 유동성 사냥 확인 실패: %s", symbol, e)
+
+    log.debug("[DEBUG][SL-CALC] %s trg=%s zone=%s entry=%.4f calculated_sl=%.4f tp=%.4f liquidity_sweep=%s",
+              symbol, trg_zone, zone, entry, calculated_sl, tp, liquidity_sweep_confirmed)
+
+    # ───────── 상세 진입근거 구성 ─────────
+    entry_reason = []
+    # 1. 기본 진입 근거 / 2. SL 설정 근거
+    if trg_zone is not None:
+        basis = f"{trg_zone['kind'].upper()} {trg_zone['low']}~{trg_zone['high']}"
+        sl_reason = f"트리거존 {trg_zone['kind'].upper()} 하단 + 버퍼"
+    elif zone is not None:
+        basis = f"{zone.get('pattern','ZONE').upper()} {zone['low']}~{zone['high']}"
+        sl_reason = f"{zone.get('pattern','ZONE').upper()} 하단 + 버퍼"
+    else:
+        basis = "NO_BLOCK zone=None"
+        sl_reason = "직전 캔들 extreme + 버퍼"
+    entry_reason.append(f"진입근거: {basis}")
+    entry_reason.append(f"SL근거: {sl_reason}")
+    # 3. TP 설정 근거
+    entry_reason.append(f"TP근거: {tp_method} (거리: {abs(tp - entry):.3f})")
+    # 4. 구조 확인
+    recent_structure = htf_struct['structure'].dropna().tail(3)
+    if len(recent_structure) > 0:
+        entry_reason.append(f"HTF구조: {recent_structure.iloc[-1]}")
+    # 5. 유동성 사냥 확인
+    entry_reason.append("유동성사냥: 확인됨" if liquidity_sweep_confirmed else "유동성사냥: 미확인")
+
+    # MSS-only 진입이면 trg_zone 안에 보호선이 같이 들어옴
+    prot_lv = trg_zone.get("protective") if isinstance(trg_zone, dict) else None
+
+    return {
+        "direction":       direction,
+        "entry":           entry,
+        "sl":              calculated_sl,
+        "tp":              tp,
+        "trg_zone":        trg_zone,
+        "zone":            zone,
+        "basis":           " | ".join(entry_reason),
+        "protective":      prot_lv,
+        "liquidity_sweep": liquidity_sweep_confirmed,
+    }
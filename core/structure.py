@@ -3,8 +3,13 @@
 import pandas as pd
 from core.ob import detect_ob
 from notify.discord import send_discord_debug
+from core.log import get_logger
+from core.cache import BoundedCache
 
-last_sent_structure: dict[tuple[str, str], tuple[str, pd.Timestamp]] = {}
+log = get_logger(__name__)
+
+# (symbol, tf) → (구조 타입, 시각) – 마지막 알림 (LRU · 지난 심볼은 밀려남)
+last_sent_structure = BoundedCache("structure_last_sent", 2048)
 
 def detect_structure(df: pd.DataFrame, *, use_wick: bool = True) -> pd.DataFrame:
     df = df.copy()
@@ -27,7 +32,7 @@ def detect_structure(df: pd.DataFrame, *, use_wick: bool = True) -> pd.DataFrame
     last_type, last_time = last_sent_structure.get((symbol, tf), (None, None))
 
     if len(df) < 3:
-        print("[STRUCTURE] ❌ 캔들 수 부족 → 구조 분석 불가")
+        log.warning("[STRUCTURE] ❌ 캔들 수 부족 → 구조 분석 불가")
         send_discord_debug("[STRUCTURE] ❌ 캔들 수 부족 → 구조 분석 불가", "aggregated")
         df.loc[:, 'structure'] = None
         return df
@@ -37,25 +42,29 @@ def detect_structure(df: pd.DataFrame, *, use_wick: bool = True) -> pd.DataFrame
 
     structure_type = None
     structure_time = None
+    # 열을 numpy 배열로 한 번만 꺼내 비교 (행마다 .iloc·.loc 호출 없음) · 음수 i 는 iloc 처럼 뒤에서부터
+    h, l = df[hi].to_numpy(), df[lo].to_numpy()
+    labels = [None] * len(df)
     for i in range(structure_window_start, len(df)):
         try:
             stype = None
-            if df[hi].iloc[i] > df[hi].iloc[i - 1] and df[lo].iloc[i] > df[lo].iloc[i - 1]:
+            if h[i] > h[i - 1] and l[i] > l[i - 1]:
                 stype = 'BOS_up'
-            elif df[lo].iloc[i] < df[lo].iloc[i - 1] and df[hi].iloc[i] < df[hi].iloc[i - 1]:
+            elif l[i] < l[i - 1] and h[i] < h[i - 1]:
                 stype = 'BOS_down'
-            elif df[lo].iloc[i] > df[lo].iloc[i - 1] and df[hi].iloc[i - 2] > df[hi].iloc[i - 1]:
+            elif l[i] > l[i - 1] and h[i - 2] > h[i - 1]:
                 stype = 'CHoCH_up'
-            elif df[hi].iloc[i] < df[hi].iloc[i - 1] and df[lo].iloc[i - 2] < df[lo].iloc[i - 1]:
+            elif h[i] < h[i - 1] and l[i - 2] < l[i - 1]:
                 stype = 'CHoCH_down'
 
             if stype:
-                df.loc[df.index[i], 'structure'] = stype
+                labels[i] = stype
                 structure_type = stype
                 structure_time = df['time'].iloc[i]
         except Exception as e:
-            print(f"[STRUCTURE] 예외 발생 (index={i}): {e}")
+            log.warning("[STRUCTURE] 예외 발생 (index=%s): %s", i, e)
             continue
+    df['structure'] = pd.Series(labels, index=df.index, dtype=object)
 
     # 마지막 구조만 알림
     # ────────────────────────────── ★ OB Break 탐지 ──────────────────────────────
@@ -79,8 +88,7 @@ def detect_structure(df: pd.DataFrame, *, use_wick: bool = True) -> pd.DataFrame
 
     # ────────────────────────────────────────────────────────────────────────────
     if structure_type and ((structure_type, structure_time) != last_sent_structure.get((symbol, tf))):
-        log_msg = f"[STRUCTURE] {symbol} ({tf}) → {structure_type} 발생 | 시각: {structure_time}"
-        print(log_msg)
+        log.info("[STRUCTURE] %s (%s) → %s 발생 | 시각: %s", symbol, tf, structure_type, structure_time)
         #send_discord_debug(log_msg, "aggregated")
         last_sent_structure[(symbol, tf)] = (structure_type, structure_time)
 
@@ -0,0 +1,282 @@
+# core/swings.py
+"""
+스윙 포인트 인덱스 (증분 확정 · O(log n) 조회)
+
+  • (symbol, tf, span, strict) 별 상태 1개 – 호출 측 DataFrame(attrs symbol·tf) 기준
+      ▸ 확정 봉 = 마지막 봉을 뺀 전부 (마지막 봉은 진행 중일 수 있음)
+      ▸ 새로 확정된 봉만 반영 : 중심 c 의 좌우 span 봉이 모두 확정되면 스윙 여부 1회 판정
+      ▸ 마지막 봉에 걸린 후보(c = n-1-span)는 조회 때 직접 판정 (저장하지 않음)
+      ▸ 기준 봉을 찾지 못하거나 값이 다르면 전체 재구성
+  • 스윙 정의 (좌우 span 봉)
+      ▸ strict=False : 저점 = 창 최솟값 (동률 허용)     – protective.get_protective_level
+      ▸ strict=True  : 저점 < 좌우 모든 봉 (동률 불가)  – HTF 스윙 보호선 · 스윙 무효화
+  • 조회 latest_swing(df, "low"|"high", start=, beyond=)
+      ▸ 중심 행 ≥ start 인 스윙 중 가장 최근 것
+      ▸ beyond : 저점은 X 미만, 고점은 X 초과 조건 추가
+      ▸ 구간 경계 bisect + min 세그먼트 트리 우측 탐색 → O(log n)
+  • attrs 가 없는 DataFrame 은 start 이후 구간만 직접 스캔
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Optional
+
+import pandas as pd
+
+from config.settings import CANDLE_LIMIT
+from core.cache import BoundedCache
+
+MAX_CATCHUP = 256
+_INF = float("inf")
+
+
+class _MinTree:
+    """append 전용 min 세그먼트 트리 – [lo, hi] 에서 값 < x 인 가장 오른쪽 위치"""
+
+    __slots__ = ("size", "n", "t")
+
+    def __init__(self, values=()):
+        self._build(list(values))
+
+    def _build(self, vals: list):
+        size = 1
+        while size < max(len(vals), 16):
+            size *= 2
+        t = [_INF] * (2 * size)
+        t[size:size + len(vals)] = vals
+        for i in range(size - 1, 0, -1):
+            t[i] = min(t[2 * i], t[2 * i + 1])
+        self.size, self.n, self.t = size, len(vals), t
+
+    def values(self) -> list:
+        return self.t[self.size:self.size + self.n]
+
+    def append(self, v: float):
+        if self.n == self.size:
+            self._build(self.values() + [v])
+            return
+        t = self.t
+        i = self.size + self.n
+        t[i] = v
+        self.n += 1
+        i //= 2
+        while i:
+            t[i] = min(t[2 * i], t[2 * i + 1])
+            i //= 2
+
+    def rightmost_below(self, lo: int, hi: int, x: float) -> int:
+        t = self.t
+
+        def go(node, nl, nr):
+            if nr < lo or nl > hi or t[node] >= x:
+                return -1
+            if nl == nr:
+                return nl
+            mid = (nl + nr) // 2
+            r = go(2 * node + 1, mid + 1, nr)
+            return r if r >= 0 else go(2 * node, nl, mid)
+
+        return go(1, 0, self.size - 1) if lo <= hi else -1
+
+
+class _Swings:
+    """한 종류(저점·고점) 스윙 목록 – seq 오름차순"""
+
+    __slots__ = ("sign", "seqs", "times", "levels", "tree")
+
+    def __init__(self, sign: int):
+        self.sign = sign                 # 저점 +1 · 고점 -1 (트리에는 sign×level)
+        self.seqs: list[int] = []
+        self.times: list = []
+        self.levels: list[float] = []
+        self.tree = _MinTree()
+
+    def add(self, seq: int, time, level: float):
+        self.seqs.append(seq)
+        self.times.append(time)
+        self.levels.append(level)
+        self.tree.append(self.sign * level)
+
+    def trim(self, min_seq: int):
+        k = bisect_left(self.seqs, min_seq)
+        if k:
+            del self.seqs[:k], self.times[:k], self.levels[:k]
+            self.tree = _MinTree([self.sign * v for v in self.levels])
+
+    def latest(self, lo_seq: int, hi_seq: int, beyond: float | None) -> int:
+        lo = bisect_left(self.seqs, lo_seq)
+        hi = bisect_right(self.seqs, hi_seq) - 1
+        if lo > hi:
+            return -1
+        if beyond is None:
+            return hi
+        return self.tree.rightmost_below(lo, hi, self.sign * beyond)
+
+
+class _SwingState:
+    __slots__ = ("span", "strict", "lows", "highs", "last_seq", "last_time", "last_bar",
+                 "first_center", "seq_of", "order")
+
+    def __init__(self, span: int, strict: bool):
+        self.span = span
+        self.strict = strict
+        self.lows = _Swings(1)
+        self.highs = _Swings(-1)
+        self.last_seq = -1                       # 마지막 확정 봉 seq
+        self.last_time: int | None = None
+        self.last_bar: tuple | None = None
+        self.first_center = 0                    # 판정한 첫 중심 seq (이전 구간은 모름)
+        self.seq_of: dict[int, int] = {}         # time_ns → seq (최근 CANDLE_LIMIT 봉)
+        self.order: deque = deque()
+
+
+_STATES = BoundedCache("swing_states", 512)    # LRU – 유니버스에서 빠진 심볼 상태는 밀려남
+_LOCK = threading.Lock()
+
+
+def _is_low(lows: list, c: int, span: int, strict: bool) -> bool:
+    v = lows[c]
+    if strict:
+        return all(v < lows[k] for k in range(c - span, c + span + 1) if k != c)
+    return v == min(lows[c - span: c + span + 1])
+
+
+def _is_high(highs: list, c: int, span: int, strict: bool) -> bool:
+    v = highs[c]
+    if strict:
+        return all(v > highs[k] for k in range(c - span, c + span + 1) if k != c)
+    return v == max(highs[c - span: c + span + 1])
+
+
+def _ns(t) -> int:
+    return pd.Timestamp(t).value
+
+
+def _commit(st: _SwingState, df: pd.DataFrame, first: int, last: int, base: int):
+    """df 행 first..last 를 확정 봉으로 반영 (seq = base + 행)"""
+    span = st.span
+    lo = max(0, first - 2 * span)
+    highs = df["high"].to_numpy()[lo:last + 1].tolist()
+    lows = df["low"].to_numpy()[lo:last + 1].tolist()
+    times = df["time"].iloc[lo:last + 1].tolist()
+
+    for c in range(max(first - span, span, st.first_center - base), last - span + 1):
+        k = c - lo
+        if _is_low(lows, k, span, st.strict):
+            st.lows.add(base + c, times[k], lows[k])
+        if _is_high(highs, k, span, st.strict):
+            st.highs.add(base + c, times[k], highs[k])
+
+    for r in range(first, last + 1):
+        k = r - lo
+        t = _ns(times[k])
+        st.seq_of[t] = base + r
+        st.order.append(t)
+    while len(st.order) > CANDLE_LIMIT:
+        st.seq_of.pop(st.order.popleft(), None)
+
+    st.last_seq = base + last
+    st.last_time = _ns(times[last - lo])
+    st.last_bar = (highs[last - lo], lows[last - lo])
+
+    horizon = st.last_seq - CANDLE_LIMIT
+    if st.lows.seqs and st.lows.seqs[0] < horizon - CANDLE_LIMIT:
+        st.lows.trim(horizon)
+        st.highs.trim(horizon)
+        st.first_center = max(st.first_center, horizon)
+
+
+def _rebuild(key: tuple, df: pd.DataFrame, span: int, strict: bool) -> tuple[_SwingState, int]:
+    st = _STATES[key] = _SwingState(span, strict)
+    st.first_center = span
+    _commit(st, df, 0, len(df) - 2, 0)
+    return st, 0
+
+
+def _sync(key: tuple, df: pd.DataFrame, span: int, strict: bool, start: int) -> tuple[_SwingState, int]:
+    """(락 보유 중) 상태를 df 확정 봉까지 맞춤 → (상태, base) – df 행 r 의 seq = base + r"""
+    lc = len(df) - 2
+    st = _STATES.get(key)
+    if st is None:
+        return _rebuild(key, df, span, strict)
+
+    seq = st.seq_of.get(_ns(df["time"].iat[lc]))
+    if seq is not None:
+        base = seq - lc                              # 이미 반영된 구간 (같은 끝 봉 · 과거 뷰)
+    else:
+        n = len(df)
+        lo = max(0, n - MAX_CATCHUP)
+        times = df["time"].iloc[lo:lc + 1].tolist()
+        j = next((lo + i for i in range(len(times) - 1, -1, -1) if _ns(times[i]) == st.last_time), None)
+        if j is None or (float(df["high"].iat[j]), float(df["low"].iat[j])) != st.last_bar:
+            return _rebuild(key, df, span, strict)
+        base = st.last_seq - j
+        _commit(st, df, j + 1, lc, base)
+
+    if st.first_center > base + max(start, span):    # 요청 구간이 상태보다 과거 → 재구성
+        return _rebuild(key, df, span, strict)
+    return st, base
+
+
+def _scan(df: pd.DataFrame, kind: str, span: int, strict: bool, start: int,
+          beyond: float | None) -> Optional[dict]:
+    """상태 없이 뒤에서부터 스캔 (start 이후 구간만)"""
+    n = len(df)
+    lo = max(0, start - span)
+    vals = df["low" if kind == "low" else "high"].to_numpy()[lo:].tolist()
+    test = _is_low if kind == "low" else _is_high
+    for c in range(n - 1 - span, max(start, span) - 1, -1):
+        k = c - lo
+        v = vals[k]
+        if beyond is not None and not (v < beyond if kind == "low" else v > beyond):
+            continue
+        if test(vals, k, span, strict):
+            return {"level": v, "time": df["time"].iat[c], "index": c}
+    return None
+
+
+def latest_swing(
+    df: pd.DataFrame,
+    kind: str,
+    *,
+    span: int = 2,
+    strict: bool = False,
+    start: int = 0,
+    beyond: float | None = None,
+) -> Optional[dict]:
+    """
+    중심 행 ≥ start 인 가장 최근 스윙 (kind "low" | "high")
+      beyond : 저점은 beyond 미만, 고점은 beyond 초과만
+      반환 {"level", "time", "index"(df 행 위치)} · 없으면 None
+    """
+    n = len(df)
+    if start < 0:
+        start += n
+    if n < 2 * span + 1:
+        return None
+    symbol, tf = df.attrs.get("symbol"), df.attrs.get("tf")
+    if not (symbol and tf and "time" in df.columns):
+        return _scan(df, kind, span, strict, start, beyond)
+
+    # 마지막 봉에 걸린 후보 – 진행 중 봉이 바뀔 수 있으므로 매번 직접 판정
+    c = n - 1 - span
+    if c >= max(start, span):
+        hit = _scan(df, kind, span, strict, c, beyond)
+        if hit is not None:
+            return hit
+
+    with _LOCK:
+        st, base = _sync((symbol, tf, span, strict), df, span, strict, start)
+        sw = st.lows if kind == "low" else st.highs
+        k = sw.latest(base + max(start, span), base + n - 2 - span, beyond)
+        if k < 0:
+            return None
+        return {"level": sw.levels[k], "time": sw.times[k], "index": sw.seqs[k] - base}
+
+
+def reset(symbol: str | None = None) -> None:
+    """상태 폐기 (심볼 지정 시 그 심볼만)"""
+    with _LOCK:
+        for key in [k for k in _STATES if symbol is None or k[0] == symbol]:
+            del _STATES[key]
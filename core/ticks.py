@@ -0,0 +1,114 @@
+# core/ticks.py
+"""
+가격 고정소수점 격자 (tick 단위 정수 연산)
+
+  • TickGrid(tick) : tick 의 소수 자릿수 d 로 가격 ↔ 정수 units(= 가격 × 10^d) 변환
+      ▸ 격자 = 기존 Decimal(str(x)).quantize(tick) 과 동일 (tick 의 지수 기준 · 10 tick 이면 d = -1)
+        → 0.01·0.1·1 같은 10 거듭제곱 tick 이면 units 1 = 1 tick
+      ▸ step = tick 1개의 units (0.5 tick → 5)
+      ▸ units() 는 float 곱셈 + 반올림, 경계(정확히 .5 · 정수 근처)만 Decimal 로 확인
+        → quantize 와 같은 결과를 Decimal 생성 없이
+  • 존 판정·버퍼·SL/TP 라운딩은 units 정수로 비교·가감
+    Decimal 은 주문 경계(decimal()) 에서만
+  • grid(tick)          : tick 값별 TickGrid 캐시 (TickGrid 를 넘기면 그대로)
+  • for_symbol(symbol)  : 심볼별 1회 조회 (exchange.router.get_tick_size) 후 캐시
+  • tick_size(symbol)   : float tick (모르면 0.0)
+"""
+
+import math
+import threading
+from decimal import Decimal, ROUND_HALF_EVEN, ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING
+from functools import lru_cache
+from typing import Callable, Optional
+
+
+class TickGrid:
+    __slots__ = ("tick", "size", "places", "scale", "div", "step")
+
+    def __init__(self, tick):
+        t = Decimal(str(tick)).normalize()
+        if t <= 0:
+            raise ValueError(f"tick must be positive: {tick!r}")
+        self.tick = t
+        self.size = float(t)
+        self.places = -t.as_tuple().exponent
+        # units = 가격 × scale ÷ div  (정수끼리만 곱·나눔 → 역변환도 정확히 반올림)
+        self.scale = 10 ** max(self.places, 0)
+        self.div = 10 ** max(-self.places, 0)
+        self.step = int(t.scaleb(self.places))
+
+    # ────────────────────────────── 변환 ──────────────────────────────
+    def units(self, price: float, rounding: str = ROUND_HALF_EVEN) -> int:
+        """가격 → units (Decimal(str(price)).quantize(tick, rounding) 과 동일)"""
+        v = price * self.scale if self.div == 1 else price / self.div
+        eps = abs(v) * 1e-12 + 1e-9
+        if rounding == ROUND_HALF_EVEN:
+            n = round(v)
+            if abs(abs(v - n) - 0.5) > eps:
+                return int(n)
+        else:
+            n = round(v)
+            if abs(v - n) > eps:
+                if rounding == ROUND_DOWN:
+                    return math.trunc(v)
+                if rounding == ROUND_UP:
+                    return math.floor(v) if v < 0 else math.ceil(v)
+                if rounding == ROUND_FLOOR:
+                    return math.floor(v)
+                if rounding == ROUND_CEILING:
+                    return math.ceil(v)
+        # 경계값 → 10진 표현 기준으로 정확히
+        return int(Decimal(str(price)).scaleb(self.places).quantize(Decimal(1), rounding))
+
+    def price(self, units: int) -> float:
+        return units / self.scale if self.div == 1 else float(units * self.div)
+
+    def decimal(self, units: int) -> Decimal:
+        """주문 전송용"""
+        return Decimal(units).scaleb(-self.places)
+
+    def round(self, price: float, rounding: str = ROUND_HALF_EVEN) -> float:
+        return self.price(self.units(price, rounding))
+
+    def __repr__(self):
+        return f"TickGrid({self.tick})"
+
+
+@lru_cache(maxsize=256)
+def _grid(tick) -> TickGrid:
+    return TickGrid(tick)
+
+
+def grid(tick) -> TickGrid:
+    """tick(float · str · Decimal · TickGrid) → TickGrid"""
+    if isinstance(tick, TickGrid):
+        return tick
+    return _grid(tick)
+
+
+_BY_SYMBOL: dict[str, TickGrid] = {}
+_LOCK = threading.Lock()
+
+
+def for_symbol(symbol: str, fetch: Optional[Callable[[str], float]] = None) -> TickGrid | None:
+    """심볼 tick 격자 (첫 호출 때만 조회 · 조회 실패(0) 는 캐시하지 않음)"""
+    g = _BY_SYMBOL.get(symbol)
+    if g is not None:
+        return g
+    if fetch is None:
+        from exchange.router import get_tick_size as fetch
+    try:
+        tick = fetch(symbol)
+    except Exception:
+        return None
+    if not tick or float(tick) <= 0:
+        return None
+    g = grid(tick)
+    with _LOCK:
+        _BY_SYMBOL[symbol] = g
+    return g
+
+
+def tick_size(symbol: str) -> float:
+    g = for_symbol(symbol)
+    return g.size if g is not None else 0.0
@@ -3,6 +3,8 @@
 import pandas as pd
 from typing import Tuple, Optional, Dict
 from config.settings import HTF_PREMIUM_DISCOUNT_WINDOW
+from core import indicators
+from core.swings import latest_swing
 
 def refined_premium_discount_filter(htf_df: pd.DataFrame, ltf_df: pd.DataFrame, direction: str, window: Optional[int] = None) -> Tuple[bool, str, float, float, float]:
     if htf_df.empty or ltf_df.empty or 'close' not in ltf_df.columns:
@@ -144,55 +146,24 @@ def get_swing_invalidation(df: pd.DataFrame, direction: str, entry_price: float)
         return None
         
     try:
-        # 간단한 스윙 포인트 감지 (3봉 기준)
-        highs = df['high'].tolist()
-        lows = df['low'].tolist()
-        times = df['time'].tolist()
-        
-        swing_points = []
-        
-        for i in range(2, len(df) - 2):
-            # 스윙 고점
-            if highs[i] > highs[i-1] and highs[i] > highs[i+1] and highs[i] > highs[i-2] and highs[i] > highs[i+2]:
-                swing_points.append({
-                    'type': 'high',
-                    'level': highs[i],
-                    'time': times[i],
-                    'index': i
-                })
-            
-            # 스윙 저점
-            if lows[i] < lows[i-1] and lows[i] < lows[i+1] and lows[i] < lows[i-2] and lows[i] < lows[i+2]:
-                swing_points.append({
-                    'type': 'low',
-                    'level': lows[i],
-                    'time': times[i],
-                    'index': i
-                })
-        
-        if not swing_points:
-            return None
-            
-        # 최근 스윙 포인트 중 적절한 무효화 지점 선택
+        # 좌우 2봉보다 엄격히 높은/낮은 스윙 (core.swings 인덱스)
         if direction == "long":
             # LONG: 최근 스윙 저점 중 진입가보다 낮은 것
-            swing_lows = [sp for sp in swing_points if sp['type'] == 'low' and sp['level'] < entry_price]
-            if swing_lows:
-                latest_swing_low = max(swing_lows, key=lambda x: x['index'])
+            swing = latest_swing(df, "low", span=2, strict=True, start=2, beyond=entry_price)
+            if swing:
                 return {
-                    'invalidation_level': latest_swing_low['level'],
-                    'reason': f"HTF 스윙 저점({latest_swing_low['level']:.5f}) 이탈",
-                    'time': latest_swing_low['time']
+                    'invalidation_level': swing['level'],
+                    'reason': f"HTF 스윙 저점({swing['level']:.5f}) 이탈",
+                    'time': swing['time']
                 }
         else:  # short
             # SHORT: 최근 스윙 고점 중 진입가보다 높은 것
-            swing_highs = [sp for sp in swing_points if sp['type'] == 'high' and sp['level'] > entry_price]
-            if swing_highs:
-                latest_swing_high = max(swing_highs, key=lambda x: x['index'])
+            swing = latest_swing(df, "high", span=2, strict=True, start=2, beyond=entry_price)
+            if swing:
                 return {
-                    'invalidation_level': latest_swing_high['level'],
-                    'reason': f"HTF 스윙 고점({latest_swing_high['level']:.5f}) 이탈",
-                    'time': latest_swing_high['time']
+                    'invalidation_level': swing['level'],
+                    'reason': f"HTF 스윙 고점({swing['level']:.5f}) 이탈",
+                    'time': swing['time']
                 }
                 
     except Exception as e:
@@ -207,19 +178,10 @@ def get_atr_based_invalidation(df: pd.DataFrame, direction: str, entry_price: fl
         return None
         
     try:
-        # ATR 계산
-        df_calc = df.copy()
-        df_calc['prev_close'] = df_calc['close'].shift(1)
-        
-        tr = pd.concat([
-            df_calc['high'] - df_calc['low'],
-            (df_calc['high'] - df_calc['prev_close']).abs(),
-            (df_calc['low'] - df_calc['prev_close']).abs(),
-        ], axis=1).max(axis=1)
-        
-        atr = tr.rolling(window=14).mean().iloc[-1]
-        
-        if pd.isna(atr):
+        # ATR 14 (core.indicators)
+        atr = indicators.atr(df, 14)
+
+        if atr is None:
             return None
             
         # ATR 기반 무효화 지점 (2 ATR 거리)
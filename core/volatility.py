@@ -2,6 +2,7 @@
 import pandas as pd
 from typing import Optional
 from config.settings import ATR_PERIOD  # 예: 14
+from core import indicators
 
 def atr_pct(df: pd.DataFrame) -> Optional[float]:
     """
@@ -14,20 +15,9 @@ def atr_pct(df: pd.DataFrame) -> Optional[float]:
     if df is None or len(df) < ATR_PERIOD + 2:
         return None
 
-    # DataFrame 복사본 생성하여 SettingWithCopyWarning 방지
-    df = df.copy()
-
-    # ───────── True Range 계산 ─────────
-    tr = pd.concat(
-        [
-            df["high"] - df["low"],
-            (df["high"] - df["close"].shift()).abs(),
-            (df["low"]  - df["close"].shift()).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
-
-    # Wilder-style EMA(α = 1 / n)  → TA-Lib ATR 과 동일
-    atr = tr.ewm(alpha=1 / ATR_PERIOD, min_periods=ATR_PERIOD).mean().iloc[-1]
+    # Wilder ATR (α = 1 / n, 첫 n봉 SMA 시작 → TA-Lib ATR 과 동일)
+    atr = indicators.atr(df, ATR_PERIOD, method="wilder")
+    if atr is None:
+        return None
 
     return float(atr / df["close"].iloc[-1] * 100)
@@ -0,0 +1,116 @@
+# core/ws_record.py
+"""
+WS 원시 프레임 레코더 (선택 기능)
+
+  • WS_RECORD_DIR 지정 시에만 동작 – 미지정이면 record() 는 즉시 반환
+  • 파일 : <WS_RECORD_DIR>/ws_<UTC 시작시각>_<pid>.jsonl.gz  (실행마다 새 파일, append-only)
+      ▸ 한 줄 = {"t": 수신 epoch 초, "src": "binance" | "gate", "raw": 원문 텍스트}
+      ▸ src = "hist" : REST 과거 캔들 스냅샷 (리플레이 워밍업용)
+  • 수신 루프는 큐 적재만, 압축·쓰기는 백그라운드 스레드
+      ▸ WS_RECORD_FLUSH_SEC 마다 gzip sync-flush → 비정상 종료 시에도 대부분 복구 가능
+  • iter_frames() : 기록 파일 읽기 (잘린 꼬리는 조용히 종료) → backtest.replay 에서 사용
+"""
+
+import os
+import gzip
+import json
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime, timezone
+
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+WS_RECORD_DIR       = os.getenv("WS_RECORD_DIR", "")
+WS_RECORD_FLUSH_SEC = float(os.getenv("WS_RECORD_FLUSH_SEC", "5"))
+
+_q: queue.SimpleQueue = queue.SimpleQueue()
+_STOP = object()
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+path: str | None = None                 # 현재 기록 중인 파일
+
+
+def enabled() -> bool:
+    return bool(WS_RECORD_DIR)
+
+
+def record(src: str, raw) -> None:
+    """수신 직후 호출 – 원문 텍스트와 수신 시각을 큐에 적재"""
+    if not WS_RECORD_DIR or not isinstance(raw, str):
+        return
+    if _thread is None:
+        _start()
+    _q.put((time.time(), src, raw))
+
+
+def record_history(symbol: str, tf: str, rows: list[dict]) -> None:
+    """REST 로 받은 과거 캔들을 'hist' 프레임 1개로 기록"""
+    if not WS_RECORD_DIR:
+        return
+    bars = [
+        [int(r["time"].timestamp() * 1000), r["open"], r["high"], r["low"], r["close"], r["volume"]]
+        for r in rows
+    ]
+    record("hist", json.dumps({"symbol": symbol, "tf": tf, "bars": bars}))
+
+
+def _start():
+    global _thread, path
+    with _lock:
+        if _thread is not None:
+            return
+        os.makedirs(WS_RECORD_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(WS_RECORD_DIR, f"ws_{stamp}_{os.getpid()}.jsonl.gz")
+        _thread = threading.Thread(target=_writer, args=(path,), name="ws-record", daemon=True)
+        _thread.start()
+        atexit.register(close)
+        log.info("[WS-REC] 기록 시작 → %s", path)
+
+
+def _writer(file_path: str):
+    with gzip.open(file_path, "at", encoding="utf-8") as fp:
+        next_flush = time.monotonic() + WS_RECORD_FLUSH_SEC
+        while True:
+            try:
+                item = _q.get(timeout=WS_RECORD_FLUSH_SEC)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                t, src, raw = item
+                fp.write(json.dumps({"t": t, "src": src, "raw": raw}, ensure_ascii=False))
+                fp.write("\n")
+            if time.monotonic() >= next_flush:
+                fp.flush()
+                next_flush = time.monotonic() + WS_RECORD_FLUSH_SEC
+
+
+def close(timeout: float = 5.0) -> None:
+    """남은 프레임 기록 후 파일 닫기 (atexit 등록)"""
+    global _thread
+    th = _thread
+    if th is None:
+        return
+    _q.put(_STOP)
+    th.join(timeout)
+    _thread = None
+
+
+def iter_frames(file_path: str):
+    """기록 파일 → (수신 epoch 초, src, 원문) 순회"""
+    with gzip.open(file_path, "rt", encoding="utf-8") as fp:
+        try:
+            for line in fp:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    break                       # 비정상 종료로 잘린 마지막 줄
+                yield rec["t"], rec["src"], rec["raw"]
+        except (EOFError, gzip.BadGzipFile):
+            return
@@ -0,0 +1,53 @@
+# core/zones.py
+"""
+HTF OB/BB 존 구간 인덱스 (is_iof_entry 존 포함 판정용)
+
+  • ZoneSet(zones, grid, lookback) : 최근 lookback 개 존 → NumPy 구간 배열
+      ▸ low · high : tick 격자 units (int64), low 오름차순 정렬
+      ▸ rank       : 최신 존 0, 그 이전 1, … (원래 reversed() 순서)
+      ▸ HTF 존 목록이 다시 계산될 때만 생성 → 틱마다 변환 없음
+  • hit(price, buffer) : low - buffer ≤ price ≤ high + buffer 인 존 중 **가장 최신** 1개
+      ▸ searchsorted 로 low ≤ price + buffer 인 접두부만 → high ≥ price - buffer 마스크 → rank 최소
+      ▸ 기존 reversed() 순회 + 첫 일치 break 와 같은 선택
+  • containing(price, buffer) : 일치하는 존 전부 (최신순)
+"""
+
+import numpy as np
+
+from core.ticks import TickGrid
+
+
+class ZoneSet:
+    __slots__ = ("zones", "low", "high", "rank")
+
+    def __init__(self, zones: list[dict], grid: TickGrid, lookback: int | None = None):
+        recent = zones[-lookback:] if lookback else zones
+        self.zones = list(reversed(recent))                     # rank 순 (최신 먼저)
+        low = np.fromiter((grid.units(z["low"]) for z in self.zones), np.int64, len(self.zones))
+        high = np.fromiter((grid.units(z["high"]) for z in self.zones), np.int64, len(self.zones))
+        order = np.argsort(low, kind="stable")
+        self.low = low[order]
+        self.high = high[order]
+        self.rank = order                                      # 정렬 위치 → rank
+
+    def __len__(self):
+        return len(self.zones)
+
+    def _mask(self, price: int, buffer: int):
+        k = int(np.searchsorted(self.low, price + buffer, side="right"))
+        if not k:
+            return k, None
+        return k, self.high[:k] >= price - buffer
+
+    def hit(self, price: int, buffer: int) -> dict | None:
+        """price ± buffer 가 걸치는 가장 최신 존 (units 기준 · 없으면 None)"""
+        k, m = self._mask(price, buffer)
+        if m is None or not m.any():
+            return None
+        return self.zones[int(self.rank[:k][m].min())]
+
+    def containing(self, price: int, buffer: int) -> list[dict]:
+        k, m = self._mask(price, buffer)
+        if m is None:
+            return []
+        return [self.zones[r] for r in np.sort(self.rank[:k][m])]
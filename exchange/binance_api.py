@@ -3,6 +3,7 @@
 import time
 import os
 import math
+import threading
 from decimal import Decimal, ROUND_DOWN, ROUND_UP
 from config.settings import TRADE_RISK_PCT
 from typing import Optional
@@ -14,13 +15,45 @@ from binance.enums import (
     ORDER_TYPE_MARKET, ORDER_TYPE_LIMIT, TIME_IN_FORCE_GTC
 )
 from binance.exceptions import BinanceAPIException
+from exchange.order_pipeline import submit_legs, record_protect_latency
+from core.metrics import TimedApi
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 load_dotenv()
 
 api_key = os.getenv("BINANCE_API_KEY")
 api_secret = os.getenv("BINANCE_API_SECRET")
-client = Client(api_key, api_secret, tld='com')
-client.API_URL = "https://fapi.binance.com/fapi"
+
+
+class _LazyClient:
+    """Client() 는 생성 시 ping REST 를 보냄 → 첫 속성 접근 때 1회 생성"""
+    __slots__ = ("_c", "_lock")
+
+    def __init__(self):
+        object.__setattr__(self, "_c", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self):
+        c = self._c
+        if c is None:
+            with self._lock:
+                c = self._c
+                if c is None:
+                    c = Client(api_key, api_secret, tld='com')
+                    c.API_URL = "https://fapi.binance.com/fapi"
+                    object.__setattr__(self, "_c", c)
+        return c
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+
+client = TimedApi(_LazyClient(), "binance")   # REST 호출 수·지연 → /metrics
 ORDER_TYPE_STOP_MARKET = 'STOP_MARKET'
 ORDER_TYPE_LIMIT       = 'LIMIT'   # ← 이미 import 됐지만 가독성용
 
@@ -46,7 +79,7 @@ def get_mark_price(symbol: str) -> float:
         resp = client.futures_mark_price(symbol=b_sym)
         return float(resp.get("markPrice", resp.get("price", 0)))
     except Exception as e:
-        print(f"[ERROR] mark price fetch failed: {symbol} → {e}")
+        log.error("[ERROR] mark price fetch failed: %s → %s", symbol, e)
         send_discord_debug(f"[BINANCE] mark price fetch failed: {symbol} → {e}", "binance")
         # 폴백: ticker 마지막 가격
         try:
@@ -74,13 +107,13 @@ def set_leverage(symbol: str, leverage: int) -> None:
     except Exception as e:
         if "No need to change margin type" not in str(e):
             msg = f"[ERROR] {symbol} 마진 타입 설정 실패 → {e}"
-            print(msg)
+            log.error("%s", msg)
             send_discord_debug(msg, "binance")
             
     try:
         client.futures_change_leverage(symbol=symbol.upper(), leverage=leverage)
     except Exception as e:
-        print(f"[WARN] 레버리지 설정 실패: {symbol} → {e}")
+        log.warning("[WARN] 레버리지 설정 실패: %s → %s", symbol, e)
         send_discord_debug(f"[BINANCE] 레버리지 설정 실패: {symbol} → {e}", "binance")
 
 def get_max_leverage(symbol: str) -> int:
@@ -93,7 +126,7 @@ def get_max_leverage(symbol: str) -> int:
                 return int(lev)
             
     except Exception as e:
-        print(f"[ERROR] 최대 레버리지 조회 실패 ({symbol}): {e}")
+        log.error("[ERROR] 최대 레버리지 조회 실패 (%s): %s", symbol, e)
         send_discord_debug(f"[BINANCE] 최대 레버리지 조회 실패: {symbol} → {e}", "binance")
     return 20  # 기본값
 
@@ -112,15 +145,80 @@ def place_order(symbol: str, side: str, quantity: float):
 
         order = client.futures_create_order(**kwargs)
         msg = f"[ORDER] {symbol} {side.upper()} x{quantity} | 포지션: {side}"
-        print(msg)
+        log.info("%s", msg)
         send_discord_message(msg, "binance")
         return order
     
     except Exception as e:
-        print(f"[ERROR] 주문 실패: {symbol} - {e}")
+        log.error("[ERROR] 주문 실패: %s - %s", symbol, e)
         send_discord_debug(f"[BINANCE] 주문 실패: {symbol} → {e}", "binance")
         return False
     
+def _batch_params(kwargs: dict) -> dict:
+    """batchOrders 용 파라미터 직렬화 (모든 값은 문자열, bool → 'true'/'false')"""
+    return {
+        k: ("true" if v else "false") if isinstance(v, bool) else str(v)
+        for k, v in kwargs.items()
+    }
+
+def _client_id(leg: str) -> str:
+    """레그별 newClientOrderId – 재전송 시 거래소가 중복으로 거절하는 멱등 키 (36자 이하)"""
+    return f"{leg}-{int(time.time() * 1000)}-{os.urandom(3).hex()}"
+
+def _find_legs(symbol: str, legs: dict) -> dict:
+    """
+    결과를 모르는 batch 뒤 : 미체결 주문에서 clientOrderId 로 이미 생성된 레그를 찾는다.
+    반환 : {레그 이름: 주문} (조회 실패 시 빈 dict → 전 레그 재전송, 중복은 거래소가 거절)
+    """
+    try:
+        by_cid = {o.get("clientOrderId"): o for o in client.futures_get_open_orders(symbol=symbol)}
+    except Exception as e:
+        log.warning("[BRACKET] %s 미체결 조회 실패 → 전 레그 재전송: %s", symbol, e)
+        return {}
+    return {
+        name: by_cid[kw["newClientOrderId"]]
+        for name, kw in legs.items()
+        if kw["newClientOrderId"] in by_cid
+    }
+
+def _submit_bracket(symbol: str, tp_kwargs: dict, sl_kwargs: dict) -> tuple:
+    """
+    TP·SL 두 레그를 한 번에 발행한다.
+      ① /fapi/v1/batchOrders 로 단일 요청 (레그마다 newClientOrderId 부여)
+      ② BinanceAPIException = 거래소가 batch 를 거절 → 생성된 레그 없음 → 두 레그 병렬 단건 발행
+      ③ 그 외 예외(타임아웃·연결 끊김) = 결과 불명 → 미체결 주문에서 clientOrderId 로 확인 후
+         빠진 레그만 재전송
+    반환 : (tp 결과 | Exception, sl 결과 | Exception)
+    """
+    tp_kwargs.setdefault("newClientOrderId", _client_id("tp"))
+    sl_kwargs.setdefault("newClientOrderId", _client_id("sl"))
+    legs = {"tp": tp_kwargs, "sl": sl_kwargs}
+    try:
+        res = client.futures_place_batch_order(
+            batchOrders=[_batch_params(tp_kwargs), _batch_params(sl_kwargs)]
+        )
+        out = []
+        for r in res:
+            if isinstance(r, dict) and "orderId" in r:
+                out.append(r)
+            else:       # 레그별 오류 {"code": …, "msg": …}
+                out.append(RuntimeError(f"{r.get('code')} {r.get('msg')}"))
+        return tuple(out)
+    except BinanceAPIException as e:
+        log.info("[BRACKET] %s batchOrders 거절 → 병렬 단건 발행: %s", symbol, e)
+        placed = {}
+    except Exception as e:
+        placed = _find_legs(symbol, legs)
+        log.info("[BRACKET] %s batchOrders 결과 불명 → 생성 확인 %s · 나머지 재전송: %s", symbol, sorted(placed), e)
+
+    missing = {name: kw for name, kw in legs.items() if name not in placed}
+    if missing:
+        placed.update(submit_legs(**{
+            name: (lambda kw=kw: client.futures_create_order(**kw))
+            for name, kw in missing.items()
+        }))
+    return placed["tp"], placed["sl"]
+
 def place_order_with_tp_sl(
     symbol: str,
     side: str,
@@ -131,7 +229,8 @@ def place_order_with_tp_sl(
     """
     ① 시장 주문이 바로 체결되지 않으면 5 초 동안 폴링  
     ② 증거금 부족(-2019) 시 수량을 10 %씩 줄여 최대 3회 재시도  
-    ③ 실제 체결 수량으로 TP/SL 주문을 생성
+    ③ 체결 응답(RESULT) 확인 즉시 TP/SL 브래킷을 batchOrders 로 동시 발행
+    ④ 진입 전송 → SL 접수까지의 지연을 metrics 로 기록
     """
     try:
         _ensure_mode_cached()
@@ -145,21 +244,28 @@ def place_order_with_tp_sl(
             base_kwargs["positionSide"] = position_side
 
         # ──────── 시장 진입 재시도 루프 ────────
-        # ← LOT_SIZE 정보 미리 확보
-        step   = float(get_tick_size(symbol) ** 0)  # tick → 0.0001 등, **0 = 1
+        # ← LOT_SIZE · tickSize · MIN_NOTIONAL 정보는 **진입 전에** 모두 확보
+        #    (체결 후 보호 전 구간에서 REST 조회를 하지 않기 위함)
+        tick   = get_tick_size(symbol)                      # Decimal
+        step   = float(tick ** 0)  # tick → 0.0001 등, **0 = 1
         exch   = client.futures_exchange_info()
         prec   = 1
+        min_notional_tp = None
         for s in exch["symbols"]:
             if s["symbol"] == symbol.upper():
                 for f in s["filters"]:
                     if f["filterType"] == "LOT_SIZE":
                         step = float(f["stepSize"])     # ex) 0.1
                         prec = abs(int(round(-1 * math.log10(step))))
-                        break
+                    elif f["filterType"] == "MIN_NOTIONAL":
+                        min_notional_tp = float(f["notional"])
+                break
 
         qty_try = round(quantity, prec)
+        t_entry = time.perf_counter()
         for attempt in range(3):
             try:
+                t_entry = time.perf_counter()
                 entry_res = client.futures_create_order(
                     newOrderRespType="RESULT",   # 즉시 체결 정보 요청
                     quantity=qty_try,
@@ -172,7 +278,7 @@ def place_order_with_tp_sl(
                     qty_try  = math.floor(qty_try * factor / step) * step
                     qty_try  = round(qty_try, prec)
                     reason = "margin" if e.code == -2019 else "notional"
-                    print(f"[RETRY] {reason} → 수량 {qty_try} 재시도({attempt+1}/3)")
+                    log.warning("[RETRY] %s → 수량 %s 재시도(%s/3)", reason, qty_try, attempt+1)
                     continue
                 raise
 
@@ -189,19 +295,18 @@ def place_order_with_tp_sl(
                 else:   # 미체결 → 수량 축소 후 재시도
                     qty_try = math.floor(qty_try * 0.9 / step) * step
                     qty_try = round(qty_try, prec)
-                    print(f"[RETRY] NEW→미체결 → 수량 {qty_try}")
+                    log.warning("[RETRY] NEW→미체결 → 수량 %s", qty_try)
                     continue
             break
         else:
             raise ValueError("시장 주문 반복 실패")
 
+        t_fill = time.perf_counter()
         filled_qty = float(entry_res["executedQty"])
         if filled_qty == 0:
             raise ValueError(f"시장 주문 미체결: {entry_res}")
 
         # ── ① 가격 자릿수 보정 + Δ≥1 tick 확보 ────────────
-        tick = get_tick_size(symbol)                        # Decimal
-
         # 기본 라운딩
         if side == "buy":                                   # LONG
             tp_dec = Decimal(str(tp)).quantize(tick, ROUND_UP)
@@ -227,9 +332,9 @@ def place_order_with_tp_sl(
         sl_str = format(sl_dec, 'f')
 
         # DEBUG
-        print(f"[DEBUG] {symbol} tick={tick}, tp={tp_str}, sl={sl_str}")
+        log.debug("[DEBUG] %s tick=%s, tp=%s, sl=%s", symbol, tick, tp_str, sl_str)
 
-        # ── ② TP / SL 주문 생성 ─────────────────────────
+        # ── ② TP / SL 주문 구성 ─────────────────────────
         opposite_side = SIDE_SELL if side == "buy" else SIDE_BUY
         # ── TP 수량 산정 ────────────────────────────────
         half_qty_raw = filled_qty / 2
@@ -241,16 +346,6 @@ def place_order_with_tp_sl(
         if half_qty < step:
             half_qty = step if filled_qty > step else filled_qty
 
-        # ── 바이낸스 MIN_NOTIONAL 필터 재검증 ────────────
-        min_notional_tp = None
-        for s in exch["symbols"]:
-            if s["symbol"] == symbol.upper():
-                for f in s["filters"]:
-                    if f["filterType"] == "MIN_NOTIONAL":
-                        min_notional_tp = float(f["notional"])
-                        break
-                break
-
         # ─── MIN_NOTIONAL 보정 로직 개편 ─────────────────────
         # ① half_qty 로는 5 USDT 를 못 넘길 때,
         # ② ‘필요 최소 수량’만큼만 늘리되 **전량을 초과하지 않음**.
@@ -290,36 +385,40 @@ def place_order_with_tp_sl(
             tp_kwargs["positionSide"] = position_side
             sl_kwargs["positionSide"] = position_side
 
-        # TP 지정가 주문
-        tp_order = client.futures_create_order(**tp_kwargs)
-        print(f"[TP] {symbol} TP 주문 생성 완료: {tp_order.get('orderId', 'N/A')}")
-        
-        # SL 주문 생성 (필수 - 포지션 보호를 위해)
-        try:
-            sl_order = client.futures_create_order(**sl_kwargs)
-            print(f"[SL] {symbol} SL 주문 생성 완료: {sl_order.get('orderId', 'N/A')}")
-            send_discord_debug(f"[SL] {symbol} SL 주문 생성 완료 @ {sl_str}", "binance")
-        except Exception as sl_e:
-            print(f"[ERROR] {symbol} SL 주문 생성 실패: {sl_e}")
-            send_discord_debug(f"[CRITICAL] {symbol} SL 주문 생성 실패: {sl_e}", "binance")
-            # SL 생성 실패는 매우 위험하므로 재시도
-            time.sleep(1)
+        # ── ③ TP·SL 브래킷 동시 발행 ─────────────────────
+        tp_order, sl_order = _submit_bracket(symbol, tp_kwargs, sl_kwargs)
+
+        # SL 은 필수 (포지션 보호) → 실패 시 **즉시** 단건 재시도
+        if isinstance(sl_order, Exception):
+            log.error("[ERROR] %s SL 주문 생성 실패: %s", symbol, sl_order)
+            send_discord_debug(f"[CRITICAL] {symbol} SL 주문 생성 실패: {sl_order}", "binance")
             try:
                 sl_order = client.futures_create_order(**sl_kwargs)
-                print(f"[SL] {symbol} SL 주문 재시도 성공: {sl_order.get('orderId', 'N/A')}")
+                log.info("[SL] %s SL 주문 재시도 성공: %s", symbol, sl_order.get('orderId', 'N/A'))
                 send_discord_debug(f"[SL] {symbol} SL 주문 재시도 성공 @ {sl_str}", "binance")
             except Exception as sl_e2:
-                print(f"[CRITICAL] {symbol} SL 주문 재시도 실패: {sl_e2}")
+                log.critical("[CRITICAL] %s SL 주문 재시도 실패: %s", symbol, sl_e2)
                 send_discord_debug(f"[CRITICAL] {symbol} SL 주문 재시도 실패 - 수동 확인 필요!", "binance")
                 raise Exception(f"SL 주문 생성 실패: {sl_e2}")
+        else:
+            log.info("[SL] %s SL 주문 생성 완료: %s", symbol, sl_order.get('orderId', 'N/A'))
+            send_discord_debug(f"[SL] {symbol} SL 주문 생성 완료 @ {sl_str}", "binance")
+        record_protect_latency("binance", symbol, t_entry, t_fill, time.perf_counter())
+
+        # TP 실패는 치명적이지 않음 → PositionManager.enter() 에서 TP 재발행
+        if isinstance(tp_order, Exception):
+            log.warning("[WARN] %s TP 주문 생성 실패: %s", symbol, tp_order)
+            send_discord_debug(f"[BINANCE] {symbol} TP 주문 생성 실패 → {tp_order}", "binance")
+        else:
+            log.info("[TP] %s TP 주문 생성 완료: %s", symbol, tp_order.get('orderId', 'N/A'))
 
         # 간단한 진입 알림만 전송 (상세 정보는 main.py에서 처리)
-        print(f"[TP/SL] {symbol} 진입 {filled_qty} → TP:{tp_str}, SL:{sl_str}")
+        log.info("[TP/SL] %s 진입 %s → TP:%s, SL:%s", symbol, filled_qty, tp_str, sl_str)
         # send_discord_message는 main.py에서 상세 정보와 함께 전송
         return True
 
     except Exception as e:
-        print(f"[ERROR] TP/SL 포함 주문 실패: {symbol} - {e}")
+        log.error("[ERROR] TP/SL 포함 주문 실패: %s - %s", symbol, e)
         send_discord_debug(f"[BINANCE] TP/SL 포함 주문 실패: {symbol} → {e}", "binance")
         return False
     
@@ -345,6 +444,21 @@ def get_open_position(symbol: str):
         raise e
     return None
 
+def get_all_open_positions() -> dict[str, dict]:
+    """보유 중인 전 심볼 포지션 1회 조회 → {symbol: {direction, entry, size}}"""
+    out = {}
+    for p in client.futures_position_information():
+        amt = float(p['positionAmt'])
+        if amt == 0 or p['symbol'] in out:
+            continue
+        out[p['symbol']] = {
+            'symbol': p['symbol'],
+            'direction': 'long' if amt > 0 else 'short',
+            'entry': float(p['entryPrice']),
+            'size': abs(amt),
+        }
+    return out
+
 def update_stop_loss_order(symbol: str, direction: str, stop_price: float):
     try:
         # ▸ SL 발행 전에도 계정 포지션 모드 확인
@@ -403,20 +517,20 @@ def update_stop_loss_order(symbol: str, direction: str, stop_price: float):
                 ):
                     try:
                         client.futures_cancel_order(symbol=symbol, orderId=o["orderId"])
-                        print(f"[CANCEL] {symbol} SL 주문 취소됨 (ID: {o['orderId']})")
+                        log.info("[CANCEL] %s SL 주문 취소됨 (ID: %s)", symbol, o['orderId'])
                     except BinanceAPIException as ce:
                         if ce.code != -2011:        # –2011 = Unknown order → 무시
                             raise
         except Exception as e:
-            print(f"[WARN] SL 취소 실패: {e}")
+            log.warning("[WARN] SL 취소 실패: %s", e)
             send_discord_debug(f"[BINANCE] SL 취소 실패 → {e}", "binance")
         msg = f"[SL 갱신] {symbol} STOP_MARKET SL 재설정 완료 → {stop_price}"
-        print(msg)
+        log.info("%s", msg)
         send_discord_debug(msg, "binance")
         return order['orderId']
     except Exception as e:
         msg = f"[ERROR] SL 갱신 실패: {symbol} → {e}"
-        print(msg)
+        log.error("%s", msg)
         send_discord_debug(msg, "binance")
         return False
     
@@ -424,12 +538,12 @@ def cancel_order(symbol: str, order_id: int):
     try:
         result = client.futures_cancel_order(symbol=symbol, orderId=order_id)
         msg = f"[CANCEL] {symbol} 주문 취소됨 (ID: {order_id})"
-        print(msg)
+        log.info("%s", msg)
         send_discord_debug(msg, "binance")
         return result
     
     except Exception as e:
-        print(f"[ERROR] 주문 취소 실패: {symbol} - {e}")
+        log.error("[ERROR] 주문 취소 실패: %s - %s", symbol, e)
         send_discord_debug(f"[BINANCE] 주문 취소 실패: {symbol} → {e}", "binance")
         return False
         
@@ -445,7 +559,7 @@ def get_available_balance() -> float:
             if asset['asset'] == 'USDT':
                 return float(asset['availableBalance'])
     except BinanceAPIException as e:
-        print(f"[BINANCE] 잔고 조회 실패: {e}")
+        log.warning("[BINANCE] 잔고 조회 실패: %s", e)
         send_discord_debug(f"[BINANCE] 잔고 조회 실패 → {e}", "binance")
     return 0.0
 
@@ -463,7 +577,7 @@ def get_total_balance() -> float:
             if asset["asset"] == "USDT":
                 return float(asset["balance"])          # ← 전체
     except BinanceAPIException as e:
-        print(f"[BINANCE] 총 잔고 조회 실패: {e}")
+        log.warning("[BINANCE] 총 잔고 조회 실패: %s", e)
         send_discord_debug(f"[BINANCE] 총 잔고 조회 실패 → {e}", "binance")
     return 0.0
 
@@ -480,7 +594,7 @@ def get_quantity_precision(symbol: str) -> int:
                         precision = abs(int(round(-1 * math.log10(step_size))))
                         return precision
     except BinanceAPIException as e:
-        print(f"[BINANCE] 수량 자리수 조회 실패: {e}")
+        log.warning("[BINANCE] 수량 자리수 조회 실패: %s", e)
         send_discord_debug(f"[BINANCE] 수량 자리수 조회 실패 → {e}", "binance")
     return 3  # 기본값
 
@@ -495,7 +609,7 @@ def get_tick_size(symbol: str) -> Decimal:
                         # 후행 0 제거(normalize)로 정확한 tick 단위를 확보
                         return Decimal(f['tickSize']).normalize()
     except Exception as e:
-        print(f"[BINANCE] tick_size 조회 실패: {e}")
+        log.warning("[BINANCE] tick_size 조회 실패: %s", e)
         send_discord_debug(f"[BINANCE] tick_size 조회 실패 → {e}", "binance")
     return Decimal("0.0001")
 
@@ -523,7 +637,7 @@ def calculate_quantity(
                     elif f['filterType'] == 'MIN_NOTIONAL':
                         min_notional = float(f['notional'])
         if step_size is None:
-            print(f"[BINANCE] ❌ stepSize 조회 실패: {symbol}")
+            log.error("[BINANCE] ❌ stepSize 조회 실패: %s", symbol)
             return 0.0
         if min_notional is None:
             min_notional = 5.0     # 바이낸스 기본
@@ -544,9 +658,9 @@ def calculate_quantity(
             needed_notional = min_steps_for_half_exit * step_size * price
             if needed_notional <= usdt_balance * leverage * 0.9:  # 10% 여유 두고 확인
                 steps = min_steps_for_half_exit
-                print(f"[BINANCE] 절반 익절 고려 최소 사이즈 적용: {steps} steps")
+                log.info("[BINANCE] 절반 익절 고려 최소 사이즈 적용: %s steps", steps)
             else:
-                print(f"[BINANCE] ⚠️ 절반 익절 고려 시 증거금 부족: steps={steps}")
+                log.warning("[BINANCE] ⚠️ 절반 익절 고려 시 증거금 부족: steps=%s", steps)
         
         qty = round(steps * step_size, precision)
 
@@ -555,7 +669,7 @@ def calculate_quantity(
             return 0.0
         return qty
     except Exception as e:
-        print(f"[BINANCE] ❌ 수량 계산 실패: {e}")
+        log.error("[BINANCE] ❌ 수량 계산 실패: %s", e)
         return 0.0
 
 # ─────────────────────────────────────────────────────────────
@@ -601,16 +715,16 @@ def update_take_profit_order(symbol: str, direction: str, take_price: float):
         if qty_tp_raw >= step:
             qty = qty_tp_raw
             remaining_qty = qty_full - qty
-            print(f"[BINANCE] 절반 익절: {qty}/{qty_full} (남은 물량: {remaining_qty})")
+            log.info("[BINANCE] 절반 익절: %s/%s (남은 물량: %s)", qty, qty_full, remaining_qty)
         else:
             # 절반 익절이 stepSize보다 작으면 전량 TP
             qty = qty_full
-            print(f"[BINANCE] ⚠️ 전량 익절 (절반이 stepSize 미달): {qty}/{qty_full}")
+            log.warning("[BINANCE] ⚠️ 전량 익절 (절반이 stepSize 미달): %s/%s", qty, qty_full)
         
         # 최종 검증: stepSize 미달이면 전량 TP
         if qty < step:
             qty = qty_full
-            print(f"[BINANCE] ⚠️ stepSize 미달로 전량 익절: {qty}/{qty_full}")
+            log.warning("[BINANCE] ⚠️ stepSize 미달로 전량 익절: %s/%s", qty, qty_full)
         
         # 정밀도 맞추기
         qty = round(qty, prec)
@@ -638,12 +752,12 @@ def update_take_profit_order(symbol: str, direction: str, take_price: float):
             kwargs["positionSide"] = pos_side
 
         res = client.futures_create_order(**kwargs)
-        print(f"[TP 갱신] {symbol} LIMIT TP 재설정 완료 → {tp_str}")
+        log.info("[TP 갱신] %s LIMIT TP 재설정 완료 → %s", symbol, tp_str)
         send_discord_debug(f"[TP 갱신] {symbol} LIMIT TP 재설정 완료 → {tp_str}", "binance")
         return res["orderId"]
 
     except Exception as e:
-        print(f"[ERROR] TP 갱신 실패: {symbol} → {e}")
+        log.error("[ERROR] TP 갱신 실패: %s → %s", symbol, e)
         send_discord_debug(f"[ERROR] TP 갱신 실패: {symbol} → {e}", "binance")
         return False
 
@@ -677,7 +791,7 @@ def verify_sl_exists(symbol: str, expected_sl_price: float = None) -> bool:
         return True
         
     except Exception as e:
-        print(f"[ERROR] SL 검증 실패: {symbol} → {e}")
+        log.error("[ERROR] SL 검증 실패: %s → %s", symbol, e)
         return False
 
 def ensure_stop_loss(symbol: str, direction: str, sl_price: float, max_retries: int = 3) -> bool:
@@ -698,28 +812,28 @@ def ensure_stop_loss(symbol: str, direction: str, sl_price: float, max_retries:
     for attempt in range(max_retries):
         # 1. 현재 SL 존재 여부 확인
         if verify_sl_exists(symbol, sl_price):
-            print(f"[SL] {symbol} SL 주문 확인됨 @ {sl_price:.4f}")
+            log.info("[SL] %s SL 주문 확인됨 @ %.4f", symbol, sl_price)
             return True
         
         # 2. SL 주문 생성/업데이트 시도
-        print(f"[SL] {symbol} SL 주문 생성 시도 {attempt + 1}/{max_retries}")
-        success = update_stop_loss(symbol, direction, sl_price)
+        log.info("[SL] %s SL 주문 생성 시도 %s/%s", symbol, attempt + 1, max_retries)
+        success = update_stop_loss(symbol, direction, sl_price, force=True)
         
         if success and success is not True:  # 실제 주문 ID 반환된 경우
             time.sleep(1)  # 주문 반영 대기
             if verify_sl_exists(symbol, sl_price):
-                print(f"[SL] {symbol} SL 주문 생성 성공 @ {sl_price:.4f}")
+                log.info("[SL] %s SL 주문 생성 성공 @ %.4f", symbol, sl_price)
                 return True
         
         # 3. 재시도 대기 (지수 백오프)
         if attempt < max_retries - 1:
             wait_time = 2 ** attempt
-            print(f"[SL] {symbol} SL 설정 실패 - {wait_time}초 후 재시도")
+            log.warning("[SL] %s SL 설정 실패 - %s초 후 재시도", symbol, wait_time)
             time.sleep(wait_time)
     
     # 4. 최종 실패 시 알림
     error_msg = f"[CRITICAL] {symbol} SL 설정 최종 실패 - 수동 확인 필요!"
-    print(error_msg)
+    log.critical("%s", error_msg)
     send_discord_debug(error_msg, "binance")
     return False
 
@@ -736,6 +850,6 @@ def health_check_stop_losses(positions: dict) -> list:
     for symbol, pos in positions.items():
         if not verify_sl_exists(symbol, pos.get('sl')):
             missing_sl_symbols.append(symbol)
-            print(f"[WARN] {symbol} SL 주문 누락 감지")
+            log.warning("[WARN] %s SL 주문 누락 감지", symbol)
     
     return missing_sl_symbols
@@ -2,7 +2,9 @@
 
 import json
 import os
-from time import time, sleep
+import threading
+from types import SimpleNamespace
+from time import time, sleep, perf_counter
 from decimal import Decimal, ROUND_UP, ROUND_DOWN
 from config.settings import TRADE_RISK_PCT
 import requests
@@ -18,9 +20,9 @@ except ModuleNotFoundError:           # 단독 실행(디버깅) 시
     def _noop(*_a, **_kw):            # → 간단한 콘솔 출력으로 대체
         pass
     def send_discord_debug(msg, *_):
-        print(f"[DEBUG][stub] {msg}")
+        log.debug("[DEBUG][stub] %s", msg)
     def send_discord_message(msg, *_):
-        print(f"[MSG][stub] {msg}")
+        log.debug("[MSG][stub] %s", msg)
 import math
 from gate_api import (
     ApiClient,
@@ -31,6 +33,12 @@ from gate_api import (
     ApiException,
 )
 from gate_api.exceptions import ApiException
+from exchange.order_pipeline import submit_legs, record_protect_latency
+from core.metrics import TimedApi
+from core.log import get_logger
+
+log = get_logger(__name__)
+
 # helper: safe float
 def _f(x):
     try:
@@ -49,7 +57,7 @@ config = Configuration(
 
 # 선물 API 전역 인스턴스
 api_client = ApiClient(config)
-futures_api = FuturesApi(api_client)
+futures_api = TimedApi(FuturesApi(api_client), "gate")    # REST 호출 수·지연 → /metrics
 
 # ─────────────────────────────────────────
 # 계약 메타데이터 캐싱(심볼 유효성·스텝 확인용)
@@ -67,13 +75,29 @@ if __name__ == "__main__":
                          indent=2, ensure_ascii=False))
         sleep(1)
 
-def _ensure_contract_cache():
-    global CONTRACT_CACHE
-    if not CONTRACT_CACHE:
-        contracts = futures_api.list_futures_contracts(settle="usdt")
-        CONTRACT_CACHE = {c.name: c for c in contracts}
+# ▸ import 시점 조회 없음 – config.settings.bootstrap() 이 스냅샷/REST 로 채우고,
+#   그 전에 필요해지면 normalize_contract_symbol() 이 1회 지연 조회
+_CONTRACT_LOCK = threading.Lock()
 
-_ensure_contract_cache()
+def fetch_contracts() -> dict[str, dict]:
+    """USDT 선물 계약 메타 전체 → {name: dict} (bootstrap 스냅샷용)"""
+    return {c.name: c.to_dict() for c in futures_api.list_futures_contracts(settle="usdt")}
+
+def load_contracts(contracts: dict[str, dict]) -> None:
+    """스냅샷 dict → CONTRACT_CACHE (getattr 접근 호환 SimpleNamespace)"""
+    if not contracts:
+        return
+    with _CONTRACT_LOCK:
+        CONTRACT_CACHE.clear()
+        CONTRACT_CACHE.update({name: SimpleNamespace(**c) for name, c in contracts.items()})
+
+def _ensure_contract_cache():
+    if CONTRACT_CACHE:
+        return
+    with _CONTRACT_LOCK:
+        if not CONTRACT_CACHE:
+            contracts = futures_api.list_futures_contracts(settle="usdt")
+            CONTRACT_CACHE.update({c.name: c for c in contracts})
 
 # quiet=True ⇒ 성공 로그 생략, 실패만 경고
 def set_leverage(symbol: str, leverage: int, *, quiet: bool = False):
@@ -90,7 +114,7 @@ def set_leverage(symbol: str, leverage: int, *, quiet: bool = False):
             raise e
     if not quiet:
         msg = f"[GATE] 레버리지 설정 완료: {symbol} → x{leverage}"
-        print(msg)
+        log.info("%s", msg)
         send_discord_debug(msg, "gateio")
     return True
 
@@ -108,14 +132,14 @@ def place_order(symbol: str, side: str, size: float, leverage: int = 20, **_kw):
 
         response = futures_api.create_futures_order(settle='usdt', futures_order=order)
         msg = f"[ORDER] {symbol} {side.upper()} x{size} | 레버리지: {leverage}"
-        print(msg)
+        log.info("%s", msg)
         send_discord_message(msg, "gateio")
         send_discord_debug(f"[GATE] 주문 전송됨: {symbol} {side.upper()} x{size}", "gateio")
         return response
     
     except Exception as e:
         msg = f"[ERROR] 주문 실패: {symbol} {side.upper()} x{size} → {e}"
-        print(msg)
+        log.error("%s", msg)
         send_discord_debug(msg, "gateio")
         return None
 
@@ -134,7 +158,7 @@ def get_open_position(symbol: str, max_wait: float = 15.0, delay: float = 0.5):
             mode = getattr(pos, "mode", "").lower()
             if size != 0 and entry > 0:
                 direction = "long" if size > 0 else "short"
-                print(f"[INFO] 단일 포지션 확인: mode={mode}, size={size}, entry={entry}")
+                log.info("[INFO] 단일 포지션 확인: mode=%s, size=%s, entry=%s", mode, size, entry)
                 return {
                     "symbol": symbol,
                     "direction": direction,
@@ -144,9 +168,9 @@ def get_open_position(symbol: str, max_wait: float = 15.0, delay: float = 0.5):
         except Exception as e:
             # 포지션이 없으면 바로 중단
             if e.status == 400 and "POSITION_NOT_FOUND" in e.body:
-                print(f"[INFO] 포지션 없음 → 즉시 종료: {symbol}")
+                log.info("[INFO] 포지션 없음 → 즉시 종료: %s", symbol)
                 return None
-            print(f"[RETRY] get_position 실패: {e}")
+            log.warning("[RETRY] get_position 실패: %s", e)
 
         try:
             # 듀얼 포지션 탐색
@@ -159,7 +183,7 @@ def get_open_position(symbol: str, max_wait: float = 15.0, delay: float = 0.5):
                 mode = (getattr(p, "mode", "") or getattr(p, "dual_side", "")).lower()
                 if size and entry and mode:
                     direction = "long" if "long" in mode else "short"
-                    print(f"[INFO] 듀얼 포지션 확인: mode={mode}, size={size}, entry={entry}")
+                    log.info("[INFO] 듀얼 포지션 확인: mode=%s, size=%s, entry=%s", mode, size, entry)
                     return {
                         "symbol": symbol,
                         "direction": direction,
@@ -167,15 +191,35 @@ def get_open_position(symbol: str, max_wait: float = 15.0, delay: float = 0.5):
                         "size": abs(size),
                     }
         except Exception as e:
-            print(f"[RETRY] list_positions 오류: {e}")
+            log.warning("[RETRY] list_positions 오류: %s", e)
 
         if first_only:
             break          # 한 번만 시도
         sleep(delay)
 
     if not first_only:     # 논블로킹일 땐 조용히 패스
-        print(f"[TIMEOUT] 포지션 entry_price 확인 실패: {symbol}")
+        log.warning("[TIMEOUT] 포지션 entry_price 확인 실패: %s", symbol)
     return None
+
+def get_all_open_positions() -> dict[str, dict]:
+    """보유 중인 전 계약 포지션 1회 조회 (단일·듀얼 모드 공용) → {contract: {...}}"""
+    out = {}
+    for p in futures_api.list_positions(settle="usdt", holding=True):
+        size, entry = _f(p.size), _f(p.entry_price)
+        if not size or entry <= 0 or p.contract in out:
+            continue
+        mode = (getattr(p, "mode", "") or "").lower()
+        if "long" in mode or "short" in mode:
+            direction = "long" if "long" in mode else "short"
+        else:
+            direction = "long" if size > 0 else "short"
+        out[p.contract] = {
+            "symbol": p.contract,
+            "direction": direction,
+            "entry": entry,
+            "size": abs(size),
+        }
+    return out
     
 # 사용 가능 잔고 조회 (USDT 기준)
 def get_available_balance() -> float:
@@ -188,7 +232,7 @@ def get_available_balance() -> float:
             acc = acc[0]
         return float(acc.available)
     except Exception as e:
-        print(f"[GATE] 잔고 조회 실패: {e}")
+        log.warning("[GATE] 잔고 조회 실패: %s", e)
         send_discord_debug(f"[GATE] 잔고 조회 실패 → {e}", "gateio")
     return 0.0
 
@@ -197,10 +241,15 @@ def get_quantity_precision(symbol: str) -> int:
     try:
         return get_contract_precision(symbol)
     except Exception as e:
-        print(f"[GATE] 수량 precision 조회 실패: {e}")
+        log.warning("[GATE] 수량 precision 조회 실패: %s", e)
         send_discord_debug(f"[GATE] 수량 precision 조회 실패 → {e}", "gateio")
     return 3
 
+def get_quanto_multiplier(symbol: str) -> float:
+    """1계약 = 기초자산 몇 개 (BTC_USDT → 0.0001)"""
+    contract = CONTRACT_CACHE[normalize_contract_symbol(symbol)]
+    return float(getattr(contract, "quanto_multiplier", 1) or 1)
+
 def get_contract_precision(symbol: str) -> int:
     contract = CONTRACT_CACHE[normalize_contract_symbol(symbol)]
     step = float(getattr(contract, "size_increment", contract.order_size_min))
@@ -212,6 +261,7 @@ def normalize_contract_symbol(symbol: str) -> str:
         normalized = symbol
     else:
         normalized = symbol.replace("USDT", "_USDT")
+    _ensure_contract_cache()
     if normalized not in CONTRACT_CACHE:
         raise ValueError(f"❌ 지원되지 않는 Gate 심볼: {symbol}")
     return normalized
@@ -228,7 +278,46 @@ def to_gate_symbol(symbol: str) -> str:
 to_gate = to_gate_symbol
 
 # TP/SL 포함 주문
+def _fetch_mark_price(contract: str) -> float:
+    """REST /mark_price 단건 조회 (실패 시 0.0)"""
+    try:
+        rj = requests.get(
+            f"https://fx-api.gateio.ws/api/v4/futures/usdt/mark_price/{contract}",
+            timeout=3
+        ).json()
+        return float(rj.get("mark_price") or rj.get("price", 0))
+    except Exception:
+        return 0.0
+
+def _sl_trigger_order(contract: str, direction: str, stop_price: float, text: str):
+    """전량 청산용 SL price-triggered 주문 모델 (mark 기준)"""
+    # Gate v4: initial 쪽에 order_type/close 대신
+    #   - reduce_only = True
+    #   - price      = "0"
+    return FuturesPriceTriggeredOrder(
+        initial={
+            "contract": contract,
+            "size": 0,          # 전량 청산
+            "price": "0",       # 시장가
+            "close": True,      # ★ size 0 이면 필수!
+            "order_type": "market",
+            "tif": "ioc",
+            "text": text,
+        },
+        trigger={
+            "price_type": 1,                       # 0=last, 1=mark, 2=index
+            "price": str(stop_price),
+            "rule": 2 if direction == "long" else 1,
+        }
+    )
+
 def place_order_with_tp_sl(symbol: str, side: str, size: float, tp: float, sl: float, leverage: int = 20):
+    """
+    ① IOC 시장 진입 → 응답(size·left·fill_price)으로 체결 즉시 확인
+       (응답에 체결 정보가 없을 때만 포지션 폴링)
+    ② TP 지정가 · SL 트리거 두 레그를 **동시에** 발행
+    ③ 진입 전송 → SL 접수까지의 지연을 metrics 로 기록
+    """
     # ▸ 가격 라운딩 (Binance 방식과 동일)
     tick = get_tick_size(symbol)
     if side == "buy":                       # LONG
@@ -243,6 +332,8 @@ def place_order_with_tp_sl(symbol: str, side: str, size: float, tp: float, sl: f
         raise ValueError(f"[ABORT] 잘못된 TP/SL 계산 → tp={tp}, sl={sl}")
     set_leverage(symbol, leverage)
     contract = normalize_contract_symbol(symbol)
+    # 마크 가격은 **진입 전에** 확보 (체결 후 보호 전 구간 REST 1회 절감)
+    mark_price = _fetch_mark_price(contract)
 
     try:
         # 진입 주문
@@ -255,43 +346,52 @@ def place_order_with_tp_sl(symbol: str, side: str, size: float, tp: float, sl: f
             text="t-SMC-BOT"
         )
 
+        t_entry = perf_counter()
         entry_res = futures_api.create_futures_order(settle='usdt', futures_order=entry_order)
-        print(f"[DEBUG] entry_res = {entry_res}")
+        log.debug("[DEBUG] entry_res = %s", entry_res)
         if not entry_res or float(entry_res.size or 0) == 0:
             raise Exception("진입 주문 미체결 (응답에서 size 없음)")
 
-        # 포지션 체결 대기
-        pos = None
-        timeout = time() + 15
-        while time() < timeout:
-            pos = get_open_position(symbol)
-            if pos:
-                break
-            print(f"[WAIT] 포지션 반영 대기 중... {symbol}")
-            sleep(1)
-
-        if not pos or pos.get("entry", 0.0) == 0.0:
-            raise ValueError(f"❌ 포지션 조회 실패 또는 entry=0 → TP/SL 설정 중단: {symbol}")
-        confirmed_size = abs(float(pos.get("size", size)))
-        entry_price = float(pos["entry"])
-        direction = pos["direction"]
-
-        # 마크 가격 실시간 조회
-        mark_url = f"https://fx-api.gateio.ws/api/v4/futures/usdt/mark_price/{contract}"
-        mark_resp = requests.get(mark_url, timeout=3).json()
-        mark_price = float(mark_resp["mark_price"]) if "mark_price" in mark_resp else entry_price
-
-        if not entry_price or not mark_price:
+        # IOC 응답 자체가 체결 확인 : 체결 수량 = |size| - |left|
+        filled = abs(_f(entry_res.size)) - abs(_f(getattr(entry_res, "left", 0)))
+        fill_px = _f(getattr(entry_res, "fill_price", 0))
+        if filled > 0 and fill_px > 0:
+            confirmed_size = filled
+            entry_price = fill_px
+            direction = "long" if side == "buy" else "short"
+        else:
+            # 응답에 체결 정보가 없을 때만 포지션 폴링
+            pos = None
+            timeout = time() + 15
+            while time() < timeout:
+                pos = get_open_position(symbol, max_wait=0)
+                if pos:
+                    break
+                log.info("[WAIT] 포지션 반영 대기 중... %s", symbol)
+                sleep(0.2)
+
+            if not pos or pos.get("entry", 0.0) == 0.0:
+                raise ValueError(f"❌ 포지션 조회 실패 또는 entry=0 → TP/SL 설정 중단: {symbol}")
+            confirmed_size = abs(float(pos.get("size", size)))
+            entry_price = float(pos["entry"])
+            direction = pos["direction"]
+        t_fill = perf_counter()
+
+        if not mark_price:
+            mark_price = entry_price
+        if not entry_price:
             raise ValueError("❌ 가격 정보 부족 → TP/SL 계산 불가")
         
         # ✅ SL 보정 (마크가격·엔트리 기준 안전 확보)
         min_diff = float(tick)
         if direction == "long":
             sl = min(sl, entry_price - min_diff, mark_price - min_diff)
+            sl = float(Decimal(str(sl)).quantize(tick, ROUND_DOWN))
             if sl >= entry_price or sl >= mark_price:
                 raise ValueError(f"❌ SL 오류 (롱) → SL={sl}, Entry={entry_price}, Mark={mark_price}")
         elif direction == "short":
             sl = max(sl, entry_price + min_diff, mark_price + min_diff)
+            sl = float(Decimal(str(sl)).quantize(tick, ROUND_UP))
             if sl <= entry_price or sl <= mark_price:
                 raise ValueError(f"❌ SL 오류 (숏) → SL={sl}, Entry={entry_price}, Mark={mark_price}")
 
@@ -301,50 +401,59 @@ def place_order_with_tp_sl(symbol: str, side: str, size: float, tp: float, sl: f
                                   getattr(CONTRACT_CACHE[contract], "order_size_min", 1)))
         tp_size_raw = math.floor((confirmed_size / 2) / step_size) * step_size
         tp_size = tp_size_raw if tp_size_raw >= step_size else confirmed_size
-        sl_size = math.floor(confirmed_size / step_size) * step_size
 
-        # ── (A) 기존 reduce-only LIMIT 주문 전량 취소 ────────────
-        try:
-            for od in futures_api.list_orders(settle="usdt",
-                                              contract=contract,
-                                              status="open"):
-                if od.reduce_only and od.type == "limit":
-                    futures_api.cancel_orders("usdt", contract, od.id)
-        except Exception:
-            pass
-        # ── (B) 새 TP 지정가 주문 발행 ────────────────────────────
-        tp_order = FuturesOrder(
-            contract=contract,
-            size=int(-tp_size) if side == "buy" else int(tp_size),
-            price=str(tp),
-            tif="gtc",
-            reduce_only=True,
-            text="t-TP-SMC"
-        )
+        def _tp_leg():
+            # ── (A) 기존 reduce-only LIMIT 주문 전량 취소 ────────────
+            try:
+                for od in futures_api.list_orders(settle="usdt",
+                                                  contract=contract,
+                                                  status="open"):
+                    if od.reduce_only and od.type == "limit":
+                        futures_api.cancel_orders("usdt", contract, od.id)
+            except Exception:
+                pass
+            # ── (B) 새 TP 지정가 주문 발행 ────────────────────────────
+            tp_order = FuturesOrder(
+                contract=contract,
+                size=int(-tp_size) if side == "buy" else int(tp_size),
+                price=str(tp),
+                tif="gtc",
+                reduce_only=True,
+                text="t-TP-SMC"
+            )
+            return futures_api.create_futures_order(settle='usdt', futures_order=tp_order)
 
-        tp_res = futures_api.create_futures_order(settle='usdt', futures_order=tp_order)
+        def _sl_leg():
+            # ── (C) SL 트리거 (전량 청산) ─────────────────────────────
+            return futures_api.create_price_triggered_order(
+                "usdt", _sl_trigger_order(contract, direction, sl, "t-SL-SMC")
+            )
+
+        legs = submit_legs(tp=_tp_leg, sl=_sl_leg)
 
-        if not tp_res:
-            raise Exception("TP 주문 실패")
+        # SL 실패는 치명적이지 않음 → PositionManager.enter() 의
+        # ensure_stop_loss_gate() 가 재시도 (여기서 False 반환 시 중복 진입 위험)
+        if isinstance(legs["sl"], Exception) or not legs["sl"]:
+            msg = f"[SL-FAIL] {symbol} 진입 직후 SL 트리거 실패 → 재시도 예정: {legs['sl']}"
+            log.warning("%s", msg)
+            send_discord_debug(msg, "gateio")
+        else:
+            record_protect_latency("gateio", symbol, t_entry, t_fill, perf_counter())
 
-        # ─ SL 트리거 주문 구성은 main.py → update_stop_loss() 에서 일괄 관리합니다.
-        # 따라서 이곳의 SL 생성 로직은 제거/주석 처리합니다.
-        # sl_price = sl * (0.999 if direction == "long" else 1.001)
-        # sl_price = float(Decimal(str(sl_price)).quantize(tick))
-        # sl_rule  = 2 if direction == "long" else 1
-        # sl_trigger = FuturesPriceTriggeredOrder(...)
-        # sl_res = futures_api.create_price_triggered_order(...)
-        # if not sl_res: raise Exception("SL 주문 실패")
+        if isinstance(legs["tp"], Exception) or not legs["tp"]:
+            msg = f"[WARN] {symbol} TP 주문 실패 → {legs['tp']}"
+            log.warning("%s", msg)
+            send_discord_debug(msg, "gateio")
 
         # 간단한 진입 알림만 전송 (상세 정보는 main.py에서 처리)
         msg = f"[TP/SL] {symbol} 진입 및 TP/SL 설정 완료 → TP: {tp}, SL: {sl}"
-        print(msg)
+        log.info("%s", msg)
         # send_discord_message는 main.py에서 상세 정보와 함께 전송
         return True
 
     except Exception as e:
         msg = f"[ERROR] TP/SL 포함 주문 실패: {symbol} → {e}"
-        print(msg)
+        log.error("%s", msg)
         send_discord_debug(msg, "gateio")
         return False
         
@@ -367,15 +476,7 @@ def update_stop_loss_order(symbol: str, direction: str, stop_price: float):
         tick = get_tick_size(symbol)
         # ── (1) stop_price 안전 보정 (Mark ± 1 tick) ──
         # ① markPrice – 실패가 잦아 → 다중 폴백
-        mark = 0.0
-        try:                                               # ① REST /mark_price
-            rj   = requests.get(
-                    f"https://fx-api.gateio.ws/api/v4/futures/usdt/mark_price/{contract}",
-                    timeout=3
-                  ).json()
-            mark = float(rj.get("mark_price") or rj.get("price", 0))
-        except Exception:
-            pass
+        mark = _fetch_mark_price(contract)                 # ① REST /mark_price
         if not mark:                                       # ② 24h ticker
             try:
                 tkr  = futures_api.list_futures_tickers("usdt", contract=contract)[0]
@@ -409,25 +510,7 @@ def update_stop_loss_order(symbol: str, direction: str, stop_price: float):
                 pass
 
         # ── (3) 새 SL 단일 발행  (Binance STOP_MARKET 대응) ────
-        # Gate v4: initial 쪽에 order_type/close 대신
-        #   - reduce_only = True
-        #   - price      = "0"
-        sl_order = FuturesPriceTriggeredOrder(
-            initial={
-                "contract": contract,
-                "size": 0,          # 전량 청산
-                "price": "0",       # 시장가
-                "close": True,      # ★ size 0 이면 필수!
-                "order_type": "market",
-                "tif": "ioc",
-                "text": "t-SL-UPDATE",
-            },
-            trigger={
-                "price_type": 1,                       # 0=last, 1=mark, 2=index
-                "price": str(normalized_stop),
-                "rule": 2 if direction == "long" else 1,
-            }
-        )
+        sl_order = _sl_trigger_order(contract, direction, normalized_stop, "t-SL-UPDATE")
         try:
             new_sl = futures_api.create_price_triggered_order("usdt", sl_order)
         except Exception as e:
@@ -449,12 +532,12 @@ def update_stop_loss_order(symbol: str, direction: str, stop_price: float):
             f"[SL 갱신] {symbol} SL 재설정 완료 → {normalized_stop} "
             f"(id={getattr(new_sl,'id','?')})"
         )
-        print(msg)
+        log.info("%s", msg)
         send_discord_debug(msg, "gateio")
         return True
     except Exception as e:
         msg = f"[ERROR] SL 갱신 실패: {symbol} → {e}"
-        print(msg)
+        log.error("%s", msg)
         send_discord_debug(msg, "gateio")
         return False
 
@@ -468,7 +551,7 @@ def cancel_price_trigger(order_id: int | str) -> bool:
     """
     try:
         futures_api.cancel_price_triggered_orders("usdt", order_id)
-        print(f"[GATE] price_triggered_order 취소 완료 | id={order_id}")
+        log.info("[GATE] price_triggered_order 취소 완료 | id=%s", order_id)
         return True
     except Exception as e:
         send_discord_debug(f"[GATE] ❌ price_trigger 취소 실패(id={order_id}) → {e}", "gateio")
@@ -494,12 +577,12 @@ def close_position(symbol: str):
             )
         )
         
-        print(f"[GATE] 포지션 강제 종료 완료 | {symbol}")
+        log.info("[GATE] 포지션 강제 종료 완료 | %s", symbol)
         send_discord_debug(f"[GATE] 포지션 강제 종료 완료 | {symbol}", "gateio")
         return True
     except Exception as e:
         msg = f"[GATE] ❌ 포지션 종료 실패 | {symbol} → {e}"
-        print(msg)
+        log.error("%s", msg)
         send_discord_debug(msg, "gateio")
         return False
 
@@ -510,7 +593,7 @@ def get_tick_size(symbol: str) -> Decimal:
         tick = getattr(contract, "tick_size", None) or getattr(contract, "order_price_round", "0.0001")
         return Decimal(str(tick)).normalize()       # ← 0.010000 → 0.01
     except Exception as e:
-        print(f"[GATE] tick_size 조회 실패: {e}")
+        log.warning("[GATE] tick_size 조회 실패: %s", e)
         send_discord_debug(f"[GATE] tick_size 조회 실패 → {e}", "gateio")
     return Decimal("0.0001")
 
@@ -533,7 +616,7 @@ def calculate_quantity_gate(
         # ────── 목표 수량(계약 수) 계산 ──────
         contract_symbol = normalize_contract_symbol(symbol)  # ✅ Gate 심볼
         contract        = CONTRACT_CACHE[contract_symbol]
-        multiplier      = float(getattr(contract, "quanto_multiplier", 1) or 1)
+        multiplier      = get_quanto_multiplier(contract_symbol)
         contract_val    = price * multiplier              # 1계약 명목가
         raw_qty         = target_notional / contract_val
         step_size = float(
@@ -551,8 +634,10 @@ def calculate_quantity_gate(
         max_steps_notional = floor((margin_cap * 0.95 * leverage)
                                    / (contract_val * step_size))
         if max_steps_notional <= 0:            # 증거금 부족 → 바로 종료
-            print(f"[GATE] ❌ 증거금 부족: price={price}, step={step_size}, "
-                  f"cap={margin_cap}, lev={leverage}")
+            log.error(
+                "[GATE] ❌ 증거금 부족: price=%s, step=%s, cap=%s, lev=%s",
+                price, step_size, margin_cap, leverage,
+            )
             return 0.0
         # 거래소 절대 수량 한도도 함께 고려
         if size_max:
@@ -579,9 +664,9 @@ def calculate_quantity_gate(
             needed_margin = (min_steps_for_half_exit * step_size * contract_val) / leverage
             if needed_margin <= margin_cap * 0.9:  # 10% 여유 두고 확인
                 steps = min_steps_for_half_exit
-                print(f"[GATE] 절반 익절 고려 최소 사이즈 적용: {steps} steps")
+                log.info("[GATE] 절반 익절 고려 최소 사이즈 적용: %s steps", steps)
             else:
-                print(f"[GATE] ⚠️ 절반 익절 고려 시 증거금 부족: steps={steps}")
+                log.warning("[GATE] ⚠️ 절반 익절 고려 시 증거금 부족: steps=%s", steps)
 
         qty   = round(steps * step_size, precision)
 
@@ -601,30 +686,25 @@ def calculate_quantity_gate(
 
         # 최종 sanity-check
         if qty < step_size or qty * price < min_notional_req:
-            print(
-                f"[GATE] 주문 최소값 미달 → qty={qty}, "
-                f"notional={qty*price:.4f} < {min_notional_req}"
-            )
+            log.info("[GATE] 주문 최소값 미달 → qty=%s, notional=%.4f < %s", qty, qty*price, min_notional_req)
             return 0.0
 
         # ────── 절반 익절 후 물량 검증 ──────────────────────────────
         # 절반 익절 후 남은 물량이 의미 있는지 미리 확인
         remaining_after_half = qty - math.floor((qty / 2) / step_size) * step_size
         if remaining_after_half < step_size:
-            print(f"[GATE] ⚠️ 절반 익절 후 남은 물량 부족: {remaining_after_half} < {step_size}")
-            print(f"[GATE] ⚠️ 권장: 더 큰 포지션 사이즈 또는 다른 심볼 고려")
+            log.warning("[GATE] ⚠️ 절반 익절 후 남은 물량 부족: %s < %s", remaining_after_half, step_size)
+            log.warning("[GATE] ⚠️ 권장: 더 큰 포지션 사이즈 또는 다른 심볼 고려")
         
-        print(
-            f"[GATE] 수량 계산 → raw_qty={raw_qty}, steps={steps}, "
-            f"qty={qty}, max_steps={max_steps}, "
-            f"min_notional={min_notional_req}, "
-            f"risk_cap={margin_cap}, est_margin={est_margin}, "
-            f"half_exit_remaining={remaining_after_half}"
+        log.info(
+            "[GATE] 수량 계산 → raw_qty=%s, steps=%s, qty=%s, max_steps=%s, min_notional=%s, "
+            "risk_cap=%s, est_margin=%s, half_exit_remaining=%s",
+            raw_qty, steps, qty, max_steps, min_notional_req, margin_cap, est_margin, remaining_after_half,
         )
         return qty
     
     except Exception as e:
-        print(f"[GATE] ❌ 수량 계산 실패: {e}")
+        log.error("[GATE] ❌ 수량 계산 실패: %s", e)
         send_discord_debug(f"[GATE] ❌ 수량 계산 실패: {e}", "gateio")
         return 0.0
     
@@ -687,16 +767,16 @@ def update_take_profit_order(symbol: str, direction: str, take_price: float):
         if qty_tp_raw >= step:
             qty_tp = qty_tp_raw
             remaining_qty = qty_full - qty_tp
-            print(f"[GATE] 절반 익절: {qty_tp}/{qty_full} (남은 물량: {remaining_qty})")
+            log.info("[GATE] 절반 익절: %s/%s (남은 물량: %s)", qty_tp, qty_full, remaining_qty)
         else:
             # 절반 익절이 stepSize보다 작으면 전량 TP
             qty_tp = qty_full
-            print(f"[GATE] ⚠️ 전량 익절 (절반이 stepSize 미달): {qty_tp}/{qty_full}")
+            log.warning("[GATE] ⚠️ 전량 익절 (절반이 stepSize 미달): %s/%s", qty_tp, qty_full)
         
         # 최종 검증: stepSize 미달이면 전량 TP
         if qty_tp < step:
             qty_tp = qty_full
-            print(f"[GATE] ⚠️ stepSize 미달로 전량 익절: {qty_tp}/{qty_full}")
+            log.warning("[GATE] ⚠️ stepSize 미달로 전량 익절: %s/%s", qty_tp, qty_full)
 
         # ① 기존 TP 주문 취소
         try:
@@ -723,12 +803,12 @@ def update_take_profit_order(symbol: str, direction: str, take_price: float):
             text        = "t-TP-UPDATE",
         )
         futures_api.create_futures_order(settle="usdt", futures_order=tp_order)
-        print(f"[TP 갱신] {symbol} LIMIT TP 재설정 완료 → {tp_price} (qty={qty_tp})")
+        log.info("[TP 갱신] %s LIMIT TP 재설정 완료 → %s (qty=%s)", symbol, tp_price, qty_tp)
         send_discord_debug(f"[TP 갱신] {symbol} LIMIT TP 재설정 완료 → {tp_price}", "gateio")
         return True
 
     except Exception as e:
-        print(f"[ERROR] TP 갱신 실패: {symbol} → {e}")
+        log.error("[ERROR] TP 갱신 실패: %s → %s", symbol, e)
         send_discord_debug(f"[ERROR] TP 갱신 실패: {symbol} → {e}", "gateio")
         return False
 
@@ -767,7 +847,7 @@ def verify_sl_exists_gate(symbol: str, expected_sl_price: float = None) -> bool:
         return True
         
     except Exception as e:
-        print(f"[ERROR] Gate SL 검증 실패: {symbol} → {e}")
+        log.error("[ERROR] Gate SL 검증 실패: %s → %s", symbol, e)
         return False
 
 def ensure_stop_loss_gate(symbol: str, direction: str, sl_price: float, max_retries: int = 3) -> bool:
@@ -787,27 +867,27 @@ def ensure_stop_loss_gate(symbol: str, direction: str, sl_price: float, max_retr
     for attempt in range(max_retries):
         # 1. 현재 SL 존재 여부 확인
         if verify_sl_exists_gate(symbol, sl_price):
-            print(f"[SL] {symbol} Gate SL 주문 확인됨 @ {sl_price:.4f}")
+            log.info("[SL] %s Gate SL 주문 확인됨 @ %.4f", symbol, sl_price)
             return True
         
         # 2. SL 주문 생성/업데이트 시도
-        print(f"[SL] {symbol} Gate SL 주문 생성 시도 {attempt + 1}/{max_retries}")
+        log.info("[SL] %s Gate SL 주문 생성 시도 %s/%s", symbol, attempt + 1, max_retries)
         success = update_stop_loss_order(symbol, direction, sl_price)
         
         if success:
             time.sleep(1)  # 주문 반영 대기
             if verify_sl_exists_gate(symbol, sl_price):
-                print(f"[SL] {symbol} Gate SL 주문 생성 성공 @ {sl_price:.4f}")
+                log.info("[SL] %s Gate SL 주문 생성 성공 @ %.4f", symbol, sl_price)
                 return True
         
         # 3. 재시도 대기 (지수 백오프)
         if attempt < max_retries - 1:
             wait_time = 2 ** attempt
-            print(f"[SL] {symbol} Gate SL 설정 실패 - {wait_time}초 후 재시도")
+            log.warning("[SL] %s Gate SL 설정 실패 - %s초 후 재시도", symbol, wait_time)
             time.sleep(wait_time)
     
     # 4. 최종 실패 시 알림
     error_msg = f"[CRITICAL] {symbol} Gate SL 설정 최종 실패 - 수동 확인 필요!"
-    print(error_msg)
+    log.critical("%s", error_msg)
     send_discord_debug(error_msg, "gateio")
     return False
\ No newline at end of file
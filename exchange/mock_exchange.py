@@ -1,153 +1,403 @@
 # exchange/mock_exchange.py
 
 """
-백테스트 전용 가상 거래소
-Binance/Gate API 시그니처와 동일한 함수명을 제공해
-router.py에서 바로 DI 될 수 있도록 설계.
+백테스트 전용 가상 거래소 (심볼별 매칭 엔진)
+Binance/Gate 래퍼와 같은 함수명·인자 순서를 제공해
+router.py 에서 바로 DI 될 수 있도록 설계.
+
+  • 심볼별 장부(_Book) : 포지션(부호 있는 수량) · 평균 진입가 · 최근가
+      ▸ STOP(closePosition) 1개 + reduce-only/일반 LIMIT 주문 여러 개
+  • process_bar() : 봉 고저를 경로 가정에 따라 순서대로 훑으며 체결
+      ▸ ohlc  : O → H → L → C
+      ▸ olhc  : O → L → H → C
+      ▸ worst : 보유 포지션에 불리한 극값 먼저 (롱 O→L→H→C / 숏 O→H→L→C)
+      ▸ 직전가 → 시가 갭에 걸린 주문은 시가로 체결 (STOP 은 갭 손실 반영)
+  • 부분 청산(50 % TP) · reduce-only · 포지션 반전 · 심볼별 수수료 · 펀딩
+  • 닿을 수 있는 주문이 없는 봉은 즉시 반환 → 수백만 봉 스윕용
+  • 포지션이 0 이 되면 왕복 1건을 TRADES 에 기록 (순손익 = 실현 - 수수료 + 펀딩)
+
+  환경변수
+    MOCK_INTRABAR_PATH (worst) · MOCK_TAKER_FEE (0.0005) · MOCK_MAKER_FEE (0.0002)
+    MOCK_SLIPPAGE_PCT (0.0001) · MOCK_FUNDING_RATE (0.0001 / 8h) · MOCK_BALANCE (10000)
 """
 
-from decimal import Decimal
-from dataclasses import dataclass
+import os
+import itertools
+import threading
 from typing import Optional, Dict
 
+from core.log import get_logger
+
+log = get_logger(__name__)
+
 # ─────────────────────────────────────────────────────────────
 #  설정값
 # ─────────────────────────────────────────────────────────────
-TAKER_FEE = Decimal("0.0005")   # 0.05 %
-MAKER_FEE = Decimal("0.0002")   # 0.02 %
-LEVERAGE  = 20
+INTRABAR_PATH = os.getenv("MOCK_INTRABAR_PATH", "worst").lower()
+TAKER_FEE     = float(os.getenv("MOCK_TAKER_FEE", "0.0005"))     # 0.05 %
+MAKER_FEE     = float(os.getenv("MOCK_MAKER_FEE", "0.0002"))     # 0.02 %
+SLIPPAGE_PCT  = float(os.getenv("MOCK_SLIPPAGE_PCT", "0.0001"))  # 시장가·STOP 체결 슬리피지
+FUNDING_RATE  = float(os.getenv("MOCK_FUNDING_RATE", "0.0001"))  # 주기당 (+ → 롱이 지불)
+FUNDING_INTERVAL_MS = 8 * 3_600_000
+INITIAL_BALANCE = float(os.getenv("MOCK_BALANCE", "10000"))
+LEVERAGE      = 20
 
-# 슬리피지(pips) = 체결가 ± 슬리피지
-SLIPPAGE_PCT = Decimal("0.0001")  # 0.01 %
+INTRABAR_PATHS = ("ohlc", "olhc", "worst")
 
-# ─────────────────────────────────────────────────────────────
-#  최근 가격 캐시  (mock_state 모듈 제거)
-# ─────────────────────────────────────────────────────────────
-# backtest.py · main.py 어디서든   set_last_price(Decimal)
-# 만 호출하면 최신가가 업데이트된다.
-_last_price: Decimal = Decimal("0")
+# 심볼별 덮어쓰기  {symbol: (maker, taker)} / {symbol: rate}
+_FEES: Dict[str, tuple] = {}
+_FUNDING: Dict[str, float] = {}
 
-def set_last_price(p: Decimal):
-    global _last_price
-    _last_price = p
+def set_symbol_config(symbol: str, *, maker: float | None = None,
+                      taker: float | None = None, funding_rate: float | None = None):
+    """심볼별 수수료·펀딩비 설정 (지정하지 않은 값은 기본값 유지)"""
+    m, t = _FEES.get(symbol, (MAKER_FEE, TAKER_FEE))
+    _FEES[symbol] = (m if maker is None else maker, t if taker is None else taker)
+    if funding_rate is not None:
+        _FUNDING[symbol] = funding_rate
 
 # ─────────────────────────────────────────────────────────────
 #  데이터 구조
 # ─────────────────────────────────────────────────────────────
-@dataclass
-class Position:
-    side: str           # "LONG" | "SHORT"
-    qty: Decimal
-    entry_price: Decimal
-    leverage: int       = LEVERAGE
-    tp: Optional[Decimal] = None
-    sl: Optional[Decimal] = None
-
-    def pnl(self, last_price: Decimal) -> Decimal:
-        """
-        레버리지 PnL (수수료 제외)
-        """
-        price_diff = (last_price - self.entry_price) if self.side == "LONG" \
-            else (self.entry_price - last_price)
-        return price_diff / self.entry_price * self.leverage
+class _Limit:
+    __slots__ = ("oid", "side", "price", "qty", "reduce")
+
+    def __init__(self, oid: int, side: int, price: float, qty: float, reduce: bool):
+        self.oid, self.side, self.price, self.qty, self.reduce = oid, side, price, qty, reduce
+
+
+class _Book:
+    __slots__ = ("symbol", "qty", "entry", "last", "t", "stop", "stop_id",
+                 "limits", "fund_slot", "trade")
+
+    def __init__(self, symbol: str):
+        self.symbol    = symbol
+        self.qty       = 0.0        # + 롱 / - 숏
+        self.entry     = 0.0
+        self.last      = 0.0
+        self.t         = 0          # 최근 봉 시각 (ms)
+        self.stop      = None       # closePosition STOP 가격
+        self.stop_id   = None
+        self.limits: list[_Limit] = []
+        self.fund_slot = None
+        self.trade     = None       # 진행 중 왕복 기록
+
 
 # ─────────────────────────────────────────────────────────────
 #  내부 상태
 # ─────────────────────────────────────────────────────────────
-_balance  = Decimal("10000")     # 초기 1만 USDT
-_equity   = Decimal("10000")
-_positions: Dict[str, Position] = {}
+_LOCK = threading.RLock()           # 라이브 모드의 SL 병합 타이머 등 다른 스레드 대비
+_books: Dict[str, _Book] = {}
+_ids = itertools.count(1)
+_balance = INITIAL_BALANCE
+TRADES: list[dict] = []             # 종료된 왕복 거래
+
+def _book(symbol: str) -> _Book:
+    b = _books.get(symbol)
+    if b is None:
+        b = _books[symbol] = _Book(symbol)
+    return b
+
+def reset(balance: float = INITIAL_BALANCE):
+    """장부·잔고·거래 기록 초기화 (스윕에서 실행마다 호출)"""
+    global _balance, _ids
+    with _LOCK:
+        _books.clear()
+        TRADES.clear()
+        _balance = float(balance)
+        _ids = itertools.count(1)
+
+def account() -> dict:
+    """잔고 + 미실현 손익"""
+    with _LOCK:
+        upnl = sum((b.last - b.entry) * b.qty for b in _books.values() if b.qty)
+        return {"balance": _balance, "equity": _balance + upnl}
+
+# ─────────────────────────────────────────────────────────────
+#  체결 처리
+# ─────────────────────────────────────────────────────────────
+def _fill(b: _Book, side: int, qty: float, price: float, fee_rate: float,
+          reason: str, reduce: bool = False) -> float:
+    """side(+1 매수 / -1 매도) 로 qty 체결 → 실제 체결 수량 반환"""
+    global _balance
+    pos = b.qty
+    closing = min(qty, abs(pos)) if pos and (pos > 0) != (side > 0) else 0.0
+    if reduce:
+        qty = closing
+    if qty <= 0:
+        return 0.0
+
+    fee = price * qty * fee_rate
+    _balance -= fee
+
+    if closing:
+        realized = (price - b.entry) * closing * (1 if pos > 0 else -1)
+        _balance += realized
+        tr = b.trade
+        tr["pnl"] += realized
+        tr["fees"] += price * closing * fee_rate
+        tr["exit_notional"] += price * closing
+        tr["exit_qty"] += closing
+        tr["reason"] = reason
+        b.qty = pos + side * closing
+        if abs(b.qty) < 1e-12:
+            _close_trade(b)
+
+    opening = qty - closing
+    if opening > 0:
+        if b.qty == 0:
+            b.entry = price
+            b.trade = {
+                "symbol": b.symbol, "direction": "long" if side > 0 else "short",
+                "entry": price, "qty": opening, "entry_time": b.t,
+                "pnl": 0.0, "fees": price * opening * fee_rate, "funding": 0.0,
+                "exit_notional": 0.0, "exit_qty": 0.0, "reason": None,
+            }
+        else:                                   # 같은 방향 추가 → 평균가
+            new_qty = abs(b.qty) + opening
+            b.entry = (b.entry * abs(b.qty) + price * opening) / new_qty
+            b.trade["entry"] = b.entry
+            b.trade["qty"] += opening
+            b.trade["fees"] += price * opening * fee_rate
+        b.qty += side * opening
+    return qty
+
+def _close_trade(b: _Book):
+    """포지션 0 → 왕복 기록 확정, STOP·reduce-only 주문 정리"""
+    tr = b.trade
+    b.qty, b.entry, b.trade = 0.0, 0.0, None
+    b.stop = b.stop_id = None
+    b.limits = [od for od in b.limits if not od.reduce]
+    if tr is None:
+        return
+    exit_px = tr.pop("exit_notional") / tr.pop("exit_qty")
+    net = tr["pnl"] - tr["fees"] + tr["funding"]
+    tr.update(
+        exit=exit_px, exit_time=b.t, net_pnl=net,
+        pnl_pct=net / (tr["entry"] * tr["qty"]),
+    )
+    TRADES.append(tr)
+
+def _apply_funding(b: _Book, t_ms: int, price: float):
+    global _balance
+    slot = t_ms // FUNDING_INTERVAL_MS
+    if b.fund_slot is None:
+        b.fund_slot = slot
+        return
+    n = slot - b.fund_slot
+    if n <= 0:
+        return
+    b.fund_slot = slot
+    if b.qty:
+        pay = b.qty * price * _FUNDING.get(b.symbol, FUNDING_RATE) * n
+        _balance -= pay
+        b.trade["funding"] -= pay
+
+def _next_event(b: _Book, p0: float, p1: float):
+    """p0 → p1 구간에서 가장 먼저 닿는 주문 (없으면 (None, None))"""
+    up = p1 > p0
+    lo, hi = (p0, p1) if up else (p1, p0)
+    hit, level = None, None
+    if b.stop is not None and b.qty and ((b.qty > 0) != up) and lo <= b.stop <= hi:
+        hit, level = "stop", b.stop
+    for od in b.limits:
+        # 매수 LIMIT 은 하락 구간, 매도 LIMIT 은 상승 구간에서 체결
+        if (od.side > 0) == up or not (lo <= od.price <= hi):
+            continue
+        if level is None or (od.price < level if up else od.price > level):
+            hit, level = od, od.price
+    return hit, level
+
+def _sweep(b: _Book, p0: float, p1: float, gap: bool = False):
+    """
+    p0 → p1 으로 가격이 움직이는 동안 닿는 주문을 순서대로 체결
+    gap=True : 직전가 → 시가 점프 구간 → 체결가는 모두 p1(시가)
+    """
+    maker, taker = _FEES.get(b.symbol, (MAKER_FEE, TAKER_FEE))
+    while True:
+        hit, level = _next_event(b, p0, p1)
+        if hit is None:
+            return
+        px = p1 if gap else level
+        if hit == "stop":
+            side = -1 if b.qty > 0 else 1
+            px *= 1 + side * SLIPPAGE_PCT                  # 불리한 쪽으로 슬리피지
+            _fill(b, side, abs(b.qty), px, taker, "sl", reduce=True)
+            b.stop = b.stop_id = None
+        else:
+            b.limits.remove(hit)
+            reason = "tp" if hit.reduce else "limit"
+            _fill(b, hit.side, hit.qty, px, maker, reason, reduce=hit.reduce)
+        p0 = level
+
+def _path(b: _Book, o, h, l, c, mode: str):
+    if mode == "ohlc":
+        return (o, h, l, c)
+    if mode == "olhc":
+        return (o, l, h, c)
+    # worst : 롱은 저가 먼저, 숏은 고가 먼저 (무포지션 → 진입 LIMIT 기준 OHLC)
+    return (o, l, h, c) if b.qty > 0 else (o, h, l, c)
+
+def _reachable(b: _Book, lo: float, hi: float) -> bool:
+    if b.stop is not None and b.qty and lo <= b.stop <= hi:
+        return True
+    for od in b.limits:
+        if lo <= od.price <= hi:
+            return True
+    return False
+
+# ─────────────────────────────────────────────────────────────
+#  러너(backtest.engine) 가 매 봉 호출
+# ─────────────────────────────────────────────────────────────
+def process_bar(symbol: str, t_ms: int, o: float, h: float, l: float, c: float,
+                path: str | None = None) -> int:
+    """
+    봉 1개 매칭 → 이번 봉에서 종료된 왕복 거래 수 반환
+    path : ohlc | olhc | worst (None → MOCK_INTRABAR_PATH)
+    """
+    with _LOCK:
+        b = _book(symbol)
+        b.t = t_ms
+        if b.qty:
+            _apply_funding(b, t_ms, o)
+        else:
+            b.fund_slot = t_ms // FUNDING_INTERVAL_MS
+
+        if b.stop is None and not b.limits:
+            b.last = c
+            return 0
+        prev = b.last or o
+        if not _reachable(b, min(l, prev), max(h, prev)):      # 빠른 경로
+            b.last = c
+            return 0
+
+        n0 = len(TRADES)
+        _sweep(b, prev, o, gap=True)
+        pts = _path(b, o, h, l, c, path or INTRABAR_PATH)
+        for p0, p1 in zip(pts, pts[1:]):
+            _sweep(b, p0, p1)
+        b.last = c
+        return len(TRADES) - n0
+
+def mark_price(symbol: str, price: float, t_ms: int | None = None) -> int:
+    """단일 가격 갱신 & 체결 체크 (틱 단위 러너용)"""
+    b = _book(symbol)
+    return process_bar(symbol, b.t if t_ms is None else t_ms, price, price, price, price)
+
+def set_last_price(symbol: str, price: float):
+    """체결 없이 최근가만 갱신 (시장가 체결 기준가)"""
+    _book(symbol).last = float(price)
 
 # ─────────────────────────────────────────────────────────────
 #  퍼블릭 API (Binance/Gate 래퍼와 동일 시그니처)
 # ─────────────────────────────────────────────────────────────
+def _side(side: str) -> int:
+    return 1 if side.lower() in ("buy", "long") else -1
+
 def place_order(
     symbol: str,
     side: str,
-    order_type: str,
-    quantity: Decimal,
-    price: Optional[Decimal] = None,
-    sl_price: Optional[Decimal] = None,
-    tp_price: Optional[Decimal] = None,
+    quantity: float,
+    order_type: str = "MARKET",
+    price: Optional[float] = None,
+    reduceOnly: bool = False,
+    **_kw,
 ):
     """
-    MARKET → 즉시 체결
-    LIMIT  → 고/저 돌파 시 체결 (백테스트 러너 쪽에서 후속 fill() 호출)
+    MARKET → 최근가 ± 슬리피지로 즉시 체결 (taker)
+    LIMIT  → 시장성 있으면 즉시 체결, 아니면 대기 후 process_bar 에서 체결 (maker)
+    reduceOnly → 반대 방향 보유분까지만 체결, 줄일 포지션이 없으면 거부(False)
     """
-    global _balance
+    with _LOCK:
+        b = _book(symbol)
+        s = _side(side)
+        qty = abs(float(quantity))
+        if not b.last:
+            log.info("[MOCK] %s 최근가 없음 → 주문 거부", symbol)
+            return False
+        maker, taker = _FEES.get(symbol, (MAKER_FEE, TAKER_FEE))
+        oid = next(_ids)
 
-    # 슬리피지 적용
-    effective_price = price or Decimal("0")
-    if order_type == "MARKET":
-        effective_price = _last_price * (1 + SLIPPAGE_PCT) if side == "BUY" \
-            else _last_price * (1 - SLIPPAGE_PCT)
-
-    notional = effective_price * quantity
-    fee = notional * (TAKER_FEE if order_type == "MARKET" else MAKER_FEE)
-    _balance -= fee
+        if order_type.upper() == "LIMIT" and price is not None:
+            px = float(price)
+            if (s > 0 and px < b.last) or (s < 0 and px > b.last):
+                if reduceOnly and not (b.qty and (b.qty > 0) != (s > 0)):
+                    return False
+                b.limits.append(_Limit(oid, s, px, qty, bool(reduceOnly)))
+                return {"orderId": oid, "symbol": symbol, "side": side,
+                        "price": px, "origQty": qty, "status": "NEW"}
 
-    # 포지션 생성/증가 (단순 1 포지션 모델)
-    _positions[symbol] = Position(
-        side="LONG" if side == "BUY" else "SHORT",
-        qty=quantity,
-        entry_price=effective_price,
-        tp=tp_price,
-        sl=sl_price,
-    )
-
-    return {
-        "symbol": symbol,
-        "side": side,
-        "price": effective_price,
-        "qty": str(quantity),
-        "status": "FILLED",
-    }
+        px = b.last * (1 + s * SLIPPAGE_PCT)
+        filled = _fill(b, s, qty, px, taker, "market", reduce=bool(reduceOnly))
+        if filled <= 0:
+            return False
+        return {"orderId": oid, "symbol": symbol, "side": side,
+                "avgPrice": px, "executedQty": filled, "status": "FILLED"}
 
+def place_order_with_tp_sl(symbol: str, side: str, quantity: float, tp: float, sl: float, **_kw) -> bool:
+    """시장 진입 + 절반 TP(reduce-only LIMIT) + 전량 STOP (라이브 브래킷과 동일 구성)"""
+    with _LOCK:
+        if not place_order(symbol, side, quantity):
+            return False
+        direction = "long" if _side(side) > 0 else "short"
+        update_take_profit_order(symbol, direction, tp)
+        return update_stop_loss_order(symbol, direction, sl) is not False
 
-def get_open_position(symbol: str) -> Optional[dict]:
-    pos = _positions.get(symbol)
-    if not pos:
+def get_open_position(symbol: str, *_args, **_kw) -> Optional[dict]:
+    b = _books.get(symbol)
+    if b is None or not b.qty:
         return None
     return {
-        "symbol": symbol,
-        "side": pos.side,
-        "entryPrice": str(pos.entry_price),
-        "positionAmt": str(pos.qty),
-        "leverage": pos.leverage,
-        "takeProfit": str(pos.tp) if pos.tp else None,
-        "stopLoss": str(pos.sl) if pos.sl else None,
+        "symbol":      symbol,
+        "direction":   "long" if b.qty > 0 else "short",
+        "entry":       b.entry,
+        "size":        abs(b.qty),
+        "positionAmt": b.qty,
+        "leverage":    LEVERAGE,
+        "takeProfit":  next((od.price for od in b.limits if od.reduce), None),
+        "stopLoss":    b.stop,
     }
 
+def get_all_open_positions() -> Dict[str, dict]:
+    return {s: p for s in list(_books) if (p := get_open_position(s))}
 
-def update_stop_loss_order(symbol: str, new_sl: Decimal):
-    if symbol in _positions:
-        _positions[symbol].sl = new_sl
-    return True
-
-
-def update_take_profit_order(symbol: str, new_tp: Decimal):
-    if symbol in _positions:
-        _positions[symbol].tp = new_tp
-    return True
-
-
-# 러너(backtest.py) 가 매 tick 호출
-def mark_price(symbol: str, price: Decimal):
+def update_stop_loss_order(symbol: str, direction: str, stop_price: float):
     """
-    가격 갱신 & TP/SL 체결 체크
+    closePosition STOP 교체 → 새 주문 ID 반환
+    즉시 트리거될 가격이면 거부(False) – Binance -2021 과 동일
     """
-    global _balance
-    pos = _positions.get(symbol)
-    if not pos:
-        return
+    with _LOCK:
+        b = _book(symbol)
+        stop = float(stop_price)
+        if b.last and ((direction == "long" and stop >= b.last)
+                       or (direction == "short" and stop <= b.last)):
+            log.info("[MOCK] %s SL %s 즉시 트리거 가격 → 거부", symbol, stop)
+            return False
+        b.stop, b.stop_id = stop, next(_ids)
+        return b.stop_id
 
-    # TP / SL   – 시장가로 가정
-    hit_tp = pos.tp and (price >= pos.tp if pos.side == "LONG" else price <= pos.tp)
-    hit_sl = pos.sl and (price <= pos.sl if pos.side == "LONG" else price >= pos.sl)
+def update_take_profit_order(symbol: str, direction: str, take_price: float):
+    """기존 reduce-only LIMIT 을 모두 취소하고 보유 수량의 절반으로 TP 재발주"""
+    with _LOCK:
+        b = _book(symbol)
+        if not b.qty:
+            return False
+        b.limits = [od for od in b.limits if not od.reduce]
+        side = -1 if direction == "long" else 1
+        oid = next(_ids)
+        b.limits.append(_Limit(oid, side, float(take_price), abs(b.qty) / 2, True))
+        return oid
 
-    if hit_tp or hit_sl:
-        notional = pos.qty * price
-        fee = notional * TAKER_FEE
-        pnl = pos.pnl(price) * pos.qty * pos.entry_price
-        _balance += pnl - fee
-        del _positions[symbol]
+def cancel_order(symbol: str, order_id: int) -> bool:
+    with _LOCK:
+        b = _books.get(symbol)
+        if b is None:
+            return False
+        if b.stop_id == order_id:
+            b.stop = b.stop_id = None
+            return True
+        for od in b.limits:
+            if od.oid == order_id:
+                b.limits.remove(od)
+                return True
+        return False
@@ -0,0 +1,55 @@
+# exchange/order_pipeline.py
+"""
+진입 → 보호(SL) 구간 단축용 주문 파이프라인 헬퍼
+
+  • submit_legs()   : TP·SL 등 브래킷 레그를 스레드 풀에서 **동시에** 발행
+  • record_protect_latency() : 진입 전송 → SL 접수까지 걸린 시간 기록
+      - 해당 구간은 포지션이 보호받지 못하는 순수 리스크 구간이므로
+        core.metrics 히스토그램으로 1급 지표로 관리한다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from core.metrics import observe
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+# 브래킷 레그는 2~3개 → 소수 워커로 충분 (심볼 여러 개 동시 진입 대비 4)
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bracket")
+
+ENTRY_TO_PROTECTED = "order_entry_to_protected_seconds"
+FILL_TO_PROTECTED  = "order_fill_to_protected_seconds"
+
+
+def submit_legs(**legs: Callable[[], object]) -> Dict[str, object]:
+    """
+    레그 이름 → 호출 가능 객체를 받아 동시에 실행한다.
+    반환: {레그 이름: 결과값 | 발생한 Exception}
+      ▸ 한 레그가 실패해도 다른 레그 결과는 그대로 돌려준다.
+    """
+    futures = {name: _EXECUTOR.submit(fn) for name, fn in legs.items()}
+    out: Dict[str, object] = {}
+    for name, fut in futures.items():
+        try:
+            out[name] = fut.result()
+        except Exception as e:          # 레그별 실패는 호출부에서 판단
+            out[name] = e
+    return out
+
+
+def record_protect_latency(
+    exchange: str,
+    symbol: str,
+    t_entry: float,
+    t_fill: float,
+    t_protected: float,
+) -> None:
+    """perf_counter() 기준 세 시각으로 진입→보호 지연을 기록·출력"""
+    observe(ENTRY_TO_PROTECTED, t_protected - t_entry, exchange=exchange)
+    observe(FILL_TO_PROTECTED,  t_protected - t_fill,  exchange=exchange)
+    log.info(
+        "[LATENCY] %s entry→protected %.1fms (fill→protected %.1fms)",
+        symbol, (t_protected - t_entry) * 1e3, (t_protected - t_fill) * 1e3,
+    )
@@ -5,11 +5,13 @@ from exchange.binance_api import (
     update_stop_loss_order as binance_sl,
     update_take_profit_order as binance_tp,      # ★ NEW
     get_open_position       as binance_pos,
+    get_all_open_positions  as binance_all_pos,
     place_order             as binance_place,
 )
 # ───────── Gate ───────────
 from exchange.gate_sdk import (
     get_open_position         as gate_pos,
+    get_all_open_positions    as gate_all_pos,
     update_stop_loss_order    as gate_sl,
     update_take_profit_order  as gate_tp,        # ★ NEW
     normalize_contract_symbol as to_gate,
@@ -23,10 +25,18 @@ if ENABLE_MOCK:
         update_stop_loss_order  as mock_sl,
         update_take_profit_order as mock_tp,
         get_open_position       as mock_pos,
+        get_all_open_positions  as mock_all_pos,
     )
 
 # ── 표준 라이브러리 ─────────────────────────────
-from decimal import Decimal
+import threading
+import time
+from decimal import Decimal, ROUND_DOWN, ROUND_UP
+from config.settings import SL_COALESCE_WINDOW_SEC
+from core.metrics import counter
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 # ------------------------------------------------------------------
 #  tickSize  통합 랩퍼  (Binance / Gate 공용)  ―  lazy-import 로 순환 차단
@@ -53,14 +63,29 @@ def get_tick_size(symbol: str) -> float:
 # Discord 로깅 (SL/TP·포지션 오류 알림용)  ★ NEW
 from notify.discord import send_discord_debug
 # Gate 심볼 집합(BTC_USDT 형식) 생성 (미지원 심볼 스킵)
-from config.settings import SYMBOLS_GATE
+from config.settings import SYMBOLS_GATE, on_bootstrap
 GATE_SET = set()
-for sym in SYMBOLS_GATE:
-    try:
-        GATE_SET.add(to_gate(sym))
-    except ValueError as e:
-        # 콘솔에 경고. 필요시 send_discord_debug 로 대체 가능
-        print(f"[WARN] Gate 심볼 변환 실패, 스킵: {sym} ({e})")
+
+def _rebuild_gate_set():
+    """settings.bootstrap() 으로 SYMBOLS_GATE 가 확정된 뒤 다시 계산"""
+    if ENABLE_MOCK:
+        return
+    GATE_SET.clear()
+    for sym in SYMBOLS_GATE:
+        try:
+            GATE_SET.add(to_gate(sym))
+        except ValueError as e:
+            # 콘솔에 경고. 필요시 send_discord_debug 로 대체 가능
+            log.warning("[WARN] Gate 심볼 변환 실패, 스킵: %s (%s)", sym, e)
+
+on_bootstrap(_rebuild_gate_set)
+
+def base_quantity(symbol: str, size: float) -> float:
+    """포지션 size → 기초자산 수량 (Gate 는 계약 수 × quanto_multiplier · Binance/Mock 그대로)"""
+    if symbol not in GATE_SET:
+        return size
+    from exchange.gate_sdk import get_quanto_multiplier
+    return size * get_quanto_multiplier(symbol)
 
 # ─────────────────────────────────────────────
 #  ▶ Mock 모드일 때 binance/gate 함수를 전부 Mock 으로 덮어쓰기
@@ -72,6 +97,7 @@ if ENABLE_MOCK:
         update_stop_loss_order  as mock_sl,
         update_take_profit_order as mock_tp,
         get_open_position       as mock_pos,
+        get_all_open_positions  as mock_all_pos,
     )
 
     # 동일한 이름으로 재지정 (trader.py 등 기존 코드 수정 불필요)
@@ -83,46 +109,242 @@ if ENABLE_MOCK:
     # Gate 구분 세트는 의미 없으므로 비워둔다
     GATE_SET.clear()
 
-def update_stop_loss(symbol: str, direction: str, stop_price: float):
+# ──────────────────────────────────────────────────────────────
+#  SL 정정 병합(coalescing) 엔진
+#   • 심볼별로 "거래소에 나가 있는 SL" 과 "원하는 SL" 을 로컬에 보관
+#   • tick 라운딩 후 값이 같으면 REST 호출 없이 no-op
+#   • 직전 발주 후 SL_COALESCE_WINDOW_SEC 이내(또는 발주 진행 중) 요청은 마지막 값만 남겨
+#     윈도우 종료 시 타이머가 1회 발주 (트렌드장 주문 churn 감소)
+#   • SL_DEFERRED 는 "아직 발주 전" – 호출 측은 SL 이 바뀐 것으로 취급하지 않는다
+#     ▸ 타이머 발주 결과는 on_result(level, res) 로 통지 (res = 주문 ID / True / False)
+#   • REST 호출 동안은 심볼 락을 풀어 둠 → 다른 요청은 기다리지 않고 병합 대기열로
+#   • 발주 후 오픈 주문에서 실제 SL 가격을 다시 읽어 sent 에 기록 (mark 근접 보정 반영)
+#   • reset_sl_state() : 대기 타이머 취소 + epoch 증가 → 진행 중이던 발주 결과·콜백 폐기
+# ──────────────────────────────────────────────────────────────
+SL_DEFERRED = "deferred"        # 병합 대기열에 적재됨 (발주 결과는 on_result 로)
+
+# SL 정정 결과별 카운터 (sent·failed 는 거래소별)
+_SL_AMEND = {
+    (ex, res): counter("sl_amendments_total", exchange=ex, result=res)
+    for ex in ("binance", "gate") for res in ("sent", "failed")
+}
+_SL_NOOP     = counter("sl_amendments_total", exchange="local", result="noop")
+_SL_COALESCE = counter("sl_amendments_total", exchange="local", result="deferred")
+
+class _SlState:
+    __slots__ = ("lock", "direction", "sent", "desired", "last_sent", "timer",
+                 "inflight", "epoch", "on_result")
+
+    def __init__(self):
+        self.lock      = threading.RLock()
+        self.direction = None
+        self.sent      = None      # 거래소에 반영된 SL (실제 발주가 · tick 라운딩 값)
+        self.desired   = None      # 윈도우 종료 시 발주할 SL
+        self.last_sent = 0.0       # monotonic
+        self.timer     = None
+        self.inflight  = False     # 발주 REST 진행 중
+        self.epoch     = 0         # reset 마다 +1 (지난 포지션의 발주 결과 폐기용)
+        self.on_result = None      # 대기 중인 요청의 결과 콜백
+
+_SL_STATE: dict[str, _SlState] = {}
+_SL_STATE_LOCK = threading.Lock()
+_TICK_CACHE: dict[str, float] = {}
+
+def _sl_state(symbol: str) -> _SlState:
+    st = _SL_STATE.get(symbol)
+    if st is None:
+        with _SL_STATE_LOCK:
+            st = _SL_STATE.setdefault(symbol, _SlState())
+    return st
+
+def _cached_tick(symbol: str) -> float:
+    """tickSize 는 거의 변하지 않으므로 심볼별 1회만 조회"""
+    tick = _TICK_CACHE.get(symbol)
+    if not tick:
+        tick = get_tick_size(symbol)
+        if tick:
+            _TICK_CACHE[symbol] = tick
+    return tick
+
+def _round_stop(stop_price: float, tick: float, direction: str) -> float:
+    """SL 을 tick 배수로 라운딩 (롱 ↓ / 숏 ↑ → 항상 보수적인 쪽)"""
+    if not tick:
+        return float(stop_price)
+    rounding = ROUND_DOWN if direction == "long" else ROUND_UP
+    return float(
+        Decimal(str(stop_price)).quantize(Decimal(str(tick)), rounding=rounding)
+    )
+
+def _current_sl_price(sym: str) -> float | None:
+    """거래소 오픈 주문에서 현재 SL 가격 조회 (시드 · 발주 후 확인용)"""
+    try:
+        if sym in GATE_SET:                 # ── Gate
+            from exchange.gate_sdk import get_open_orders
+            for o in get_open_orders(sym):
+                if o.get("type") == "trigger" and o.get("reduce_only"):
+                    return float(o["price"])
+        else:                               # ── Binance
+            from exchange.binance_api import client, ORDER_TYPE_STOP_MARKET
+            b_sym = sym.replace("_", "")
+            for o in client.futures_get_open_orders(symbol=b_sym):
+                if o["type"] == ORDER_TYPE_STOP_MARKET and (
+                    o.get("reduceOnly") or o.get("closePosition")
+                ):
+                    return float(o["stopPrice"])
+    except Exception as e:
+        log.warning("[router] SL 가격 조회 실패(%s) → %s", sym, e)
+    return None
+
+def _dispatch_sl(symbol: str, direction: str, stop_price: float):
+    if symbol in GATE_SET:       # Gate 심볼이면
+        ex, res = "gate", gate_sl(symbol, direction, stop_price)
+    else:
+        ex, res = "binance", binance_sl(symbol, direction, stop_price)
+    _SL_AMEND[ex, "failed" if res is False else "sent"].inc()
+    return res
+
+def _placed_level(symbol: str, direction: str, level: float) -> float:
+    """발주 직후 거래소에 실제로 걸린 SL (mark 근접 보정 반영 · 조회 실패/Mock → 요청 값)"""
+    if ENABLE_MOCK:
+        return level
+    px = _current_sl_price(symbol)
+    return level if px is None else _round_stop(px, _cached_tick(symbol), direction)
+
+def _send(st: _SlState, symbol: str, direction: str, level: float):
+    """
+    st.lock 1회 보유 상태에서 호출 – 락을 풀고 발주한 뒤 다시 잡아 로컬 상태 갱신
+    반환 (res, placed, current)
+      placed  : 거래소에 실제로 걸린 SL (실패 시 None)
+      current : False 면 발주 도중 reset 됨 → 결과를 반영하지 말 것
+    """
+    if st.timer is not None:
+        st.timer.cancel()
+        st.timer = None
+    st.desired = None
+    st.inflight = True
+    epoch = st.epoch
+    st.lock.release()
+    try:
+        res = _dispatch_sl(symbol, direction, level)
+        placed = None if res is False else _placed_level(symbol, direction, level)
+    finally:
+        st.lock.acquire()
+        if st.epoch == epoch:
+            st.inflight = False
+    if st.epoch != epoch:
+        return res, placed, False
+    if res is not False:
+        st.sent      = placed
+        st.last_sent = time.monotonic()
+    return res, placed, True
+
+def _arm_timer(st: _SlState, symbol: str, delay: float):
+    if st.timer is None:
+        st.timer = threading.Timer(max(delay, 0.05), _flush_sl, args=(symbol,))
+        st.timer.daemon = True
+        st.timer.start()
+
+def _flush_sl(symbol: str):
+    """병합 윈도우 종료 → 마지막으로 원했던 SL 1회 발주 · 결과를 on_result 로 통지"""
+    st = _sl_state(symbol)
+    with st.lock:
+        st.timer = None
+        if st.inflight:                         # 직전 발주가 아직 진행 중 → 다음 윈도우로
+            if st.desired is not None:
+                _arm_timer(st, symbol, SL_COALESCE_WINDOW_SEC)
+            return
+        level, direction, on_result = st.desired, st.direction, st.on_result
+        st.desired = st.on_result = None
+        if level is None or direction is None:
+            return
+        if level == st.sent:
+            res, placed, current = True, level, True
+        else:
+            res, placed, current = _send(st, symbol, direction, level)
+    if not current:
+        return
+    if res is False:
+        msg = f"[router] 병합 SL 발주 실패: {symbol} → {level}"
+        log.warning("%s", msg)
+        send_discord_debug(msg, "aggregated")
+    if on_result is not None:
+        try:
+            on_result(level if placed is None else placed, res)
+        except Exception as e:
+            log.warning("[router] 병합 SL 결과 처리 실패(%s) → %s", symbol, e)
+
+def reset_sl_state(symbol: str):
+    """포지션 종료/신규 진입 시 로컬 SL 상태 초기화 (대기 중 발주 취소 · 진행 중 결과 폐기)"""
+    st = _SL_STATE.get(symbol)
+    if st is None:
+        return
+    with st.lock:
+        if st.timer is not None:
+            st.timer.cancel()
+        st.direction = st.sent = st.desired = st.timer = st.on_result = None
+        st.last_sent = 0.0
+        st.inflight  = False
+        st.epoch    += 1
+
+def update_stop_loss(symbol: str, direction: str, stop_price: float, *,
+                     force: bool = False, on_result=None):
     """
     symbol 예시
       - Binance : BTCUSDT
       - Gate    : BTC_USDT  ← 이미 변환된 값
+
+    반환
+      - True        : tick 라운딩 후 현재 SL 과 동일 → no-op
+      - SL_DEFERRED : 병합 윈도우 내 요청 → 아직 발주 전 (SL 미변경으로 취급할 것)
+                      윈도우 종료 시 발주 후 on_result(실제 SL, 거래소 반환값) 호출
+                      (더 새 요청에 밀리면 그 요청의 on_result 만 호출)
+      - 그 외       : 거래소 함수 반환값 (주문 ID / True / False)
+    force=True 이면 로컬 상태·윈도우를 무시하고 즉시 발주 (SL 보장 경로용)
     """
-    print(f"[router] SL 갱신 요청: {symbol} → {stop_price}")
+    tick  = _cached_tick(symbol)
+    level = _round_stop(stop_price, tick, direction)
+    st    = _sl_state(symbol)
 
-    # ────────────────────────────────────────────────
-    #   ▶ 현재 “오픈 주문” 중 STOP-MARKET 이 있는지 살펴보고
-    #     stopPrice 가 변동 없으면 재발주하지 않음
-    # ────────────────────────────────────────────────
+    with st.lock:
+        if st.direction != direction:           # 방향 전환 = 다른 포지션
+            reset_sl_state(symbol)
+            st.direction = direction
 
-    def _current_sl_price(sym: str) -> float | None:
-        try:
-            if sym in GATE_SET:                 # ── Gate
-                from exchange.gate_sdk import get_open_orders
-                for o in get_open_orders(sym):
-                    if o.get("type") == "trigger" and o.get("reduce_only"):
-                        return float(o["price"])
-            else:                               # ── Binance
-                from exchange.binance_api import client, ORDER_TYPE_STOP_MARKET
-                b_sym = sym.replace("_", "")
-                for o in client.futures_get_open_orders(symbol=b_sym):
-                    if o["type"] == ORDER_TYPE_STOP_MARKET and (
-                        o.get("reduceOnly") or o.get("closePosition")
-                    ):
-                        return float(o["stopPrice"])
-        except Exception as e:
-            print(f"[router] SL 가격 조회 실패({sym}) → {e}")
-        return None
+        if force:
+            log.info("[router] SL 갱신 요청(force): %s → %s", symbol, level)
+            st.on_result = None
+            return _send(st, symbol, direction, level)[0]
 
-    tick = get_tick_size(symbol)
-    cur_sl = _current_sl_price(symbol)
-    if cur_sl is not None and abs(cur_sl - stop_price) < float(tick):
-        # ±1 tick 이내면 동일 주문으로 간주 → no-op
-        return True
-    if symbol in GATE_SET:       # Gate 심볼이면
-        return gate_sl(symbol, direction, stop_price)
-    return binance_sl(symbol, direction, stop_price)
+        # ① 로컬 상태가 없을 때만 거래소 오픈 주문으로 시드
+        if st.sent is None and not st.inflight:
+            cur_sl = _current_sl_price(symbol)
+            if cur_sl is not None:
+                st.sent = _round_stop(cur_sl, tick, direction)
+
+        # ② tick 라운딩 기준 동일 레벨 → no-op (대기 중 값도 폐기)
+        if st.sent is not None and level == st.sent and not st.inflight:
+            if st.timer is not None:
+                st.timer.cancel()
+                st.timer = None
+            st.desired = st.on_result = None
+            _SL_NOOP.inc()
+            return True
+
+        # ③ 병합 윈도우 이내 · 발주 진행 중 → 최신 값만 보관하고 타이머 예약
+        elapsed = time.monotonic() - st.last_sent
+        if st.inflight or (SL_COALESCE_WINDOW_SEC > 0 and elapsed < SL_COALESCE_WINDOW_SEC):
+            st.desired, st.on_result = level, on_result
+            _arm_timer(
+                st, symbol,
+                SL_COALESCE_WINDOW_SEC if st.inflight else SL_COALESCE_WINDOW_SEC - elapsed,
+            )
+            _SL_COALESCE.inc()
+            return SL_DEFERRED
+
+        # ④ 즉시 발주
+        log.info("[router] SL 갱신 요청: %s → %s", symbol, level)
+        st.on_result = None
+        return _send(st, symbol, direction, level)[0]
 
 # ==========================================================
 #   NEW : TP(리미트) 가격 수정 라우터
@@ -134,7 +356,7 @@ def update_take_profit(symbol: str, direction: str, take_price: float):
       - Binance : `update_take_profit_order()` 사용  
       - Gate    : reduce-only LIMIT 주문 재발주 방식
     """
-    print(f"[router] TP 갱신 요청: {symbol} → {take_price}")
+    log.info("[router] TP 갱신 요청: %s → %s", symbol, take_price)
     try:
         # ① tickSize 라운드(거래소별 함수에서도 재확인하지만 1차 보정) ★
         tick = get_tick_size(symbol)
@@ -145,7 +367,7 @@ def update_take_profit(symbol: str, direction: str, take_price: float):
             return gate_tp(symbol, direction, take_price)
         return binance_tp(symbol, direction, take_price)
     except Exception as e:
-        print(f"[router] TP 갱신 실패: {e}")
+        log.warning("[router] TP 갱신 실패: %s", e)
         return False
     
 def cancel_order(symbol: str, order_id: int):
@@ -153,7 +375,11 @@ def cancel_order(symbol: str, order_id: int):
     Gate:  ❯ price_triggered_order 를 **ID 로 직접 취소**
            (더 이상 포지션을 강제 종료하지 않음)
     Binance: 기존 로직 유지
+    Mock   : 가상 거래소 장부에서 주문 제거
     """
+    if ENABLE_MOCK:
+        from exchange.mock_exchange import cancel_order as mock_cancel
+        return mock_cancel(symbol, order_id)
     if "_USDT" in symbol:
         from exchange.gate_sdk import cancel_price_trigger      # ★ NEW
         return cancel_price_trigger(order_id)
@@ -186,7 +412,27 @@ def get_open_position(symbol: str, *args, **kwargs):
     except Exception as e:
         exch = "Gate" if "_USDT" in symbol else "Binance"
         msg  = f"[WARN] {exch} 포지션 조회 실패: {symbol} → {e}"
-        print(msg)
+        log.warning("%s", msg)
+        send_discord_debug(msg, "aggregated")
+        return None
+
+def get_all_open_positions() -> dict[str, dict] | None:
+    """
+    전 심볼 포지션 스냅샷 1회 조회 (심볼별 REST N 회 대신 거래소당 1 회)
+
+    ▸ 키 = 내부 심볼 표기 (Binance "BTCUSDT" · Gate "BTC_USDT")
+    ▸ 한 거래소라도 실패하면 None → 호출 측은 '포지션 없음' 판정을 보류해야 함
+    """
+    try:
+        if ENABLE_MOCK:
+            return mock_all_pos()
+        live = dict(binance_all_pos())
+        if GATE_SET:
+            live.update(gate_all_pos())
+        return live
+    except Exception as e:
+        msg = f"[WARN] 전체 포지션 조회 실패 → {e}"
+        log.warning("%s", msg)
         send_discord_debug(msg, "aggregated")
         return None
 
@@ -255,7 +501,7 @@ def close_position_partial(symbol: str, ratio: float = 0.5):
     """
     pos = get_open_position(symbol)
     if not pos:
-        print(f"[PARTIAL CLOSE] {symbol} 포지션 없음")
+        log.info("[PARTIAL CLOSE] %s 포지션 없음", symbol)
         return None
 
     # ── 1) 수량 추출 ──────────────────────────────
@@ -275,7 +521,7 @@ def close_position_partial(symbol: str, ratio: float = 0.5):
 
     total_size = _pos_size(pos)
     if total_size == 0:
-        print(f"[PARTIAL CLOSE] {symbol} 포지션 사이즈 0")
+        log.info("[PARTIAL CLOSE] %s 포지션 사이즈 0", symbol)
         return None
 
     # 청산할 수량 계산
@@ -290,21 +536,24 @@ def close_position_partial(symbol: str, ratio: float = 0.5):
 
     side = "sell" if direction == "long" else "buy"
 
-    print(f"[PARTIAL CLOSE] {symbol} {direction.upper()} 부분 청산: {partial_size:.6f} / {total_size:.6f} ({ratio*100:.1f}%)")
+    log.info(
+        "[PARTIAL CLOSE] %s %s 부분 청산: %.6f / %.6f (%.1f%%)",
+        symbol, direction.upper(), partial_size, total_size, ratio*100,
+    )
 
     # ── 3) 거래소별 주문 라우팅 ────────────────────
     if "_USDT" in symbol:      # Gate
         ok = gate_place(symbol, side, partial_size,
                         order_type="MARKET", reduceOnly=True)
         if not ok:
-            print(f"[PARTIAL CLOSE] {symbol} Gate 부분 청산 실패")
+            log.warning("[PARTIAL CLOSE] %s Gate 부분 청산 실패", symbol)
             return None
         return ok
     # Binance
     ok = binance_place(symbol, side, partial_size,
                        order_type="MARKET", reduceOnly=True)
     if not ok:
-        print(f"[PARTIAL CLOSE] {symbol} Binance 부분 청산 실패")
+        log.warning("[PARTIAL CLOSE] %s Binance 부분 청산 실패", symbol)
         return None
     return ok
     
@@ -1,6 +1,10 @@
 #test_position_flow.py
 
 import os
+import time
+import atexit
+import threading
+from collections import deque
 import requests
 from dotenv import load_dotenv
 
@@ -15,19 +19,178 @@ WEBHOOKS = {
     "aggregated_message": os.getenv("SEND_MESSAGE_AGGREGATED"),
 }
 
-def _send_discord(message: str, category: str, exchange: str):
-    key = f"{exchange}_{category}"
+# NOTIFY_DISABLED=1 → 모든 전송을 큐에 넣지 않고 버림 (백테스트·리플레이·스윕 워커)
+NOTIFY_DISABLED = os.getenv("NOTIFY_DISABLED", "0").lower() in ("1", "true", "yes")
+if NOTIFY_DISABLED:
+    WEBHOOKS.update({k: None for k in WEBHOOKS})
+
+# ─────────────────────────────────────────────────────────────
+#  비동기 전송 큐
+#   • send_* 는 큐에 넣고 즉시 반환 → 트레이딩 핫패스가 웹훅을 기다리지 않음
+#   • 워커 스레드가 DISCORD_FLUSH_SEC 마다 채널별로 모아 1건으로 전송
+#   • 파일도 같은 큐로 → 큐에 들어온 순서대로 전송 (파일 앞의 텍스트 묶음을 먼저 보냄)
+#   • 큐가 가득 차면 가장 오래된 항목부터 버림 (drop-oldest)
+#   • 429 → 해당 채널만 retry_after 동안 보류 (워커는 잠들지 않음)
+#       ▸ 보류 채널의 항목·미전송 묶음은 큐 앞쪽으로 되돌려 다음 drain 에서 재시도
+#       ▸ 다른 채널 전송은 그대로 진행
+# ─────────────────────────────────────────────────────────────
+FLUSH_INTERVAL_SEC = float(os.getenv("DISCORD_FLUSH_SEC", "2"))
+QUEUE_MAXLEN       = int(os.getenv("DISCORD_QUEUE_MAX", "1000"))
+REQUEST_TIMEOUT    = float(os.getenv("DISCORD_TIMEOUT_SEC", "5"))
+MAX_CONTENT_LEN    = 2000          # Discord 메시지 본문 한도
+
+_queue: deque = deque(maxlen=QUEUE_MAXLEN)   # (webhook_key, text | None, file | None)
+_wake  = threading.Event()
+_idle  = threading.Event()
+_idle.set()
+_retry_at: dict[str, float] = {}             # 채널별 429 해제 시각
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+dropped = 0                                  # 오버플로로 버린 건수
+
+def queue_depth() -> int:
+    return len(_queue)
+
+def pending() -> deque:
+    """대기 중인 (키, 텍스트, 파일) 큐 – /memory 측정용 (main 에서 등록)"""
+    return _queue
+
+def queue_samples():
+    """/metrics 수집기 (main 에서 register_collector 로 등록)"""
+    return [
+        ("notify_queue_depth", {"channel": "discord"}, len(_queue)),
+        ("notify_dropped_total", {"channel": "discord"}, dropped),
+    ]
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="discord-notify", daemon=True)
+            _worker.start()
+
+def _enqueue(key: str, text: str | None = None, file: tuple | None = None):
+    global dropped
+    if NOTIFY_DISABLED:
+        return
+    if len(_queue) == _queue.maxlen:
+        dropped += 1                          # deque(maxlen) 가 가장 오래된 항목 제거
+    _idle.clear()
+    _queue.append((key, text, file))
+    _ensure_worker()
+    if file is not None:
+        _wake.set()                           # 파일은 배치 대상이 아님 → 바로 깨움
+
+def _cooling(key: str) -> bool:
+    return _retry_at.get(key, 0) > time.monotonic()
+
+def _post(key: str, **kwargs) -> bool:
+    """
+    단건 POST
+      ▸ False = 429 로 보류 (호출자가 큐로 되돌림) · 그 외(성공·오류)는 True
+    """
     url = WEBHOOKS.get(key)
     if not url:
         print(f"[DISCORD] ❌ 웹훅 URL 없음: {key}")
-        return
+        return True
     try:
-        data = {"content": message}
-        response = requests.post(url, json=data)
-        if response.status_code not in (200, 204):
-            print(f"[DISCORD] ❌ 응답 오류 {response.status_code} → {response.text}")
+        response = requests.post(url, timeout=REQUEST_TIMEOUT, **kwargs)
     except Exception as e:
         print(f"[DISCORD] ❌ 전송 실패 → {e}")
+        return True
+    if response.status_code == 429:
+        try:
+            retry_after = float(response.json().get("retry_after", 1))
+        except Exception:
+            retry_after = float(response.headers.get("Retry-After", 1))
+        _retry_at[key] = time.monotonic() + retry_after
+        return False
+    if response.status_code not in (200, 204):
+        print(f"[DISCORD] ❌ 응답 오류 {response.status_code} → {response.text}")
+    return True
+
+def _chunks(lines: list[str]):
+    """채널별 메시지들을 2000자 이하 묶음으로 분할"""
+    buf, size = [], 0
+    for line in lines:
+        line = line[:MAX_CONTENT_LEN]
+        if buf and size + len(line) + 1 > MAX_CONTENT_LEN:
+            yield "\n".join(buf)
+            buf, size = [], 0
+        buf.append(line)
+        size += len(line) + 1
+    if buf:
+        yield "\n".join(buf)
+
+def _post_batches(batches: dict[str, list[str]], held: set, deferred: list):
+    for key, lines in batches.items():
+        chunks = list(_chunks(lines))
+        for n, content in enumerate(chunks):
+            if key in held or not _post(key, json={"content": content}):
+                held.add(key)
+                deferred.extend((key, c, None) for c in chunks[n:])
+                break
+    batches.clear()
+
+def _requeue(deferred: list):
+    """보류 항목을 큐 앞쪽으로 (원래 순서 유지 · 넘치면 최신 항목부터 버려짐)"""
+    global dropped
+    if not deferred:
+        return
+    dropped += max(0, len(_queue) + len(deferred) - QUEUE_MAXLEN)
+    _queue.extendleft(reversed(deferred))
+
+def _drain():
+    batches: dict[str, list[str]] = {}
+    held: set[str] = set()                    # 이번 drain 에서 보류된 채널 → 뒤 항목도 보류 (순서 보장)
+    deferred: list[tuple] = []
+    while _queue:
+        try:
+            item = _queue.popleft()
+        except IndexError:
+            break
+        key, text, file = item
+        if key in held or _cooling(key):
+            held.add(key)
+            deferred.append(item)
+        elif file is not None:
+            _post_batches(batches, held, deferred)    # 파일보다 먼저 들어온 텍스트부터
+            if key in held:
+                deferred.append(item)
+                continue
+            name, data = file
+            if not _post(key, files={"file": (name, data)}):
+                held.add(key)
+                deferred.append(item)
+        else:
+            batches.setdefault(key, []).append(text)
+    _post_batches(batches, held, deferred)
+    _requeue(deferred)
+
+def _run():
+    while True:
+        _wake.wait(FLUSH_INTERVAL_SEC)
+        _wake.clear()
+        try:
+            _drain()
+        except Exception as e:
+            print(f"[DISCORD] ❌ 워커 오류 → {e}")
+        if not _queue:
+            _idle.set()
+
+def flush(timeout: float = 10.0) -> bool:
+    """큐가 빌 때까지 대기 (종료 직전·보고서 전송 후 사용)"""
+    if _worker is None:
+        return True
+    _wake.set()
+    return _idle.wait(timeout)
+
+atexit.register(flush)
+
+def _send_discord(message: str, category: str, exchange: str):
+    _enqueue(f"{exchange}_{category}", text=str(message))
 
 def send_discord_debug(message: str, exchange: str = "aggregated"):
     _send_discord(message, "debug", exchange)
@@ -36,9 +199,14 @@ def send_discord_message(message: str, exchange: str = "aggregated"):
     _send_discord(message, "message", exchange)
 
 def send_discord_file(file_path: str, channel: str = "aggregated"):
-    """이미지·CSV 등을 Discord로 전송"""
-    url = WEBHOOKS.get(channel)
-    if not url:
+    """
+    이미지·CSV 등을 Discord로 전송 (파일 내용은 즉시 읽어 큐에 적재 · 텍스트와 같은 순서)
+      ▸ channel : WEBHOOKS 키 또는 거래소명 – 거래소명은 send_discord_message 와 같은
+        {거래소}_message 웹훅 ("aggregated" → aggregated_message)
+    """
+    key = channel if channel in WEBHOOKS else f"{channel}_message"
+    if not WEBHOOKS.get(key):
         return
     with open(file_path, "rb") as fp:
-        requests.post(url, files={"file": fp})
\ No newline at end of file
+        data = fp.read()
+    _enqueue(key, file=(os.path.basename(file_path), data))